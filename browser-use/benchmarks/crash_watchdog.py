@@ -0,0 +1,229 @@
+"""
+Crash detection benchmark: the event-driven CrashWatchdog versus the health check polling loop it replaced.
+
+Each run opens one of the pages in a fresh browser and measures:
+- idle CPU: CPU time of this process (where the watchdog runs) and of the browser processes while nothing happens
+- tab crash latency: time from navigating the tab to chrome://crash until the crash is reported
+- browser crash latency: time from killing the browser process (SIGKILL) until that is reported, in a second browser
+
+Modes:
+- `events`: CrashWatchdog (BrowserProfile.monitor_crashes=True), crash events, the CDP socket closing and a pidfd on the
+  browser process. A crash counts as reported when it dispatches a BrowserErrorEvent.
+- `polling`: the loop CrashWatchdog ran before, every --interval seconds Target.getTargets, a session per page,
+  Runtime.evaluate('1+1') on the focused tab (1 s timeout) and a psutil status check of the browser process. A crash
+  counts as reported when a check fails. The 10 s startup delay of the old loop is left out.
+
+Usage (from the browser-use directory, needs a browser):
+	python -m benchmarks.crash_watchdog                                 both modes, 3 runs each
+	python -m benchmarks.crash_watchdog --idle 30 --runs 5              longer idle window, more runs
+	python -m benchmarks.crash_watchdog --modes polling --interval 1    the polling loop checking every second
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+
+import psutil
+
+logger = logging.getLogger('benchmarks')
+
+MODES = ('events', 'polling')
+CRASH_ERROR_TYPES = {'TargetCrash', 'BrowserProcessCrashed', 'BrowserDisconnected'}
+
+
+@dataclass
+class CrashWatchdogResult:
+	mode: str
+	idle_seconds: float
+	python_cpu_seconds: list[float] = field(default_factory=list)
+	browser_cpu_seconds: list[float] = field(default_factory=list)
+	tab_crash_ms: list[float | None] = field(default_factory=list)  # None when not reported within --crash-timeout
+	browser_crash_ms: list[float | None] = field(default_factory=list)
+
+
+class PollingCrashDetector:
+	"""The health check loop CrashWatchdog ran before it was event-driven, reports the time of the first failed check"""
+
+	def __init__(self, browser_session, interval: float):
+		self.browser_session = browser_session
+		self.interval = interval
+		self.reported: asyncio.Future[float] = asyncio.get_running_loop().create_future()
+		self._task = asyncio.create_task(self._run())
+
+	async def _check(self) -> None:
+		browser_session = self.browser_session
+		cdp_session = await browser_session.get_or_create_cdp_session()
+		for target in (await browser_session.cdp_client.send.Target.getTargets()).get('targetInfos', []):
+			if target.get('type') == 'page':
+				await browser_session.get_or_create_cdp_session(target_id=target['targetId'], focus=False)
+		await asyncio.wait_for(
+			cdp_session.cdp_client.send.Runtime.evaluate(params={'expression': '1+1'}, session_id=cdp_session.session_id),
+			timeout=1.0,
+		)
+		local_browser_watchdog = browser_session._local_browser_watchdog
+		process = local_browser_watchdog._subprocess if local_browser_watchdog else None
+		if process is not None and process.status() in (psutil.STATUS_ZOMBIE, psutil.STATUS_DEAD):
+			raise RuntimeError(f'Browser process {process.pid} has crashed')
+
+	async def _run(self) -> None:
+		while True:
+			try:
+				await self._check()
+			except Exception:
+				self.reported.set_result(time.perf_counter())
+				return
+			await asyncio.sleep(self.interval)
+
+	async def stop(self) -> None:
+		self._task.cancel()
+		with contextlib.suppress(asyncio.CancelledError):
+			await self._task
+
+
+class EventCrashDetector:
+	"""Reports the time of the first crash BrowserErrorEvent dispatched by CrashWatchdog"""
+
+	def __init__(self, browser_session):
+		from browser_use.browser.events import BrowserErrorEvent
+
+		self.reported: asyncio.Future[float] = asyncio.get_running_loop().create_future()
+		browser_session.event_bus.on(BrowserErrorEvent, self._on_error)
+
+	async def _on_error(self, event) -> None:
+		if event.error_type in CRASH_ERROR_TYPES and not self.reported.done():
+			self.reported.set_result(time.perf_counter())
+
+	async def stop(self) -> None:
+		pass
+
+
+@contextlib.asynccontextmanager
+async def browser_with_detector(mode: str, url: str, interval: float):
+	"""A started browser showing url and a crash detector of the given mode, killed on exit"""
+	from browser_use.browser import BrowserProfile, BrowserSession
+	from browser_use.browser.events import NavigateToUrlEvent
+
+	browser_session = BrowserSession(
+		browser_profile=BrowserProfile(headless=True, user_data_dir=None, monitor_crashes=mode == 'events')
+	)
+	await browser_session.start()
+	try:
+		await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url))
+		detector = EventCrashDetector(browser_session) if mode == 'events' else PollingCrashDetector(browser_session, interval)
+		try:
+			yield browser_session, detector
+		finally:
+			await detector.stop()
+	finally:
+		try:
+			await browser_session.kill()
+		except Exception as e:
+			logger.debug(f'Failed to stop the browser after the run: {type(e).__name__}: {e}')
+
+
+def browser_processes(browser_session) -> list[psutil.Process]:
+	process = browser_session._local_browser_watchdog._subprocess
+	return [process, *process.children(recursive=True)]
+
+
+def cpu_seconds(processes: list[psutil.Process]) -> float:
+	total = 0.0
+	for process in processes:
+		try:
+			times = process.cpu_times()
+		except psutil.Error:
+			continue  # exited between listing and measuring
+		total += times.user + times.system
+	return total
+
+
+async def wait_reported(detector, started: float, timeout: float) -> float | None:
+	"""Milliseconds from started until the detector reported a crash, None if it did not within timeout"""
+	try:
+		reported = await asyncio.wait_for(asyncio.shield(detector.reported), timeout=timeout)
+	except TimeoutError:
+		return None
+	return (reported - started) * 1000
+
+
+async def run_once(result: CrashWatchdogResult, url: str, interval: float, crash_timeout: float) -> None:
+	async with browser_with_detector(result.mode, url, interval) as (browser_session, detector):
+		python_process = psutil.Process()
+		processes = browser_processes(browser_session)
+		python_before, browser_before = cpu_seconds([python_process]), cpu_seconds(processes)
+		await asyncio.sleep(result.idle_seconds)
+		result.python_cpu_seconds.append(cpu_seconds([python_process]) - python_before)
+		result.browser_cpu_seconds.append(cpu_seconds(processes) - browser_before)
+		if detector.reported.done():
+			raise RuntimeError(f'{result.mode}: a crash was reported while the browser was idle')
+
+		assert browser_session.agent_focus is not None
+		started = time.perf_counter()
+		# does not get an answer once the renderer is gone, only the detector's report is waited for
+		navigate = asyncio.create_task(
+			browser_session.cdp_client.send.Page.navigate(
+				params={'url': 'chrome://crash'}, session_id=browser_session.agent_focus.session_id
+			)
+		)
+		result.tab_crash_ms.append(await wait_reported(detector, started, crash_timeout))
+		navigate.cancel()
+		with contextlib.suppress(asyncio.CancelledError, Exception):
+			await navigate
+
+	async with browser_with_detector(result.mode, url, interval) as (browser_session, detector):
+		started = time.perf_counter()
+		browser_session._local_browser_watchdog._subprocess.kill()
+		result.browser_crash_ms.append(await wait_reported(detector, started, crash_timeout))
+
+
+def format_latency(latencies: list[float | None]) -> str:
+	detected = [latency for latency in latencies if latency is not None]
+	missed = len(latencies) - len(detected)
+	median = f'{statistics.median(detected):>8.1f} ms' if detected else f'{"-":>11}'
+	return f'{median}{f" ({missed} missed)" if missed else ""}'
+
+
+def print_result(result: CrashWatchdogResult) -> None:
+	python_cpu = statistics.median(result.python_cpu_seconds) / result.idle_seconds * 100
+	browser_cpu = statistics.median(result.browser_cpu_seconds) / result.idle_seconds * 100
+	print(
+		f'{result.mode:<8} idle CPU python {python_cpu:>6.2f}%   browser {browser_cpu:>6.2f}%   '
+		f'tab crash {format_latency(result.tab_crash_ms)}   browser crash {format_latency(result.browser_crash_ms)}'
+	)
+
+
+async def main(args: argparse.Namespace) -> int:
+	from benchmarks.pages import PAGES, PageServer
+
+	with PageServer({args.page: PAGES[args.page]()}) as server:
+		url = server.url(args.page)
+		for mode in args.modes:
+			result = CrashWatchdogResult(mode, args.idle)
+			for _ in range(args.runs):
+				await run_once(result, url, args.interval, args.crash_timeout)
+			print_result(result)
+	print(f'\nmedians of {args.runs} runs, idle CPU over {args.idle:g} s, polling every {args.interval:g} s')
+	return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+	from benchmarks.pages import PAGES
+
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--runs', type=int, default=3, help='runs per mode (default: 3)')
+	parser.add_argument('--idle', type=float, default=15.0, help='seconds the idle CPU is measured over (default: 15)')
+	parser.add_argument('--interval', type=float, default=5.0, help='check interval of the polling loop (default: 5, as before)')
+	parser.add_argument('--crash-timeout', type=float, default=30.0, help='seconds to wait for a crash report (default: 30)')
+	parser.add_argument('--page', choices=list(PAGES), default='large_table')
+	parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+	return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+	logging.basicConfig(level=logging.WARNING)
+	sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,83 @@
+"""Scripted chat model for end-to-end step timing without a real LLM."""
+
+import asyncio
+import json
+from typing import Any, TypeVar, overload
+
+from pydantic import BaseModel
+
+from browser_use.llm.messages import BaseMessage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+
+T = TypeVar('T', bound=BaseModel)
+
+DONE_ACTION = {'done': {'text': 'Benchmark finished', 'success': True}}
+
+
+class ScriptedChatModel:
+	"""
+	Replies with a fixed list of actions (one per step, then `done`), after an optional simulated latency.
+
+	Usage is estimated at 4 characters per token so the token cost service has something to count.
+	"""
+
+	_verified_api_keys = True
+
+	def __init__(self, actions: list[dict[str, Any]], latency: float = 0.0):
+		self.model = 'scripted'
+		self.actions = actions
+		self.latency = latency
+		self.prompt_chars: list[int] = []
+
+	@property
+	def provider(self) -> str:
+		return 'scripted'
+
+	@property
+	def name(self) -> str:
+		return self.model
+
+	@property
+	def model_name(self) -> str:
+		return self.model
+
+	@classmethod
+	def scrolling(cls, steps: int, latency: float = 0.0) -> 'ScriptedChatModel':
+		"""Scroll down and back up for `steps` steps, every step rebuilds the DOM of the whole page"""
+		return cls([{'scroll': {'down': step % 2 == 0, 'num_pages': 1.0}} for step in range(steps)], latency)
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T]) -> ChatInvokeCompletion[T]: ...
+
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		if self.latency:
+			await asyncio.sleep(self.latency)
+
+		step = len(self.prompt_chars)
+		prompt_chars = sum(len(message.text) for message in messages)
+		self.prompt_chars.append(prompt_chars)
+		output = {
+			'thinking': f'Benchmark step {step + 1}',
+			'evaluation_previous_goal': 'Success',
+			'memory': f'Ran {step} scripted steps',
+			'next_goal': 'Continue the script',
+			'action': [self.actions[step] if step < len(self.actions) else DONE_ACTION],
+		}
+		completion = json.dumps(output)
+		usage = ChatInvokeUsage(
+			prompt_tokens=prompt_chars // 4,
+			prompt_cached_tokens=None,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=len(completion) // 4,
+			total_tokens=(prompt_chars + len(completion)) // 4,
+		)
+
+		if output_format is None:
+			return ChatInvokeCompletion(completion=completion, usage=usage)
+		return ChatInvokeCompletion(completion=output_format.model_validate(output), usage=usage)
@@ -0,0 +1,206 @@
+"""
+Synthetic benchmark pages.
+
+Every page is described once as a small element tree (`El`) and rendered two ways:
+- `render_html()` gives a self-contained HTML document (iframes use `srcdoc`, shadow roots use declarative
+  `<template shadowrootmode="open">`) that `record.py` serves locally and captures through a real browser
+- `benchmarks.synthetic.build_cdp_payloads()` gives the CDP payloads Chrome would return for it, so the
+  replay benchmarks run without a browser
+"""
+
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+@dataclass
+class El:
+	"""An element of a synthetic page, children are elements or text"""
+
+	tag: str
+	attrs: dict[str, str] = field(default_factory=dict)
+	children: list['El | str'] = field(default_factory=list)
+	shadow: list['El | str'] | None = None  # children of an open shadow root attached to this element
+	frame: list['El | str'] | None = None  # body of a same-origin iframe document (tag must be 'iframe')
+
+
+def document(title: str, body: list[El | str]) -> El:
+	return El('html', children=[El('head', children=[El('title', children=[title])]), El('body', children=body)])
+
+
+def count_nodes(node: El | str) -> int:
+	"""Number of DOM nodes (elements, text and shadow roots) in the tree, not counting iframe documents"""
+	if isinstance(node, str):
+		return 1
+	total = 1 + sum(count_nodes(child) for child in node.children)
+	if node.shadow is not None:
+		total += 1 + sum(count_nodes(child) for child in node.shadow)
+	return total
+
+
+def render_html(root: El) -> str:
+	return '<!DOCTYPE html>' + _render(root)
+
+
+def _render(node: El | str) -> str:
+	if isinstance(node, str):
+		return escape(node, quote=False)
+
+	attrs = dict(node.attrs)
+	if node.frame is not None:
+		attrs['srcdoc'] = render_html(document('frame', node.frame))
+	attr_html = ''.join(f' {name}="{escape(value)}"' for name, value in attrs.items())
+	if node.tag in VOID_TAGS:
+		return f'<{node.tag}{attr_html}>'
+
+	inner = ''.join(_render(child) for child in node.children)
+	if node.shadow is not None:
+		inner = '<template shadowrootmode="open">' + ''.join(_render(child) for child in node.shadow) + '</template>' + inner
+	return f'<{node.tag}{attr_html}>{inner}</{node.tag}>'
+
+
+# --- Pages ---
+
+
+def large_table(rows: int = 1000, columns: int = 8) -> El:
+	"""A data grid: every row has a link, a checkbox and an action button"""
+	header = El('tr', children=[El('th', children=[f'Column {column}']) for column in range(columns)])
+	body_rows = []
+	for row in range(rows):
+		cells: list[El | str] = [
+			El('td', children=[El('input', {'type': 'checkbox', 'name': f'select-{row}', 'aria-label': f'Select row {row}'})]),
+			El('td', children=[El('a', {'href': f'/item/{row}'}, [f'Item {row}'])]),
+		]
+		cells += [El('td', children=[f'Value {row}.{column}']) for column in range(2, columns - 1)]
+		cells.append(El('td', children=[El('button', {'type': 'button'}, ['Edit'])]))
+		body_rows.append(El('tr', children=cells))
+	table = El('table', {'id': 'grid'}, [El('thead', children=[header]), El('tbody', children=body_rows)])
+	return document('Large table', [El('h1', children=['Orders']), table])
+
+
+def deep_shadow(hosts: int = 40, depth: int = 15) -> El:
+	"""Web components nested `depth` shadow roots deep, each level with a button and some text"""
+
+	def component(level: int, host: int) -> El:
+		content: list[El | str] = [
+			El('span', children=[f'Level {level} of component {host}']),
+			El('button', {'type': 'button', 'aria-label': f'Action {host}.{level}'}, ['Action']),
+		]
+		if level < depth:
+			content.append(component(level + 1, host))
+		return El(f'x-level-{level}', shadow=content)
+
+	return document('Deep shadow DOM', [El('main', children=[component(1, host) for host in range(hosts)])])
+
+
+def many_iframes(frames: int = 40) -> El:
+	"""Same-origin iframes, each containing a small form"""
+
+	def form(frame: int) -> list[El | str]:
+		return [
+			El('h2', children=[f'Form {frame}']),
+			El(
+				'form',
+				children=[
+					El('label', {'for': f'name-{frame}'}, ['Name']),
+					El('input', {'id': f'name-{frame}', 'name': 'name', 'type': 'text', 'placeholder': 'Your name'}),
+					El('select', {'name': 'plan'}, [El('option', children=[plan]) for plan in ('Free', 'Pro', 'Team')]),
+					El('button', {'type': 'submit'}, ['Submit']),
+				],
+			),
+		]
+
+	return document(
+		'Many iframes',
+		[
+			El('iframe', {'title': f'frame {frame}', 'width': '600', 'height': '300'}, frame=form(frame))
+			for frame in range(frames)
+		],
+	)
+
+
+def huge_dom(target_nodes: int = 50_000) -> El:
+	"""A long article feed of roughly `target_nodes` nodes, mostly static text with some links and a scroll container"""
+	sections: list[El | str] = []
+	section = 0
+	nodes = 0
+	while nodes < target_nodes:
+		items = [
+			El('li', children=[El('a', {'href': f'/s/{section}/{item}'}, [f'Link {item}']), f' description {item}'])
+			for item in range(10)
+		]
+		article = El(
+			'article',
+			children=[
+				El('h2', children=[f'Section {section}']),
+				El('div', children=[El('p', children=[f'Paragraph {section}.{paragraph} ' * 5]) for paragraph in range(5)]),
+				El('ul', children=items),
+			],
+		)
+		sections.append(article)
+		nodes += count_nodes(article)
+		section += 1
+	scroller = El('div', {'id': 'feed', 'style': 'overflow: auto; height: 600px'}, sections)
+	return document('Huge DOM', [El('nav', children=[El('a', {'href': '/'}, ['Home'])]), scroller])
+
+
+def deep_nesting(depth: int = 200, width: int = 5) -> El:
+	"""A generated layout nested `depth` wrappers deep, every level with `width` labelled buttons"""
+	level: El | None = None
+	for depth_index in reversed(range(depth)):
+		content: list[El | str] = [
+			El('div', children=[El('span', children=[f'Cell {depth_index}.{cell}']), El('button', children=['Open'])])
+			for cell in range(width)
+		]
+		if level is not None:
+			content.append(level)
+		level = El('div', {'class': f'layout-{depth_index}'}, content)
+	assert level is not None
+	return document('Deep nesting', [level])
+
+
+PAGES: dict[str, Callable[[], El]] = {
+	'large_table': large_table,
+	'deep_shadow': deep_shadow,
+	'many_iframes': many_iframes,
+	'huge_dom': huge_dom,
+	'deep_nesting': deep_nesting,
+}
+
+
+class PageServer:
+	"""Serves the rendered pages at http://127.0.0.1:<port>/<name>.html from a background thread"""
+
+	def __init__(self, pages: dict[str, El]):
+		rendered = {f'/{name}.html': render_html(root).encode() for name, root in pages.items()}
+
+		class Handler(BaseHTTPRequestHandler):
+			def do_GET(self):
+				body = rendered.get(self.path)
+				self.send_response(200 if body is not None else 404)
+				self.send_header('Content-Type', 'text/html; charset=utf-8')
+				self.send_header('Content-Length', str(len(body or b'')))
+				self.end_headers()
+				self.wfile.write(body or b'')
+
+			def log_message(self, format, *args):
+				pass
+
+		self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+		self._thread = threading.Thread(target=self._server.serve_forever, name='benchmark-page-server', daemon=True)
+
+	def url(self, name: str) -> str:
+		host, port = self._server.server_address[:2]
+		return f'http://{host}:{port}/{name}.html'
+
+	def __enter__(self) -> 'PageServer':
+		self._thread.start()
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		self._server.shutdown()
+		self._server.server_close()
@@ -0,0 +1,73 @@
+"""
+Record the CDP payloads of the benchmark pages from a real browser.
+
+Serves the synthetic pages locally, opens each one in a headless browser and stores what `DomService` receives from
+`DOM.getDocument`, `DOMSnapshot.captureSnapshot` and `Accessibility.getFullAXTree` in
+`benchmarks/recordings/<page>.json.gz`. `run.py` replays these instead of the synthetic payloads when they exist.
+
+Usage (from the browser-use directory):
+	python -m benchmarks.record                   record every page
+	python -m benchmarks.record large_table       record one page
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+
+from benchmarks.pages import PAGES, PageServer
+from benchmarks.synthetic import build_cdp_payloads
+
+RECORDINGS_DIR = Path(__file__).parent / 'recordings'
+
+
+def recording_path(page: str) -> Path:
+	return RECORDINGS_DIR / f'{page}.json.gz'
+
+
+def load_payloads(page: str) -> tuple[dict[str, Any], str]:
+	"""Get the CDP payloads of a page and where they came from: 'recorded' if a recording exists, else 'synthetic'"""
+	path = recording_path(page)
+	if path.exists():
+		with gzip.open(path, 'rt') as f:
+			return json.load(f), 'recorded'
+	return build_cdp_payloads(PAGES[page]()), 'synthetic'
+
+
+async def record(pages: list[str]) -> None:
+	from browser_use.browser import BrowserProfile, BrowserSession
+	from browser_use.browser.events import NavigateToUrlEvent
+	from browser_use.dom.service import DomService
+
+	RECORDINGS_DIR.mkdir(exist_ok=True)
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, keep_alive=True))
+	await session.start()
+	try:
+		with PageServer({page: PAGES[page]() for page in pages}) as server:
+			for page in pages:
+				await session.event_bus.dispatch(NavigateToUrlEvent(url=server.url(page)))
+				assert session.agent_focus is not None
+				trees = await DomService(session)._get_all_trees(session.agent_focus.target_id)
+				payloads = {
+					'url': server.url(page),
+					'snapshot': trees.snapshot,
+					'dom_tree': trees.dom_tree,
+					'ax_tree': trees.ax_tree,
+					'device_pixel_ratio': trees.device_pixel_ratio,
+				}
+				with gzip.open(recording_path(page), 'wt') as f:
+					json.dump(payloads, f)
+				print(f'Recorded {page} to {recording_path(page)}')
+	finally:
+		await session.kill()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('pages', nargs='*', help=f'pages to record (default: all of {", ".join(PAGES)})')
+	args = parser.parse_args()
+	if unknown := set(args.pages) - PAGES.keys():
+		parser.error(f'unknown pages: {", ".join(sorted(unknown))}')
+	asyncio.run(record(args.pages or list(PAGES)))
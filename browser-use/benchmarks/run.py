@@ -0,0 +1,330 @@
+"""
+Offline performance benchmarks for the DOM -> prompt pipeline.
+
+Replays the CDP payloads of the benchmark pages (recorded with `record.py`, or built synthetically when there is no
+recording) through the code every agent step runs, without a browser or an LLM:
+
+	snapshot_lookup   build_snapshot_lookup() over the DOMSnapshot payload
+	dom_tree          DomService.get_dom_tree(), merging the DOM, snapshot and AX payloads into EnhancedDOMTreeNodes
+	serialize         DOMTreeSerializer.serialize_accessible_elements()
+	prompt            AgentMessagePrompt.get_user_message() for the serialized page
+
+With --e2e it also times full agent steps against the pages served locally, driven by a scripted fake LLM (needs a
+browser). Each result reports p50/p95 latency and the peak memory allocated by one run (tracemalloc), and is compared
+against `benchmarks/baseline.json`; the exit code is 1 when a p50 regressed by more than --tolerance.
+
+Usage (from the browser-use directory):
+	python -m benchmarks.run                                 run everything and compare against the baseline
+	python -m benchmarks.run --pages large_table -n 20       one page, 20 timed iterations
+	python -m benchmarks.run --save-baseline                 store the results as the new baseline
+	python -m benchmarks.run --e2e                           also time agent steps in a real browser
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import math
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, cast
+
+from benchmarks.record import load_payloads
+from browser_use.dom.enhanced_snapshot import build_snapshot_lookup
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode, SerializedDOMState, TargetAllTrees
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+TARGET_ID = 'BENCHMARK0000000000000000000000000000000'
+NOISE_FLOOR_MS = 1.0  # differences smaller than this are never reported as regressions
+
+logger = logging.getLogger('benchmarks')
+
+
+@dataclass
+class BenchmarkResult:
+	name: str  # '<page>/<stage>'
+	timings_ms: list[float]
+	peak_memory_mb: float
+	source: str  # 'recorded', 'synthetic' or 'browser'
+
+	@property
+	def p50_ms(self) -> float:
+		return percentile(self.timings_ms, 50)
+
+	@property
+	def p95_ms(self) -> float:
+		return percentile(self.timings_ms, 95)
+
+	def to_dict(self) -> dict[str, Any]:
+		return {
+			'p50_ms': round(self.p50_ms, 3),
+			'p95_ms': round(self.p95_ms, 3),
+			'peak_memory_mb': round(self.peak_memory_mb, 3),
+			'iterations': len(self.timings_ms),
+			'source': self.source,
+		}
+
+
+def percentile(values: list[float], pct: float) -> float:
+	"""Nearest-rank percentile, exact for the small sample sizes benchmarks use"""
+	ordered = sorted(values)
+	return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+# --- Replay ---
+
+
+class ReplayDomService(DomService):
+	"""DomService that builds the tree from stored CDP payloads instead of asking a browser for them"""
+
+	def __init__(self, payloads: dict[str, Any]):
+		super().__init__(cast(Any, SimpleNamespace(logger=logger, agent_focus=None)), logger=logger)
+		self.payloads = payloads
+
+	async def _get_all_trees(self, target_id: str) -> TargetAllTrees:
+		return TargetAllTrees(
+			snapshot=self.payloads['snapshot'],
+			dom_tree=self.payloads['dom_tree'],
+			ax_tree=self.payloads['ax_tree'],
+			device_pixel_ratio=self.payloads['device_pixel_ratio'],
+			cdp_timing={},
+		)
+
+
+class Replay:
+	"""The payloads of one page plus the intermediate results later stages start from"""
+
+	def __init__(self, page: str):
+		self.page = page
+		self.payloads, self.source = load_payloads(page)
+		self.url = self.payloads.get('url', f'http://127.0.0.1/{page}.html')
+		self._serialized: SerializedDOMState | None = None
+
+	async def dom_tree(self) -> EnhancedDOMTreeNode:
+		return await ReplayDomService(self.payloads).get_dom_tree(TARGET_ID)
+
+	async def serialized(self) -> SerializedDOMState:
+		if self._serialized is None:
+			self._serialized, _ = DOMTreeSerializer(await self.dom_tree()).serialize_accessible_elements()
+		return self._serialized
+
+
+# Every stage prepares its input (untimed) and returns the callable that is timed
+Stage = Callable[[Replay], Awaitable[Callable[[], Any]]]
+
+
+async def _snapshot_lookup_stage(replay: Replay) -> Callable[[], Any]:
+	return lambda: build_snapshot_lookup(replay.payloads['snapshot'], replay.payloads['device_pixel_ratio'])
+
+
+async def _dom_tree_stage(replay: Replay) -> Callable[[], Any]:
+	return replay.dom_tree
+
+
+async def _serialize_stage(replay: Replay) -> Callable[[], Any]:
+	tree = await replay.dom_tree()  # the serializer annotates the tree, so every run gets a fresh one
+	return lambda: DOMTreeSerializer(tree).serialize_accessible_elements()
+
+
+async def _prompt_stage(replay: Replay) -> Callable[[], Any]:
+	from browser_use.agent.prompts import AgentMessagePrompt
+	from browser_use.browser.views import BrowserStateSummary, TabInfo
+	from browser_use.filesystem.file_system import FileSystem
+
+	state = BrowserStateSummary(
+		dom_state=await replay.serialized(),
+		url=replay.url,
+		title=replay.page,
+		tabs=[TabInfo(url=replay.url, title=replay.page, target_id=TARGET_ID)],
+	)
+	file_system = FileSystem(tempfile.mkdtemp(prefix='browser_use_benchmark_'))
+
+	def build_prompt():
+		return AgentMessagePrompt(
+			browser_state_summary=state, file_system=file_system, task='Benchmark the prompt build'
+		).get_user_message(use_vision=False)
+
+	return build_prompt
+
+
+STAGES: dict[str, Stage] = {
+	'snapshot_lookup': _snapshot_lookup_stage,
+	'dom_tree': _dom_tree_stage,
+	'serialize': _serialize_stage,
+	'prompt': _prompt_stage,
+}
+
+
+async def _call(func: Callable[[], Any]) -> Any:
+	result = func()
+	if inspect.isawaitable(result):
+		result = await result
+	return result
+
+
+async def run_stage(replay: Replay, stage: str, iterations: int, warmup: int = 1) -> BenchmarkResult:
+	timings_ms: list[float] = []
+	for run in range(warmup + iterations):
+		func = await STAGES[stage](replay)
+		start = time.perf_counter()
+		await _call(func)
+		if run >= warmup:
+			timings_ms.append((time.perf_counter() - start) * 1000)
+
+	# measured separately, tracemalloc slows down allocation heavy code too much to time it at the same time
+	func = await STAGES[stage](replay)
+	tracemalloc.start()
+	try:
+		await _call(func)
+		_, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+
+	return BenchmarkResult(f'{replay.page}/{stage}', timings_ms, peak / 1024 / 1024, replay.source)
+
+
+async def run_replay_benchmarks(pages: list[str], stages: list[str], iterations: int) -> list[BenchmarkResult]:
+	results = []
+	for page in pages:
+		replay = Replay(page)
+		for stage in stages:
+			result = await run_stage(replay, stage, iterations)
+			print_result(result)
+			results.append(result)
+	return results
+
+
+# --- End to end ---
+
+
+async def run_agent_benchmarks(pages: list[str], steps: int) -> list[BenchmarkResult]:
+	"""Time real agent steps (browser state, prompt, scripted LLM, action) on the locally served pages"""
+	from benchmarks.fake_llm import ScriptedChatModel
+	from benchmarks.pages import PAGES, PageServer
+	from browser_use import Agent
+	from browser_use.browser import BrowserProfile, BrowserSession
+
+	results = []
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, keep_alive=True))
+	await session.start()
+	try:
+		with PageServer({page: PAGES[page]() for page in pages}) as server:
+			for page in pages:
+				llm = ScriptedChatModel.scrolling(steps)
+				agent = Agent(
+					task=f'Scroll through the {page} page',
+					llm=llm,
+					browser_session=session,
+					initial_actions=[{'go_to_url': {'url': server.url(page), 'new_tab': False}}],
+					use_vision=False,
+				)
+				tracemalloc.start()
+				try:
+					history = await agent.run(max_steps=steps + 1)
+					_, peak = tracemalloc.get_traced_memory()
+				finally:
+					tracemalloc.stop()
+				timings_ms = [
+					item.metadata.duration_seconds * 1000
+					for item in history.history
+					if item.metadata is not None and item.metadata.step_number > 0
+				]
+				result = BenchmarkResult(f'{page}/agent_step', timings_ms, peak / 1024 / 1024, 'browser')
+				print_result(result, f'prompt ~{sum(llm.prompt_chars) // max(len(llm.prompt_chars), 1)} chars')
+				results.append(result)
+	finally:
+		await session.kill()
+	return results
+
+
+# --- Reporting ---
+
+
+def print_result(result: BenchmarkResult, extra: str = '') -> None:
+	print(
+		f'{result.name:<32} p50 {result.p50_ms:>10.2f} ms   p95 {result.p95_ms:>10.2f} ms   '
+		f'peak {result.peak_memory_mb:>8.2f} MB   [{result.source}] {extra}'
+	)
+
+
+def compare_to_baseline(results: list[BenchmarkResult], baseline: dict[str, Any], tolerance: float) -> list[str]:
+	"""Print how every result moved against the baseline, returns the names of the ones that regressed"""
+	regressions = []
+	print(f'\nCompared to baseline ({baseline.get("created", "unknown date")}, {baseline.get("machine", "unknown machine")}):')
+	for result in results:
+		reference = baseline['results'].get(result.name)
+		if reference is None:
+			print(f'{result.name:<32} new')
+			continue
+		if reference['source'] != result.source:
+			print(f'{result.name:<32} skipped, baseline was measured on {reference["source"]} payloads')
+			continue
+		change = result.p50_ms / reference['p50_ms'] - 1 if reference['p50_ms'] else 0.0
+		memory_change = result.peak_memory_mb / reference['peak_memory_mb'] - 1 if reference['peak_memory_mb'] else 0.0
+		regressed = change > tolerance and result.p50_ms - reference['p50_ms'] > NOISE_FLOOR_MS
+		print(
+			f'{result.name:<32} p50 {change:>+8.1%}   peak memory {memory_change:>+8.1%}' + ('   REGRESSION' if regressed else '')
+		)
+		if regressed:
+			regressions.append(result.name)
+	return regressions
+
+
+def save_baseline(results: list[BenchmarkResult], path: Path) -> None:
+	baseline = {
+		'created': time.strftime('%Y-%m-%d'),
+		'machine': f'{platform.system()} {platform.machine()}, Python {platform.python_version()}',
+		'results': {result.name: result.to_dict() for result in results},
+	}
+	if path.exists():  # keep the results of pages and stages that were not part of this run
+		baseline['results'] = {**json.loads(path.read_text())['results'], **baseline['results']}
+	path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+	print(f'\nSaved baseline to {path}')
+
+
+async def main(args: argparse.Namespace) -> int:
+	results = await run_replay_benchmarks(args.pages, args.stages, args.iterations)
+	if args.e2e:
+		results += await run_agent_benchmarks(args.pages, args.steps)
+
+	if args.save_baseline:
+		save_baseline(results, args.baseline)
+		return 0
+	if not args.baseline.exists():
+		print(f'\nNo baseline at {args.baseline}, create one with --save-baseline')
+		return 0
+	regressions = compare_to_baseline(results, json.loads(args.baseline.read_text()), args.tolerance)
+	if regressions:
+		print(f'\n{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}: {", ".join(regressions)}')
+		return 1
+	return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+	from benchmarks.pages import PAGES
+
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--pages', nargs='+', choices=list(PAGES), default=list(PAGES))
+	parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+	parser.add_argument('-n', '--iterations', type=int, default=5, help='timed iterations per stage (default: 5)')
+	parser.add_argument('--e2e', action='store_true', help='also time full agent steps in a real browser')
+	parser.add_argument('--steps', type=int, default=4, help='agent steps per page with --e2e (default: 4)')
+	parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+	parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+	parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p50 slowdown before failing (default: 0.25)')
+	return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+	logging.basicConfig(level=logging.WARNING)
+	sys.exit(asyncio.run(main(parse_args())))
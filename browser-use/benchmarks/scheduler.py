@@ -0,0 +1,205 @@
+"""
+Load test: many agents in one process sharing one browser (AgentScheduler), versus one process and browser per agent.
+
+Every agent scrolls through the same locally served page, driven by the scripted fake LLM with a simulated latency.
+Each mode reports the wall time, agent steps per second and the peak RSS of all its processes (Python and Chromium),
+sampled with psutil. In the process-per-agent mode the processes are the agent workers and their browsers, the
+harness process that only waits for them is not counted.
+
+Usage (from the browser-use directory, needs a browser):
+	python -m benchmarks.scheduler                                    8 agents, 4 steps each, both modes
+	python -m benchmarks.scheduler --agents 16 --latency 1.0          more agents, slower LLM
+	python -m benchmarks.scheduler --modes scheduler --llm-slots 4    4 LLM calls at a time, scheduler only
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+
+import psutil
+
+logger = logging.getLogger('benchmarks')
+
+MODES = ('scheduler', 'process_per_agent')
+RSS_SAMPLE_INTERVAL = 0.1
+
+
+@dataclass
+class LoadTestResult:
+	mode: str
+	agents: int
+	steps: int
+	seconds: float
+	peak_rss_mb: float
+
+	@property
+	def steps_per_second(self) -> float:
+		return self.steps / self.seconds if self.seconds else 0.0
+
+
+class RssSampler:
+	"""Samples the summed RSS of a process and its children in the background, keeps the peak"""
+
+	def __init__(self, include_self: bool):
+		self.include_self = include_self
+		self.peak_bytes = 0
+		self._task: asyncio.Task | None = None
+
+	def sample(self) -> int:
+		process = psutil.Process()
+		processes = process.children(recursive=True) + ([process] if self.include_self else [])
+		total = 0
+		for child in processes:
+			try:
+				total += child.memory_info().rss
+			except psutil.Error:
+				pass  # exited between listing and measuring
+		self.peak_bytes = max(self.peak_bytes, total)
+		return total
+
+	async def _run(self) -> None:
+		while True:
+			self.sample()
+			await asyncio.sleep(RSS_SAMPLE_INTERVAL)
+
+	async def __aenter__(self) -> 'RssSampler':
+		self._task = asyncio.create_task(self._run())
+		return self
+
+	async def __aexit__(self, *exc_info) -> None:
+		assert self._task is not None
+		self._task.cancel()
+		self.sample()
+
+
+async def run_scheduler(url: str, agents: int, steps: int, latency: float, llm_slots: int | None) -> LoadTestResult:
+	"""All agents in this process, one shared browser"""
+	from benchmarks.fake_llm import ScriptedChatModel
+	from browser_use.agent.scheduler import AgentScheduler
+	from browser_use.browser import BrowserProfile, BrowserSession
+
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, keep_alive=True))
+	scheduler = AgentScheduler(browser_session=browser_session, max_concurrent_llm_calls=llm_slots)
+	for i in range(agents):
+		scheduler.add(
+			f'Scroll through the page ({i})',
+			llm=ScriptedChatModel.scrolling(steps, latency),  # type: ignore[arg-type]
+			max_steps=steps + 1,
+			initial_actions=[{'go_to_url': {'url': url, 'new_tab': False}}],
+			use_vision=False,
+		)
+
+	async with RssSampler(include_self=True) as rss:
+		start = time.perf_counter()
+		try:
+			histories = await scheduler.run()
+		finally:
+			seconds = time.perf_counter() - start
+			await browser_session.kill()
+	return LoadTestResult(
+		'scheduler', agents, sum(history.number_of_steps() for history in histories), seconds, rss.peak_bytes / 1e6
+	)
+
+
+async def run_process_per_agent(url: str, agents: int, steps: int, latency: float) -> LoadTestResult:
+	"""Every agent in a worker process with a browser of its own"""
+	async with RssSampler(include_self=False) as rss:
+		start = time.perf_counter()
+		workers = [
+			await asyncio.create_subprocess_exec(
+				sys.executable,
+				'-m',
+				'benchmarks.scheduler',
+				'--worker',
+				url,
+				'--steps',
+				str(steps),
+				'--latency',
+				str(latency),
+				stdout=asyncio.subprocess.PIPE,
+			)
+			for _ in range(agents)
+		]
+		outputs = await asyncio.gather(*(worker.communicate() for worker in workers))
+		seconds = time.perf_counter() - start
+
+	total_steps = 0
+	for worker, (stdout, _) in zip(workers, outputs):
+		if worker.returncode != 0:
+			raise RuntimeError(f'Agent worker exited with code {worker.returncode}')
+		total_steps += json.loads(stdout.decode().strip().splitlines()[-1])['steps']
+	return LoadTestResult('process_per_agent', agents, total_steps, seconds, rss.peak_bytes / 1e6)
+
+
+async def run_worker(url: str, steps: int, latency: float) -> None:
+	"""One agent with its own browser, prints its number of steps as the last line of output"""
+	from benchmarks.fake_llm import ScriptedChatModel
+	from browser_use import Agent
+	from browser_use.browser import BrowserProfile, BrowserSession
+
+	agent = Agent(
+		task='Scroll through the page',
+		llm=ScriptedChatModel.scrolling(steps, latency),  # type: ignore[arg-type]
+		browser_session=BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None)),
+		initial_actions=[{'go_to_url': {'url': url, 'new_tab': False}}],
+		use_vision=False,
+	)
+	history = await agent.run(max_steps=steps + 1)
+	print(json.dumps({'steps': history.number_of_steps()}))
+
+
+def print_result(result: LoadTestResult) -> None:
+	print(
+		f'{result.mode:<20} {result.agents:>4} agents   {result.steps:>5} steps in {result.seconds:>7.2f} s   '
+		f'{result.steps_per_second:>7.2f} steps/s   peak RSS {result.peak_rss_mb:>9.1f} MB'
+	)
+
+
+async def main(args: argparse.Namespace) -> int:
+	from benchmarks.pages import PAGES, PageServer
+
+	if args.worker:
+		await run_worker(args.worker, args.steps, args.latency)
+		return 0
+
+	results = []
+	with PageServer({args.page: PAGES[args.page]()}) as server:
+		url = server.url(args.page)
+		for mode in args.modes:
+			if mode == 'scheduler':
+				result = await run_scheduler(url, args.agents, args.steps, args.latency, args.llm_slots)
+			else:
+				result = await run_process_per_agent(url, args.agents, args.steps, args.latency)
+			print_result(result)
+			results.append(result)
+
+	if len(results) == 2:
+		scheduler, processes = results
+		print(
+			f'\nscheduler vs process per agent: throughput {scheduler.steps_per_second / processes.steps_per_second:.2f}x, '
+			f'peak RSS {scheduler.peak_rss_mb / processes.peak_rss_mb:.2f}x'
+		)
+	return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+	from benchmarks.pages import PAGES
+
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--agents', type=int, default=8, help='number of agents (default: 8)')
+	parser.add_argument('--steps', type=int, default=4, help='scripted steps per agent (default: 4)')
+	parser.add_argument('--latency', type=float, default=0.5, help='simulated LLM latency in seconds (default: 0.5)')
+	parser.add_argument('--page', choices=list(PAGES), default='large_table')
+	parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+	parser.add_argument('--llm-slots', type=int, default=None, help='max concurrent LLM calls with the scheduler')
+	parser.add_argument('--worker', metavar='URL', help=argparse.SUPPRESS)  # runs one agent, used by process_per_agent
+	return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+	logging.basicConfig(level=logging.WARNING)
+	sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,369 @@
+"""
+CDP payloads for synthetic pages, built without a browser.
+
+`build_cdp_payloads()` returns what `DOM.getDocument`, `DOMSnapshot.captureSnapshot` and `Accessibility.getFullAXTree`
+would return for a page from `benchmarks.pages`. The layout is deliberately simple (blocks stacked vertically, table
+cells side by side, fixed-size form controls and iframes) but realistic enough for visibility, paint order and
+clickability detection to do the same work they do on a real page. Recordings made with `record.py` take precedence.
+"""
+
+import math
+from typing import Any
+
+from benchmarks.pages import El, document
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES
+
+VIEWPORT_WIDTH = 1280
+VIEWPORT_HEIGHT = 800
+IFRAME_WIDTH = 600
+IFRAME_HEIGHT = 300
+LINE_HEIGHT = 18
+CHAR_WIDTH = 7
+CONTROL_HEIGHT = 24
+INDENT = 4
+
+NO_LAYOUT_TAGS = {'head', 'title', 'meta', 'link', 'script', 'style', 'template', 'option'}
+CONTROL_TAGS = {'input', 'button', 'select', 'textarea'}
+CLICKABLE_TAGS = {'a', 'button', 'input', 'select', 'textarea', 'label'}
+FOCUSABLE_TAGS = {'a', 'button', 'input', 'select', 'textarea'}
+DISPLAY = {
+	'a': 'inline',
+	'span': 'inline',
+	'label': 'inline',
+	'button': 'inline-block',
+	'input': 'inline-block',
+	'select': 'inline-block',
+	'table': 'table',
+	'thead': 'table-header-group',
+	'tbody': 'table-row-group',
+	'tr': 'table-row',
+	'td': 'table-cell',
+	'th': 'table-cell',
+	'li': 'list-item',
+}
+CURSOR = {'a': 'pointer', 'button': 'pointer', 'select': 'pointer', 'label': 'pointer', 'input': 'text'}
+AX_ROLES = {
+	'a': 'link',
+	'button': 'button',
+	'input': 'textbox',
+	'select': 'combobox',
+	'option': 'option',
+	'label': 'LabelText',
+	'h1': 'heading',
+	'h2': 'heading',
+	'p': 'paragraph',
+	'table': 'table',
+	'tr': 'row',
+	'td': 'cell',
+	'th': 'columnheader',
+	'ul': 'list',
+	'li': 'listitem',
+	'form': 'form',
+	'main': 'main',
+	'nav': 'navigation',
+	'article': 'article',
+	'iframe': 'Iframe',
+}
+
+
+class _Document:
+	"""One entry of `DOMSnapshot.captureSnapshot().documents`, the main page or an iframe"""
+
+	def __init__(self, builder: '_PayloadBuilder', url: str, title: str, frame_id: str):
+		self.nodes: dict[str, Any] = {
+			'parentIndex': [],
+			'nodeType': [],
+			'nodeName': [],
+			'nodeValue': [],
+			'backendNodeId': [],
+			'attributes': [],
+			'isClickable': {'index': []},
+			'contentDocumentIndex': {'index': [], 'value': []},
+		}
+		self.layout: dict[str, Any] = {
+			'nodeIndex': [],
+			'styles': [],
+			'bounds': [],
+			'text': [],
+			'stackingContexts': {'index': [0]},
+			'paintOrders': [],
+			'offsetRects': [],
+			'scrollRects': [],
+			'clientRects': [],
+		}
+		self.snapshot: dict[str, Any] = {
+			'documentURL': builder.string(url),
+			'title': builder.string(title),
+			'baseURL': builder.string(url),
+			'contentLanguage': -1,
+			'encodingName': builder.string('UTF-8'),
+			'publicId': -1,
+			'systemId': -1,
+			'frameId': builder.string(frame_id),
+			'nodes': self.nodes,
+			'layout': self.layout,
+			'textBoxes': {'layoutIndex': [], 'bounds': [], 'start': [], 'length': []},
+			'scrollOffsetX': 0,
+			'scrollOffsetY': 0,
+		}
+
+
+class _PayloadBuilder:
+	def __init__(self):
+		self.strings: list[str] = []
+		self._string_ids: dict[str, int] = {}
+		self._style_ids: dict[tuple[str, ...], list[int]] = {}
+		self.documents: list[_Document] = []
+		self.ax_nodes: list[dict[str, Any]] = []
+		self._node_ids = 0
+		self._frames = 0
+
+	def string(self, value: str) -> int:
+		string_id = self._string_ids.get(value)
+		if string_id is None:
+			string_id = self._string_ids[value] = len(self.strings)
+			self.strings.append(value)
+		return string_id
+
+	def build(self, root: El, url: str) -> dict[str, Any]:
+		dom_root = self._document(root, url, None, VIEWPORT_WIDTH, VIEWPORT_HEIGHT)
+		return {
+			'snapshot': {'documents': [doc.snapshot for doc in self.documents], 'strings': self.strings},
+			'dom_tree': {'root': dom_root},
+			'ax_tree': {'nodes': self.ax_nodes},
+			'device_pixel_ratio': 1.0,
+		}
+
+	# --- Nodes ---
+
+	def _node(
+		self, doc: _Document, node_type: int, name: str, value: str, parent: dict[str, Any] | None, parent_index: int
+	) -> tuple[dict[str, Any], int]:
+		"""Add a node to the DOM tree and the snapshot, returns the DOM node and its snapshot index"""
+		self._node_ids += 1
+		node: dict[str, Any] = {
+			'nodeId': self._node_ids,
+			'backendNodeId': self._node_ids,
+			'nodeType': node_type,
+			'nodeName': name,
+			'localName': name.lower() if node_type == 1 else '',
+			'nodeValue': value,
+		}
+		if parent is not None:
+			node['parentId'] = parent['nodeId']
+
+		index = len(doc.nodes['backendNodeId'])
+		doc.nodes['parentIndex'].append(parent_index)
+		doc.nodes['nodeType'].append(node_type)
+		doc.nodes['nodeName'].append(self.string(name))
+		doc.nodes['nodeValue'].append(self.string(value) if value else -1)
+		doc.nodes['backendNodeId'].append(node['backendNodeId'])
+		doc.nodes['attributes'].append([])
+		return node, index
+
+	def _layout(self, doc: _Document, index: int, styles: tuple[str, ...], text: str = '') -> int:
+		"""Add a layout node with placeholder bounds, returns its layout index"""
+		style_ids = self._style_ids.get(styles)
+		if style_ids is None:
+			style_ids = self._style_ids[styles] = [self.string(style) for style in styles]
+		layout_index = len(doc.layout['nodeIndex'])
+		doc.layout['nodeIndex'].append(index)
+		doc.layout['styles'].append(style_ids)
+		doc.layout['bounds'].append([0, 0, 0, 0])
+		doc.layout['text'].append(self.string(text) if text else -1)
+		doc.layout['paintOrders'].append(layout_index + 1)
+		doc.layout['offsetRects'].append([])
+		doc.layout['scrollRects'].append([])
+		doc.layout['clientRects'].append([])
+		return layout_index
+
+	def _ax(self, backend_node_id: int, role: str, name: str = '', ignored: bool = False, **properties: Any) -> None:
+		ax_node: dict[str, Any] = {
+			'nodeId': str(len(self.ax_nodes) + 1),
+			'ignored': ignored,
+			'role': {'type': 'role', 'value': role},
+			'backendDOMNodeId': backend_node_id,
+		}
+		if name:
+			ax_node['name'] = {'type': 'computedString', 'value': name}
+		if properties:
+			ax_node['properties'] = [
+				{'name': key, 'value': {'type': 'boolean' if isinstance(value, bool) else 'token', 'value': value}}
+				for key, value in properties.items()
+			]
+		self.ax_nodes.append(ax_node)
+
+	# --- Tree ---
+
+	def _document(
+		self, html: El, url: str, owner: dict[str, Any] | None, viewport_width: int, viewport_height: int
+	) -> dict[str, Any]:
+		frame_id = f'FRAME{self._frames:04d}'
+		self._frames += 1
+		title = next((child for child in html.children[0].children[0].children if isinstance(child, str)), '')
+		doc = _Document(self, url, title, frame_id)
+		self.documents.append(doc)
+
+		doc_node, doc_index = self._node(doc, 9, '#document', '', owner, -1)
+		doc_node.update(documentURL=url, baseURL=url, xmlVersion='', compatibilityMode='NoQuirksMode')
+		self._ax(doc_node['backendNodeId'], 'RootWebArea', title, focusable=True)
+
+		html_node, height = self._element(html, doc, doc_node, doc_index, 0, 0, viewport_width)
+		html_node['frameId'] = frame_id
+		# the document node has no layout, so the <html> element is the first layout node
+		doc.layout['clientRects'][0] = [0, 0, viewport_width, viewport_height]
+		doc.layout['scrollRects'][0] = [0, 0, viewport_width, height]
+		doc.snapshot['contentWidth'] = viewport_width
+		doc.snapshot['contentHeight'] = height
+
+		doc_node['children'] = [html_node]
+		doc_node['childNodeCount'] = 1
+		return doc_node
+
+	def _element(
+		self, el: El, doc: _Document, parent: dict[str, Any], parent_index: int, x: float, y: float, width: float
+	) -> tuple[dict[str, Any], float]:
+		"""Add an element and its subtree laid out at (x, y), returns the DOM node and its height"""
+		tag = el.tag
+		node, index = self._node(doc, 1, tag.upper(), '', parent, parent_index)
+		flat_attributes = [part for item in el.attrs.items() for part in item]
+		node['attributes'] = flat_attributes
+		doc.nodes['attributes'][index] = [self.string(part) for part in flat_attributes]
+		if tag in CLICKABLE_TAGS:
+			doc.nodes['isClickable']['index'].append(index)
+
+		scroll_height = _style_px(el.attrs.get('style', ''), 'height') if 'overflow' in el.attrs.get('style', '') else None
+		layout_index = None
+		if tag not in NO_LAYOUT_TAGS:
+			styles = (
+				DISPLAY.get(tag, 'block'),
+				'visible',
+				'1',
+				'auto' if scroll_height else 'visible',
+				'auto' if scroll_height else 'visible',
+				'auto' if scroll_height else 'visible',
+				CURSOR.get(tag, 'auto'),
+				'auto',
+				'static',
+				'rgb(239, 239, 239)' if tag in ('button', 'select') else 'rgba(0, 0, 0, 0)',
+			)
+			layout_index = self._layout(doc, index, styles)
+			if scroll_height:
+				node['isScrollable'] = True
+
+		children: list[dict[str, Any]] = []
+		child_x = x + INDENT if layout_index is not None else x
+		child_width = max(width - INDENT, CHAR_WIDTH)
+		content_height = 0.0
+
+		if el.shadow is not None:
+			shadow_root, shadow_index = self._node(doc, 11, '#document-fragment', '', node, index)
+			shadow_root['shadowRootType'] = 'open'
+			shadow_children, content_height = self._children(
+				el.shadow, doc, shadow_root, shadow_index, child_x, y, child_width, tag
+			)
+			shadow_root['children'] = shadow_children
+			shadow_root['childNodeCount'] = len(shadow_children)
+			node['shadowRoots'] = [shadow_root]
+
+		light_children, light_height = self._children(
+			el.children, doc, node, index, child_x, y + content_height, child_width, tag
+		)
+		children.extend(light_children)
+		content_height += light_height
+
+		if tag == 'iframe':
+			node['frameId'] = f'FRAME{self._frames:04d}'
+			node['contentDocument'] = self._document(
+				document('frame', el.frame or []), 'about:srcdoc', node, IFRAME_WIDTH, IFRAME_HEIGHT
+			)
+			doc.nodes['contentDocumentIndex']['index'].append(index)
+			doc.nodes['contentDocumentIndex']['value'].append(len(self.documents) - 1)
+			box_width, height = float(IFRAME_WIDTH), float(IFRAME_HEIGHT)
+		elif tag in CONTROL_TAGS:
+			box_width, height = min(width, 160.0), max(float(CONTROL_HEIGHT), content_height)
+		else:
+			box_width, height = width, content_height
+		if scroll_height:
+			height = scroll_height
+
+		if layout_index is not None:
+			doc.layout['bounds'][layout_index] = [x, y, box_width, height]
+			if scroll_height:
+				doc.layout['clientRects'][layout_index] = [x, y, box_width, scroll_height]
+				doc.layout['scrollRects'][layout_index] = [0, 0, box_width, content_height]
+
+		role = AX_ROLES.get(tag, 'generic')
+		if tag == 'input' and el.attrs.get('type') == 'checkbox':
+			self._ax(node['backendNodeId'], 'checkbox', el.attrs.get('aria-label', ''), focusable=True, checked='false')
+		elif tag in FOCUSABLE_TAGS:
+			name = el.attrs.get('aria-label') or el.attrs.get('placeholder') or _text_content(el)
+			self._ax(node['backendNodeId'], role, name, focusable=True)
+		else:
+			self._ax(node['backendNodeId'], role, el.attrs.get('aria-label', ''), ignored=role == 'generic')
+
+		if children:
+			node['children'] = children
+		node['childNodeCount'] = len(children)
+		return node, height if layout_index is not None else 0.0
+
+	def _children(
+		self,
+		children: list[El | str],
+		doc: _Document,
+		parent: dict[str, Any],
+		parent_index: int,
+		x: float,
+		y: float,
+		width: float,
+		parent_tag: str,
+	) -> tuple[list[dict[str, Any]], float]:
+		"""Lay out children top to bottom, or side by side for table rows, returns the DOM nodes and their total height"""
+		nodes: list[dict[str, Any]] = []
+		horizontal = parent_tag == 'tr'
+		cell_width = width / max(len(children), 1) if horizontal else width
+		height = 0.0
+		for position, child in enumerate(children):
+			child_x = x + position * cell_width if horizontal else x
+			child_y = y if horizontal else y + height
+			if isinstance(child, str):
+				child_node, child_height = self._text(child, doc, parent, parent_index, child_x, child_y, cell_width)
+			else:
+				child_node, child_height = self._element(child, doc, parent, parent_index, child_x, child_y, cell_width)
+			nodes.append(child_node)
+			height = max(height, child_height) if horizontal else height + child_height
+		return nodes, height
+
+	def _text(
+		self, text: str, doc: _Document, parent: dict[str, Any], parent_index: int, x: float, y: float, width: float
+	) -> tuple[dict[str, Any], float]:
+		node, index = self._node(doc, 3, '#text', text, parent, parent_index)
+		if parent['nodeName'].lower() in NO_LAYOUT_TAGS:
+			return node, 0.0
+
+		text_width = len(text) * CHAR_WIDTH
+		height = float(LINE_HEIGHT * max(math.ceil(text_width / max(width, 1)), 1))
+		cursor = CURSOR.get(parent['nodeName'].lower(), 'auto')
+		styles = ('inline', 'visible', '1', 'visible', 'visible', 'visible', cursor, 'auto', 'static', 'rgba(0, 0, 0, 0)')
+		layout_index = self._layout(doc, index, styles, text)
+		doc.layout['bounds'][layout_index] = [x, y, min(text_width, width), height]
+		self._ax(node['backendNodeId'], 'StaticText', text)
+		return node, height
+
+
+def _text_content(el: El) -> str:
+	return ' '.join(child if isinstance(child, str) else _text_content(child) for child in el.children).strip()
+
+
+def _style_px(style: str, prop: str) -> float | None:
+	for declaration in style.split(';'):
+		name, _, value = declaration.partition(':')
+		if name.strip() == prop and value.strip().endswith('px'):
+			return float(value.strip()[:-2])
+	return None
+
+
+def build_cdp_payloads(root: El, url: str = 'http://127.0.0.1/') -> dict[str, Any]:
+	"""CDP payloads for a synthetic page: {'snapshot', 'dom_tree', 'ax_tree', 'device_pixel_ratio'}"""
+	assert len(REQUIRED_COMPUTED_STYLES) == 10, 'update the computed styles in synthetic.py'
+	return _PayloadBuilder().build(root, url)
@@ -46,6 +46,7 @@ base_subprocess.BaseSubprocessTransport.__del__ = _patched_del
 # Type stubs for lazy imports - fixes linter warnings
 if TYPE_CHECKING:
 	from browser_use.agent.prompts import SystemPrompt
+	from browser_use.agent.scheduler import AgentScheduler
 	from browser_use.agent.service import Agent
 	from browser_use.agent.views import ActionModel, ActionResult, AgentHistoryList
 	from browser_use.browser import BrowserProfile, BrowserSession
@@ -65,6 +66,7 @@ if TYPE_CHECKING:
 _LAZY_IMPORTS = {
 	# Agent service (heavy due to dependencies)
 	'Agent': ('browser_use.agent.service', 'Agent'),
+	'AgentScheduler': ('browser_use.agent.scheduler', 'AgentScheduler'),
 	# System prompt (moderate weight due to agent.views imports)
 	'SystemPrompt': ('browser_use.agent.prompts', 'SystemPrompt'),
 	# Agent views (very heavy - over 1 second!)
@@ -115,6 +117,7 @@ def __getattr__(name: str):
 
 __all__ = [
 	'Agent',
+	'AgentScheduler',
 	'BrowserSession',
 	'Browser',  # Alias for BrowserSession
 	'BrowserProfile',
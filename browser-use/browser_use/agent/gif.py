@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import io
 import logging
 import os
 import platform
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import TYPE_CHECKING, BinaryIO
 
-from browser_use.agent.views import AgentHistoryList
+from browser_use.agent.views import AgentHistory, AgentHistoryList
 from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT
 from browser_use.config import CONFIG
 
@@ -52,35 +55,205 @@ def create_history_gif(
 		logger.warning('No history to create GIF from')
 		return
 
-	from PIL import Image, ImageFont
+	builder = HistoryGifBuilder(
+		task,
+		output_path=output_path,
+		duration=duration,
+		show_goals=show_goals,
+		show_task=show_task,
+		show_logo=show_logo,
+		font_size=font_size,
+		title_font_size=title_font_size,
+		goal_font_size=goal_font_size,
+		margin=margin,
+		line_spacing=line_spacing,
+	)
+	for i, item in enumerate(history.history, 1):
+		builder.append_step(item, i)
+	builder.close()
 
-	images = []
 
-	# if history is empty, we can't create a gif
-	if not history.history:
-		logger.warning('No history to create GIF from')
-		return
+class HistoryGifBuilder:
+	"""Writes the history GIF frame by frame, e.g. while the agent runs
 
-	# Get all screenshots from history (including None placeholders)
-	screenshots = history.screenshots(return_none_if_not_screenshot=True)
+	Every frame is quantized to one fixed palette and appended to the file right away, so only one frame is in memory at
+	a time and closing the GIF only writes its trailer. `queue_step()` renders and writes in a worker
+	thread, in the order the steps were queued. Fonts and the logo are loaded once per process, the logo layer once per
+	frame size.
+	"""
 
-	if not screenshots:
-		logger.warning('No screenshots found in history')
-		return
+	def __init__(
+		self,
+		task: str,
+		output_path: str = 'agent_history.gif',
+		duration: int = 3000,
+		show_goals: bool = True,
+		show_task: bool = True,
+		show_logo: bool = False,
+		font_size: int = 40,
+		title_font_size: int = 56,
+		goal_font_size: int = 44,
+		margin: int = 40,
+		line_spacing: float = 1.5,
+	):
+		self.task = task
+		self.output_path = output_path
+		self.duration = duration
+		self.show_goals = show_goals
+		self.show_task = show_task
+		self.show_logo = show_logo
+		self.font_size = font_size
+		self.title_font_size = title_font_size
+		self.goal_font_size = goal_font_size
+		self.margin = margin
+		self.line_spacing = line_spacing
+		self.frame_count = 0
+
+		self._executor: ThreadPoolExecutor | None = None
+		self._file: BinaryIO | None = None
+		self._size: tuple[int, int] | None = None
+		self._logo_layers: dict[tuple[int, int], Image.Image] = {}
+
+	def queue_step(self, history_item: AgentHistory, step_number: int) -> None:
+		"""Render and append the frame of a completed step in the worker thread"""
+		if self._executor is None:
+			self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='browser_use_gif')
+		self._executor.submit(self._append_step_logged, history_item, step_number)
+
+	async def aclose(self) -> bool:
+		"""Wait for the queued steps and complete the GIF, returns whether a GIF was written"""
+		if self._executor is None:
+			return self.close()
+		executor, self._executor = self._executor, None
+		try:
+			return await asyncio.wrap_future(executor.submit(self.close))
+		finally:
+			executor.shutdown(wait=False)
 
-	# Find the first non-placeholder screenshot
-	# A screenshot is considered a placeholder if:
-	# 1. It's the exact 4px placeholder for about:blank pages, OR
-	# 2. It comes from a new tab page (chrome://newtab/, about:blank, etc.)
-	first_real_screenshot = None
-	for screenshot in screenshots:
-		if screenshot and screenshot != PLACEHOLDER_4PX_SCREENSHOT:
-			first_real_screenshot = screenshot
-			break
-
-	if not first_real_screenshot:
-		logger.warning('No valid screenshots found (all are placeholders or from new tab pages)')
-		return
+	def append_step(self, history_item: AgentHistory, step_number: int) -> None:
+		"""Render the frame of a step and append it to the GIF, steps without a real screenshot are skipped"""
+		screenshot = history_item.state.get_screenshot()
+		if not screenshot:
+			return
+
+		# Skip placeholder screenshots from about:blank pages
+		# These are 4x4 white PNGs encoded as a specific base64 string
+		if screenshot == PLACEHOLDER_4PX_SCREENSHOT:
+			logger.debug(f'Skipping placeholder screenshot from about:blank page at step {step_number}')
+			return
+
+		# Skip screenshots from new tab pages
+		from browser_use.utils import is_new_tab_page
+
+		if is_new_tab_page(history_item.state.url):
+			logger.debug(f'Skipping screenshot from new tab page ({history_item.state.url}) at step {step_number}')
+			return
+
+		from PIL import Image
+
+		regular_font, title_font, _ = _load_fonts(self.font_size, self.title_font_size, self.goal_font_size)
+		logo = _load_logo() if self.show_logo else None
+
+		# Convert base64 screenshot to PIL Image
+		image = Image.open(io.BytesIO(base64.b64decode(screenshot)))
+		if self.show_goals and history_item.model_output:
+			image = _add_overlay_to_image(
+				image=image,
+				step_number=step_number,
+				goal_text=history_item.model_output.current_state.next_goal,
+				regular_font=regular_font,  # type: ignore
+				title_font=title_font,  # type: ignore
+				margin=self.margin,
+				logo=logo,
+				logo_layer=self._logo_layer(logo, image.size) if logo else None,
+			)
+		else:
+			image = image.convert('RGB')
+
+		if self._file is None:
+			self._start(image, screenshot)
+		self._write_frame(image)
+
+	def close(self) -> bool:
+		"""Complete the GIF, returns whether a GIF was written"""
+		if self._file is None:
+			logger.warning('No images found in history to create GIF')
+			return False
+		self._file.write(b';')  # GIF trailer
+		self._file.close()
+		self._file = None
+		logger.info(f'Created GIF at {self.output_path}')
+		return True
+
+	def _append_step_logged(self, history_item: AgentHistory, step_number: int) -> None:
+		try:
+			self.append_step(history_item, step_number)
+		except Exception as e:
+			logger.warning(f'Could not add step {step_number} to GIF: {e}')
+
+	def _start(self, first_frame: Image.Image, first_screenshot: str) -> None:
+		"""Open the file, write the header with the shared palette and the task frame"""
+		from PIL import GifImagePlugin, Image
+
+		self._size = first_frame.size
+		# the logical screen of the header has to be the size of the frames
+		screen = Image.new('P', self._size)
+		screen.putpalette(_shared_palette().getpalette())  # type: ignore[arg-type]
+		header, _ = GifImagePlugin.getheader(screen, info={'loop': 0})
+		self._file = open(self.output_path, 'wb')
+		self._file.write(b''.join(header))
+
+		if self.show_task and self.task:
+			regular_font, title_font, _ = _load_fonts(self.font_size, self.title_font_size, self.goal_font_size)
+			task_frame = _create_task_frame(
+				self.task,
+				first_screenshot,
+				title_font,  # type: ignore
+				regular_font,  # type: ignore
+				_load_logo() if self.show_logo else None,
+				self.line_spacing,
+			)
+			self._write_frame(task_frame)
+
+	def _write_frame(self, image: Image.Image) -> None:
+		from PIL import GifImagePlugin, Image
+
+		assert self._file is not None and self._size is not None
+		if image.size != self._size:
+			image = image.resize(self._size, Image.Resampling.LANCZOS)
+		frame = image.convert('RGB').quantize(palette=_shared_palette(), dither=Image.Dither.NONE)
+		self._file.write(b''.join(GifImagePlugin.getdata(frame, duration=self.duration)))
+		self.frame_count += 1
+
+	def _logo_layer(self, logo: Image.Image, size: tuple[int, int]) -> Image.Image:
+		if size not in self._logo_layers:
+			self._logo_layers[size] = _create_logo_layer(logo, size)
+		return self._logo_layers[size]
+
+
+@cache
+def _shared_palette() -> Image.Image:
+	"""Palette of all frames: the 216 web-safe colors and 40 grays
+
+	Much closer to pages that look nothing like the first frame than a palette computed from it, and cheaper than
+	computing one per frame.
+	"""
+	from PIL import Image
+
+	levels = range(0, 256, 51)
+	colors = [(r, g, b) for r in levels for g in levels for b in levels]
+	colors += [(gray, gray, gray) for gray in (round(i * 255 / 41) for i in range(1, 41))]
+	palette = Image.new('P', (1, 1))
+	palette.putpalette([channel for color in colors for channel in color])
+	return palette
+
+
+@cache
+def _load_fonts(
+	font_size: int, title_font_size: int, goal_font_size: int
+) -> tuple[ImageFont.FreeTypeFont | ImageFont.ImageFont, ...]:
+	"""Regular, title and goal font, the nicest one available"""
+	from PIL import ImageFont
 
 	# Try to load nicer fonts
 	try:
@@ -99,7 +272,6 @@ def create_history_gif(
 			'DejaVuSans',
 			'Verdana',
 		]
-		font_loaded = False
 
 		for font_name in font_options:
 			try:
@@ -109,104 +281,43 @@ def create_history_gif(
 				regular_font = ImageFont.truetype(font_name, font_size)
 				title_font = ImageFont.truetype(font_name, title_font_size)
 				goal_font = ImageFont.truetype(font_name, goal_font_size)
-				font_loaded = True
-				break
+				return regular_font, title_font, goal_font
 			except OSError:
 				continue
 
-		if not font_loaded:
-			raise OSError('No preferred fonts found')
+		raise OSError('No preferred fonts found')
 
 	except OSError:
 		regular_font = ImageFont.load_default()
 		title_font = ImageFont.load_default()
+		return regular_font, title_font, regular_font
 
-		goal_font = regular_font
-
-	# Load logo if requested
-	logo = None
-	if show_logo:
-		try:
-			logo = Image.open('./static/browser-use.png')
-			# Resize logo to be small (e.g., 40px height)
-			logo_height = 150
-			aspect_ratio = logo.width / logo.height
-			logo_width = int(logo_height * aspect_ratio)
-			logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
-		except Exception as e:
-			logger.warning(f'Could not load logo: {e}')
-
-	# Create task frame if requested
-	if show_task and task:
-		# Find the first non-placeholder screenshot for the task frame
-		first_real_screenshot = None
-		for item in history.history:
-			screenshot_b64 = item.state.get_screenshot()
-			if screenshot_b64 and screenshot_b64 != PLACEHOLDER_4PX_SCREENSHOT:
-				first_real_screenshot = screenshot_b64
-				break
-
-		if first_real_screenshot:
-			task_frame = _create_task_frame(
-				task,
-				first_real_screenshot,
-				title_font,  # type: ignore
-				regular_font,  # type: ignore
-				logo,
-				line_spacing,
-			)
-			images.append(task_frame)
-		else:
-			logger.warning('No real screenshots found for task frame, skipping task frame')
-
-	# Process each history item with its corresponding screenshot
-	for i, (item, screenshot) in enumerate(zip(history.history, screenshots), 1):
-		if not screenshot:
-			continue
-
-		# Skip placeholder screenshots from about:blank pages
-		# These are 4x4 white PNGs encoded as a specific base64 string
-		if screenshot == PLACEHOLDER_4PX_SCREENSHOT:
-			logger.debug(f'Skipping placeholder screenshot from about:blank page at step {i}')
-			continue
 
-		# Skip screenshots from new tab pages
-		from browser_use.utils import is_new_tab_page
+@cache
+def _load_logo() -> Image.Image | None:
+	from PIL import Image
 
-		if is_new_tab_page(item.state.url):
-			logger.debug(f'Skipping screenshot from new tab page ({item.state.url}) at step {i}')
-			continue
+	try:
+		logo = Image.open('./static/browser-use.png')
+		# Resize logo to be small (e.g., 40px height)
+		logo_height = 150
+		aspect_ratio = logo.width / logo.height
+		logo_width = int(logo_height * aspect_ratio)
+		return logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
+	except Exception as e:
+		logger.warning(f'Could not load logo: {e}')
+		return None
 
-		# Convert base64 screenshot to PIL Image
-		img_data = base64.b64decode(screenshot)
-		image = Image.open(io.BytesIO(img_data))
 
-		if show_goals and item.model_output:
-			image = _add_overlay_to_image(
-				image=image,
-				step_number=i,
-				goal_text=item.model_output.current_state.next_goal,
-				regular_font=regular_font,  # type: ignore
-				title_font=title_font,  # type: ignore
-				margin=margin,
-				logo=logo,
-			)
+def _create_logo_layer(logo: Image.Image, size: tuple[int, int]) -> Image.Image:
+	"""Transparent layer of the given size with the logo in the top right corner"""
+	from PIL import Image
 
-		images.append(image)
-
-	if images:
-		# Save the GIF
-		images[0].save(
-			output_path,
-			save_all=True,
-			append_images=images[1:],
-			duration=duration,
-			loop=0,
-			optimize=False,
-		)
-		logger.info(f'Created GIF at {output_path}')
-	else:
-		logger.warning('No images found in history to create GIF')
+	logo_layer = Image.new('RGBA', size, (0, 0, 0, 0))
+	logo_margin = 20
+	logo_x = size[0] - logo.width - logo_margin
+	logo_layer.paste(logo, (logo_x, logo_margin), logo if logo.mode == 'RGBA' else None)
+	return logo_layer
 
 
 def _create_task_frame(
@@ -297,6 +408,7 @@ def _add_overlay_to_image(
 	title_font: ImageFont.FreeTypeFont,
 	margin: int,
 	logo: Image.Image | None = None,
+	logo_layer: Image.Image | None = None,
 	display_step: bool = True,
 	text_color: tuple[int, int, int, int] = (255, 255, 255, 255),
 	text_box_color: tuple[int, int, int, int] = (0, 0, 0, 255),
@@ -378,10 +490,8 @@ def _add_overlay_to_image(
 
 	# Add logo if provided (top right corner)
 	if logo:
-		logo_layer = Image.new('RGBA', image.size, (0, 0, 0, 0))
-		logo_margin = 20
-		logo_x = image.width - logo.width - logo_margin
-		logo_layer.paste(logo, (logo_x, logo_margin), logo if logo.mode == 'RGBA' else None)
+		if logo_layer is None:
+			logo_layer = _create_logo_layer(logo, image.size)
 		txt_layer = Image.alpha_composite(logo_layer, txt_layer)
 
 	# Composite and convert
@@ -4,6 +4,7 @@ import logging
 from typing import Literal
 
 from browser_use.agent.message_manager.views import (
+	HistoryDescriptionBuffer,
 	HistoryItem,
 )
 from browser_use.agent.prompts import AgentMessagePrompt
@@ -22,7 +23,7 @@ from browser_use.llm.messages import (
 	SystemMessage,
 )
 from browser_use.observability import observe_debug
-from browser_use.utils import match_url_with_domain_pattern, time_execution_sync
+from browser_use.utils import DomainMatcher, SensitiveDataMatcher, time_execution_sync
 
 logger = logging.getLogger(__name__)
 
@@ -129,6 +130,7 @@ class MessageManager:
 		self.include_attributes = include_attributes or []
 		self.sensitive_data = sensitive_data
 		self.last_input_messages = []
+		self._history_description = HistoryDescriptionBuffer(max_history_items)
 		# Only initialize messages if state is empty
 		if len(self.state.history.get_messages()) == 0:
 			self._set_message_with_type(self.system_prompt, 'system')
@@ -136,31 +138,7 @@ class MessageManager:
 	@property
 	def agent_history_description(self) -> str:
 		"""Build agent history description from list of items, respecting max_history_items limit"""
-		if self.max_history_items is None:
-			# Include all items
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
-
-		total_items = len(self.state.agent_history_items)
-
-		# If we have fewer items than the limit, just return all items
-		if total_items <= self.max_history_items:
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
-
-		# We have more items than the limit, so we need to omit some
-		omitted_count = total_items - self.max_history_items
-
-		# Show first item + omitted message + most recent (max_history_items - 1) items
-		# The omitted message doesn't count against the limit, only real history items do
-		recent_items_count = self.max_history_items - 1  # -1 for first item
-
-		items_to_include = [
-			self.state.agent_history_items[0].to_string(),  # Keep first item (initialization)
-			f'<sys>[... {omitted_count} previous steps omitted...]</sys>',
-		]
-		# Add most recent items
-		items_to_include.extend([item.to_string() for item in self.state.agent_history_items[-recent_items_count:]])
-
-		return '\n'.join(items_to_include)
+		return self._history_description.render(self.state.agent_history_items)
 
 	def add_new_task(self, new_task: str) -> None:
 		new_task = '<follow_up_user_request> ' + new_task.strip() + ' </follow_up_user_request>'
@@ -182,24 +160,21 @@ class MessageManager:
 			result = []
 		step_number = step_info.step_number if step_info else None
 
-		self.state.read_state_description = ''
-
-		action_results = ''
-		result_len = len(result)
-		read_state_idx = 0
-		for idx, action_result in enumerate(result):
+		read_state_parts: list[str] = []
+		action_result_parts: list[str] = []
+		for action_result in result:
 			if action_result.include_extracted_content_only_once and action_result.extracted_content:
-				self.state.read_state_description += (
+				read_state_idx = len(read_state_parts)
+				read_state_parts.append(
 					f'<read_state_{read_state_idx}>\n{action_result.extracted_content}\n</read_state_{read_state_idx}>\n'
 				)
-				read_state_idx += 1
 				logger.debug(f'Added extracted_content to read_state_description: {action_result.extracted_content}')
 
 			if action_result.long_term_memory:
-				action_results += f'{action_result.long_term_memory}\n'
+				action_result_parts.append(f'{action_result.long_term_memory}\n')
 				logger.debug(f'Added long_term_memory to action_results: {action_result.long_term_memory}')
 			elif action_result.extracted_content and not action_result.include_extracted_content_only_once:
-				action_results += f'{action_result.extracted_content}\n'
+				action_result_parts.append(f'{action_result.extracted_content}\n')
 				logger.debug(f'Added extracted_content to action_results: {action_result.extracted_content}')
 
 			if action_result.error:
@@ -207,11 +182,12 @@ class MessageManager:
 					error_text = action_result.error[:100] + '......' + action_result.error[-100:]
 				else:
 					error_text = action_result.error
-				action_results += f'{error_text}\n'
+				action_result_parts.append(f'{error_text}\n')
 				logger.debug(f'Added error to action_results: {error_text}')
 
-		self.state.read_state_description = self.state.read_state_description.strip('\n')
+		self.state.read_state_description = ''.join(read_state_parts).strip('\n')
 
+		action_results = ''.join(action_result_parts)
 		if action_results:
 			action_results = f'Result:\n{action_results}'
 		action_results = action_results.strip('\n') if action_results else None
@@ -246,10 +222,16 @@ class MessageManager:
 		# Collect placeholders for sensitive data
 		placeholders: set[str] = set()
 
+		# Match the current URL against all domain patterns at once
+		matching_domains: set[str] = set()
+		domain_patterns = [key for key, value in sensitive_data.items() if isinstance(value, dict)]
+		if domain_patterns and current_page_url:
+			matching_domains = set(DomainMatcher.cached(domain_patterns, log_warnings=True).matching_patterns(current_page_url))
+
 		for key, value in sensitive_data.items():
 			if isinstance(value, dict):
 				# New format: {domain: {key: value}}
-				if current_page_url and match_url_with_domain_pattern(current_page_url, key, True):
+				if key in matching_domains:
 					placeholders.update(value.keys())
 			else:
 				# Old format: {key: value}
@@ -387,30 +369,15 @@ class MessageManager:
 			if not self.sensitive_data:
 				return value
 
-			# Collect all sensitive values, immediately converting old format to new format
-			sensitive_values: dict[str, str] = {}
-
-			# Process all sensitive data entries
-			for key_or_domain, content in self.sensitive_data.items():
-				if isinstance(content, dict):
-					# Already in new format: {domain: {key: value}}
-					for key, val in content.items():
-						if val:  # Skip empty values
-							sensitive_values[key] = val
-				elif content:  # Old format: {key: value} - convert to new format internally
-					# We treat this as if it was {'http*://*': {key_or_domain: content}}
-					sensitive_values[key_or_domain] = content
+			matcher = SensitiveDataMatcher.cached(self.sensitive_data)
 
 			# If there are no valid sensitive data entries, just return the original value
-			if not sensitive_values:
+			if not matcher.has_secrets:
 				logger.warning('No valid entries found in sensitive_data dictionary')
 				return value
 
 			# Replace all valid sensitive data values with their placeholder tags
-			for key, val in sensitive_values.items():
-				value = value.replace(val, f'<secret>{key}</secret>')
-
-			return value
+			return matcher.redact(value)
 
 		if isinstance(message.content, str):
 			message.content = replace_sensitive(message.content)
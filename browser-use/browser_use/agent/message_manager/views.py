@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import deque
 from typing import TYPE_CHECKING
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -65,6 +66,83 @@ class HistoryItem(BaseModel):
 </{step_str}>"""
 
 
+class HistoryDescriptionBuffer:
+	"""Rendered agent history description, updated as history items are appended
+
+	Each item is rendered once, when it is first seen. The description is cached until items are appended, and with
+	max_history_items the recent window is a bounded deque, so an update only renders the new items. The history is
+	re-rendered from scratch when the item list is replaced or changed other than by appending.
+	"""
+
+	def __init__(self, max_history_items: int | None = None):
+		# the window keeps the first item plus max_history_items - 1 recent ones, so it needs room for at least one of each
+		if max_history_items is not None and max_history_items < 2:
+			raise ValueError(f'max_history_items must be None or at least 2, got {max_history_items}')
+		self.max_history_items = max_history_items
+		self._items: list[HistoryItem] | None = None  # the list the buffer was rendered from
+		self._count = 0
+		self._first_item: HistoryItem | None = None
+		self._last_item: HistoryItem | None = None
+		self._first = ''
+		# with max_history_items: the most recent items after the first one, otherwise all rendered items joined
+		self._recent: deque[str] = deque(maxlen=max_history_items - 1 if max_history_items is not None else None)
+		self._joined = ''
+		self._description: str | None = None
+
+	def render(self, items: list[HistoryItem]) -> str:
+		"""Get the history description of items, respecting max_history_items limit"""
+		count = len(items)
+		if (
+			items is not self._items
+			or count < self._count
+			or (self._count and items[self._count - 1] is not self._last_item)
+			or (self._count and items[0] is not self._first_item)
+		):
+			self._reset(items)
+
+		if count > self._count:
+			self._append([item.to_string() for item in items[self._count :]])
+			self._count = count
+			self._last_item = items[-1]
+
+		if self._description is None:
+			self._description = self._build()
+		return self._description
+
+	def _reset(self, items: list[HistoryItem]) -> None:
+		self._items = items
+		self._count = 0
+		self._first_item = items[0] if items else None
+		self._last_item = None
+		self._first = ''
+		self._recent.clear()
+		self._joined = ''
+		self._description = None
+
+	def _append(self, rendered: list[str]) -> None:
+		self._description = None
+		if self.max_history_items is None:
+			self._joined = '\n'.join([self._joined, *rendered]) if self._count else '\n'.join(rendered)
+			return
+		if not self._count:
+			self._first = rendered[0]
+			rendered = rendered[1:]
+		self._recent.extend(rendered)
+
+	def _build(self) -> str:
+		if self.max_history_items is None:
+			return self._joined
+
+		# If we have fewer items than the limit, just return all items
+		if self._count <= self.max_history_items:
+			return '\n'.join([self._first, *self._recent]) if self._count else ''
+
+		# Show first item + omitted message + most recent (max_history_items - 1) items
+		# The omitted message doesn't count against the limit, only real history items do
+		omitted_count = self._count - self.max_history_items
+		return '\n'.join([self._first, f'<sys>[... {omitted_count} previous steps omitted...]</sys>', *self._recent])
+
+
 class MessageHistory(BaseModel):
 	"""History of messages"""
 
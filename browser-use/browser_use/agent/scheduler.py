@@ -0,0 +1,174 @@
+"""Run many agents in one process against one shared browser."""
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass
+from typing import Any, cast
+
+from browser_use.agent.service import Agent
+from browser_use.agent.views import AgentHistoryList
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.messages import BaseMessage
+
+logger = logging.getLogger(__name__)
+
+
+class _ScheduledChatModel:
+	"""One agent's handle on a chat model, with slots every call waits for a free one of, handed out in arrival order
+
+	Each agent gets its own handle, so the token cost service of one agent does not count the calls of the others.
+	"""
+
+	def __init__(self, llm: BaseChatModel, slots: asyncio.Semaphore | None):
+		self._llm = llm
+		self._slots = slots
+
+	def __getattr__(self, name: str) -> Any:
+		return getattr(self._llm, name)
+
+	async def ainvoke(self, messages: list[BaseMessage], output_format: Any = None) -> Any:
+		async with self._slots or contextlib.nullcontext():
+			return await self._llm.ainvoke(messages, output_format)
+
+
+@dataclass
+class _ScheduledTask:
+	task: str
+	llm: BaseChatModel
+	max_steps: int
+	timeout: float | None
+	browser_profile: BrowserProfile | None
+	agent_kwargs: dict[str, Any]
+
+
+class AgentScheduler:
+	"""
+	Runs many agents in one process against one browser, instead of one browser per agent.
+
+	Every agent gets its own BrowserSession connected to the shared browser and bound to a browser context of its own
+	(separate tabs, cookies and storage), so it has its own agent_focus, event bus and watchdogs and only sees its own
+	tabs. The LLM calls of all agents share max_concurrent_llm_calls slots, handed out in arrival order so no agent is
+	starved, and every session has at most max_in_flight_cdp_commands commands waiting for the browser. Per agent,
+	max_steps and timeout bound the run.
+
+	```python
+	scheduler = AgentScheduler(max_concurrent_agents=8, max_concurrent_llm_calls=4)
+	for task in tasks:
+	    scheduler.add(task, llm=llm, max_steps=20, timeout=300)
+	histories = await scheduler.run()
+	```
+
+	Waiting for an LLM slot counts towards the agent's llm_timeout.
+	"""
+
+	def __init__(
+		self,
+		browser_session: BrowserSession | None = None,
+		max_concurrent_agents: int | None = None,
+		max_concurrent_llm_calls: int | None = None,
+		max_in_flight_cdp_commands: int | None = 16,
+	):
+		# the browser is started by this session, the agents connect to it over its cdp_url
+		self.browser_session = browser_session or BrowserSession(browser_profile=BrowserProfile(keep_alive=True))
+		self._owns_browser_session = browser_session is None
+		self.max_concurrent_agents = max_concurrent_agents
+		self.max_concurrent_llm_calls = max_concurrent_llm_calls
+		self.max_in_flight_cdp_commands = max_in_flight_cdp_commands
+
+		self.agents: list[Agent] = []  # in the order they were started
+		self._scheduled: list[_ScheduledTask] = []
+
+	def add(
+		self,
+		task: str,
+		llm: BaseChatModel,
+		*,
+		max_steps: int = 100,
+		timeout: float | None = None,
+		browser_profile: BrowserProfile | None = None,
+		**agent_kwargs: Any,
+	) -> None:
+		"""Schedule an agent for the next run()
+
+		Args:
+			task: The task of the agent
+			llm: Its chat model, may be shared with other agents
+			max_steps: Maximum number of steps of the agent
+			timeout: Seconds after which the agent is stopped, its history so far is returned
+			browser_profile: Settings of its browser session, defaults to the profile of the shared browser session.
+				Its user_data_dir and storage_state are ignored, every agent starts with an empty browser context
+			agent_kwargs: Other Agent arguments
+		"""
+		if 'browser_session' in agent_kwargs or 'browser' in agent_kwargs:
+			raise ValueError('AgentScheduler creates the browser session of every agent, do not pass browser_session or browser')
+		self._scheduled.append(_ScheduledTask(task, llm, max_steps, timeout, browser_profile, agent_kwargs))
+
+	async def run(self) -> list[AgentHistoryList]:
+		"""Run all scheduled agents, returns their histories in the order they were added"""
+		scheduled, self._scheduled = self._scheduled, []
+		agent_slots = asyncio.Semaphore(self.max_concurrent_agents) if self.max_concurrent_agents else None
+		llm_slots = asyncio.Semaphore(self.max_concurrent_llm_calls) if self.max_concurrent_llm_calls else None
+
+		await self.browser_session.start()
+		try:
+			results = await asyncio.gather(
+				*(self._run_agent(task, agent_slots, llm_slots) for task in scheduled), return_exceptions=True
+			)
+		finally:
+			if self._owns_browser_session:
+				await self.browser_session.kill()
+
+		for result in results:
+			if isinstance(result, BaseException):
+				raise result
+		return cast(list[AgentHistoryList], results)
+
+	async def _run_agent(
+		self, scheduled: _ScheduledTask, agent_slots: asyncio.Semaphore | None, llm_slots: asyncio.Semaphore | None
+	) -> AgentHistoryList:
+		async with agent_slots or contextlib.nullcontext():
+			# disposed by the browser as well if the shared session disconnects before we dispose it
+			context = await self.browser_session.cdp_client.send.Target.createBrowserContext(params={'disposeOnDetach': True})
+			browser_context_id = context['browserContextId']
+			try:
+				agent = self._create_agent(scheduled, browser_context_id, llm_slots)
+				self.agents.append(agent)
+
+				deadline = asyncio.timeout(scheduled.timeout)
+				try:
+					async with deadline:
+						return await agent.run(max_steps=scheduled.max_steps)
+				except TimeoutError:
+					if not deadline.expired():
+						raise
+					agent.logger.warning(f'⏱️ Agent stopped after its timeout of {scheduled.timeout}s')
+					return agent.history
+			finally:
+				try:
+					await self.browser_session.cdp_client.send.Target.disposeBrowserContext(
+						params={'browserContextId': browser_context_id}
+					)
+				except Exception as e:
+					logger.debug(f'Failed to dispose browser context {browser_context_id}: {type(e).__name__}: {e}')
+
+	def _create_agent(self, scheduled: _ScheduledTask, browser_context_id: str, llm_slots: asyncio.Semaphore | None) -> Agent:
+		# agents would otherwise all load and save the same storage_state.json and share the user_data_dir
+		browser_profile = (scheduled.browser_profile or self.browser_session.browser_profile).model_copy(
+			update={'max_in_flight_cdp_commands': self.max_in_flight_cdp_commands, 'user_data_dir': None, 'storage_state': None}
+		)
+		browser_session = BrowserSession(
+			browser_profile=browser_profile,
+			browser_context_id=browser_context_id,
+			cdp_url=self.browser_session.cdp_url,
+			is_local=False,
+			keep_alive=False,  # closes the agent's connection when it is done, the shared browser keeps running
+		)
+
+		agent_kwargs = dict(scheduled.agent_kwargs)
+		if agent_kwargs.get('page_extraction_llm') is not None:
+			agent_kwargs['page_extraction_llm'] = _ScheduledChatModel(agent_kwargs['page_extraction_llm'], llm_slots)
+		llm = cast(BaseChatModel, _ScheduledChatModel(scheduled.llm, llm_slots))
+
+		return Agent(task=scheduled.task, llm=llm, browser_session=browser_session, **agent_kwargs)
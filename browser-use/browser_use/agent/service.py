@@ -9,7 +9,7 @@ import time
 from collections.abc import Awaitable, Callable
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Generic, Literal, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar
 from urllib.parse import urlparse
 
 from dotenv import load_dotenv
@@ -24,7 +24,6 @@ from browser_use.agent.cloud_events import (
 from browser_use.agent.message_manager.utils import save_conversation
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.messages import BaseMessage, ContentPartImageParam, ContentPartTextParam, UserMessage
-from browser_use.llm.openai.chat import ChatOpenAI
 from browser_use.tokens.service import TokenCost
 
 load_dotenv()
@@ -37,6 +36,8 @@ from browser_use import Browser, BrowserProfile, BrowserSession
 
 # Lazy import for gif to avoid heavy agent.views import at startup
 # from browser_use.agent.gif import create_history_gif
+if TYPE_CHECKING:
+	from browser_use.agent.gif import HistoryGifBuilder
 from browser_use.agent.message_manager.service import (
 	MessageManager,
 )
@@ -46,6 +47,7 @@ from browser_use.agent.views import (
 	AgentError,
 	AgentHistory,
 	AgentHistoryList,
+	AgentHistoryWriter,
 	AgentOutput,
 	AgentSettings,
 	AgentState,
@@ -60,6 +62,7 @@ from browser_use.config import CONFIG
 from browser_use.dom.views import DOMInteractedElement
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.observability import observe, observe_debug
+from browser_use.profiling import profiler
 from browser_use.sync import CloudSync
 from browser_use.telemetry.service import ProductTelemetry
 from browser_use.telemetry.views import AgentTelemetryEvent
@@ -182,10 +185,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
 		final_response_after_failure: bool = True,
+		save_history_path: str | Path | None = None,
+		screenshot_near_duplicate_threshold: int | None = None,
 		_url_shortening_limit: int = 25,
 		**kwargs,
 	):
 		if llm is None:
+			from browser_use.llm.openai.chat import ChatOpenAI
+
 			default_llm_name = CONFIG.DEFAULT_LLM
 			if default_llm_name:
 				try:
@@ -268,6 +275,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			llm_timeout=llm_timeout,
 			step_timeout=step_timeout,
 			final_response_after_failure=final_response_after_failure,
+			save_history_path=save_history_path,
+			screenshot_near_duplicate_threshold=screenshot_near_duplicate_threshold,
 		)
 
 		# Token cost service
@@ -280,6 +289,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		# Initialize history
 		self.history = AgentHistoryList(history=[], usage=None)
+		self._history_writer: AgentHistoryWriter | None = None
+		self._gif_builder: HistoryGifBuilder | None = None
 
 		# Initialize agent directory
 		import time
@@ -432,6 +443,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			self.settings.save_conversation_path = Path(self.settings.save_conversation_path).expanduser().resolve()
 			self.logger.info(f'💬 Saving conversation to {_log_pretty_path(self.settings.save_conversation_path)}')
 
+		if self.settings.save_history_path:
+			self.settings.save_history_path = Path(self.settings.save_history_path).expanduser().resolve()
+			self._history_writer = AgentHistoryWriter(self.settings.save_history_path, sensitive_data=self.sensitive_data)
+			self.logger.info(f'📜 Saving history to {_log_pretty_path(self.settings.save_history_path)}')
+
 		# Initialize download tracking
 		assert self.browser_session is not None, 'BrowserSession is not set up'
 		self.has_downloads_path = self.browser_session.browser_profile.downloads_path is not None
@@ -541,7 +557,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		try:
 			from browser_use.screenshots.service import ScreenshotService
 
-			self.screenshot_service = ScreenshotService(self.agent_directory)
+			self.screenshot_service = ScreenshotService(
+				self.agent_directory, near_duplicate_threshold=self.settings.screenshot_near_duplicate_threshold
+			)
 			logger.debug(f'📸 Screenshot service initialized in: {self.agent_directory}/screenshots')
 		except Exception as e:
 			logger.error(f'📸 Failed to initialize screenshot service: {e}.')
@@ -627,7 +645,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			raise InterruptedError
 
 	@observe(name='agent.step', ignore_output=True, ignore_input=True)
-	@time_execution_async('--step')
+	@time_execution_async('--step', category='step')
 	async def step(self, step_info: AgentStepInfo | None = None) -> None:
 		"""Execute one step of the task"""
 		# Initialize timing first, before any exceptions can occur
@@ -814,10 +832,12 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			return
 
 		if browser_state_summary:
+			step_span = profiler.current_span('step')
 			metadata = StepMetadata(
 				step_number=self.state.n_steps,
 				step_start_time=self.step_start_time,
 				step_end_time=step_end_time,
+				span_summary=profiler.summarize(step_span) if step_span is not None else None,
 			)
 
 			# Use _make_history_item like main branch
@@ -965,7 +985,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			self.logger.debug(
 				f'📸 Storing screenshot for step {self.state.n_steps}, screenshot length: {len(browser_state_summary.screenshot)}'
 			)
-			screenshot_path = await self.screenshot_service.store_screenshot(browser_state_summary.screenshot, self.state.n_steps)
+			screenshot_path = await self.screenshot_service.store_screenshot(browser_state_summary.screenshot)
 			self.logger.debug(f'📸 Screenshot stored at: {screenshot_path}')
 		else:
 			self.logger.debug(f'📸 No screenshot in browser_state_summary for step {self.state.n_steps}')
@@ -985,7 +1005,15 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			metadata=metadata,
 		)
 
+		await self._add_history_item(history_item)
+
+	async def _add_history_item(self, history_item: AgentHistory) -> None:
+		"""Add a step to the history and append it to the history file, if one is set"""
 		self.history.add_item(history_item)
+		if self._history_writer:
+			await self._history_writer.append(history_item)
+		if self._gif_builder:
+			self._gif_builder.queue_step(history_item, len(self.history.history))
 
 	def _remove_think_tags(self, text: str) -> str:
 		THINK_TAGS = re.compile(r'<think>.*?</think>', re.DOTALL)
@@ -1148,7 +1176,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	# endregion - URL replacement
 
-	@time_execution_async('--get_next_action')
+	@time_execution_async('--get_next_action', category='llm')
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_model_output')
 	async def get_model_output(self, input_messages: list[BaseMessage]) -> AgentOutput:
 		"""Get next action from LLM based on current state"""
@@ -1412,10 +1440,25 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			exit_on_second_int=True,
 		)
 		signal_handler.register()
+		# spans of this run (including the watchdogs of its browser session) are told apart from those of other agents
+		profiler_owner = profiler.set_owner(self.id)
 
 		try:
 			await self._log_agent_run()
 
+			if self.settings.generate_gif:
+				# Lazy import gif module to avoid heavy startup cost
+				from browser_use.agent.gif import HistoryGifBuilder
+
+				# frames are added as the steps complete, earlier runs of this agent are part of the GIF as well
+				output_path = self.settings.generate_gif if isinstance(self.settings.generate_gif, str) else 'agent_history.gif'
+				self._gif_builder = HistoryGifBuilder(task=self.task, output_path=output_path)
+				for i, item in enumerate(self.history.history, 1):
+					self._gif_builder.queue_step(item, i)
+
+			# Start loading pricing data in the background so it is ready by the first LLM response
+			await self.token_cost_service.ensure_pricing_loaded()
+
 			self.logger.debug(
 				f'🔧 Agent setup: Agent Session ID {self.session_id[-4:]}, Task ID {self.task_id[-4:]}, Browser Session ID {self.browser_session.id[-4:] if self.browser_session else "None"} {"(connecting via CDP)" if (self.browser_session and self.browser_session.cdp_url) else "(launching local browser)"}'
 			)
@@ -1507,7 +1550,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			else:
 				agent_run_error = 'Failed to complete task in maximum steps'
 
-				self.history.add_item(
+				await self._add_history_item(
 					AgentHistory(
 						model_output=None,
 						result=[ActionResult(error=agent_run_error, include_in_memory=True)],
@@ -1572,20 +1615,12 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			if self.enable_cloud_sync:
 				self.eventbus.dispatch(UpdateAgentTaskEvent.from_agent(self))
 
-			# Generate GIF if needed before stopping event bus
-			if self.settings.generate_gif:
-				output_path: str = 'agent_history.gif'
-				if isinstance(self.settings.generate_gif, str):
-					output_path = self.settings.generate_gif
-
-				# Lazy import gif module to avoid heavy startup cost
-				from browser_use.agent.gif import create_history_gif
-
-				create_history_gif(task=self.task, history=self.history, output_path=output_path)
-
+			# Complete the GIF if needed before stopping event bus
+			if self._gif_builder:
+				gif_builder, self._gif_builder = self._gif_builder, None
 				# Only emit output file event if GIF was actually created
-				if Path(output_path).exists():
-					output_event = await CreateAgentOutputFileEvent.from_agent_and_file(self, output_path)
+				if await gif_builder.aclose():
+					output_event = await CreateAgentOutputFileEvent.from_agent_and_file(self, gif_builder.output_path)
 					self.eventbus.dispatch(output_event)
 
 			# Wait briefly for cloud auth to start and print the URL, but don't block for completion
@@ -1603,10 +1638,17 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			# Use longer timeout to avoid deadlocks in tests with multiple agents
 			await self.eventbus.stop(timeout=3.0)
 
+			if profiler.enabled and CONFIG.BROWSER_USE_PROFILE_TRACE_DIR:
+				trace_path = profiler.export_chrome_trace(
+					Path(CONFIG.BROWSER_USE_PROFILE_TRACE_DIR) / f'{self.id}.trace.json', owner=self.id
+				)
+				self.logger.info(f'📊 Profiler trace saved to {trace_path} (open it in https://ui.perfetto.dev)')
+
 			await self.close()
+			profiler.reset_owner(profiler_owner)
 
 	@observe_debug(ignore_input=True, ignore_output=True)
-	@time_execution_async('--multi_act')
+	@time_execution_async('--multi_act', category='action')
 	async def multi_act(
 		self,
 		actions: list[ActionModel],
@@ -1866,7 +1908,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				metadata=metadata,
 			)
 
-			self.history.add_item(history_item)
+			await self._add_history_item(history_item)
 			self.logger.debug('📝 Saved initial actions to history as step 0')
 			self.logger.debug('Initial actions completed')
 
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import sys
+import textwrap
 import traceback
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Generic, Literal
+from typing import Any, Generic, Literal, overload
 
-from openai import RateLimitError
 from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model, model_validator
 from typing_extensions import TypeVar
 from uuid_extensions import uuid7str
@@ -26,6 +29,7 @@ from browser_use.filesystem.file_system import FileSystemState
 from browser_use.llm.base import BaseChatModel
 from browser_use.tokens.views import UsageSummary
 from browser_use.tools.registry.views import ActionModel
+from browser_use.utils import SensitiveDataMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +49,7 @@ class AgentSettings(BaseModel):
 	max_actions_per_step: int = 4
 	use_thinking: bool = True
 	flash_mode: bool = False  # If enabled, disables evaluation_previous_goal and next_goal, and sets use_thinking = False
-	max_history_items: int | None = None
+	max_history_items: int | None = Field(default=None, gt=5)  # same limit as the MessageManager
 
 	page_extraction_llm: BaseChatModel | None = None
 	calculate_cost: bool = False
@@ -53,6 +57,8 @@ class AgentSettings(BaseModel):
 	llm_timeout: int = 60  # Timeout in seconds for LLM calls
 	step_timeout: int = 180  # Timeout in seconds for each step
 	final_response_after_failure: bool = True  # If True, attempt one final recovery call after max_failures
+	save_history_path: str | Path | None = None  # JSONL file that every step is appended to as it completes
+	screenshot_near_duplicate_threshold: int | None = None  # max perceptual hash bits a screenshot may differ to reuse the last
 
 
 class AgentState(BaseModel):
@@ -132,6 +138,7 @@ class StepMetadata(BaseModel):
 	step_start_time: float
 	step_end_time: float
 	step_number: int
+	span_summary: dict[str, float] | None = None  # milliseconds per layer (dom, cdp, llm, ...), only set while profiling
 
 	@property
 	def duration_seconds(self) -> float:
@@ -273,29 +280,8 @@ class AgentHistory(BaseModel):
 		if not sensitive_data:
 			return value
 
-		# Collect all sensitive values, immediately converting old format to new format
-		sensitive_values: dict[str, str] = {}
-
-		# Process all sensitive data entries
-		for key_or_domain, content in sensitive_data.items():
-			if isinstance(content, dict):
-				# Already in new format: {domain: {key: value}}
-				for key, val in content.items():
-					if val:  # Skip empty values
-						sensitive_values[key] = val
-			elif content:  # Old format: {key: value} - convert to new format internally
-				# We treat this as if it was {'http*://*': {key_or_domain: content}}
-				sensitive_values[key_or_domain] = content
-
-		# If there are no valid sensitive data entries, just return the original value
-		if not sensitive_values:
-			return value
-
 		# Replace all valid sensitive data values with their placeholder tags
-		for key, val in sensitive_values.items():
-			value = value.replace(val, f'<secret>{key}</secret>')
-
-		return value
+		return SensitiveDataMatcher.cached(sensitive_data).redact(value)
 
 	def _filter_sensitive_data_from_dict(
 		self, data: dict[str, Any], sensitive_data: dict[str, str | dict[str, str]] | None
@@ -361,6 +347,19 @@ class AgentHistory(BaseModel):
 			'metadata': self.metadata.model_dump() if self.metadata else None,
 		}
 
+	@classmethod
+	def load_dump(cls, data: dict[str, Any], output_model: type[AgentOutput]) -> AgentHistory:
+		"""Validate one item of a saved history, with the actions of `output_model`"""
+		# validate output_model actions to enrich with custom actions
+		if data['model_output']:
+			if isinstance(data['model_output'], dict):
+				data['model_output'] = output_model.model_validate(data['model_output'])
+			else:
+				data['model_output'] = None
+		if 'interacted_element' not in data['state']:
+			data['state']['interacted_element'] = None
+		return cls.model_validate(data)
+
 
 AgentStructuredOutput = TypeVar('AgentStructuredOutput', bound=BaseModel)
 
@@ -398,14 +397,24 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 		return self.__str__()
 
 	def save_to_file(self, filepath: str | Path, sensitive_data: dict[str, str | dict[str, str]] | None = None) -> None:
-		"""Save history to JSON file with proper serialization and optional sensitive data filtering"""
-		try:
-			Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-			data = self.model_dump(sensitive_data=sensitive_data)
-			with open(filepath, 'w', encoding='utf-8') as f:
-				json.dump(data, f, indent=2)
-		except Exception as e:
-			raise e
+		"""Save history to JSON file with proper serialization and optional sensitive data filtering
+
+		Files ending in `.jsonl` get one step per line, the format `AgentHistoryWriter` appends to while the agent runs.
+		Items are serialized one at a time, the dump of the whole history is never held in memory.
+		"""
+		Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+		with open(filepath, 'w', encoding='utf-8') as f:
+			if Path(filepath).suffix == '.jsonl':
+				for h in self.history:
+					f.write(json.dumps(h.model_dump(sensitive_data=sensitive_data)) + '\n')
+				return
+
+			# same output as json.dump(self.model_dump(), f, indent=2)
+			f.write('{\n  "history": [')
+			for i, h in enumerate(self.history):
+				item = json.dumps(h.model_dump(sensitive_data=sensitive_data), indent=2)
+				f.write(('\n' if i == 0 else ',\n') + textwrap.indent(item, '    '))
+			f.write('\n  ]\n}' if self.history else ']\n}')
 
 	# def save_as_playwright_script(
 	# 	self,
@@ -447,20 +456,12 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 
 	@classmethod
 	def load_from_file(cls, filepath: str | Path, output_model: type[AgentOutput]) -> AgentHistoryList:
-		"""Load history from JSON file"""
+		"""Load history from JSON file, or from a JSONL file with one step per line"""
+		if Path(filepath).suffix == '.jsonl':
+			return AgentHistoryReader(filepath, output_model).to_history_list()
 		with open(filepath, encoding='utf-8') as f:
 			data = json.load(f)
-		# loop through history and validate output_model actions to enrich with custom actions
-		for h in data['history']:
-			if h['model_output']:
-				if isinstance(h['model_output'], dict):
-					h['model_output'] = output_model.model_validate(h['model_output'])
-				else:
-					h['model_output'] = None
-			if 'interacted_element' not in h['state']:
-				h['state']['interacted_element'] = None
-		history = cls.model_validate(data)
-		return history
+		return cls(history=[AgentHistory.load_dump(h, output_model) for h in data['history']])
 
 	def last_action(self) -> None | dict:
 		"""Last action in history"""
@@ -523,15 +524,19 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 				return [h.state.screenshot_path for h in self.history[-n_last:] if h.state.screenshot_path is not None]
 
 	def screenshots(self, n_last: int | None = None, return_none_if_not_screenshot: bool = True) -> list[str | None]:
-		"""Get all screenshots from history as base64 strings"""
+		"""Get all screenshots from history as base64 strings, use ascreenshots() inside an event loop"""
 		if n_last == 0:
 			return []
 
 		history_items = self.history if n_last is None else self.history[-n_last:]
 		screenshots = []
+		loaded: dict[str, str | None] = {}  # steps showing the same page share one screenshot file, read it once
 
 		for item in history_items:
-			screenshot_b64 = item.state.get_screenshot()
+			path = item.state.screenshot_path or ''
+			if path not in loaded:
+				loaded[path] = item.state.get_screenshot()
+			screenshot_b64 = loaded[path]
 			if screenshot_b64:
 				screenshots.append(screenshot_b64)
 			else:
@@ -541,6 +546,15 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 
 		return screenshots
 
+	async def ascreenshots(self, n_last: int | None = None, return_none_if_not_screenshot: bool = True) -> list[str | None]:
+		"""Like screenshots(), with the distinct files read concurrently and off the event loop"""
+		from browser_use.screenshots.service import load_screenshots
+
+		screenshots = await load_screenshots(self.screenshot_paths(n_last))
+		if return_none_if_not_screenshot:
+			return screenshots
+		return [screenshot for screenshot in screenshots if screenshot]
+
 	def action_names(self) -> list[str]:
 		"""Get all action names from history"""
 		action_names = []
@@ -638,6 +652,86 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 		return None
 
 
+class AgentHistoryWriter:
+	"""Appends history items to a JSONL file as the steps complete, so a crashed run keeps all finished steps
+
+	The file is started over by the first append, items are serialized on the caller's thread (the history item must
+	not change while it is dumped) and written in a worker thread.
+	"""
+
+	def __init__(self, filepath: str | Path, sensitive_data: dict[str, str | dict[str, str]] | None = None):
+		self.filepath = Path(filepath)
+		self.sensitive_data = sensitive_data
+		self._started = False
+
+	async def append(self, history_item: AgentHistory) -> None:
+		line = json.dumps(history_item.model_dump(sensitive_data=self.sensitive_data)) + '\n'
+		mode = 'a' if self._started else 'w'
+		self._started = True
+		await asyncio.to_thread(self._write, line, mode)
+
+	def _write(self, line: str, mode: str) -> None:
+		self.filepath.parent.mkdir(parents=True, exist_ok=True)
+		with open(self.filepath, mode, encoding='utf-8') as f:
+			f.write(line)
+
+
+class AgentHistoryReader(Sequence[AgentHistory]):
+	"""Read-only view of a JSONL history file that parses and validates steps only when they are accessed
+
+	Opening the file only indexes the byte offset of every complete line, so any step can be read without reading the
+	steps before it. A line cut off by a crash is not part of the history, `refresh()` picks up steps appended since.
+	"""
+
+	def __init__(self, filepath: str | Path, output_model: type[AgentOutput]):
+		self.filepath = Path(filepath)
+		self.output_model = output_model
+		self._offsets: list[int] = []
+		self._indexed_size = 0
+		self.refresh()
+
+	def refresh(self) -> None:
+		"""Index the steps appended to the file since it was last indexed"""
+		with open(self.filepath, 'rb') as f:
+			f.seek(self._indexed_size)
+			offset = self._indexed_size
+			for line in f:
+				if not line.endswith(b'\n'):
+					break  # incomplete last line of an interrupted write
+				if line.strip():
+					self._offsets.append(offset)
+				offset += len(line)
+		self._indexed_size = offset
+
+	def __len__(self) -> int:
+		return len(self._offsets)
+
+	@overload
+	def __getitem__(self, index: int) -> AgentHistory: ...
+
+	@overload
+	def __getitem__(self, index: slice) -> list[AgentHistory]: ...
+
+	def __getitem__(self, index: int | slice) -> AgentHistory | list[AgentHistory]:
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(len(self)))]
+		offset = self._offsets[index]
+		with open(self.filepath, 'rb') as f:
+			f.seek(offset)
+			line = f.readline()
+		return AgentHistory.load_dump(json.loads(line), self.output_model)
+
+	def __iter__(self) -> Iterator[AgentHistory]:
+		with open(self.filepath, 'rb') as f:
+			for offset in self._offsets:
+				f.seek(offset)
+				yield AgentHistory.load_dump(json.loads(f.readline()), self.output_model)
+
+	def to_history_list(self) -> AgentHistoryList:
+		"""Load all steps, e.g. to export them with `AgentHistoryList.save_to_file`"""
+		return AgentHistoryList(history=list(self))
+
+
 class AgentError:
 	"""Container for agent error handling"""
 
@@ -651,7 +745,9 @@ class AgentError:
 		message = ''
 		if isinstance(error, ValidationError):
 			return f'{AgentError.VALIDATION_ERROR}\nDetails: {str(error)}'
-		if isinstance(error, RateLimitError):
+		# openai's RateLimitError can only be raised once a provider has imported the SDK, no need to import it here
+		openai = sys.modules.get('openai')
+		if openai is not None and isinstance(error, openai.RateLimitError):
 			return AgentError.RATE_LIMIT_ERROR
 		if include_trace:
 			return f'{str(error)}\nStacktrace:\n{traceback.format_exc()}'
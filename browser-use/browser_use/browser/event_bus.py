@@ -0,0 +1,61 @@
+"""Event bus of a BrowserSession, with a bounded history that does not hold on to old results."""
+
+from typing import Any
+
+from bubus import EventBus
+
+
+class BrowserEventBus(EventBus):
+	"""EventBus whose history is trimmed oldest-first and keeps the results of the most recent events only.
+
+	The history is a dict in dispatch order, so trimming removes completed events from its front instead of sorting the
+	whole history after every event. Results of completed events (e.g. `BrowserStateSummary`s with their DOM tree and
+	screenshot) are released once `max_result_history` newer events were dispatched; the events themselves stay in the
+	history for parent lookups and recent event listings.
+	"""
+
+	def __init__(self, *args: Any, max_history_size: int | None = 50, max_result_history: int = 10, **kwargs: Any):
+		super().__init__(*args, max_history_size=max_history_size, **kwargs)
+		self.max_result_history = max_result_history
+		self._newest_released_id: str | None = None
+
+	def cleanup_event_history(self) -> int:
+		"""Release old results, then remove the oldest completed events above `max_history_size`"""
+		self.release_old_results()
+
+		history = self.event_history
+		excess = len(history) - self.max_history_size if self.max_history_size else 0
+		if excess <= 0:
+			return 0
+
+		to_remove: list[str] = []
+		for event_id, event in history.items():
+			if event.event_status == 'completed':
+				to_remove.append(event_id)
+				if len(to_remove) == excess:
+					break
+		for event_id in to_remove:
+			del history[event_id]
+
+		if len(to_remove) < excess:
+			# more events are in flight than the history holds, let bubus decide which of them to drop
+			return len(to_remove) + super().cleanup_event_history()
+		return len(to_remove)
+
+	def release_old_results(self) -> None:
+		"""Drop the results of completed events older than the `max_result_history` most recent events"""
+		events = reversed(self.event_history.values())
+		for _ in zip(range(self.max_result_history), events):
+			pass
+
+		newest_released_id = None
+		for event in events:
+			if event.event_id == self._newest_released_id:
+				break
+			if event.event_status != 'completed':
+				continue
+			for event_result in event.event_results.values():
+				event_result.result = None
+			newest_released_id = newest_released_id or event.event_id
+		if newest_released_id:
+			self._newest_released_id = newest_released_id
@@ -560,6 +560,12 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		"""Alias for use_cloud field for compatibility."""
 		return self.use_cloud
 
+	max_in_flight_cdp_commands: int | None = Field(
+		default=None,
+		ge=1,
+		description='Maximum number of CDP commands awaiting a response at once, further commands wait their turn. Keeps one session from flooding a browser shared with other sessions.',
+	)
+
 	# custom options we provide that aren't native playwright kwargs
 	disable_security: bool = Field(default=False, description='Disable browser security features.')
 	deterministic_rendering: bool = Field(default=False, description='Enable deterministic rendering flags.')
@@ -630,6 +636,12 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	# --- Downloads ---
 	auto_download_pdfs: bool = Field(default=True, description='Automatically download PDFs when navigating to PDF viewer pages.')
 
+	# --- Health monitoring ---
+	monitor_crashes: bool = Field(
+		default=False,
+		description='Report crashed or closed tabs, unresponsive tabs and a dead browser as BrowserErrorEvents (CrashWatchdog).',
+	)
+
 	profile_directory: str = 'Default'  # e.g. 'Profile 1', 'Profile 2', 'Custom Profile', etc.
 
 	# these can be found in BrowserLaunchArgs, BrowserLaunchPersistentContextArgs, BrowserNewContextArgs, BrowserConnectArgs:
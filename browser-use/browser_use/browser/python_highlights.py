@@ -405,7 +405,7 @@ def process_element_highlight(
 
 
 @observe_debug(ignore_input=True, ignore_output=True, name='create_highlighted_screenshot')
-@time_execution_async('create_highlighted_screenshot')
+@time_execution_async('create_highlighted_screenshot', category='screenshot')
 async def create_highlighted_screenshot(
 	screenshot_b64: str,
 	selector_map: DOMSelectorMap,
@@ -498,7 +498,7 @@ async def get_viewport_info_from_cdp(cdp_session) -> tuple[float, int, int]:
 		return 1.0, 0, 0
 
 
-@time_execution_async('create_highlighted_screenshot_async')
+@time_execution_async('create_highlighted_screenshot_async', category='screenshot')
 async def create_highlighted_screenshot_async(
 	screenshot_b64: str, selector_map: DOMSelectorMap, cdp_session=None, filter_highlight_ids: bool = True
 ) -> str:
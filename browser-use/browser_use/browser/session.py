@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+from collections.abc import Callable
 from functools import cached_property
 from pathlib import Path
 from typing import Any, Literal, Self, cast
@@ -11,7 +12,8 @@ from bubus import EventBus
 from cdp_use import CDPClient
 from cdp_use.cdp.fetch import AuthRequiredEvent, RequestPausedEvent
 from cdp_use.cdp.network import Cookie
-from cdp_use.cdp.target import AttachedToTargetEvent, SessionID, TargetID
+from cdp_use.cdp.target import AttachedToTargetEvent, CreateTargetParameters, SessionID, TargetID
+from cdp_use.cdp.target.events import DetachedFromTargetEvent, TargetDestroyedEvent
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from uuid_extensions import uuid7str
 
@@ -19,6 +21,7 @@ from browser_use.browser.cloud import CloudBrowserAuthError, CloudBrowserError,
 
 # CDP logging is now handled by setup_logging() in logging_config.py
 # It automatically sets CDP logs to the same level as browser_use logs
+from browser_use.browser.event_bus import BrowserEventBus
 from browser_use.browser.events import (
 	AgentFocusChangedEvent,
 	BrowserConnectedEvent,
@@ -42,6 +45,7 @@ from browser_use.browser.profile import BrowserProfile, ProxySettings
 from browser_use.browser.views import BrowserStateSummary, TabInfo
 from browser_use.dom.views import EnhancedDOMTreeNode, TargetInfo
 from browser_use.observability import observe_debug
+from browser_use.profiling import profiler
 from browser_use.utils import _log_pretty_url, is_new_tab_page
 
 DEFAULT_BROWSER_PROFILE = BrowserProfile()
@@ -51,10 +55,90 @@ red = '\033[91m'
 reset = '\033[0m'
 
 
+class MultiplexedCDPClient(CDPClient):
+	"""Root CDP client shared by every target session over a single WebSocket connection.
+
+	Sessions are attached with Target.attachToTarget(flatten=True), so commands and events for all targets
+	travel over this one socket and are routed by their sessionId. Tracks in-flight commands per session,
+	and tells subscribers when the socket drops or a command is still unanswered after slow_command_timeout.
+	With max_in_flight_commands, at most that many commands await a response at once and the others wait their
+	turn in order, so one connection cannot flood a browser shared with other sessions.
+	"""
+
+	# answer the browser while other commands are blocked on them, so they never wait for a free slot
+	UNTHROTTLED_METHOD_PREFIXES = ('Fetch.', 'Page.handleJavaScriptDialog')
+
+	def __init__(self, *args, max_in_flight_commands: int | None = None, **kwargs):
+		super().__init__(*args, **kwargs)
+		# session_id -> number of commands sent but not yet answered ('' is the browser-level session)
+		self.in_flight_commands: dict[str, int] = {}
+		self._command_slots = asyncio.Semaphore(max_in_flight_commands) if max_in_flight_commands else None
+		# called when the WebSocket closes without stop() having been called
+		self.disconnect_callbacks: list[Callable[[], None]] = []
+		# called with (method, session_id) for each command that takes longer than slow_command_timeout
+		self.slow_command_callbacks: list[Callable[[str, str | None], None]] = []
+		self.slow_command_timeout: float = 10.0
+		self._stopping = False
+
+	async def start(self) -> None:
+		self._stopping = False
+		await super().start()
+		if self._message_handler_task:
+			self._message_handler_task.add_done_callback(self._on_message_handler_done)
+
+	async def stop(self) -> None:
+		self._stopping = True
+		await super().stop()
+
+	def _on_message_handler_done(self, task: asyncio.Task) -> None:
+		if self._stopping:
+			return
+		for callback in list(self.disconnect_callbacks):
+			try:
+				callback()
+			except Exception as e:
+				logging.getLogger('browser_use.CDPClient').debug(f'Error in CDP disconnect callback: {type(e).__name__}: {e}')
+
+	def _on_slow_command(self, method: str, session_id: str | None) -> None:
+		for callback in list(self.slow_command_callbacks):
+			try:
+				callback(method, session_id)
+			except Exception as e:
+				logging.getLogger('browser_use.CDPClient').debug(f'Error in CDP slow command callback: {type(e).__name__}: {e}')
+
+	async def send_raw(self, method: str, params: Any | None = None, session_id: str | None = None) -> dict[str, Any]:
+		if self._command_slots is None or method.startswith(self.UNTHROTTLED_METHOD_PREFIXES):
+			return await self._send_raw(method, params, session_id)
+		async with self._command_slots:
+			return await self._send_raw(method, params, session_id)
+
+	async def _send_raw(self, method: str, params: Any | None, session_id: str | None) -> dict[str, Any]:
+		key = session_id or ''
+		self.in_flight_commands[key] = self.in_flight_commands.get(key, 0) + 1
+		# a timer per command instead of polling for stuck ones, cancelled as soon as the response arrives
+		slow_timer = (
+			asyncio.get_running_loop().call_later(self.slow_command_timeout, self._on_slow_command, method, session_id)
+			if self.slow_command_callbacks
+			else None
+		)
+		try:
+			with profiler.span(method, 'cdp'):
+				return await super().send_raw(method, params=params, session_id=session_id)
+		finally:
+			if slow_timer:
+				slow_timer.cancel()
+			remaining = self.in_flight_commands.get(key, 1) - 1
+			if remaining > 0:
+				self.in_flight_commands[key] = remaining
+			else:
+				self.in_flight_commands.pop(key, None)
+
+
 class CDPSession(BaseModel):
 	"""Info about a single CDP session bound to a specific target.
 
-	Can optionally use its own WebSocket connection for better isolation.
+	By default shares the root WebSocket connection (flattened sessions routed by sessionId),
+	but can optionally use its own WebSocket connection for better isolation.
 	"""
 
 	model_config = ConfigDict(arbitrary_types_allowed=True, revalidate_instances='never')
@@ -163,13 +247,26 @@ class CDPSession(BaseModel):
 		self.url = target_info['url']
 		return self
 
+	@property
+	def in_flight_commands(self) -> int:
+		"""Number of commands sent on this session that are still awaiting a response."""
+		counts = getattr(self.cdp_client, 'in_flight_commands', None)
+		return counts.get(self.session_id, 0) if counts else 0
+
 	async def disconnect(self) -> None:
-		"""Disconnect and cleanup if this session owns its CDP client."""
+		"""Disconnect and cleanup if this session owns its CDP client, otherwise detach from the shared socket."""
 		if self.owns_cdp_client and self.cdp_client:
 			try:
 				await self.cdp_client.stop()
 			except Exception:
 				pass  # Ignore errors during cleanup
+		elif self.cdp_client and self.session_id and self.session_id != 'connecting':
+			try:
+				await asyncio.wait_for(
+					self.cdp_client.send.Target.detachFromTarget(params={'sessionId': self.session_id}), timeout=1.0
+				)
+			except Exception:
+				pass  # target may already be gone
 
 	async def get_tab_info(self) -> TabInfo:
 		target_info = await self.get_target_info()
@@ -217,6 +314,7 @@ class BrowserSession(BaseModel):
 		self,
 		# Core configuration
 		id: str | None = None,
+		browser_context_id: str | None = None,
 		cdp_url: str | None = None,
 		is_local: bool = False,
 		browser_profile: BrowserProfile | None = None,
@@ -268,6 +366,7 @@ class BrowserSession(BaseModel):
 		wait_between_actions: float | None = None,
 		filter_highlight_ids: bool | None = None,
 		auto_download_pdfs: bool | None = None,
+		monitor_crashes: bool | None = None,
 		profile_directory: str | None = None,
 		cookie_whitelist_domains: list[str] | None = None,
 		# DOM extraction layer configuration
@@ -280,7 +379,11 @@ class BrowserSession(BaseModel):
 	):
 		# Following the same pattern as AgentSettings in service.py
 		# Only pass non-None values to avoid validation errors
-		profile_kwargs = {k: v for k, v in locals().items() if k not in ['self', 'browser_profile', 'id'] and v is not None}
+		profile_kwargs = {
+			k: v
+			for k, v in locals().items()
+			if k not in ['self', 'browser_profile', 'id', 'browser_context_id'] and v is not None
+		}
 
 		# Handle backward compatibility: map cloud_browser to use_cloud
 		if 'cloud_browser' in profile_kwargs:
@@ -303,11 +406,16 @@ class BrowserSession(BaseModel):
 		# Initialize the Pydantic model
 		super().__init__(
 			id=id or str(uuid7str()),
+			browser_context_id=browser_context_id,
 			browser_profile=resolved_browser_profile,
 		)
 
 	# Session configuration (session identity only)
 	id: str = Field(default_factory=lambda: str(uuid7str()), description='Unique identifier for this browser session')
+	browser_context_id: str | None = Field(
+		default=None,
+		description='CDP browser context to open and list tabs in, other tabs of the browser are not visible to this session',
+	)
 
 	# Browser configuration (reusable profile)
 	browser_profile: BrowserProfile = Field(
@@ -332,7 +440,7 @@ class BrowserSession(BaseModel):
 		return self.browser_profile.use_cloud
 
 	# Main shared event bus for all browser session + all watchdogs
-	event_bus: EventBus = Field(default_factory=EventBus)
+	event_bus: EventBus = Field(default_factory=BrowserEventBus)
 
 	# Mutable public state
 	agent_focus: CDPSession | None = None
@@ -397,12 +505,20 @@ class BrowserSession(BaseModel):
 		# await self.event_bus.wait_for_idle(timeout=5.0)
 		# await self.event_bus.clear()
 
-		# Disconnect sessions that own their WebSocket connections
-		for session in self._cdp_session_pool.values():
-			if hasattr(session, 'disconnect'):
-				await session.disconnect()
+		# Disconnect sessions that own their WebSocket connections and detach the ones multiplexed on the root socket
+		await asyncio.gather(
+			*(session.disconnect() for session in self._cdp_session_pool.values() if hasattr(session, 'disconnect')),
+			return_exceptions=True,
+		)
 		self._cdp_session_pool.clear()
 
+		# A session bound to a browser context shares its browser with other sessions (AgentScheduler), close its root
+		# WebSocket or it keeps receiving target events of the browser
+		if self.browser_context_id and self._cdp_client_root is not None:
+			try:
+				await asyncio.wait_for(self._cdp_client_root.stop(), timeout=2.0)
+			except Exception as e:
+				self.logger.debug(f'Error closing the CDP connection: {type(e).__name__}: {e}')
 		self._cdp_client_root = None  # type: ignore
 		self._cached_browser_state_summary = None
 		self._cached_selector_map.clear()
@@ -472,7 +588,7 @@ class BrowserSession(BaseModel):
 		# Reset all state
 		await self.reset()
 		# Create fresh event bus
-		self.event_bus = EventBus()
+		self.event_bus = BrowserEventBus()
 
 	async def stop(self) -> None:
 		"""Stop the browser session without killing the browser process.
@@ -494,7 +610,7 @@ class BrowserSession(BaseModel):
 		# Reset all state
 		await self.reset()
 		# Create fresh event bus
-		self.event_bus = EventBus()
+		self.event_bus = BrowserEventBus()
 
 	async def on_BrowserStartEvent(self, event: BrowserStartEvent) -> dict[str, str]:
 		"""Handle browser start request.
@@ -714,8 +830,7 @@ class BrowserSession(BaseModel):
 			else:
 				# no pages open at all, create a new one (handles switching to it automatically)
 				assert self._cdp_client_root is not None, 'CDP client root not initialized - browser may not be connected yet'
-				new_target = await self._cdp_client_root.send.Target.createTarget(params={'url': 'about:blank'})
-				target_id = new_target['targetId']
+				target_id = await self._cdp_create_new_page('about:blank')
 				# do not await! these may circularly trigger SwitchTabEvent and could deadlock, dispatch to enqueue and return
 				self.event_bus.dispatch(TabCreatedEvent(url='about:blank', target_id=target_id))
 				self.event_bus.dispatch(AgentFocusChangedEvent(target_id=target_id, url='about:blank'))
@@ -884,7 +999,7 @@ class BrowserSession(BaseModel):
 		Args:
 				target_id: Target ID to get session for. If None, uses current agent focus.
 				focus: If True, switches agent focus to this target. If False, just returns session without changing focus.
-				new_socket: If True, create a dedicated WebSocket connection. If None (default), creates new socket for new targets only.
+				new_socket: If True, create a dedicated WebSocket connection. If None (default), the session is multiplexed over the root WebSocket.
 
 		Returns:
 				CDPSession for the specified target.
@@ -918,8 +1033,8 @@ class BrowserSession(BaseModel):
 			return self.agent_focus
 
 		# Create new session for this target
-		# Default to True for new sessions (each new target gets its own WebSocket)
-		should_use_new_socket = True if new_socket is None else new_socket
+		# Default to False: all targets share the root WebSocket and are routed by sessionId
+		should_use_new_socket = bool(new_socket)
 		self.logger.debug(
 			f'[get_or_create_cdp_session] Creating new CDP session for target {target_id} (new_socket={should_use_new_socket})'
 		)
@@ -931,7 +1046,10 @@ class BrowserSession(BaseModel):
 		)
 		self._cdp_session_pool[target_id] = session
 		# log length of _cdp_session_pool
-		self.logger.debug(f'[get_or_create_cdp_session] new _cdp_session_pool length: {len(self._cdp_session_pool)}')
+		self.logger.debug(
+			f'[get_or_create_cdp_session] new _cdp_session_pool length: {len(self._cdp_session_pool)} '
+			f'({sum(1 for s in self._cdp_session_pool.values() if s.owns_cdp_client)} with dedicated sockets)'
+		)
 
 		# Only change agent focus if requested
 		if focus:
@@ -1006,25 +1124,26 @@ class BrowserSession(BaseModel):
 			return
 
 		from browser_use.browser.watchdogs.aboutblank_watchdog import AboutBlankWatchdog
-
-		# from browser_use.browser.crash_watchdog import CrashWatchdog
 		from browser_use.browser.watchdogs.default_action_watchdog import DefaultActionWatchdog
 		from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
 		from browser_use.browser.watchdogs.downloads_watchdog import DownloadsWatchdog
 		from browser_use.browser.watchdogs.local_browser_watchdog import LocalBrowserWatchdog
-		from browser_use.browser.watchdogs.permissions_watchdog import PermissionsWatchdog
 		from browser_use.browser.watchdogs.popups_watchdog import PopupsWatchdog
-		from browser_use.browser.watchdogs.recording_watchdog import RecordingWatchdog
 		from browser_use.browser.watchdogs.screenshot_watchdog import ScreenshotWatchdog
 		from browser_use.browser.watchdogs.security_watchdog import SecurityWatchdog
-		from browser_use.browser.watchdogs.storage_state_watchdog import StorageStateWatchdog
 
-		# Initialize CrashWatchdog
-		# CrashWatchdog.model_rebuild()
-		# self._crash_watchdog = CrashWatchdog(event_bus=self.event_bus, browser_session=self)
-		# self.event_bus.on(BrowserConnectedEvent, self._crash_watchdog.on_BrowserConnectedEvent)
-		# self.event_bus.on(BrowserStoppedEvent, self._crash_watchdog.on_BrowserStoppedEvent)
-		# self._crash_watchdog.attach_to_session()
+		# Optional watchdogs are only imported and constructed when the profile enables them
+
+		# Initialize CrashWatchdog conditionally (event-driven, costs nothing while the browser is healthy)
+		if self.browser_profile.monitor_crashes:
+			from browser_use.browser.watchdogs.crash_watchdog import CrashWatchdog
+
+			CrashWatchdog.model_rebuild()
+			self._crash_watchdog = CrashWatchdog(event_bus=self.event_bus, browser_session=self)
+			# self.event_bus.on(BrowserConnectedEvent, self._crash_watchdog.on_BrowserConnectedEvent)
+			# self.event_bus.on(BrowserStopEvent, self._crash_watchdog.on_BrowserStopEvent)
+			# self.event_bus.on(BrowserStoppedEvent, self._crash_watchdog.on_BrowserStoppedEvent)
+			self._crash_watchdog.attach_to_session()
 
 		# Initialize DownloadsWatchdog
 		DownloadsWatchdog.model_rebuild()
@@ -1045,13 +1164,15 @@ class BrowserSession(BaseModel):
 		)
 
 		if should_enable_storage_state:
+			from browser_use.browser.watchdogs.storage_state_watchdog import StorageStateWatchdog
+
 			StorageStateWatchdog.model_rebuild()
 			self._storage_state_watchdog = StorageStateWatchdog(
 				event_bus=self.event_bus,
 				browser_session=self,
 				# More conservative defaults when auto-enabled
-				auto_save_interval=60.0,  # 1 minute instead of 30 seconds
-				save_on_change=False,  # Only save on shutdown by default
+				auto_save_interval=60.0,  # changes are saved at most 1 minute after they happen instead of 30 seconds
+				save_on_change=False,  # don't save right after every change, only every auto_save_interval and on shutdown
 			)
 			self._storage_state_watchdog.attach_to_session()
 			self.logger.debug(
@@ -1092,10 +1213,13 @@ class BrowserSession(BaseModel):
 		self._popups_watchdog.attach_to_session()
 
 		# Initialize PermissionsWatchdog (handles granting and revoking browser permissions like clipboard, microphone, camera, etc.)
-		PermissionsWatchdog.model_rebuild()
-		self._permissions_watchdog = PermissionsWatchdog(event_bus=self.event_bus, browser_session=self)
-		# self.event_bus.on(BrowserConnectedEvent, self._permissions_watchdog.on_BrowserConnectedEvent)
-		self._permissions_watchdog.attach_to_session()
+		if self.browser_profile.permissions:
+			from browser_use.browser.watchdogs.permissions_watchdog import PermissionsWatchdog
+
+			PermissionsWatchdog.model_rebuild()
+			self._permissions_watchdog = PermissionsWatchdog(event_bus=self.event_bus, browser_session=self)
+			# self.event_bus.on(BrowserConnectedEvent, self._permissions_watchdog.on_BrowserConnectedEvent)
+			self._permissions_watchdog.attach_to_session()
 
 		# Initialize DefaultActionWatchdog (handles all default actions like click, type, scroll, go back, go forward, refresh, wait, send keys, upload file, scroll to text, etc.)
 		DefaultActionWatchdog.model_rebuild()
@@ -1128,9 +1252,12 @@ class BrowserSession(BaseModel):
 		self._dom_watchdog.attach_to_session()
 
 		# Initialize RecordingWatchdog (handles video recording)
-		RecordingWatchdog.model_rebuild()
-		self._recording_watchdog = RecordingWatchdog(event_bus=self.event_bus, browser_session=self)
-		self._recording_watchdog.attach_to_session()
+		if self.browser_profile.record_video_dir:
+			from browser_use.browser.watchdogs.recording_watchdog import RecordingWatchdog
+
+			RecordingWatchdog.model_rebuild()
+			self._recording_watchdog = RecordingWatchdog(event_bus=self.event_bus, browser_session=self)
+			self._recording_watchdog.attach_to_session()
 
 		# Mark watchdogs as attached to prevent duplicate attachment
 		self._watchdogs_attached = True
@@ -1168,12 +1295,18 @@ class BrowserSession(BaseModel):
 			# Convert HTTP URL to WebSocket URL if needed
 
 			# Create and store the CDP client for direct CDP communication
-			self._cdp_client_root = CDPClient(self.cdp_url)
+			self._cdp_client_root = MultiplexedCDPClient(
+				self.cdp_url, max_in_flight_commands=self.browser_profile.max_in_flight_cdp_commands
+			)
 			assert self._cdp_client_root is not None
 			await self._cdp_client_root.start()
 			await self._cdp_client_root.send.Target.setAutoAttach(
 				params={'autoAttach': True, 'waitForDebuggerOnStart': False, 'flatten': True}
 			)
+			# Target discovery is needed to get Target.targetDestroyed events for pruning the session pool
+			await self._cdp_client_root.send.Target.setDiscoverTargets(params={'discover': True})
+			self._cdp_client_root.register.Target.targetDestroyed(self._on_target_destroyed)
+			self._cdp_client_root.register.Target.detachedFromTarget(self._on_detached_from_target)
 			self.logger.debug('CDP client connected successfully')
 
 			# Get browser targets to find available contexts/pages
@@ -1183,7 +1316,8 @@ class BrowserSession(BaseModel):
 			page_targets: list[TargetInfo] = [
 				t
 				for t in targets['targetInfos']
-				if self._is_valid_target(
+				if self._is_in_browser_context(t)
+				and self._is_valid_target(
 					t, include_http=True, include_about=True, include_pages=True, include_iframes=False, include_workers=False
 				)
 			]
@@ -1224,8 +1358,7 @@ class BrowserSession(BaseModel):
 
 			if not page_targets:
 				# No pages found, create a new one
-				new_target = await self._cdp_client_root.send.Target.createTarget(params={'url': 'about:blank'})
-				target_id = new_target['targetId']
+				target_id = await self._cdp_create_new_page('about:blank')
 				self.logger.debug(f'📄 Created new blank page with target ID: {target_id}')
 			else:
 				# Use the first available page
@@ -1281,6 +1414,22 @@ class BrowserSession(BaseModel):
 
 		return self
 
+	def _on_target_destroyed(self, event: TargetDestroyedEvent, session_id: SessionID | None = None) -> None:
+		"""Drop the pooled CDP session of a target that no longer exists."""
+		if self._cdp_session_pool.pop(event['targetId'], None):
+			self.logger.debug(f'[_on_target_destroyed] Removed destroyed target {event["targetId"]} from _cdp_session_pool')
+		# only one handler can be registered per CDP event, so pass it on to the CrashWatchdog from here
+		if self._crash_watchdog:
+			self._crash_watchdog.handle_target_destroyed(event['targetId'])
+
+	def _on_detached_from_target(self, event: DetachedFromTargetEvent, session_id: SessionID | None = None) -> None:
+		"""Drop the pooled CDP session when the browser detaches it (only if it is still the pooled session)."""
+		target_id = event.get('targetId')
+		session = self._cdp_session_pool.get(target_id) if target_id else None
+		if session and session.session_id == event['sessionId']:
+			del self._cdp_session_pool[target_id]
+			self.logger.debug(f'[_on_detached_from_target] Removed detached session {event["sessionId"]} from _cdp_session_pool')
+
 	async def _setup_proxy_auth(self) -> None:
 		"""Enable CDP Fetch auth handling for authenticated proxy, if credentials provided.
 
@@ -1576,7 +1725,7 @@ class BrowserSession(BaseModel):
 		all_targets = await self.cdp_client.send.Target.getTargets()
 		# Filter for valid page/tab targets only
 		for target in all_targets.get('targetInfos', []):
-			if target['targetId'].endswith(tab_id):
+			if target['targetId'].endswith(tab_id) and self._is_in_browser_context(target):
 				return target['targetId']
 
 		raise ValueError(f'No TargetID found ending in tab_id=...{tab_id}')
@@ -1584,13 +1733,14 @@ class BrowserSession(BaseModel):
 	async def get_target_id_from_url(self, url: str) -> TargetID:
 		"""Get the TargetID from a URL."""
 		all_targets = await self.cdp_client.send.Target.getTargets()
-		for target in all_targets.get('targetInfos', []):
-			if target['url'] == url and target['type'] == 'page':
+		page_targets = [t for t in all_targets.get('targetInfos', []) if t['type'] == 'page' and self._is_in_browser_context(t)]
+		for target in page_targets:
+			if target['url'] == url:
 				return target['targetId']
 
 		# still not found, try substring match as fallback
-		for target in all_targets.get('targetInfos', []):
-			if url in target['url'] and target['type'] == 'page':
+		for target in page_targets:
+			if url in target['url']:
 				return target['targetId']
 
 		raise ValueError(f'No TargetID found for url={url}')
@@ -1735,7 +1885,8 @@ class BrowserSession(BaseModel):
 		return [
 			t
 			for t in targets.get('targetInfos', [])
-			if self._is_valid_target(
+			if self._is_in_browser_context(t)
+			and self._is_valid_target(
 				t,
 				include_http=include_http,
 				include_about=include_about,
@@ -1750,16 +1901,15 @@ class BrowserSession(BaseModel):
 
 	async def _cdp_create_new_page(self, url: str = 'about:blank', background: bool = False, new_window: bool = False) -> str:
 		"""Create a new page/tab using CDP Target.createTarget. Returns target ID."""
+		params: CreateTargetParameters = {'url': url, 'newWindow': new_window, 'background': background}
+		if self.browser_context_id:
+			params['browserContextId'] = self.browser_context_id
 		# Use the root CDP client to create tabs at the browser level
 		if self._cdp_client_root:
-			result = await self._cdp_client_root.send.Target.createTarget(
-				params={'url': url, 'newWindow': new_window, 'background': background}
-			)
+			result = await self._cdp_client_root.send.Target.createTarget(params=params)
 		else:
 			# Fallback to using cdp_client if root is not available
-			result = await self.cdp_client.send.Target.createTarget(
-				params={'url': url, 'newWindow': new_window, 'background': background}
-			)
+			result = await self.cdp_client.send.Target.createTarget(params=params)
 		return result['targetId']
 
 	async def _cdp_close_page(self, target_id: TargetID) -> None:
@@ -1863,8 +2013,12 @@ class BrowserSession(BaseModel):
 			session_id=cdp_session.session_id,
 		)
 
-	async def _cdp_get_origins(self) -> list[dict[str, Any]]:
-		"""Get origins with localStorage and sessionStorage using CDP."""
+	async def _cdp_get_origins(self, keep_dom_storage_enabled: bool = False) -> list[dict[str, Any]]:
+		"""Get origins with localStorage and sessionStorage using CDP.
+
+		Args:
+			keep_dom_storage_enabled: Leave the DOMStorage domain enabled afterwards, for callers listening to its events
+		"""
 		origins = []
 		cdp_session = await self.get_or_create_cdp_session(target_id=None, new_socket=False)
 
@@ -1930,21 +2084,22 @@ class BrowserSession(BaseModel):
 						origins.append(origin_data)
 
 			finally:
-				# Always disable DOMStorage tracking when done
-				await cdp_session.cdp_client.send.DOMStorage.disable(session_id=cdp_session.session_id)
+				# Disable DOMStorage tracking when done, unless someone is listening for storage changes
+				if not keep_dom_storage_enabled:
+					await cdp_session.cdp_client.send.DOMStorage.disable(session_id=cdp_session.session_id)
 
 		except Exception as e:
 			self.logger.warning(f'Failed to get origins: {e}')
 
 		return origins
 
-	async def _cdp_get_storage_state(self) -> dict:
+	async def _cdp_get_storage_state(self, keep_dom_storage_enabled: bool = False) -> dict:
 		"""Get storage state (cookies, localStorage, sessionStorage) using CDP."""
 		# Use the _cdp_get_cookies helper which handles session attachment
 		cookies = await self._cdp_get_cookies()
 
 		# Get origins with localStorage/sessionStorage
-		origins = await self._cdp_get_origins()
+		origins = await self._cdp_get_origins(keep_dom_storage_enabled=keep_dom_storage_enabled)
 
 		return {
 			'cookies': cookies,
@@ -1963,6 +2118,10 @@ class BrowserSession(BaseModel):
 		# Use helper to navigate on the target
 		await self.agent_focus.cdp_client.send.Page.navigate(params={'url': url}, session_id=self.agent_focus.session_id)
 
+	def _is_in_browser_context(self, target_info: TargetInfo) -> bool:
+		"""Whether a target belongs to this session, all targets do unless the session is bound to a browser context"""
+		return self.browser_context_id is None or target_info.get('browserContextId') == self.browser_context_id
+
 	@staticmethod
 	def _is_valid_target(
 		target_info: TargetInfo,
@@ -1,6 +1,7 @@
 """Base watchdog class for browser monitoring components."""
 
 import inspect
+import logging
 import time
 from collections.abc import Iterable
 from typing import Any, ClassVar
@@ -9,6 +10,7 @@ from bubus import BaseEvent, EventBus
 from pydantic import BaseModel, ConfigDict, Field
 
 from browser_use.browser.session import BrowserSession
+from browser_use.profiling import profiler
 
 
 class BaseWatchdog(BaseModel):
@@ -84,56 +86,59 @@ class BaseWatchdog(BaseModel):
 		# Create a wrapper function with unique name to avoid duplicate handler warnings
 		# Capture handler by value to avoid closure issues
 		def make_unique_handler(actual_handler):
+			handler_name = f'{watchdog_class_name}.{actual_handler.__name__}'
+
 			async def unique_handler(event):
-				# just for debug logging, not used for anything else
-				parent_event = event_bus.event_history.get(event.event_parent_id) if event.event_parent_id else None
-				grandparent_event = (
-					event_bus.event_history.get(parent_event.event_parent_id)
-					if parent_event and parent_event.event_parent_id
-					else None
-				)
-				parent = (
-					f'{yellow}↲  triggered by {cyan}on_{parent_event.event_type}#{parent_event.event_id[-4:]}{reset}'
-					if parent_event
-					else f'{magenta}👈 by Agent{reset}'
-				)
-				grandparent = (
-					(
-						f'{yellow}↲  under {cyan}{grandparent_event.event_type}#{grandparent_event.event_id[-4:]}{reset}'
-						if grandparent_event
+				# the debug logs below look up parent events and format several strings, skip all of it unless they are shown
+				debug = browser_session.logger.isEnabledFor(logging.DEBUG)
+				if debug:
+					parent_event = event_bus.event_history.get(event.event_parent_id) if event.event_parent_id else None
+					grandparent_event = (
+						event_bus.event_history.get(parent_event.event_parent_id)
+						if parent_event and parent_event.event_parent_id
+						else None
+					)
+					parent = (
+						f'{yellow}↲  triggered by {cyan}on_{parent_event.event_type}#{parent_event.event_id[-4:]}{reset}'
+						if parent_event
 						else f'{magenta}👈 by Agent{reset}'
 					)
-					if parent_event
-					else ''
-				)
-				event_str = f'#{event.event_id[-4:]}'
+					grandparent = (
+						(
+							f'{yellow}↲  under {cyan}{grandparent_event.event_type}#{grandparent_event.event_id[-4:]}{reset}'
+							if grandparent_event
+							else f'{magenta}👈 by Agent{reset}'
+						)
+						if parent_event
+						else ''
+					)
+					watchdog_and_handler_str = f'[{handler_name}(#{event.event_id[-4:]})]'.ljust(54)
+					browser_session.logger.debug(
+						f'{cyan}🚌 {watchdog_and_handler_str} ⏳ Starting...      {reset} {parent} {grandparent}'
+					)
 				time_start = time.time()
-				watchdog_and_handler_str = f'[{watchdog_class_name}.{actual_handler.__name__}({event_str})]'.ljust(54)
-				browser_session.logger.debug(
-					f'{cyan}🚌 {watchdog_and_handler_str} ⏳ Starting...      {reset} {parent} {grandparent}'
-				)
 
 				try:
 					# **EXECUTE THE EVENT HANDLER FUNCTION**
-					result = await actual_handler(event)
+					with profiler.span(handler_name, 'watchdog'):
+						result = await actual_handler(event)
 
 					if isinstance(result, Exception):
 						raise result
 
-					# just for debug logging, not used for anything else
-					time_end = time.time()
-					time_elapsed = time_end - time_start
-					result_summary = '' if result is None else f' ➡️ {magenta}<{type(result).__name__}>{reset}'
-					parents_summary = f' {parent}'.replace('↲  triggered by ', f'⤴  {green}returned to  {cyan}').replace(
-						'👈 by Agent', f'👉 {green}returned to  {magenta}Agent{reset}'
-					)
-					browser_session.logger.debug(
-						f'{green}🚌 {watchdog_and_handler_str} ✅ Succeeded ({time_elapsed:.2f}s){reset}{result_summary}{parents_summary}'
-					)
+					if debug:
+						time_elapsed = time.time() - time_start
+						result_summary = '' if result is None else f' ➡️ {magenta}<{type(result).__name__}>{reset}'
+						parents_summary = f' {parent}'.replace('↲  triggered by ', f'⤴  {green}returned to  {cyan}').replace(
+							'👈 by Agent', f'👉 {green}returned to  {magenta}Agent{reset}'
+						)
+						browser_session.logger.debug(
+							f'{green}🚌 {watchdog_and_handler_str} ✅ Succeeded ({time_elapsed:.2f}s){reset}{result_summary}{parents_summary}'
+						)
 					return result
 				except Exception as e:
-					time_end = time.time()
-					time_elapsed = time_end - time_start
+					time_elapsed = time.time() - time_start
+					watchdog_and_handler_str = f'[{handler_name}(#{event.event_id[-4:]})]'.ljust(54)
 					original_error = e
 					browser_session.logger.error(
 						f'{red}🚌 {watchdog_and_handler_str} ❌ Failed ({time_elapsed:.2f}s): {type(e).__name__}: {e}{reset}'
@@ -149,13 +154,13 @@ class BaseWatchdog(BaseModel):
 							)
 							del browser_session._cdp_session_pool[browser_session.agent_focus.target_id]
 							browser_session.agent_focus = await browser_session.get_or_create_cdp_session(
-								target_id=browser_session.agent_focus.target_id, new_socket=True
+								target_id=browser_session.agent_focus.target_id
 							)
 							await browser_session.agent_focus.cdp_client.send.Target.activateTarget(
 								params={'targetId': browser_session.agent_focus.target_id}
 							)
 						else:
-							await browser_session.get_or_create_cdp_session(target_id=None, new_socket=True, focus=True)
+							await browser_session.get_or_create_cdp_session(target_id=None, focus=True)
 					except Exception as sub_error:
 						if 'ConnectionClosedError' in str(type(sub_error)) or 'ConnectionError' in str(type(sub_error)):
 							browser_session.logger.error(
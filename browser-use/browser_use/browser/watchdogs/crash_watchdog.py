@@ -1,11 +1,12 @@
-"""Browser watchdog for monitoring crashes and network timeouts using CDP."""
+"""Browser watchdog for monitoring crashes and disconnects using CDP."""
 
 import asyncio
-import time
-from typing import TYPE_CHECKING, ClassVar
+import os
+from typing import TYPE_CHECKING, Any, ClassVar
 
-import psutil
 from bubus import BaseEvent
+from cdp_use import CDPClient
+from cdp_use.cdp.inspector.events import TargetCrashedEvent as InspectorTargetCrashedEvent
 from cdp_use.cdp.target import SessionID, TargetID
 from cdp_use.cdp.target.events import TargetCrashedEvent
 from pydantic import Field, PrivateAttr
@@ -13,161 +14,214 @@ from pydantic import Field, PrivateAttr
 from browser_use.browser.events import (
 	BrowserConnectedEvent,
 	BrowserErrorEvent,
+	BrowserStopEvent,
 	BrowserStoppedEvent,
+	TabClosedEvent,
 	TabCreatedEvent,
 )
+from browser_use.browser.session import MultiplexedCDPClient
 from browser_use.browser.watchdog_base import BaseWatchdog
 
 if TYPE_CHECKING:
 	pass
 
 
-class NetworkRequestTracker:
-	"""Tracks ongoing network requests."""
-
-	def __init__(self, request_id: str, start_time: float, url: str, method: str, resource_type: str | None = None):
-		self.request_id = request_id
-		self.start_time = start_time
-		self.url = url
-		self.method = method
-		self.resource_type = resource_type
-
-
 class CrashWatchdog(BaseWatchdog):
-	"""Monitors browser health for crashes and network timeouts using CDP."""
+	"""Monitors browser health for crashes, disconnects and unresponsive tabs using CDP.
+
+	Nothing is polled, so a healthy idle browser costs no CDP traffic or CPU:
+	- crashed tabs are reported by Target.targetCrashed / Inspector.targetCrashed
+	- tabs that disappear under the agent are reported by Target.targetDestroyed (forwarded by BrowserSession)
+	- a dead browser shows up as the CDP WebSocket closing or the local browser process exiting (pidfd)
+	- a tab is only probed with Runtime.evaluate once one of its commands is unanswered for command_timeout_seconds
+	"""
 
 	# Event contracts
 	LISTENS_TO: ClassVar[list[type[BaseEvent]]] = [
 		BrowserConnectedEvent,
+		BrowserStopEvent,
 		BrowserStoppedEvent,
 		TabCreatedEvent,
 	]
-	EMITS: ClassVar[list[type[BaseEvent]]] = [BrowserErrorEvent]
+	EMITS: ClassVar[list[type[BaseEvent]]] = [BrowserErrorEvent, TabClosedEvent]
 
 	# Configuration
-	network_timeout_seconds: float = Field(default=10.0)
-	check_interval_seconds: float = Field(default=5.0)  # Reduced frequency to reduce noise
+	command_timeout_seconds: float = Field(default=10.0)  # CDP commands unanswered this long trigger a health probe
+	probe_timeout_seconds: float = Field(default=1.0)  # how long the health probe itself may take
 
 	# Private state
-	_active_requests: dict[str, NetworkRequestTracker] = PrivateAttr(default_factory=dict)
-	_monitoring_task: asyncio.Task | None = PrivateAttr(default=None)
-	_last_responsive_checks: dict[str, float] = PrivateAttr(default_factory=dict)  # target_url -> timestamp
 	_cdp_event_tasks: set[asyncio.Task] = PrivateAttr(default_factory=set)  # Track CDP event handler tasks
-	_sessions_with_listeners: set[str] = PrivateAttr(default_factory=set)  # Track sessions that already have event listeners
+	_clients_with_listeners: set[int] = PrivateAttr(default_factory=set)  # id() of CDP clients with crash handlers
+	_monitored_client: MultiplexedCDPClient | None = PrivateAttr(default=None)
+	_monitoring: bool = PrivateAttr(default=False)  # False when stopped on purpose or after reporting the browser dead
+	_crashed_targets: set[str] = PrivateAttr(default_factory=set)  # crashes already handled, both crash events fire
+	_probing: set[str] = PrivateAttr(default_factory=set)  # session ids with a health probe in flight
+	_process_watcher_fd: int | None = PrivateAttr(default=None)
 
 	async def on_BrowserConnectedEvent(self, event: BrowserConnectedEvent) -> None:
 		"""Start monitoring when browser is connected."""
-		# logger.debug('[CrashWatchdog] Browser connected event received, beginning monitoring')
+		await self._start_monitoring()
 
-		asyncio.create_task(self._start_monitoring())
-		# logger.debug(f'[CrashWatchdog] Monitoring task started: {self._monitoring_task and not self._monitoring_task.done()}')
+	async def on_BrowserStopEvent(self, event: BrowserStopEvent) -> None:
+		"""Stop monitoring before the browser is shut down, so closing it is not reported as a crash."""
+		await self._stop_monitoring()
 
 	async def on_BrowserStoppedEvent(self, event: BrowserStoppedEvent) -> None:
 		"""Stop monitoring when browser stops."""
-		# logger.debug('[CrashWatchdog] Browser stopped, ending monitoring')
 		await self._stop_monitoring()
 
 	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
 		"""Attach to new tab."""
-		assert self.browser_session.agent_focus is not None, 'No current target ID'
-		await self.attach_to_target(self.browser_session.agent_focus.target_id)
+		await self.attach_to_target(event.target_id)
 
 	async def attach_to_target(self, target_id: TargetID) -> None:
-		"""Set up crash monitoring for a specific target using CDP."""
+		"""Set up crash monitoring for a specific target using CDP.
+
+		Tabs multiplexed on the root socket are already covered by the handlers registered in _start_monitoring(),
+		this only registers handlers on tabs that were given their own WebSocket connection.
+		"""
 		try:
 			# Create temporary session for monitoring without switching focus
 			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
+			if self._register_crash_handlers(cdp_session.cdp_client):
+				self.logger.debug(f'[CrashWatchdog] Added target to monitoring: {cdp_session.url}')
+		except Exception as e:
+			self.logger.warning(f'[CrashWatchdog] Failed to attach to target {target_id}: {e}')
 
-			# Check if we already have listeners for this session
-			if cdp_session.session_id in self._sessions_with_listeners:
-				self.logger.debug(f'[CrashWatchdog] Event listeners already exist for session: {cdp_session.session_id}')
-				return
-
-			# Set up network event handlers
-			# def on_request_will_be_sent(event):
-			# 	# Create and track the task
-			# 	task = asyncio.create_task(self._on_request_cdp(event))
-			# 	self._cdp_event_tasks.add(task)
-			# 	# Remove from set when done
-			# 	task.add_done_callback(lambda t: self._cdp_event_tasks.discard(t))
-
-			# def on_response_received(event):
-			# 	self._on_response_cdp(event)
-
-			# def on_loading_failed(event):
-			# 	self._on_request_failed_cdp(event)
+	def _register_crash_handlers(self, cdp_client: CDPClient) -> bool:
+		"""Register the crash event handlers on a CDP client once, returns False if already registered."""
+		if id(cdp_client) in self._clients_with_listeners:
+			return False
+
+		# Sessions share the socket, so these handlers see crashes of every target on it
+		cdp_client.register.Target.targetCrashed(self._on_target_crashed)
+		cdp_client.register.Inspector.targetCrashed(self._on_inspector_target_crashed)
+		self._clients_with_listeners.add(id(cdp_client))
+		return True
+
+	def _on_target_crashed(self, event: TargetCrashedEvent, session_id: SessionID | None = None) -> None:
+		self._create_task(self._on_target_crash_cdp(event['targetId']))
+
+	def _on_inspector_target_crashed(self, event: InspectorTargetCrashedEvent, session_id: SessionID | None = None) -> None:
+		# Inspector events carry no targetId, only the session they were sent on
+		if target_id := self._target_id_for_session(session_id):
+			self._create_task(self._on_target_crash_cdp(target_id))
+
+	def _target_id_for_session(self, session_id: SessionID | None) -> TargetID | None:
+		if not session_id:
+			return None
+		for target_id, cdp_session in self.browser_session._cdp_session_pool.items():
+			if cdp_session.session_id == session_id:
+				return target_id
+		return None
+
+	def _create_task(self, coro: Any) -> None:
+		"""Run a CDP event handler coroutine in a tracked task."""
+		task = asyncio.create_task(coro)
+		self._cdp_event_tasks.add(task)
+		# Remove from set when done
+		task.add_done_callback(lambda t: self._cdp_event_tasks.discard(t))
+
+	def handle_target_destroyed(self, target_id: TargetID) -> None:
+		"""Called by BrowserSession on Target.targetDestroyed, recovers focus if the agent's tab vanished under it."""
+		self._crashed_targets.discard(target_id)
+		if not self._monitoring:
+			return
 
-			# def on_loading_finished(event):
-			# 	self._on_request_finished_cdp(event)
+		# CloseTabEvent moves the focus away before closing, so a focused target being destroyed was not our doing
+		agent_focus = self.browser_session.agent_focus
+		if agent_focus and agent_focus.target_id == target_id:
+			self.logger.warning(f'[CrashWatchdog] Agent tab {target_id[-4:]} was closed unexpectedly, switching to another tab')
+			self.event_bus.dispatch(TabClosedEvent(target_id=target_id))
 
-			# Register event handlers
-			# TEMPORARILY DISABLED: Network events causing too much logging
-			# cdp_client.on('Network.requestWillBeSent', on_request_will_be_sent, session_id=session_id)
-			# cdp_client.on('Network.responseReceived', on_response_received, session_id=session_id)
-			# cdp_client.on('Network.loadingFailed', on_loading_failed, session_id=session_id)
-			# cdp_client.on('Network.loadingFinished', on_loading_finished, session_id=session_id)
+	def _on_cdp_disconnected(self) -> None:
+		"""The root CDP WebSocket closed without being stopped, the browser is gone."""
+		if not self._monitoring:
+			return
+		self._monitoring = False
 
-			def on_target_crashed(event: TargetCrashedEvent, session_id: SessionID | None = None):
-				# Create and track the task
-				task = asyncio.create_task(self._on_target_crash_cdp(target_id))
-				self._cdp_event_tasks.add(task)
-				# Remove from set when done
-				task.add_done_callback(lambda t: self._cdp_event_tasks.discard(t))
+		self.logger.error('[CrashWatchdog] ❌ Browser disconnected unexpectedly, the CDP connection was closed')
+		self.browser_session._cdp_session_pool.clear()
+		self.event_bus.dispatch(
+			BrowserErrorEvent(
+				error_type='BrowserDisconnected',
+				message='Browser disconnected unexpectedly: CDP WebSocket connection closed',
+				details={'cdp_url': self.browser_session.cdp_url},
+			)
+		)
 
-			cdp_session.cdp_client.register.Target.targetCrashed(on_target_crashed)
+	def _on_browser_process_exit(self, pid: int) -> None:
+		"""The local browser process exited while we were still monitoring it."""
+		self._stop_process_watcher()
+		if not self._monitoring:
+			return
+		self._monitoring = False
 
-			# Track that we've added listeners to this session
-			self._sessions_with_listeners.add(cdp_session.session_id)
+		self.logger.error(f'[CrashWatchdog] Browser process {pid} has crashed')
+		# Clear all sessions from pool when browser crashes, their socket is gone with the browser
+		self.browser_session._cdp_session_pool.clear()
+		self.logger.debug('[CrashWatchdog] Cleared all sessions from pool due to browser crash')
 
-			# Get target info for logging
-			targets = await cdp_session.cdp_client.send.Target.getTargets()
-			target_info = next((t for t in targets['targetInfos'] if t['targetId'] == target_id), None)
-			if target_info:
-				self.logger.debug(f'[CrashWatchdog] Added target to monitoring: {target_info.get("url", "unknown")}')
+		self.event_bus.dispatch(
+			BrowserErrorEvent(
+				error_type='BrowserProcessCrashed',
+				message=f'Browser process {pid} has crashed',
+				details={'pid': pid},
+			)
+		)
 
-		except Exception as e:
-			self.logger.warning(f'[CrashWatchdog] Failed to attach to target {target_id}: {e}')
+	def _on_slow_command(self, method: str, session_id: str | None) -> None:
+		"""A CDP command is unanswered after command_timeout_seconds, check whether its tab is still alive."""
+		key = session_id or ''
+		if not self._monitoring or key in self._probing:
+			return
+		self._probing.add(key)
+		self._create_task(self._probe_session(method, session_id))
 
-	async def _on_request_cdp(self, event: dict) -> None:
-		"""Track new network request from CDP event."""
-		request_id = event.get('requestId', '')
-		request = event.get('request', {})
-
-		self._active_requests[request_id] = NetworkRequestTracker(
-			request_id=request_id,
-			start_time=time.time(),
-			url=request.get('url', ''),
-			method=request.get('method', ''),
-			resource_type=event.get('type'),
-		)
-		# logger.debug(f'[CrashWatchdog] Tracking request: {request.get("method", "")} {request.get("url", "")[:50]}...')
-
-	def _on_response_cdp(self, event: dict) -> None:
-		"""Remove request from tracking on response."""
-		request_id = event.get('requestId', '')
-		if request_id in self._active_requests:
-			elapsed = time.time() - self._active_requests[request_id].start_time
-			response = event.get('response', {})
-			self.logger.debug(f'[CrashWatchdog] Request completed in {elapsed:.2f}s: {response.get("url", "")[:50]}...')
-			# Don't remove yet - wait for loadingFinished
-
-	def _on_request_failed_cdp(self, event: dict) -> None:
-		"""Remove request from tracking on failure."""
-		request_id = event.get('requestId', '')
-		if request_id in self._active_requests:
-			elapsed = time.time() - self._active_requests[request_id].start_time
+	async def _probe_session(self, method: str, session_id: str | None) -> None:
+		"""Actively check that a session (or the browser itself, for browser-level commands) still responds."""
+		try:
+			cdp_client = self._monitored_client
+			if cdp_client is None:
+				return
+			target_id = self._target_id_for_session(session_id)
 			self.logger.debug(
-				f'[CrashWatchdog] Request failed after {elapsed:.2f}s: {self._active_requests[request_id].url[:50]}...'
+				f'[CrashWatchdog] {method} unanswered after {self.command_timeout_seconds}s, probing '
+				f'{f"target {target_id}" if target_id else "browser"}'
 			)
-			del self._active_requests[request_id]
-
-	def _on_request_finished_cdp(self, event: dict) -> None:
-		"""Remove request from tracking when loading is finished."""
-		request_id = event.get('requestId', '')
-		self._active_requests.pop(request_id, None)
+			try:
+				if session_id:
+					probe = cdp_client.send.Runtime.evaluate(params={'expression': '1+1'}, session_id=session_id)
+				else:
+					probe = cdp_client.send.Browser.getVersion()
+				await asyncio.wait_for(probe, timeout=self.probe_timeout_seconds)
+			except Exception as e:
+				if not self._monitoring:
+					return
+				self.logger.error(
+					f'[CrashWatchdog] ❌ Unresponsive {f"target {target_id}" if target_id else "browser"} detected '
+					f'after {method} timed out: {type(e).__name__}: {e}'
+				)
+				if session_id and not target_id:
+					return  # session is no longer pooled, its target went away in the meantime
+				# Only reported: a tab busy with a heavy command (e.g. a huge DOM snapshot) can fail the probe and recover,
+				# real crashes and closed tabs are handled by the crash and targetDestroyed events
+				self.event_bus.dispatch(
+					BrowserErrorEvent(
+						error_type='TargetUnresponsive' if target_id else 'BrowserUnresponsive',
+						message=f'{"Target" if target_id else "Browser"} did not respond after {method} timed out',
+						details={'target_id': target_id, 'method': method, 'timeout_seconds': self.command_timeout_seconds},
+					)
+				)
+		finally:
+			self._probing.discard(session_id or '')
 
 	async def _on_target_crash_cdp(self, target_id: TargetID) -> None:
 		"""Handle target crash detected via CDP."""
+		if target_id in self._crashed_targets:
+			return
+		self._crashed_targets.add(target_id)
+
 		# Remove crashed session from pool
 		if session := self.browser_session._cdp_session_pool.pop(target_id, None):
 			await session.disconnect()
@@ -201,25 +255,34 @@ class CrashWatchdog(BaseWatchdog):
 		)
 
 	async def _start_monitoring(self) -> None:
-		"""Start the monitoring loop."""
+		"""Hook into the CDP connection and the browser process, nothing runs until one of them reports a problem."""
 		assert self.browser_session.cdp_client is not None, 'Root CDP client not initialized - browser may not be connected yet'
 
-		if self._monitoring_task and not self._monitoring_task.done():
-			# logger.info('[CrashWatchdog] Monitoring already running')
+		if self._monitoring:
 			return
+		self._monitoring = True
 
-		self._monitoring_task = asyncio.create_task(self._monitoring_loop())
-		# logger.debug('[CrashWatchdog] Monitoring loop created and started')
+		cdp_client = self.browser_session.cdp_client
+		self._register_crash_handlers(cdp_client)
+		if isinstance(cdp_client, MultiplexedCDPClient):
+			cdp_client.slow_command_timeout = self.command_timeout_seconds
+			cdp_client.disconnect_callbacks.append(self._on_cdp_disconnected)
+			cdp_client.slow_command_callbacks.append(self._on_slow_command)
+			self._monitored_client = cdp_client
+
+		self._start_process_watcher()
 
 	async def _stop_monitoring(self) -> None:
-		"""Stop the monitoring loop."""
-		if self._monitoring_task and not self._monitoring_task.done():
-			self._monitoring_task.cancel()
-			try:
-				await self._monitoring_task
-			except asyncio.CancelledError:
-				pass
-			self.logger.debug('[CrashWatchdog] Monitoring loop stopped')
+		"""Unhook from the CDP connection and browser process and cancel in-flight handlers."""
+		self._monitoring = False
+
+		if cdp_client := self._monitored_client:
+			if self._on_cdp_disconnected in cdp_client.disconnect_callbacks:
+				cdp_client.disconnect_callbacks.remove(self._on_cdp_disconnected)
+			if self._on_slow_command in cdp_client.slow_command_callbacks:
+				cdp_client.slow_command_callbacks.remove(self._on_slow_command)
+			self._monitored_client = None
+		self._stop_process_watcher()
 
 		# Cancel all CDP event handler tasks
 		for task in list(self._cdp_event_tasks):
@@ -231,132 +294,34 @@ class CrashWatchdog(BaseWatchdog):
 		self._cdp_event_tasks.clear()
 
 		# Clear tracking (CDP sessions are cached and managed by BrowserSession)
-		self._active_requests.clear()
-		self._sessions_with_listeners.clear()
-
-	async def _monitoring_loop(self) -> None:
-		"""Main monitoring loop."""
-		await asyncio.sleep(10)  # give browser time to start up and load the first page after first LLM call
-		while True:
-			try:
-				await self._check_network_timeouts()
-				await self._check_browser_health()
-				await asyncio.sleep(self.check_interval_seconds)
-			except asyncio.CancelledError:
-				break
-			except Exception as e:
-				self.logger.error(f'[CrashWatchdog] Error in monitoring loop: {e}')
-
-	async def _check_network_timeouts(self) -> None:
-		"""Check for network requests exceeding timeout."""
-		current_time = time.time()
-		timed_out_requests = []
-
-		# Debug logging
-		if self._active_requests:
-			self.logger.debug(
-				f'[CrashWatchdog] Checking {len(self._active_requests)} active requests for timeouts (threshold: {self.network_timeout_seconds}s)'
-			)
-
-		for request_id, tracker in self._active_requests.items():
-			elapsed = current_time - tracker.start_time
-			self.logger.debug(
-				f'[CrashWatchdog] Request {tracker.url[:30]}... elapsed: {elapsed:.1f}s, timeout: {self.network_timeout_seconds}s'
-			)
-			if elapsed >= self.network_timeout_seconds:
-				timed_out_requests.append((request_id, tracker))
-
-		# Emit events for timed out requests
-		for request_id, tracker in timed_out_requests:
-			self.logger.warning(
-				f'[CrashWatchdog] Network request timeout after {self.network_timeout_seconds}s: '
-				f'{tracker.method} {tracker.url[:100]}...'
-			)
-
-			self.event_bus.dispatch(
-				BrowserErrorEvent(
-					error_type='NetworkTimeout',
-					message=f'Network request timed out after {self.network_timeout_seconds}s',
-					details={
-						'url': tracker.url,
-						'method': tracker.method,
-						'resource_type': tracker.resource_type,
-						'elapsed_seconds': current_time - tracker.start_time,
-					},
-				)
-			)
-
-			# Remove from tracking
-			del self._active_requests[request_id]
-
-	async def _check_browser_health(self) -> None:
-		"""Check if browser and targets are still responsive."""
+		self._clients_with_listeners.clear()
+		self._crashed_targets.clear()
+		self._probing.clear()
+
+	def _start_process_watcher(self) -> None:
+		"""Get notified by the event loop when the local browser process exits.
+
+		Uses a pidfd, which becomes readable when the process exits, so waiting costs no thread and no polling.
+		Where pidfds are unavailable (non-Linux), a dead local browser is still detected by its CDP socket closing.
+		"""
+		local_browser_watchdog = self.browser_session._local_browser_watchdog
+		process = local_browser_watchdog._subprocess if local_browser_watchdog else None
+		if process is None or self._process_watcher_fd is not None or not hasattr(os, 'pidfd_open'):
+			return
 
 		try:
-			try:
-				self.logger.debug(f'[CrashWatchdog] Checking browser health for target {self.browser_session.agent_focus}')
-				cdp_session = await self.browser_session.get_or_create_cdp_session()
-			except Exception as e:
-				self.logger.debug(
-					f'[CrashWatchdog] Checking browser health for target {self.browser_session.agent_focus} error: {type(e).__name__}: {e}'
-				)
-				self.agent_focus = cdp_session = await self.browser_session.get_or_create_cdp_session(
-					target_id=self.agent_focus.target_id, new_socket=True, focus=True
-				)
-
-			for target in (await self.browser_session.cdp_client.send.Target.getTargets()).get('targetInfos', []):
-				if target.get('type') == 'page':
-					cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target.get('targetId'))
-					if self._is_new_tab_page(target.get('url')) and target.get('url') != 'about:blank':
-						self.logger.debug(
-							f'[CrashWatchdog] Redirecting chrome://new-tab-page/ to about:blank {target.get("url")}'
-						)
-						await cdp_session.cdp_client.send.Page.navigate(
-							params={'url': 'about:blank'}, session_id=cdp_session.session_id
-						)
-
-			# Quick ping to check if session is alive
-			self.logger.debug(f'[CrashWatchdog] Attempting to run simple JS test expression in session {cdp_session} 1+1')
-			await asyncio.wait_for(
-				cdp_session.cdp_client.send.Runtime.evaluate(params={'expression': '1+1'}, session_id=cdp_session.session_id),
-				timeout=1.0,
-			)
-			self.logger.debug(f'[CrashWatchdog] Browser health check passed for target {self.browser_session.agent_focus}')
-		except Exception as e:
-			self.logger.error(
-				f'[CrashWatchdog] ❌ Crashed session detected for target {self.browser_session.agent_focus} error: {type(e).__name__}: {e}'
-			)
-			# Remove crashed session from pool
-			if self.browser_session.agent_focus and (target_id := self.browser_session.agent_focus.target_id):
-				if session := self.browser_session._cdp_session_pool.pop(target_id, None):
-					await session.disconnect()
-					self.logger.debug(f'[CrashWatchdog] Removed crashed session from pool: {target_id}')
-			self.browser_session.agent_focus.target_id = None  # type: ignore
-
-		# Check browser process if we have PID
-		if self.browser_session._local_browser_watchdog and (proc := self.browser_session._local_browser_watchdog._subprocess):
-			try:
-				if proc.status() in (psutil.STATUS_ZOMBIE, psutil.STATUS_DEAD):
-					self.logger.error(f'[CrashWatchdog] Browser process {proc.pid} has crashed')
-					# Clear all sessions from pool when browser crashes
-					for session in self.browser_session._cdp_session_pool.values():
-						await session.disconnect()
-					self.browser_session._cdp_session_pool.clear()
-					self.logger.debug('[CrashWatchdog] Cleared all sessions from pool due to browser crash')
-
-					self.event_bus.dispatch(
-						BrowserErrorEvent(
-							error_type='BrowserProcessCrashed',
-							message=f'Browser process {proc.pid} has crashed',
-							details={'pid': proc.pid, 'status': proc.status()},
-						)
-					)
-					await self._stop_monitoring()
-					return
-			except Exception:
-				pass  # psutil not available or process doesn't exist
-
-	@staticmethod
-	def _is_new_tab_page(url: str) -> bool:
-		"""Check if URL is a new tab page."""
-		return url in ['about:blank', 'chrome://new-tab-page/', 'chrome://newtab/']
+			self._process_watcher_fd = os.pidfd_open(process.pid)
+			asyncio.get_running_loop().add_reader(self._process_watcher_fd, self._on_browser_process_exit, process.pid)
+		except (OSError, NotImplementedError) as e:
+			self.logger.debug(f'[CrashWatchdog] Not watching browser process {process.pid}: {type(e).__name__}: {e}')
+			self._stop_process_watcher()
+
+	def _stop_process_watcher(self) -> None:
+		if self._process_watcher_fd is None:
+			return
+		try:
+			asyncio.get_running_loop().remove_reader(self._process_watcher_fd)
+		except (RuntimeError, NotImplementedError):
+			pass
+		os.close(self._process_watcher_fd)
+		self._process_watcher_fd = None
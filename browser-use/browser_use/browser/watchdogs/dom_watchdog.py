@@ -2,6 +2,7 @@
 
 import asyncio
 import time
+from itertools import islice
 from typing import TYPE_CHECKING
 
 from browser_use.browser.events import (
@@ -58,14 +59,12 @@ class DOMWatchdog(BaseWatchdog):
 		import json
 
 		try:
-			# Get all events from history, sorted by creation time (most recent first)
-			all_events = sorted(
-				self.browser_session.event_bus.event_history.values(), key=lambda e: e.event_created_at.timestamp(), reverse=True
-			)
+			# The history is in dispatch order, the most recent events are at its end
+			recent_events = islice(reversed(self.browser_session.event_bus.event_history.values()), limit)
 
-			# Take the most recent events and create JSON-serializable data
+			# Create JSON-serializable data
 			recent_events_data = []
-			for event in all_events[:limit]:
+			for event in recent_events:
 				event_data = {
 					'event_type': event.event_type,
 					'timestamp': event.event_created_at.isoformat(),
@@ -347,7 +346,7 @@ class DOMWatchdog(BaseWatchdog):
 				recent_events=None,
 			)
 
-	@time_execution_async('build_dom_tree_without_highlights')
+	@time_execution_async('build_dom_tree_without_highlights', category='dom')
 	@observe_debug(ignore_input=True, ignore_output=True, name='build_dom_tree_without_highlights')
 	async def _build_dom_tree_without_highlights(self, previous_state: SerializedDOMState | None = None) -> SerializedDOMState:
 		"""Build DOM tree without injecting JavaScript highlights (for parallel execution)."""
@@ -403,7 +402,7 @@ class DOMWatchdog(BaseWatchdog):
 			)
 			raise
 
-	@time_execution_async('capture_clean_screenshot')
+	@time_execution_async('capture_clean_screenshot', category='screenshot')
 	@observe_debug(ignore_input=True, ignore_output=True, name='capture_clean_screenshot')
 	async def _capture_clean_screenshot(self) -> str:
 		"""Capture a clean screenshot without JavaScript highlights."""
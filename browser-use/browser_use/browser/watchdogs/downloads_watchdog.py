@@ -10,7 +10,7 @@ from urllib.parse import urlparse
 
 import anyio
 from bubus import BaseEvent
-from cdp_use.cdp.browser import DownloadProgressEvent, DownloadWillBeginEvent
+from cdp_use.cdp.browser import DownloadProgressEvent, DownloadWillBeginEvent, SetDownloadBehaviorParameters
 from cdp_use.cdp.target import SessionID, TargetID
 from pydantic import PrivateAttr
 
@@ -249,13 +249,15 @@ class DownloadsWatchdog(BaseWatchdog):
 					return
 				# Ensure path is properly expanded (~ -> absolute path)
 				expanded_downloads_path = Path(downloads_path).expanduser().resolve()
-				await cdp_client.send.Browser.setDownloadBehavior(
-					params={
-						'behavior': 'allow',
-						'downloadPath': str(expanded_downloads_path),  # Use expanded absolute path
-						'eventsEnabled': True,
-					}
-				)
+				download_behavior: SetDownloadBehaviorParameters = {
+					'behavior': 'allow',
+					'downloadPath': str(expanded_downloads_path),  # Use expanded absolute path
+					'eventsEnabled': True,
+				}
+				if self.browser_session.browser_context_id:
+					# only the downloads of this session's browser context
+					download_behavior['browserContextId'] = self.browser_session.browser_context_id
+				await cdp_client.send.Browser.setDownloadBehavior(params=download_behavior)
 
 				# Register the handlers with CDP
 				cdp_client.register.Browser.downloadWillBegin(download_will_begin_handler)  # type: ignore[arg-type]
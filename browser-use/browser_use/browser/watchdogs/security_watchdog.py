@@ -1,8 +1,9 @@
 """Security watchdog for enforcing URL access policies."""
 
-from typing import TYPE_CHECKING, ClassVar
+from typing import TYPE_CHECKING, ClassVar, NamedTuple
 
 from bubus import BaseEvent
+from pydantic import PrivateAttr
 
 from browser_use.browser.events import (
 	BrowserErrorEvent,
@@ -11,6 +12,7 @@ from browser_use.browser.events import (
 	TabCreatedEvent,
 )
 from browser_use.browser.watchdog_base import BaseWatchdog
+from browser_use.utils import DomainSuffixTrie
 
 if TYPE_CHECKING:
 	pass
@@ -19,6 +21,15 @@ if TYPE_CHECKING:
 _GLOB_WARNING_SHOWN = False
 
 
+class _CompiledDomainPatterns(NamedTuple):
+	"""A domain pattern list split by how each pattern is matched, so most lookups avoid a per-pattern scan."""
+
+	exact_hosts: frozenset[str]  # lowercased domain-only patterns, plus www. for root domains
+	parent_domains: DomainSuffixTrie  # *.example.com patterns, keyed by example.com
+	other_patterns: tuple[str, ...]  # full URL patterns and remaining globs, checked one by one
+	has_globs: bool
+
+
 class SecurityWatchdog(BaseWatchdog):
 	"""Monitors and enforces security policies for URL access."""
 
@@ -32,6 +43,8 @@ class SecurityWatchdog(BaseWatchdog):
 		BrowserErrorEvent,
 	]
 
+	_compiled_patterns: dict[tuple[str, ...], _CompiledDomainPatterns] = PrivateAttr(default_factory=dict)
+
 	async def on_NavigateToUrlEvent(self, event: NavigateToUrlEvent) -> None:
 		"""Check if navigation URL is allowed before navigation starts."""
 		# Security check BEFORE navigation
@@ -153,24 +166,59 @@ class SecurityWatchdog(BaseWatchdog):
 		if not host:
 			return False
 
-		# Check each allowed domain pattern
+		# Check the allowed domain patterns
 		if self.browser_session.browser_profile.allowed_domains:
-			for pattern in self.browser_session.browser_profile.allowed_domains:
-				if self._is_url_match(url, host, parsed.scheme, pattern):
-					return True
+			return self._matches_any_pattern(url, host, parsed.scheme, self.browser_session.browser_profile.allowed_domains)
 
-			return False
-
-		# Check each prohibited domain pattern
+		# Check the prohibited domain patterns
 		if self.browser_session.browser_profile.prohibited_domains:
-			for pattern in self.browser_session.browser_profile.prohibited_domains:
-				if self._is_url_match(url, host, parsed.scheme, pattern):
-					return False
-
-			return True
+			return not self._matches_any_pattern(
+				url, host, parsed.scheme, self.browser_session.browser_profile.prohibited_domains
+			)
 
 		return True
 
+	def _compile_patterns(self, patterns: tuple[str, ...]) -> _CompiledDomainPatterns:
+		"""Sort patterns into exact hosts, parent domains and the rest, cached per pattern list."""
+		compiled = self._compiled_patterns.get(patterns)
+		if compiled is not None:
+			return compiled
+
+		exact_hosts: set[str] = set()
+		parent_domains = DomainSuffixTrie()
+		other_patterns: list[str] = []
+		for pattern in patterns:
+			if pattern.startswith('*.'):
+				parent_domains.add(pattern[2:], pattern)
+			elif '*' in pattern or '://' in pattern:
+				other_patterns.append(pattern)
+			else:
+				exact_hosts.add(pattern.lower())
+				if self._is_root_domain(pattern):
+					exact_hosts.add(f'www.{pattern.lower()}')
+
+		compiled = _CompiledDomainPatterns(
+			exact_hosts=frozenset(exact_hosts),
+			parent_domains=parent_domains,
+			other_patterns=tuple(other_patterns),
+			has_globs=any('*' in pattern for pattern in patterns),
+		)
+		self._compiled_patterns[patterns] = compiled
+		return compiled
+
+	def _matches_any_pattern(self, url: str, host: str, scheme: str, patterns: list[str] | tuple[str, ...]) -> bool:
+		"""Check if a URL matches any of the patterns, same result as calling _is_url_match() on each one."""
+		compiled = self._compile_patterns(tuple(patterns))
+		if compiled.has_globs:
+			self._log_glob_warning()
+
+		if host.lower() in compiled.exact_hosts:
+			return True
+		# Only match http/https URLs for domain-only patterns
+		if scheme in ('http', 'https') and compiled.parent_domains.find(host):
+			return True
+		return any(self._is_url_match(url, host, scheme, pattern) for pattern in compiled.other_patterns)
+
 	def _is_url_match(self, url: str, host: str, scheme: str, pattern: str) -> bool:
 		"""Check if a URL matches a pattern."""
 
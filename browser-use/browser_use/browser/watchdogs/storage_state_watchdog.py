@@ -3,11 +3,15 @@
 import asyncio
 import json
 import os
+import shutil
+import time
 from pathlib import Path
 from typing import Any, ClassVar
 
 from bubus import BaseEvent
 from cdp_use.cdp.network import Cookie
+from cdp_use.cdp.network.events import ResponseReceivedExtraInfoEvent
+from cdp_use.cdp.target import SessionID, TargetID
 from pydantic import Field, PrivateAttr
 
 from browser_use.browser.events import (
@@ -17,12 +21,17 @@ from browser_use.browser.events import (
 	SaveStorageStateEvent,
 	StorageStateLoadedEvent,
 	StorageStateSavedEvent,
+	TabCreatedEvent,
 )
 from browser_use.browser.watchdog_base import BaseWatchdog
 
 
 class StorageStateWatchdog(BaseWatchdog):
-	"""Monitors and persists browser storage state including cookies and localStorage."""
+	"""Monitors and persists browser storage state including cookies and localStorage.
+
+	Changes are detected from CDP events (Set-Cookie response headers and DOMStorage mutations) instead of polling,
+	and saved after a debounce so an idle browser costs nothing and a busy one doesn't rewrite the file on every change.
+	"""
 
 	# Event contracts
 	LISTENS_TO: ClassVar[list[type[BaseEvent]]] = [
@@ -30,6 +39,7 @@ class StorageStateWatchdog(BaseWatchdog):
 		BrowserStopEvent,
 		SaveStorageStateEvent,
 		LoadStorageStateEvent,
+		TabCreatedEvent,
 	]
 	EMITS: ClassVar[list[type[BaseEvent]]] = [
 		StorageStateSavedEvent,
@@ -37,13 +47,20 @@ class StorageStateWatchdog(BaseWatchdog):
 	]
 
 	# Configuration
-	auto_save_interval: float = Field(default=30.0)  # Auto-save every 30 seconds
-	save_on_change: bool = Field(default=True)  # Save immediately when cookies change
+	auto_save_interval: float = Field(default=30.0)  # Longest a detected change waits before it is saved
+	save_on_change: bool = Field(default=True)  # Save shortly after changes settle instead of waiting auto_save_interval
+	save_debounce: float = Field(default=1.0)  # Quiet period after the last change before saving when save_on_change is set
 
 	# Private state
-	_monitoring_task: asyncio.Task | None = PrivateAttr(default=None)
-	_last_cookie_state: list[dict] = PrivateAttr(default_factory=list)
 	_save_lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
+	_flush_task: asyncio.Task | None = PrivateAttr(default=None)
+	_changes: set[str] = PrivateAttr(default_factory=set)  # what changed since the last save: 'cookies' / 'origins'
+	_first_change_at: float | None = PrivateAttr(default=None)
+	_last_change_at: float = PrivateAttr(default=0.0)
+	_clients_with_listeners: set[int] = PrivateAttr(default_factory=set)  # id() of CDP clients with our handlers
+	_sessions_with_listeners: set[str] = PrivateAttr(default_factory=set)  # CDP sessions with Network/DOMStorage enabled
+	_saved_state: dict[str, Any] | None = PrivateAttr(default=None)  # contents of the state file as last read or written
+	_saved_state_mtime_ns: int | None = PrivateAttr(default=None)
 
 	async def on_BrowserConnectedEvent(self, event: BrowserConnectedEvent) -> None:
 		"""Start monitoring when browser starts."""
@@ -60,6 +77,11 @@ class StorageStateWatchdog(BaseWatchdog):
 		self.logger.debug('[StorageStateWatchdog] Stopping storage_state monitoring')
 		await self._stop_monitoring()
 
+	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
+		"""Watch the new tab for cookie and storage changes."""
+		if self._state_file_path():
+			await self._watch_target(event.target_id)
+
 	async def on_SaveStorageStateEvent(self, event: SaveStorageStateEvent) -> None:
 		"""Handle storage state save request."""
 		# Use provided path or fall back to profile default
@@ -84,82 +106,102 @@ class StorageStateWatchdog(BaseWatchdog):
 				path = None  # Skip loading if no path available
 		await self._load_storage_state(path)
 
-	async def _start_monitoring(self) -> None:
-		"""Start the monitoring task."""
-		if self._monitoring_task and not self._monitoring_task.done():
-			return
+	def _state_file_path(self) -> str | None:
+		"""The storage_state file this watchdog keeps in sync, None if storage state is not persisted to a file."""
+		storage_state = self.browser_session.browser_profile.storage_state
+		if not storage_state or isinstance(storage_state, dict):
+			return None
+		return str(storage_state)
 
+	async def _start_monitoring(self) -> None:
+		"""Start listening for cookie and storage changes on the open tabs."""
 		assert self.browser_session.cdp_client is not None
 
-		self._monitoring_task = asyncio.create_task(self._monitor_storage_changes())
-		# self.logger'[StorageStateWatchdog] Started storage monitoring task')
+		# Nothing to keep in sync, don't pay for Network/DOMStorage events
+		if not self._state_file_path():
+			return
+
+		for target in await self.browser_session._cdp_get_all_pages():
+			await self._watch_target(target['targetId'])
 
 	async def _stop_monitoring(self) -> None:
-		"""Stop the monitoring task."""
-		if self._monitoring_task and not self._monitoring_task.done():
-			self._monitoring_task.cancel()
+		"""Stop the pending debounced save, the final save is done by the SaveStorageStateEvent sent before stopping."""
+		if self._flush_task and not self._flush_task.done():
+			self._flush_task.cancel()
 			try:
-				await self._monitoring_task
+				await self._flush_task
 			except asyncio.CancelledError:
 				pass
-			# self.logger.debug('[StorageStateWatchdog] Stopped storage monitoring task')
+		self._flush_task = None
+		self._clients_with_listeners.clear()
+		self._sessions_with_listeners.clear()
 
-	async def _check_for_cookie_changes_cdp(self, event: dict) -> None:
-		"""Check if a CDP network event indicates cookie changes.
-
-		This would be called by Network.responseReceivedExtraInfo events
-		if we set up CDP event listeners.
-		"""
+	async def _watch_target(self, target_id: TargetID) -> None:
+		"""Enable the CDP events that signal cookie and localStorage changes for a target."""
 		try:
-			# Check for Set-Cookie headers in the response
-			headers = event.get('headers', {})
-			if 'set-cookie' in headers or 'Set-Cookie' in headers:
-				self.logger.debug('[StorageStateWatchdog] Cookie change detected via CDP')
-
-				# If save on change is enabled, trigger save immediately
-				if self.save_on_change:
-					await self._save_storage_state()
-		except Exception as e:
-			self.logger.warning(f'[StorageStateWatchdog] Error checking for cookie changes: {e}')
-
-	async def _monitor_storage_changes(self) -> None:
-		"""Periodically check for storage changes and auto-save."""
-		while True:
-			try:
-				await asyncio.sleep(self.auto_save_interval)
-
-				# Check if cookies have changed
-				if await self._have_cookies_changed():
-					self.logger.debug('[StorageStateWatchdog] Detected changes to sync with storage_state.json')
-					await self._save_storage_state()
-
-			except asyncio.CancelledError:
-				break
-			except Exception as e:
-				self.logger.error(f'[StorageStateWatchdog] Error in monitoring loop: {e}')
-
-	async def _have_cookies_changed(self) -> bool:
-		"""Check if cookies have changed since last save."""
-		if not self.browser_session.cdp_client:
-			return False
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
+			if cdp_session.session_id in self._sessions_with_listeners:
+				return
 
+			# Handlers are registered once per socket, sessions sharing the root socket all report to the same handler
+			if id(cdp_session.cdp_client) not in self._clients_with_listeners:
+				cdp_client = cdp_session.cdp_client
+				cdp_client.register.Network.responseReceivedExtraInfo(self._on_response_extra_info)  # type: ignore[arg-type]
+				cdp_client.register.DOMStorage.domStorageItemAdded(self._on_dom_storage_changed)  # type: ignore[arg-type]
+				cdp_client.register.DOMStorage.domStorageItemUpdated(self._on_dom_storage_changed)  # type: ignore[arg-type]
+				cdp_client.register.DOMStorage.domStorageItemRemoved(self._on_dom_storage_changed)  # type: ignore[arg-type]
+				cdp_client.register.DOMStorage.domStorageItemsCleared(self._on_dom_storage_changed)  # type: ignore[arg-type]
+				self._clients_with_listeners.add(id(cdp_client))
+
+			await asyncio.gather(
+				cdp_session.cdp_client.send.Network.enable(session_id=cdp_session.session_id),
+				cdp_session.cdp_client.send.DOMStorage.enable(session_id=cdp_session.session_id),
+			)
+			self._sessions_with_listeners.add(cdp_session.session_id)
+		except Exception as e:
+			self.logger.debug(f'[StorageStateWatchdog] Failed to watch target {target_id} for storage changes: {e}')
+
+	def _on_response_extra_info(self, event: ResponseReceivedExtraInfoEvent, session_id: SessionID | None = None) -> None:
+		"""Mark cookies as changed when a response sets any."""
+		if any(name.lower() == 'set-cookie' for name in event.get('headers', {})):
+			self._mark_changed('cookies')
+
+	def _on_dom_storage_changed(self, event: dict[str, Any], session_id: SessionID | None = None) -> None:
+		"""Mark origins as changed on any localStorage/sessionStorage mutation."""
+		self._mark_changed('origins')
+
+	def _mark_changed(self, kind: str) -> None:
+		"""Record a storage change and make sure a debounced save is scheduled."""
+		now = time.monotonic()
+		self._changes.add(kind)
+		self._last_change_at = now
+		if self._first_change_at is None:
+			self._first_change_at = now
+		if self._flush_task is None or self._flush_task.done():
+			self._flush_task = asyncio.create_task(self._flush_after_debounce())
+
+	async def _flush_after_debounce(self) -> None:
+		"""Save once changes have been quiet for the debounce period, or auto_save_interval after the first change."""
+		debounce = self.save_debounce if self.save_on_change else self.auto_save_interval
 		try:
-			# Get current cookies using CDP
-			current_cookies = await self.browser_session._cdp_get_cookies()
-
-			# Convert to comparable format, using .get() for optional fields
-			current_cookie_set = {
-				(c.get('name', ''), c.get('domain', ''), c.get('path', '')): c.get('value', '') for c in current_cookies
-			}
+			# Changes arriving while saving set _first_change_at again and are picked up by another round
+			while self._first_change_at is not None:
+				now = time.monotonic()
+				due_at = min(self._last_change_at + debounce, self._first_change_at + self.auto_save_interval)
+				if now < due_at:
+					await asyncio.sleep(due_at - now)
+					continue
 
-			last_cookie_set = {
-				(c.get('name', ''), c.get('domain', ''), c.get('path', '')): c.get('value', '') for c in self._last_cookie_state
-			}
-
-			return current_cookie_set != last_cookie_set
+				self.logger.debug(
+					f'[StorageStateWatchdog] Detected {"/".join(sorted(self._changes))} changes to sync with storage_state.json'
+				)
+				self._changes.clear()
+				self._first_change_at = None
+				await self._save_storage_state()
+		except asyncio.CancelledError:
+			raise
 		except Exception as e:
-			self.logger.debug(f'[StorageStateWatchdog] Error comparing cookies: {e}')
-			return False
+			self.logger.error(f'[StorageStateWatchdog] Error in debounced save: {e}')
 
 	async def _save_storage_state(self, path: str | None = None) -> None:
 		"""Save browser storage state to file."""
@@ -178,36 +220,31 @@ class StorageStateWatchdog(BaseWatchdog):
 				return
 
 			try:
-				# Get current storage state using CDP
-				storage_state = await self.browser_session._cdp_get_storage_state()
+				# Changes arriving from here on are not covered by this save and schedule another one
+				self._changes.clear()
+				self._first_change_at = None
 
-				# Update our last known state
-				self._last_cookie_state = storage_state.get('cookies', []).copy()
+				# Get current storage state using CDP, keeping DOMStorage events flowing for the watched tabs
+				storage_state = await self.browser_session._cdp_get_storage_state(
+					keep_dom_storage_enabled=bool(self._sessions_with_listeners)
+				)
 
 				# Convert path to Path object
 				json_path = Path(save_path).expanduser().resolve()
 				json_path.parent.mkdir(parents=True, exist_ok=True)
 
 				# Merge with existing state if file exists
-				merged_state = storage_state
-				if json_path.exists():
-					try:
-						existing_state = json.loads(json_path.read_text())
-						merged_state = self._merge_storage_states(existing_state, dict(storage_state))
-					except Exception as e:
-						self.logger.error(f'[StorageStateWatchdog] Failed to merge with existing state: {e}')
-
-				# Write atomically
-				temp_path = json_path.with_suffix('.json.tmp')
-				temp_path.write_text(json.dumps(merged_state, indent=4))
-
-				# Backup existing file
-				if json_path.exists():
-					backup_path = json_path.with_suffix('.json.bak')
-					json_path.replace(backup_path)
-
-				# Move temp to final
-				temp_path.replace(json_path)
+				existing_state = await asyncio.to_thread(self._read_saved_state, json_path)
+				merged_state = dict(storage_state)
+				if existing_state is not None:
+					merged_state = self._merge_storage_states(existing_state, dict(storage_state))
+
+				diff = self._diff_storage_states(existing_state or {}, merged_state)
+				if existing_state is not None and not any(diff.values()):
+					self.logger.debug(f'[StorageStateWatchdog] Storage state unchanged, not rewriting {json_path}')
+					return
+
+				await asyncio.to_thread(self._write_state_file, json_path, merged_state)
 
 				# Emit success event
 				self.event_bus.dispatch(
@@ -221,12 +258,76 @@ class StorageStateWatchdog(BaseWatchdog):
 				self.logger.debug(
 					f'[StorageStateWatchdog] Saved storage state to {json_path} '
 					f'({len(merged_state.get("cookies", []))} cookies, '
-					f'{len(merged_state.get("origins", []))} origins)'
+					f'{len(merged_state.get("origins", []))} origins; '
+					f'cookies +{len(diff["cookies_added"])} ~{len(diff["cookies_changed"])} -{len(diff["cookies_removed"])}, '
+					f'origins changed: {diff["origins_changed"] or "none"})'
 				)
 
 			except Exception as e:
 				self.logger.error(f'[StorageStateWatchdog] Failed to save storage state: {e}')
 
+	def _read_saved_state(self, json_path: Path) -> dict[str, Any] | None:
+		"""Existing state file contents, only re-read from disk when the file changed since we last read or wrote it."""
+		try:
+			mtime_ns = json_path.stat().st_mtime_ns
+		except FileNotFoundError:
+			self._saved_state = self._saved_state_mtime_ns = None
+			return None
+
+		if self._saved_state is None or self._saved_state_mtime_ns != mtime_ns:
+			try:
+				self._saved_state = json.loads(json_path.read_text())
+				self._saved_state_mtime_ns = mtime_ns
+			except Exception as e:
+				self.logger.error(f'[StorageStateWatchdog] Failed to merge with existing state: {e}')
+				return None
+		return self._saved_state
+
+	def _write_state_file(self, json_path: Path, state: dict[str, Any]) -> None:
+		"""Atomically replace the state file, keeping the previous version as .json.bak."""
+		temp_path = json_path.with_suffix('.json.tmp')
+		with open(temp_path, 'w') as f:
+			f.write(json.dumps(state, indent=4))
+			f.flush()
+			os.fsync(f.fileno())
+
+		# Backup existing file, hard linked so the state file itself never goes missing
+		if json_path.exists():
+			backup_path = json_path.with_suffix('.json.bak')
+			backup_path.unlink(missing_ok=True)
+			try:
+				os.link(json_path, backup_path)
+			except OSError:
+				shutil.copy2(json_path, backup_path)
+
+		# Move temp to final
+		temp_path.replace(json_path)
+		self._saved_state = state
+		self._saved_state_mtime_ns = json_path.stat().st_mtime_ns
+
+	@staticmethod
+	def _diff_storage_states(old: dict[str, Any], new: dict[str, Any]) -> dict[str, list[str]]:
+		"""Which cookies and origins differ between two storage states, for the save log."""
+
+		def cookie_key(cookie: dict[str, Any]) -> str:
+			return f'{cookie.get("name", "")}@{cookie.get("domain", "")}{cookie.get("path", "")}'
+
+		old_cookies = {cookie_key(c): c for c in old.get('cookies', [])}
+		new_cookies = {cookie_key(c): c for c in new.get('cookies', [])}
+		old_origins = {o.get('origin'): o for o in old.get('origins', [])}
+		new_origins = {o.get('origin'): o for o in new.get('origins', [])}
+
+		return {
+			'cookies_added': [key for key in new_cookies if key not in old_cookies],
+			'cookies_changed': [key for key in new_cookies if key in old_cookies and new_cookies[key] != old_cookies[key]],
+			'cookies_removed': [key for key in old_cookies if key not in new_cookies],
+			'origins_changed': [
+				str(origin)
+				for origin in new_origins.keys() | old_origins.keys()
+				if new_origins.get(origin) != old_origins.get(origin)
+			],
+		}
+
 	async def _load_storage_state(self, path: str | None = None) -> None:
 		"""Load browser storage state from file."""
 		if not self.browser_session.cdp_client:
@@ -247,7 +348,6 @@ class StorageStateWatchdog(BaseWatchdog):
 			# Apply cookies if present
 			if 'cookies' in storage and storage['cookies']:
 				await self.browser_session._cdp_set_cookies(storage['cookies'])
-				self._last_cookie_state = storage['cookies'].copy()
 				self.logger.debug(f'[StorageStateWatchdog] Added {len(storage["cookies"])} cookies from storage state')
 
 			# Apply origins (localStorage/sessionStorage) if present
@@ -59,6 +59,9 @@ os.environ['BROWSER_USE_LOGGING_LEVEL'] = 'result'
 
 from browser_use.config import CONFIG
 
+# browser_use may have been imported (and CONFIG read) before the logging level above was set
+CONFIG.reload()
+
 # Set USER_DATA_DIR now that CONFIG is imported
 USER_DATA_DIR = CONFIG.BROWSER_USE_PROFILES_DIR / 'cli'
 
@@ -1356,6 +1359,7 @@ async def run_prompt_mode(prompt: str, ctx: click.Context, debug: bool = False):
 
 	# Set up logging to only show results by default
 	os.environ['BROWSER_USE_LOGGING_LEVEL'] = 'result'
+	CONFIG.reload()
 
 	# Re-run setup_logging to apply the new log level
 	setup_logging()
@@ -1601,6 +1605,7 @@ async def run_auth_command():
 
 	# Ensure cloud sync is enabled (should be default, but make sure)
 	os.environ['BROWSER_USE_CLOUD_SYNC'] = 'true'
+	CONFIG.reload()
 
 	auth_client = DeviceAuthClient()
 
@@ -1909,6 +1914,7 @@ def run_main_interface(ctx: click.Context, debug: bool = False, **kwargs):
 	if kwargs.get('prompt'):
 		# Set environment variable for prompt mode before running
 		os.environ['BROWSER_USE_LOGGING_LEVEL'] = 'result'
+		CONFIG.reload()
 		# Run in non-interactive mode
 		asyncio.run(run_prompt_mode(kwargs['prompt'], ctx, debug))
 		return
@@ -192,6 +192,10 @@ class FlatEnvConfig(BaseSettings):
 	BROWSER_USE_CLOUD_API_URL: str = Field(default='https://api.browser-use.com')
 	BROWSER_USE_CLOUD_UI_URL: str = Field(default='')
 
+	# Profiling
+	BROWSER_USE_PROFILE: bool = Field(default=False)
+	BROWSER_USE_PROFILE_TRACE_DIR: str | None = Field(default=None)
+
 	# Path configuration
 	XDG_CACHE_HOME: str = Field(default='~/.cache')
 	XDG_CONFIG_HOME: str = Field(default='~/.config')
@@ -227,6 +231,19 @@ class FlatEnvConfig(BaseSettings):
 	BROWSER_USE_PROXY_PASSWORD: str | None = Field(default=None)
 
 
+# Environment variables the config reads, checked for changes when watching the environment
+_CONFIG_ENV_VARS = tuple(FlatEnvConfig.model_fields)
+
+
+def _env_fingerprint() -> tuple[Any, ...]:
+	"""Cheap summary of everything a config snapshot is built from: the config env vars and the .env file."""
+	try:
+		dotenv_mtime = os.stat('.env').st_mtime_ns
+	except OSError:
+		dotenv_mtime = None
+	return (dotenv_mtime, *map(os.environ.get, _CONFIG_ENV_VARS))
+
+
 class DBStyleEntry(BaseModel):
 	"""Database-style entry with UUID and metadata."""
 
@@ -344,51 +361,86 @@ def load_and_migrate_config(config_path: Path) -> DBStyleConfigJSON:
 class Config:
 	"""Backward-compatible configuration class that merges all config sources.
 
-	Re-reads environment variables on every access to maintain compatibility.
+	Values are read from the environment on first access and kept in a snapshot, so hot paths reading CONFIG.*
+	don't re-parse the environment (and .env file) every time. Call CONFIG.reload() after changing environment
+	variables at runtime, or CONFIG.watch_env_changes() to pick up changes automatically on access (used by tests).
 	"""
 
 	def __init__(self):
 		# Cache for directory creation tracking only
 		self._dirs_created = False
+		self._watching_env = False
+		self.reload()
 
-	def __getattr__(self, name: str) -> Any:
-		"""Dynamically proxy all attributes to fresh instances.
+	def reload(self) -> None:
+		"""Drop the snapshot, values are read from the environment again on next access."""
+		self._snapshot: dict[str, Any] = {}
+		self._old_config = OldConfig()
+		self._env_config: FlatEnvConfig | None = None
+		self._env_fingerprint = _env_fingerprint() if self._watching_env else None
+
+	def watch_env_changes(self, enabled: bool = True) -> None:
+		"""Check the config env vars (and .env file) on every access and reload when they changed.
 
-		This ensures env vars are re-read on every access.
+		Costs tens of microseconds per access instead of well under one for a plain snapshot lookup,
+		meant for tests and other code that modifies os.environ while running.
 		"""
+		self._watching_env = enabled
+		self._env_fingerprint = _env_fingerprint() if enabled else None
+
+	def __getattr__(self, name: str) -> Any:
+		"""Proxy all attributes to the snapshot, reading them from the environment on first access."""
 		# Special handling for internal attributes
 		if name.startswith('_'):
 			raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
-		# Create fresh instances on every access
-		old_config = OldConfig()
+		if self._watching_env:
+			fingerprint = _env_fingerprint()
+			if fingerprint != self._env_fingerprint:
+				self.reload()
+
+		try:
+			return self._snapshot[name]
+		except KeyError:
+			pass
 
 		# Always use old config for all attributes (it handles env vars with proper transformations)
-		if hasattr(old_config, name):
-			return getattr(old_config, name)
-
-		# For new MCP-specific attributes not in old config
-		env_config = FlatEnvConfig()
-		if hasattr(env_config, name):
-			return getattr(env_config, name)
-
-		# Handle special methods
-		if name == 'get_default_profile':
-			return lambda: self._get_default_profile()
-		elif name == 'get_default_llm':
-			return lambda: self._get_default_llm()
-		elif name == 'get_default_agent':
-			return lambda: self._get_default_agent()
-		elif name == 'load_config':
-			return lambda: self._load_config()
-		elif name == '_ensure_dirs':
-			return lambda: old_config._ensure_dirs()
-
-		raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+		if hasattr(OldConfig, name):
+			value = getattr(self._old_config, name)
+		else:
+			# For new MCP-specific attributes not in old config
+			env_config = self._get_env_config()
+			if not hasattr(env_config, name):
+				raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+			value = getattr(env_config, name)
+
+		self._snapshot[name] = value
+		return value
+
+	def _get_env_config(self) -> FlatEnvConfig:
+		"""The parsed environment (and .env file) for the current snapshot."""
+		if self._env_config is None:
+			self._env_config = FlatEnvConfig()
+		return self._env_config
+
+	def get_default_profile(self) -> dict[str, Any]:
+		return self._get_default_profile()
+
+	def get_default_llm(self) -> dict[str, Any]:
+		return self._get_default_llm()
+
+	def get_default_agent(self) -> dict[str, Any]:
+		return self._get_default_agent()
+
+	def load_config(self) -> dict[str, Any]:
+		return self._load_config()
+
+	def _ensure_dirs(self) -> None:
+		self._old_config._ensure_dirs()
 
 	def _get_config_path(self) -> Path:
-		"""Get config path from fresh env config."""
-		env_config = FlatEnvConfig()
+		"""Get config path from the env config snapshot."""
+		env_config = self._get_env_config()
 		if env_config.BROWSER_USE_CONFIG_PATH:
 			return Path(env_config.BROWSER_USE_CONFIG_PATH).expanduser()
 		elif env_config.BROWSER_USE_CONFIG_DIR:
@@ -449,8 +501,8 @@ class Config:
 			'agent': self._get_default_agent(),
 		}
 
-		# Fresh env config for overrides
-		env_config = FlatEnvConfig()
+		# Env config snapshot for overrides
+		env_config = self._get_env_config()
 
 		# Apply MCP-specific env var overrides
 		if env_config.BROWSER_USE_HEADLESS is not None:
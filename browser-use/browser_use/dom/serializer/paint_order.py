@@ -139,7 +139,10 @@ class PaintOrderRemover:
 	def calculate_paint_order(self) -> None:
 		all_simplified_nodes_with_paint_order: list[SimplifiedNode] = []
 
-		def collect_paint_order(node: SimplifiedNode) -> None:
+		# collect in document order, with an explicit stack so deep trees don't hit the recursion limit
+		stack = [self.root]
+		while stack:
+			node = stack.pop()
 			if (
 				node.original_node.snapshot_node
 				and node.original_node.snapshot_node.paint_order is not None
@@ -147,10 +150,7 @@ class PaintOrderRemover:
 			):
 				all_simplified_nodes_with_paint_order.append(node)
 
-			for child in node.children:
-				collect_paint_order(child)
-
-		collect_paint_order(self.root)
+			stack.extend(reversed(node.children))
 
 		grouped_by_paint_order: defaultdict[int, list[SimplifiedNode]] = defaultdict(list)
 
@@ -1,5 +1,9 @@
 # @file purpose: Serializes enhanced DOM trees to string format for LLM consumption
 
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from typing import Any
 
 from browser_use.dom.serializer.clickable_elements import ClickableElementDetector
@@ -14,10 +18,38 @@ from browser_use.dom.views import (
 	SerializedDOMState,
 	SimplifiedNode,
 )
+from browser_use.profiling import profiler
 
 DISABLED_ELEMENTS = {'style', 'script', 'head', 'meta', 'link', 'title'}
 
 
+@dataclass(slots=True)
+class _SimplifiedDocument:
+	"""A document in `_create_simplified_tree`, which is replaced by its first simplified child."""
+
+	target: 'list[SimplifiedNode] | _SimplifiedDocument'
+	done: bool = False
+
+
+def _add_simplified(target: 'list[SimplifiedNode] | _SimplifiedDocument', simplified: SimplifiedNode) -> None:
+	"""Add a kept node to the children of its parent."""
+	while type(target) is _SimplifiedDocument:
+		target.done = True
+		target = target.target
+	target.append(simplified)
+
+
+def _preorder(root: SimplifiedNode) -> list[SimplifiedNode]:
+	"""All nodes of a simplified tree in document order, without recursion."""
+	nodes = []
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		nodes.append(node)
+		stack.extend(reversed(node.children))
+	return nodes
+
+
 class DOMTreeSerializer:
 	"""Serializes enhanced DOM trees to string format."""
 
@@ -74,53 +106,45 @@ class DOMTreeSerializer:
 		except (ValueError, TypeError):
 			return None
 
-	def serialize_accessible_elements(self) -> tuple[SerializedDOMState, dict[str, float]]:
-		import time
+	@contextmanager
+	def _timed(self, pass_name: str) -> Iterator[None]:
+		"""Record the duration of a serialization pass in timing_info and as a profiler span."""
+		start = time.time()
+		with profiler.span(pass_name, 'serializer'):
+			yield
+		self.timing_info[pass_name] = time.time() - start
 
-		start_total = time.time()
+	def serialize_accessible_elements(self) -> tuple[SerializedDOMState, dict[str, float]]:
+		with self._timed('serialize_accessible_elements_total'):
+			# Reset state
+			self._interactive_counter = 1
+			self._selector_map = {}
+			self._semantic_groups = []
+			self._clickable_cache = {}  # Clear cache for new serialization
+
+			# Step 1: Create simplified tree (includes clickable element detection)
+			with self._timed('create_simplified_tree'):
+				simplified_tree = self._create_simplified_tree(self.root_node)
+
+			# Step 2: Remove elements based on paint order
+			with self._timed('calculate_paint_order'):
+				if self.paint_order_filtering and simplified_tree:
+					PaintOrderRemover(simplified_tree).calculate_paint_order()
+
+			# Step 3: Optimize tree (remove unnecessary parents)
+			with self._timed('optimize_tree'):
+				optimized_tree = self._optimize_tree(simplified_tree)
+
+			# Step 3: Apply bounding box filtering (NEW)
+			if self.enable_bbox_filtering and optimized_tree:
+				with self._timed('bbox_filtering'):
+					filtered_tree = self._apply_bounding_box_filtering(optimized_tree)
+			else:
+				filtered_tree = optimized_tree
 
-		# Reset state
-		self._interactive_counter = 1
-		self._selector_map = {}
-		self._semantic_groups = []
-		self._clickable_cache = {}  # Clear cache for new serialization
-
-		# Step 1: Create simplified tree (includes clickable element detection)
-		start_step1 = time.time()
-		simplified_tree = self._create_simplified_tree(self.root_node)
-		end_step1 = time.time()
-		self.timing_info['create_simplified_tree'] = end_step1 - start_step1
-
-		# Step 2: Remove elements based on paint order
-		start_step3 = time.time()
-		if self.paint_order_filtering and simplified_tree:
-			PaintOrderRemover(simplified_tree).calculate_paint_order()
-		end_step3 = time.time()
-		self.timing_info['calculate_paint_order'] = end_step3 - start_step3
-
-		# Step 3: Optimize tree (remove unnecessary parents)
-		start_step2 = time.time()
-		optimized_tree = self._optimize_tree(simplified_tree)
-		end_step2 = time.time()
-		self.timing_info['optimize_tree'] = end_step2 - start_step2
-
-		# Step 3: Apply bounding box filtering (NEW)
-		if self.enable_bbox_filtering and optimized_tree:
-			start_step3 = time.time()
-			filtered_tree = self._apply_bounding_box_filtering(optimized_tree)
-			end_step3 = time.time()
-			self.timing_info['bbox_filtering'] = end_step3 - start_step3
-		else:
-			filtered_tree = optimized_tree
-
-		# Step 4: Assign interactive indices to clickable elements
-		start_step4 = time.time()
-		self._assign_interactive_indices_and_mark_new_nodes(filtered_tree)
-		end_step4 = time.time()
-		self.timing_info['assign_interactive_indices'] = end_step4 - start_step4
-
-		end_total = time.time()
-		self.timing_info['serialize_accessible_elements_total'] = end_total - start_total
+			# Step 4: Assign interactive indices to clickable elements
+			with self._timed('assign_interactive_indices'):
+				self._assign_interactive_indices_and_mark_new_nodes(filtered_tree)
 
 		return SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map), self.timing_info
 
@@ -407,8 +431,6 @@ class DOMTreeSerializer:
 	def _is_interactive_cached(self, node: EnhancedDOMTreeNode) -> bool:
 		"""Cached version of clickable element detection to avoid redundant calls."""
 		if node.node_id not in self._clickable_cache:
-			import time
-
 			start_time = time.time()
 			result = ClickableElementDetector.is_interactive(node)
 			end_time = time.time()
@@ -421,133 +443,159 @@ class DOMTreeSerializer:
 
 		return self._clickable_cache[node.node_id]
 
-	def _create_simplified_tree(self, node: EnhancedDOMTreeNode, depth: int = 0) -> SimplifiedNode | None:
-		"""Step 1: Create a simplified tree with enhanced element detection."""
+	def _create_simplified_tree(self, root: EnhancedDOMTreeNode) -> SimplifiedNode | None:
+		"""Step 1: Create a simplified tree with enhanced element detection.
 
-		if node.node_type == NodeType.DOCUMENT_NODE:
-			# for all cldren including shadow roots
-			for child in node.children_and_shadow_roots:
-				simplified_child = self._create_simplified_tree(child, depth + 1)
-				if simplified_child:
-					return simplified_child
+		Walks the tree with an explicit stack instead of recursion, so deeply nested pages can't hit the recursion limit.
+		A simplified node is added to its parent as soon as it is known to be kept; only elements that are kept just for
+		their children are revisited after their subtree.
+		"""
+		result: list[SimplifiedNode] = []
+		# (node to simplify, where it goes, None), or (None, where it goes, element waiting for its subtree)
+		stack: list[tuple[EnhancedDOMTreeNode | None, list[SimplifiedNode] | _SimplifiedDocument, SimplifiedNode | None]] = [
+			(root, result, None)
+		]
 
-			return None
+		while stack:
+			node, target, pending = stack.pop()
 
-		if node.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
-			# ENHANCED shadow DOM processing - always include shadow content
-			simplified = SimplifiedNode(original_node=node, children=[])
-			for child in node.children_and_shadow_roots:
-				simplified_child = self._create_simplified_tree(child, depth + 1)
-				if simplified_child:
-					simplified.children.append(simplified_child)
-
-			# Always return shadow DOM fragments, even if children seem empty
-			# Shadow DOM often contains the actual interactive content in SPAs
-			return simplified if simplified.children else SimplifiedNode(original_node=node, children=[])
-
-		elif node.node_type == NodeType.ELEMENT_NODE:
-			# Skip non-content elements
-			if node.node_name.lower() in DISABLED_ELEMENTS:
-				return None
-
-			if node.node_name == 'IFRAME' or node.node_name == 'FRAME':
-				if node.content_document:
+			if node is None:
+				assert pending is not None
+				# Return if meaningful or has meaningful children
+				if pending.children:
+					_add_simplified(target, pending)
+				continue
+
+			if type(target) is _SimplifiedDocument and target.done:
+				continue  # the document is already replaced by an earlier child
+
+			node_type = node.node_type
+			if node_type == NodeType.DOCUMENT_NODE:
+				# for all cldren including shadow roots
+				document = _SimplifiedDocument(target)
+				for child in reversed(node.children_and_shadow_roots):
+					stack.append((child, document, None))
+				continue
+
+			if node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
+				# ENHANCED shadow DOM processing - always include shadow content
+				# Always return shadow DOM fragments, even if children seem empty
+				# Shadow DOM often contains the actual interactive content in SPAs
+				simplified = SimplifiedNode(original_node=node, children=[])
+				_add_simplified(target, simplified)
+				children = node.children_and_shadow_roots
+
+			elif node_type == NodeType.ELEMENT_NODE:
+				# Skip non-content elements
+				node_name = node.node_name
+				if node_name.lower() in DISABLED_ELEMENTS:
+					continue
+
+				if (node_name == 'IFRAME' or node_name == 'FRAME') and node.content_document:
 					simplified = SimplifiedNode(original_node=node, children=[])
-					for child in node.content_document.children_nodes or []:
-						simplified_child = self._create_simplified_tree(child, depth + 1)
-						if simplified_child is not None:
-							simplified.children.append(simplified_child)
-					return simplified
-
-			is_visible = node.is_visible
-			is_scrollable = node.is_actually_scrollable
-			has_shadow_content = bool(node.children_and_shadow_roots)
-
-			# ENHANCED SHADOW DOM DETECTION: Include shadow hosts even if not visible
-			is_shadow_host = any(child.node_type == NodeType.DOCUMENT_FRAGMENT_NODE for child in node.children_and_shadow_roots)
-
-			# Override visibility for elements with validation attributes
-			if not is_visible and node.attributes:
-				has_validation_attrs = any(attr.startswith(('aria-', 'pseudo')) for attr in node.attributes.keys())
-				if has_validation_attrs:
-					is_visible = True  # Force visibility for validation elements
-
-			# Include if visible, scrollable, has children, or is shadow host
-			if is_visible or is_scrollable or has_shadow_content or is_shadow_host:
-				simplified = SimplifiedNode(original_node=node, children=[], is_shadow_host=is_shadow_host)
-
-				# Process ALL children including shadow roots with enhanced logging
-				for child in node.children_and_shadow_roots:
-					simplified_child = self._create_simplified_tree(child, depth + 1)
-					if simplified_child:
-						simplified.children.append(simplified_child)
-
-				# COMPOUND CONTROL PROCESSING: Add virtual components for compound controls
-				self._add_compound_components(simplified, node)
-
-				# SHADOW DOM SPECIAL CASE: Always include shadow hosts even if not visible
-				# Many SPA frameworks (React, Vue) render content in shadow DOM
-				if is_shadow_host and simplified.children:
-					return simplified
+					_add_simplified(target, simplified)
+					children = node.content_document.children_nodes or []
 
-				# Return if meaningful or has meaningful children
-				if is_visible or is_scrollable or simplified.children:
-					return simplified
+				else:
+					is_visible = node.is_visible
+					is_scrollable = node.is_actually_scrollable
+					children = node.children_and_shadow_roots
+					has_shadow_content = bool(children)
+
+					# ENHANCED SHADOW DOM DETECTION: Include shadow hosts even if not visible
+					is_shadow_host = any(child.node_type == NodeType.DOCUMENT_FRAGMENT_NODE for child in children)
+
+					# Override visibility for elements with validation attributes
+					if not is_visible and node.attributes:
+						has_validation_attrs = any(attr.startswith(('aria-', 'pseudo')) for attr in node.attributes.keys())
+						if has_validation_attrs:
+							is_visible = True  # Force visibility for validation elements
 
-		elif node.node_type == NodeType.TEXT_NODE:
-			# Include meaningful text nodes
-			is_visible = node.snapshot_node and node.is_visible
-			if is_visible and node.node_value and node.node_value.strip() and len(node.node_value.strip()) > 1:
-				return SimplifiedNode(original_node=node, children=[])
+					# Include if visible, scrollable, has children, or is shadow host
+					if not (is_visible or is_scrollable or has_shadow_content or is_shadow_host):
+						continue
+
+					simplified = SimplifiedNode(original_node=node, children=[], is_shadow_host=is_shadow_host)
+
+					# COMPOUND CONTROL PROCESSING: Add virtual components for compound controls
+					self._add_compound_components(simplified, node)
+
+					# SHADOW DOM SPECIAL CASE: shadow hosts (even if not visible) and other elements are kept if any
+					# of their children is. Many SPA frameworks (React, Vue) render content in shadow DOM
+					if is_visible or is_scrollable:
+						_add_simplified(target, simplified)
+					else:
+						stack.append((None, target, simplified))
+
+			elif node_type == NodeType.TEXT_NODE:
+				# Include meaningful text nodes
+				is_visible = node.snapshot_node and node.is_visible
+				if is_visible and node.node_value and node.node_value.strip() and len(node.node_value.strip()) > 1:
+					_add_simplified(target, SimplifiedNode(original_node=node, children=[]))
+				continue
+
+			else:
+				continue
 
-		return None
+			# Process ALL children including shadow roots
+			for child in reversed(children):
+				stack.append((child, simplified.children, None))
 
-	def _optimize_tree(self, node: SimplifiedNode | None) -> SimplifiedNode | None:
+		return result[0] if result else None
+
+	def _optimize_tree(self, root: SimplifiedNode | None) -> SimplifiedNode | None:
 		"""Step 2: Optimize tree structure."""
-		if not node:
+		if not root:
 			return None
 
-		# Process children
-		optimized_children = []
-		for child in node.children:
-			optimized_child = self._optimize_tree(child)
-			if optimized_child:
-				optimized_children.append(optimized_child)
+		# children are decided before their parents: walk the nodes in reverse pre-order
+		nodes = _preorder(root)
+		removed: set[int] = set()
+		for node in reversed(nodes):
+			# Process children
+			if node.children and removed:
+				node.children = [child for child in node.children if id(child) not in removed]
 
-		node.children = optimized_children
-
-		# Keep meaningful nodes
-		is_visible = node.original_node.snapshot_node and node.original_node.is_visible
+			# Keep meaningful nodes
+			is_visible = node.original_node.snapshot_node and node.original_node.is_visible
 
-		if (
-			is_visible  # Keep all visible nodes
-			or node.original_node.is_actually_scrollable
-			or node.original_node.node_type == NodeType.TEXT_NODE
-			or node.children
-		):
-			return node
+			if not (
+				is_visible  # Keep all visible nodes
+				or node.original_node.is_actually_scrollable
+				or node.original_node.node_type == NodeType.TEXT_NODE
+				or node.children
+			):
+				removed.add(id(node))
 
-		return None
+		return None if id(root) in removed else root
 
 	def _collect_interactive_elements(self, node: SimplifiedNode, elements: list[SimplifiedNode]) -> None:
-		"""Recursively collect interactive elements that are also visible."""
-		is_interactive = self._is_interactive_cached(node.original_node)
-		is_visible = node.original_node.snapshot_node and node.original_node.is_visible
-
-		# Only collect elements that are both interactive AND visible
-		if is_interactive and is_visible:
-			elements.append(node)
+		"""Collect interactive elements that are also visible, in document order."""
+		for descendant in _preorder(node):
+			is_interactive = self._is_interactive_cached(descendant.original_node)
+			is_visible = descendant.original_node.snapshot_node and descendant.original_node.is_visible
 
-		for child in node.children:
-			self._collect_interactive_elements(child, elements)
+			# Only collect elements that are both interactive AND visible
+			if is_interactive and is_visible:
+				elements.append(descendant)
 
-	def _assign_interactive_indices_and_mark_new_nodes(self, node: SimplifiedNode | None) -> None:
+	def _assign_interactive_indices_and_mark_new_nodes(self, root: SimplifiedNode | None) -> None:
 		"""Assign interactive indices to clickable elements that are also visible."""
-		if not node:
+		if not root:
 			return
 
-		# Skip assigning index to excluded nodes, or ignored by paint order
-		if not node.excluded_by_parent and not node.ignored_by_paint_order:
+		previous_backend_node_ids = {node.backend_node_id for node in (self._previous_cached_selector_map or {}).values()}
+
+		stack = [root]
+		while stack:
+			node = stack.pop()
+			# Process children
+			stack.extend(reversed(node.children))
+
+			# Skip assigning index to excluded nodes, or ignored by paint order
+			if node.excluded_by_parent or node.ignored_by_paint_order:
+				continue
+
 			# Regular interactive element assignment (including enhanced compound controls)
 			is_interactive_assign = self._is_interactive_cached(node.original_node)
 			is_visible = node.original_node.snapshot_node and node.original_node.is_visible
@@ -564,21 +612,16 @@ class DOMTreeSerializer:
 					node.is_new = True
 				elif self._previous_cached_selector_map:
 					# Check if node is new for regular elements
-					previous_backend_node_ids = {node.backend_node_id for node in self._previous_cached_selector_map.values()}
 					if node.original_node.backend_node_id not in previous_backend_node_ids:
 						node.is_new = True
 
-		# Process children
-		for child in node.children:
-			self._assign_interactive_indices_and_mark_new_nodes(child)
-
 	def _apply_bounding_box_filtering(self, node: SimplifiedNode | None) -> SimplifiedNode | None:
 		"""Filter children contained within propagating parent bounds."""
 		if not node:
 			return None
 
 		# Start with no active bounds
-		self._filter_tree_recursive(node, active_bounds=None, depth=0)
+		self._filter_tree(node)
 
 		# Log statistics
 		excluded_count = self._count_excluded_nodes(node)
@@ -589,42 +632,45 @@ class DOMTreeSerializer:
 
 		return node
 
-	def _filter_tree_recursive(self, node: SimplifiedNode, active_bounds: PropagatingBounds | None = None, depth: int = 0):
+	def _filter_tree(self, root: SimplifiedNode) -> None:
 		"""
-		Recursively filter tree with bounding box propagation.
+		Filter tree with bounding box propagation.
 		Bounds propagate to ALL descendants until overridden.
 		"""
+		stack: list[tuple[SimplifiedNode, PropagatingBounds | None, int]] = [(root, None, 0)]
+		while stack:
+			node, active_bounds, depth = stack.pop()
+
+			# Check if this node should be excluded by active bounds
+			if active_bounds and self._should_exclude_child(node, active_bounds):
+				node.excluded_by_parent = True
+				# Important: Still check if this node starts NEW propagation
+
+			# Check if this node starts new propagation (even if excluded!)
+			new_bounds = None
+			tag = node.original_node.tag_name.lower()
+			role = node.original_node.attributes.get('role') if node.original_node.attributes else None
+			attributes = {
+				'tag': tag,
+				'role': role,
+			}
+			# Check if this element matches any propagating element pattern
+			if self._is_propagating_element(attributes):
+				# This node propagates bounds to ALL its descendants
+				if node.original_node.snapshot_node and node.original_node.snapshot_node.bounds:
+					new_bounds = PropagatingBounds(
+						tag=tag,
+						bounds=node.original_node.snapshot_node.bounds,
+						node_id=node.original_node.node_id,
+						depth=depth,
+					)
 
-		# Check if this node should be excluded by active bounds
-		if active_bounds and self._should_exclude_child(node, active_bounds):
-			node.excluded_by_parent = True
-			# Important: Still check if this node starts NEW propagation
-
-		# Check if this node starts new propagation (even if excluded!)
-		new_bounds = None
-		tag = node.original_node.tag_name.lower()
-		role = node.original_node.attributes.get('role') if node.original_node.attributes else None
-		attributes = {
-			'tag': tag,
-			'role': role,
-		}
-		# Check if this element matches any propagating element pattern
-		if self._is_propagating_element(attributes):
-			# This node propagates bounds to ALL its descendants
-			if node.original_node.snapshot_node and node.original_node.snapshot_node.bounds:
-				new_bounds = PropagatingBounds(
-					tag=tag,
-					bounds=node.original_node.snapshot_node.bounds,
-					node_id=node.original_node.node_id,
-					depth=depth,
-				)
-
-		# Propagate to ALL children
-		# Use new_bounds if this node starts propagation, otherwise continue with active_bounds
-		propagate_bounds = new_bounds if new_bounds else active_bounds
+			# Propagate to ALL children
+			# Use new_bounds if this node starts propagation, otherwise continue with active_bounds
+			propagate_bounds = new_bounds if new_bounds else active_bounds
 
-		for child in node.children:
-			self._filter_tree_recursive(child, propagate_bounds, depth + 1)
+			for child in reversed(node.children):
+				stack.append((child, propagate_bounds, depth + 1))
 
 	def _should_exclude_child(self, node: SimplifiedNode, active_bounds: PropagatingBounds) -> bool:
 		"""
@@ -703,13 +749,9 @@ class DOMTreeSerializer:
 		containment_ratio = intersection_area / child_area
 		return containment_ratio >= threshold
 
-	def _count_excluded_nodes(self, node: SimplifiedNode, count: int = 0) -> int:
+	def _count_excluded_nodes(self, node: SimplifiedNode) -> int:
 		"""Count how many nodes were excluded (for debugging)."""
-		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
-			count += 1
-		for child in node.children:
-			count = self._count_excluded_nodes(child, count)
-		return count
+		return sum(1 for descendant in _preorder(node) if getattr(descendant, 'excluded_by_parent', False))
 
 	def _is_propagating_element(self, attributes: dict[str, str | None]) -> bool:
 		"""
@@ -727,31 +769,48 @@ class DOMTreeSerializer:
 
 	@staticmethod
 	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
-		"""Serialize the optimized tree to string format."""
+		"""Serialize the optimized tree to string format.
+
+		Walks the tree with an explicit stack: each node emits its own lines, then its children follow in order.
+		"""
 		if not node:
 			return ''
 
+		formatted_text: list[str] = []
+		# (node, depth) to serialize, or a line to emit once the children of a shadow root are done
+		stack: list[tuple[SimplifiedNode, int] | str] = [(node, depth)]
+		while stack:
+			item = stack.pop()
+			if isinstance(item, str):
+				formatted_text.append(item)
+				continue
+			node, depth = item
+			next_depth = DOMTreeSerializer._serialize_node(node, include_attributes, depth, formatted_text, stack)
+			for child in reversed(node.children):
+				stack.append((child, next_depth))
+
+		return '\n'.join(formatted_text)
+
+	@staticmethod
+	def _serialize_node(
+		node: SimplifiedNode,
+		include_attributes: list[str],
+		depth: int,
+		formatted_text: list[str],
+		stack: list[tuple[SimplifiedNode, int] | str],
+	) -> int:
+		"""Append the lines of a single node and return the depth its children are serialized at."""
 		# Skip rendering excluded nodes, but process their children
 		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
-			formatted_text = []
-			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
-				if child_text:
-					formatted_text.append(child_text)
-			return '\n'.join(formatted_text)
-
-		formatted_text = []
+			return depth
+
 		depth_str = depth * '\t'
 		next_depth = depth
 
 		if node.original_node.node_type == NodeType.ELEMENT_NODE:
 			# Skip displaying nodes marked as should_display=False
 			if not node.should_display:
-				for child in node.children:
-					child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
-					if child_text:
-						formatted_text.append(child_text)
-				return '\n'.join(formatted_text)
+				return depth
 
 			# Add element with interactive_index if clickable, scrollable, or iframe
 			is_any_scrollable = node.original_node.is_actually_scrollable or node.original_node.is_scrollable
@@ -856,15 +915,9 @@ class DOMTreeSerializer:
 
 			next_depth += 1
 
-			# Process shadow DOM children
-			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
-				if child_text:
-					formatted_text.append(child_text)
-
-			# Close shadow DOM indicator
+			# Close shadow DOM indicator, after the shadow DOM children
 			if node.children:  # Only show close if we had content
-				formatted_text.append(f'{depth_str}▲ Shadow Content End')
+				stack.append(f'{depth_str}▲ Shadow Content End')
 
 		elif node.original_node.node_type == NodeType.TEXT_NODE:
 			# Include visible text
@@ -878,14 +931,7 @@ class DOMTreeSerializer:
 				clean_text = node.original_node.node_value.strip()
 				formatted_text.append(f'{depth_str}{clean_text}')
 
-		# Process children (for non-shadow elements)
-		if node.original_node.node_type != NodeType.DOCUMENT_FRAGMENT_NODE:
-			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
-				if child_text:
-					formatted_text.append(child_text)
-
-		return '\n'.join(formatted_text)
+		return next_depth
 
 	@staticmethod
 	def _build_attributes_string(node: EnhancedDOMTreeNode, include_attributes: list[str], text: str) -> str:
@@ -1,7 +1,8 @@
 import asyncio
 import logging
 import time
-from typing import TYPE_CHECKING
+from collections.abc import Awaitable
+from typing import TYPE_CHECKING, Any
 
 from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
 from cdp_use.cdp.accessibility.types import AXNode
@@ -13,16 +14,16 @@ from browser_use.dom.enhanced_snapshot import (
 	build_snapshot_lookup,
 )
 from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.store import NO_INDEX, DomStore
 from browser_use.dom.views import (
 	CurrentPageTargets,
 	DOMRect,
-	EnhancedAXNode,
-	EnhancedAXProperty,
 	EnhancedDOMTreeNode,
 	NodeType,
 	SerializedDOMState,
 	TargetAllTrees,
 )
+from browser_use.profiling import profiler, traced
 
 if TYPE_CHECKING:
 	from browser_use.browser.session import BrowserSession
@@ -49,6 +50,8 @@ class DomService:
 		paint_order_filtering: bool = True,
 		max_iframes: int = 100,
 		max_iframe_depth: int = 5,
+		max_concurrent_frames: int = 8,
+		frame_timeout: float = 5.0,
 	):
 		self.browser_session = browser_session
 		self.logger = logger or browser_session.logger
@@ -56,6 +59,13 @@ class DomService:
 		self.paint_order_filtering = paint_order_filtering
 		self.max_iframes = max_iframes
 		self.max_iframe_depth = max_iframe_depth
+		self.max_concurrent_frames = max_concurrent_frames
+		"""How many frames (cross origin iframe targets, or frames of one accessibility tree) are captured at once"""
+		self.frame_timeout = frame_timeout
+		"""Seconds after which a cross origin iframe or the accessibility tree of a frame is skipped"""
+		self._capture_slots = asyncio.Semaphore(max_concurrent_frames)
+		self.capture_timing: dict[TargetID, dict[str, float]] = {}
+		"""Target ID -> CDP timing of its capture during the last `get_dom_tree`, including per-frame entries"""
 
 	async def __aenter__(self):
 		return self
@@ -106,34 +116,6 @@ class DomService:
 			iframe_sessions=iframe_targets,
 		)
 
-	def _build_enhanced_ax_node(self, ax_node: AXNode) -> EnhancedAXNode:
-		properties: list[EnhancedAXProperty] | None = None
-		if 'properties' in ax_node and ax_node['properties']:
-			properties = []
-			for property in ax_node['properties']:
-				try:
-					# test whether property name can go into the enum (sometimes Chrome returns some random properties)
-					properties.append(
-						EnhancedAXProperty(
-							name=property['name'],
-							value=property.get('value', {}).get('value', None),
-							# related_nodes=[],  # TODO: add related nodes
-						)
-					)
-				except ValueError:
-					pass
-
-		enhanced_ax_node = EnhancedAXNode(
-			ax_node_id=ax_node['nodeId'],
-			ignored=ax_node['ignored'],
-			role=ax_node.get('role', {}).get('value', None),
-			name=ax_node.get('name', {}).get('value', None),
-			description=ax_node.get('description', {}).get('value', None),
-			properties=properties,
-			child_ids=ax_node.get('childIds', []) if ax_node.get('childIds') else None,
-		)
-		return enhanced_ax_node
-
 	async def _get_viewport_ratio(self, target_id: TargetID) -> float:
 		"""Get viewport dimensions, device pixel ratio, and scroll position using CDP."""
 		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=True)
@@ -169,10 +151,11 @@ class DomService:
 	) -> bool:
 		"""Check if the element is visible according to all its parent HTML frames."""
 
-		if not node.snapshot_node:
+		snapshot_node = node.snapshot_node
+		if not snapshot_node:
 			return False
 
-		computed_styles = node.snapshot_node.computed_styles or {}
+		computed_styles = snapshot_node.computed_styles or {}
 
 		display = computed_styles.get('display', '').lower()
 		visibility = computed_styles.get('visibility', '').lower()
@@ -188,7 +171,7 @@ class DomService:
 			pass
 
 		# Start with the element's local bounds (in its own frame's coordinate system)
-		current_bounds = node.snapshot_node.bounds
+		current_bounds = snapshot_node.bounds
 
 		if not current_bounds:
 			return False  # If there are no bounds, the element is not visible
@@ -197,25 +180,20 @@ class DomService:
 		Reverse iterate through the html frames (that can be either iframe or document -> if it's a document frame compare if the current bounds interest with it (taking scroll into account) otherwise move the current bounds by the iframe offset)
 		"""
 		for frame in reversed(html_frames):
-			if (
-				frame.node_type == NodeType.ELEMENT_NODE
-				and (frame.node_name.upper() == 'IFRAME' or frame.node_name.upper() == 'FRAME')
-				and frame.snapshot_node
-				and frame.snapshot_node.bounds
-			):
-				iframe_bounds = frame.snapshot_node.bounds
-
-				# negate the values added in `_construct_enhanced_node`
-				current_bounds.x += iframe_bounds.x
-				current_bounds.y += iframe_bounds.y
-
-			if (
-				frame.node_type == NodeType.ELEMENT_NODE
-				and frame.node_name == 'HTML'
-				and frame.snapshot_node
-				and frame.snapshot_node.scrollRects
-				and frame.snapshot_node.clientRects
-			):
+			frame_snapshot = frame.snapshot_node
+			if frame.node_type != NodeType.ELEMENT_NODE or not frame_snapshot:
+				continue
+
+			if frame.node_name.upper() == 'IFRAME' or frame.node_name.upper() == 'FRAME':
+				iframe_bounds = frame_snapshot.bounds
+				if iframe_bounds:
+					# negate the values added in `_construct_enhanced_node`
+					current_bounds.x += iframe_bounds.x
+					current_bounds.y += iframe_bounds.y
+
+			scroll_rects = frame_snapshot.scrollRects
+			client_rects = frame_snapshot.clientRects
+			if frame.node_name == 'HTML' and scroll_rects and client_rects:
 				# For iframe content, we need to check visibility within the iframe's viewport
 				# The scrollRects represent the current scroll position
 				# The clientRects represent the viewport size
@@ -224,13 +202,13 @@ class DomService:
 				# The viewport of the frame (what's actually visible)
 				viewport_left = 0  # Viewport always starts at 0 in frame coordinates
 				viewport_top = 0
-				viewport_right = frame.snapshot_node.clientRects.width
-				viewport_bottom = frame.snapshot_node.clientRects.height
+				viewport_right = client_rects.width
+				viewport_bottom = client_rects.height
 
 				# Adjust element bounds by the scroll offset to get position relative to viewport
 				# When scrolled down, scrollRects.y is positive, so we subtract it from element's y
-				adjusted_x = current_bounds.x - frame.snapshot_node.scrollRects.x
-				adjusted_y = current_bounds.y - frame.snapshot_node.scrollRects.y
+				adjusted_x = current_bounds.x - scroll_rects.x
+				adjusted_y = current_bounds.y - scroll_rects.y
 
 				frame_intersects = (
 					adjusted_x < viewport_right
@@ -244,14 +222,21 @@ class DomService:
 
 				# Keep the original coordinate adjustment to maintain consistency
 				# This adjustment is needed for proper coordinate transformation
-				current_bounds.x -= frame.snapshot_node.scrollRects.x
-				current_bounds.y -= frame.snapshot_node.scrollRects.y
+				current_bounds.x -= scroll_rects.x
+				current_bounds.y -= scroll_rects.y
 
 		# If we reach here, element is visible in main viewport and all containing iframes
 		return True
 
-	async def _get_ax_tree_for_all_frames(self, target_id: TargetID) -> GetFullAXTreeReturns:
-		"""Recursively collect all frames and merge their accessibility trees into a single array."""
+	async def _get_ax_tree_for_all_frames(
+		self, target_id: TargetID, timing: dict[str, float] | None = None
+	) -> GetFullAXTreeReturns:
+		"""Recursively collect all frames and merge their accessibility trees into a single array.
+
+		The frames are fetched concurrently, at most `max_concurrent_frames` at a time. A frame that fails or takes
+		longer than `frame_timeout` is left out, its nodes just won't have accessibility data. The time spent on each
+		frame is added to `timing`.
+		"""
 
 		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
 		frame_tree = await cdp_session.cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)
@@ -270,23 +255,36 @@ class DomService:
 		all_frame_ids = collect_all_frame_ids(frame_tree['frameTree'])
 
 		# Get accessibility tree for each frame
-		ax_tree_requests = []
-		for frame_id in all_frame_ids:
-			ax_tree_request = cdp_session.cdp_client.send.Accessibility.getFullAXTree(
-				params={'frameId': frame_id}, session_id=cdp_session.session_id
-			)
-			ax_tree_requests.append(ax_tree_request)
+		slots = asyncio.Semaphore(self.max_concurrent_frames)
 
-		# Wait for all requests to complete
-		ax_trees = await asyncio.gather(*ax_tree_requests)
+		async def get_frame_ax_nodes(frame_id: str) -> list[AXNode]:
+			async with slots:
+				start = time.time()
+				try:
+					ax_tree = await asyncio.wait_for(
+						cdp_session.cdp_client.send.Accessibility.getFullAXTree(
+							params={'frameId': frame_id}, session_id=cdp_session.session_id
+						),
+						timeout=self.frame_timeout,
+					)
+					return ax_tree['nodes']
+				except Exception as e:
+					self.logger.debug(f'Skipping accessibility tree of frame {frame_id[-4:]}: {type(e).__name__}: {e}')
+					return []
+				finally:
+					if timing is not None:
+						timing[f'ax_tree_frame_{frame_id[-4:]}'] = time.time() - start
+
+		ax_nodes_per_frame = await asyncio.gather(*(get_frame_ax_nodes(frame_id) for frame_id in all_frame_ids))
 
 		# Merge all AX nodes into a single array
 		merged_nodes: list[AXNode] = []
-		for ax_tree in ax_trees:
-			merged_nodes.extend(ax_tree['nodes'])
+		for ax_nodes in ax_nodes_per_frame:
+			merged_nodes.extend(ax_nodes)
 
 		return {'nodes': merged_nodes}
 
+	@traced(category='dom')
 	async def _get_all_trees(self, target_id: TargetID) -> TargetAllTrees:
 		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
 
@@ -357,43 +355,60 @@ class DomService:
 			)
 
 		start = time.time()
+		cdp_timing: dict[str, float] = {}
+
+		async def timed(key: str, request: Awaitable[Any]) -> Any:
+			request_start = time.time()
+			result = await request
+			cdp_timing[f'cdp_{key}'] = time.time() - request_start
+			return result
 
 		# Create initial tasks
 		tasks = {
-			'snapshot': asyncio.create_task(create_snapshot_request()),
-			'dom_tree': asyncio.create_task(create_dom_tree_request()),
-			'ax_tree': asyncio.create_task(self._get_ax_tree_for_all_frames(target_id)),
-			'device_pixel_ratio': asyncio.create_task(self._get_viewport_ratio(target_id)),
+			'snapshot': asyncio.create_task(timed('snapshot', create_snapshot_request())),
+			'dom_tree': asyncio.create_task(timed('dom_tree', create_dom_tree_request())),
+			'ax_tree': asyncio.create_task(timed('ax_tree', self._get_ax_tree_for_all_frames(target_id, cdp_timing))),
+			'device_pixel_ratio': asyncio.create_task(timed('device_pixel_ratio', self._get_viewport_ratio(target_id))),
 		}
 
-		# Wait for all tasks with timeout
-		done, pending = await asyncio.wait(tasks.values(), timeout=10.0)
-
-		# Retry any failed or timed out tasks
-		if pending:
-			for task in pending:
-				task.cancel()
-
-			# Retry mapping for pending tasks
-			retry_map = {
-				tasks['snapshot']: lambda: asyncio.create_task(create_snapshot_request()),
-				tasks['dom_tree']: lambda: asyncio.create_task(create_dom_tree_request()),
-				tasks['ax_tree']: lambda: asyncio.create_task(self._get_ax_tree_for_all_frames(target_id)),
-				tasks['device_pixel_ratio']: lambda: asyncio.create_task(self._get_viewport_ratio(target_id)),
-			}
-
-			# Create new tasks only for the ones that didn't complete
-			for key, task in tasks.items():
-				if task in pending and task in retry_map:
-					tasks[key] = retry_map[task]()
-
-			# Wait again with shorter timeout
-			done2, pending2 = await asyncio.wait([t for t in tasks.values() if not t.done()], timeout=2.0)
+		try:
+			# Wait for all tasks with timeout
+			done, pending = await asyncio.wait(tasks.values(), timeout=10.0)
 
-			if pending2:
-				for task in pending2:
+			# Retry any failed or timed out tasks
+			if pending:
+				for task in pending:
 					task.cancel()
 
+				# Retry mapping for pending tasks
+				retry_map = {
+					tasks['snapshot']: lambda: asyncio.create_task(timed('snapshot', create_snapshot_request())),
+					tasks['dom_tree']: lambda: asyncio.create_task(timed('dom_tree', create_dom_tree_request())),
+					tasks['ax_tree']: lambda: asyncio.create_task(
+						timed('ax_tree', self._get_ax_tree_for_all_frames(target_id, cdp_timing))
+					),
+					tasks['device_pixel_ratio']: lambda: asyncio.create_task(
+						timed('device_pixel_ratio', self._get_viewport_ratio(target_id))
+					),
+				}
+
+				# Create new tasks only for the ones that didn't complete
+				for key, task in tasks.items():
+					if task in pending and task in retry_map:
+						tasks[key] = retry_map[task]()
+
+				# Wait again with shorter timeout
+				done2, pending2 = await asyncio.wait([t for t in tasks.values() if not t.done()], timeout=2.0)
+
+				if pending2:
+					for task in pending2:
+						task.cancel()
+		except asyncio.CancelledError:
+			# e.g. the frame timeout of a cross origin iframe, don't leave the requests running
+			for task in tasks.values():
+				task.cancel()
+			raise
+
 		# Extract results, tracking which ones failed
 		results = {}
 		failed = []
@@ -417,7 +432,7 @@ class DomService:
 		ax_tree = results['ax_tree']
 		device_pixel_ratio = results['device_pixel_ratio']
 		end = time.time()
-		cdp_timing = {'cdp_calls_total': end - start}
+		cdp_timing['cdp_calls_total'] = end - start
 
 		# DEBUG: Log snapshot info and limit documents to prevent explosion
 		if snapshot and 'documents' in snapshot:
@@ -446,6 +461,7 @@ class DomService:
 			cdp_timing=cdp_timing,
 		)
 
+	@traced(category='dom')
 	async def get_dom_tree(
 		self,
 		target_id: TargetID,
@@ -462,7 +478,8 @@ class DomService:
 			iframe_depth: Current depth of iframe nesting to prevent infinite recursion
 		"""
 
-		trees = await self._get_all_trees(target_id)
+		trees = await self._capture_trees(target_id, timeout=self.frame_timeout if iframe_depth else None)
+		self.capture_timing[target_id] = trees.cdp_timing
 
 		dom_tree = trees.dom_tree
 		ax_tree = trees.ax_tree
@@ -473,110 +490,85 @@ class DomService:
 			ax_node['backendDOMNodeId']: ax_node for ax_node in ax_tree['nodes'] if 'backendDOMNodeId' in ax_node
 		}
 
-		enhanced_dom_tree_node_lookup: dict[int, EnhancedDOMTreeNode] = {}
-		""" NodeId (NOT backend node id) -> enhanced dom tree node"""  # way to get the parent/content node
+		# all nodes of this target are rows of one store, the nodes handed out are views of it
+		store = DomStore()
+		view = EnhancedDOMTreeNode._view
+
+		enhanced_dom_tree_node_lookup: dict[int, int] = {}
+		""" NodeId (NOT backend node id) -> index of the node in the store"""  # way to get the parent/content node
 
 		# Parse snapshot data with everything calculated upfront
 		snapshot_lookup = build_snapshot_lookup(snapshot, device_pixel_ratio)
 
-		async def _construct_enhanced_node(
-			node: Node, html_frames: list[EnhancedDOMTreeNode] | None, total_frame_offset: DOMRect | None
-		) -> EnhancedDOMTreeNode:
+		def _create_enhanced_node(
+			node: Node, html_frames: list[EnhancedDOMTreeNode], total_frame_offset: DOMRect
+		) -> tuple[int, list[EnhancedDOMTreeNode], DOMRect]:
 			"""
-			Recursively construct enhanced DOM tree nodes.
+			Add one enhanced DOM tree node to the store, without its subtree.
 
-			Args:
-				node: The DOM node to construct
-				html_frames: List of HTML frame nodes encountered so far
-				accumulated_iframe_offset: Accumulated coordinate translation from parent iframes (includes scroll corrections)
+			Returns the index of the node together with the HTML frames and the accumulated frame offset its subtree is
+			built with. Both are only copied when they change, so siblings share them.
 			"""
-
-			# Initialize lists if not provided
-			if html_frames is None:
-				html_frames = []
-
-			# to get rid of the pointer references
-			if total_frame_offset is None:
-				total_frame_offset = DOMRect(x=0.0, y=0.0, width=0.0, height=0.0)
-			else:
-				total_frame_offset = DOMRect(
-					total_frame_offset.x, total_frame_offset.y, total_frame_offset.width, total_frame_offset.height
-				)
-
-			# memoize the mf (I don't know if some nodes are duplicated)
-			if node['nodeId'] in enhanced_dom_tree_node_lookup:
-				return enhanced_dom_tree_node_lookup[node['nodeId']]
-
-			ax_node = ax_tree_lookup.get(node['backendNodeId'])
-			if ax_node:
-				enhanced_ax_node = self._build_enhanced_ax_node(ax_node)
-			else:
-				enhanced_ax_node = None
-
-			# To make attributes more readable
-			attributes: dict[str, str] | None = None
-			if 'attributes' in node and node['attributes']:
-				attributes = {}
-				for i in range(0, len(node['attributes']), 2):
-					attributes[node['attributes'][i]] = node['attributes'][i + 1]
-
-			shadow_root_type = None
-			if 'shadowRootType' in node and node['shadowRootType']:
-				try:
-					shadow_root_type = node['shadowRootType']
-				except ValueError:
-					pass
-
-			# Get snapshot data and calculate absolute position
-			snapshot_data = snapshot_lookup.get(node['backendNodeId'], None)
-			absolute_position = None
-			if snapshot_data and snapshot_data.bounds:
-				absolute_position = DOMRect(
-					x=snapshot_data.bounds.x + total_frame_offset.x,
-					y=snapshot_data.bounds.y + total_frame_offset.y,
-					width=snapshot_data.bounds.width,
-					height=snapshot_data.bounds.height,
-				)
-
-			dom_tree_node = EnhancedDOMTreeNode(
+			index = store.add_node(
 				node_id=node['nodeId'],
 				backend_node_id=node['backendNodeId'],
-				node_type=NodeType(node['nodeType']),
+				node_type=node['nodeType'],
 				node_name=node['nodeName'],
 				node_value=node['nodeValue'],
-				attributes=attributes or {},
+				attributes=node.get('attributes'),
 				is_scrollable=node.get('isScrollable', None),
-				frame_id=node.get('frameId', None),
-				session_id=self.browser_session.agent_focus.session_id if self.browser_session.agent_focus else None,
 				target_id=target_id,
-				content_document=None,
-				shadow_root_type=shadow_root_type,
-				shadow_roots=None,
-				parent_node=None,
-				children_nodes=None,
-				ax_node=enhanced_ax_node,
-				snapshot_node=snapshot_data,
-				is_visible=None,
-				absolute_position=absolute_position,
-				element_index=None,
+				frame_id=node.get('frameId', None),
+				session_id=session_id,
+				shadow_root_type=node.get('shadowRootType') or None,
 			)
 
-			enhanced_dom_tree_node_lookup[node['nodeId']] = dom_tree_node
+			ax_node = ax_tree_lookup.get(node['backendNodeId'])
+			if ax_node:
+				store.add_cdp_ax_node(index, ax_node)
+
+			# Get snapshot data and calculate absolute position
+			snapshot_data = snapshot_lookup.get(node['backendNodeId'], None)
+			if snapshot_data:
+				store.add_snapshot(
+					index,
+					is_clickable=snapshot_data.is_clickable,
+					cursor_style=snapshot_data.cursor_style,
+					bounds=snapshot_data.bounds,
+					client_rects=snapshot_data.clientRects,
+					scroll_rects=snapshot_data.scrollRects,
+					computed_styles=snapshot_data.computed_styles,
+					paint_order=snapshot_data.paint_order,
+					stacking_contexts=snapshot_data.stacking_contexts,
+				)
+				if snapshot_data.bounds:
+					store.set_position(
+						index,
+						(
+							snapshot_data.bounds.x + total_frame_offset.x,
+							snapshot_data.bounds.y + total_frame_offset.y,
+							snapshot_data.bounds.width,
+							snapshot_data.bounds.height,
+						),
+					)
+
+			enhanced_dom_tree_node_lookup[node['nodeId']] = index
 
 			if 'parentId' in node and node['parentId']:
-				dom_tree_node.parent_node = enhanced_dom_tree_node_lookup[
-					node['parentId']
-				]  # parents should always be in the lookup
+				store.parent[index] = enhanced_dom_tree_node_lookup[node['parentId']]  # parents should always be in the lookup
 
 			# Check if this is an HTML frame node and add it to the list
-			updated_html_frames = html_frames.copy()
 			if node['nodeType'] == NodeType.ELEMENT_NODE.value and node['nodeName'] == 'HTML' and node.get('frameId') is not None:
-				updated_html_frames.append(dom_tree_node)
+				html_frames = [*html_frames, view(store, index)]
 
 				# and adjust the total frame offset by scroll
 				if snapshot_data and snapshot_data.scrollRects:
-					total_frame_offset.x -= snapshot_data.scrollRects.x
-					total_frame_offset.y -= snapshot_data.scrollRects.y
+					total_frame_offset = DOMRect(
+						x=total_frame_offset.x - snapshot_data.scrollRects.x,
+						y=total_frame_offset.y - snapshot_data.scrollRects.y,
+						width=total_frame_offset.width,
+						height=total_frame_offset.height,
+					)
 					# DEBUG: Log iframe scroll information
 					self.logger.debug(
 						f'🔍 DEBUG: HTML frame scroll - scrollY={snapshot_data.scrollRects.y}, scrollX={snapshot_data.scrollRects.x}, frameId={node.get("frameId")}, nodeId={node["nodeId"]}'
@@ -588,128 +580,209 @@ class DomService:
 				and snapshot_data
 				and snapshot_data.bounds
 			):
-				if snapshot_data.bounds:
-					updated_html_frames.append(dom_tree_node)
+				html_frames = [*html_frames, view(store, index)]
+				total_frame_offset = DOMRect(
+					x=total_frame_offset.x + snapshot_data.bounds.x,
+					y=total_frame_offset.y + snapshot_data.bounds.y,
+					width=total_frame_offset.width,
+					height=total_frame_offset.height,
+				)
 
-					total_frame_offset.x += snapshot_data.bounds.x
-					total_frame_offset.y += snapshot_data.bounds.y
+			return index, html_frames, total_frame_offset
+
+		session_id = self.browser_session.agent_focus.session_id if self.browser_session.agent_focus else None
+		is_visible_in_frames = self.is_element_visible_according_to_all_parents
+		debug = self.logger.isEnabledFor(logging.DEBUG)
+		root_offset = initial_total_frame_offset or DOMRect(x=0.0, y=0.0, width=0.0, height=0.0)
+		cross_origin_iframes: list[tuple[EnhancedDOMTreeNode, Node, DOMRect]] = []
+		root = NO_INDEX
+
+		# Depth-first traversal with an explicit stack, so deeply nested pages don't hit the recursion limit.
+		# A node is visited in the order content document -> shadow roots -> children, and its visibility is only
+		# computed after its whole subtree (the visibility check shifts the bounds of the nodes inside iframes).
+		# Entries are (node, html frames, frame offset, parent index, relation to the parent), or a finished node to close.
+		stack: list[
+			tuple[Node, list[EnhancedDOMTreeNode], DOMRect, int, str] | tuple[Node, int, list[EnhancedDOMTreeNode], DOMRect]
+		] = [(dom_tree['root'], initial_html_frames or [], root_offset, NO_INDEX, '')]
+		while stack:
+			entry = stack.pop()
+			if len(entry) == 4:
+				node, index, html_frames, total_frame_offset = entry
+				dom_tree_node = view(store, index)
+
+				# Set visibility using the collected HTML frames
+				dom_tree_node.is_visible = is_visible_in_frames(dom_tree_node, html_frames)
+
+				# DEBUG: Log visibility info for form elements in iframes
+				if (
+					debug
+					and dom_tree_node.tag_name
+					and dom_tree_node.tag_name.upper() in ['INPUT', 'SELECT', 'TEXTAREA', 'LABEL']
+				):
+					attrs = dom_tree_node.attributes or {}
+					elem_id = attrs.get('id', '')
+					elem_name = attrs.get('name', '')
+					if (
+						'city' in elem_id.lower()
+						or 'city' in elem_name.lower()
+						or 'state' in elem_id.lower()
+						or 'state' in elem_name.lower()
+						or 'zip' in elem_id.lower()
+						or 'zip' in elem_name.lower()
+					):
+						self.logger.debug(
+							f"🔍 DEBUG: Form element {dom_tree_node.tag_name} id='{elem_id}' name='{elem_name}' - visible={dom_tree_node.is_visible}, bounds={dom_tree_node.snapshot_node.bounds if dom_tree_node.snapshot_node else 'NO_SNAPSHOT'}"
+						)
 
-			if 'contentDocument' in node and node['contentDocument']:
-				dom_tree_node.content_document = await _construct_enhanced_node(
-					node['contentDocument'], updated_html_frames, total_frame_offset
-				)
-				dom_tree_node.content_document.parent_node = dom_tree_node
+				# handle cross origin iframes after the traversal, see _attach_cross_origin_iframe
+				if (
+					# TODO: hacky way to disable cross origin iframes for now
+					self.cross_origin_iframes
+					and node['nodeName'].upper() == 'IFRAME'
+					and node.get('contentDocument', None) is None
+				):  # None meaning there is no content
+					cross_origin_iframes.append((dom_tree_node, node, total_frame_offset))
+				continue
+
+			node, html_frames, total_frame_offset, parent, relation = entry
+
+			# memoize the mf (I don't know if some nodes are duplicated)
+			memoized = node['nodeId'] in enhanced_dom_tree_node_lookup
+			if memoized:
+				index = enhanced_dom_tree_node_lookup[node['nodeId']]
+			else:
+				index, html_frames, total_frame_offset = _create_enhanced_node(node, html_frames, total_frame_offset)
+
+			if parent == NO_INDEX:
+				root = index
+			elif relation == 'content_document':
+				store.content_document[parent] = index
 				# forcefully set the parent node to the content document node (helps traverse the tree)
+				store.parent[index] = parent
+			elif relation == 'shadow_root':
+				# forcefully set the parent node to the shadow root node (helps traverse the tree)
+				store.parent[index] = parent
+				store.append_shadow_root(parent, index)
+			else:
+				store.append_child(parent, index)
 
-			if 'shadowRoots' in node and node['shadowRoots']:
-				dom_tree_node.shadow_roots = []
-				for shadow_root in node['shadowRoots']:
-					shadow_root_node = await _construct_enhanced_node(shadow_root, updated_html_frames, total_frame_offset)
-					# forcefully set the parent node to the shadow root node (helps traverse the tree)
-					shadow_root_node.parent_node = dom_tree_node
-					dom_tree_node.shadow_roots.append(shadow_root_node)
+			if memoized:
+				continue
 
+			stack.append((node, index, html_frames, total_frame_offset))
 			if 'children' in node and node['children']:
-				dom_tree_node.children_nodes = []
-				for child in node['children']:
-					dom_tree_node.children_nodes.append(
-						await _construct_enhanced_node(child, updated_html_frames, total_frame_offset)
-					)
+				store.reserve_children(index, len(node['children']))
+				for child in reversed(node['children']):
+					stack.append((child, html_frames, total_frame_offset, index, 'child'))
+			if 'shadowRoots' in node and node['shadowRoots']:
+				store.reserve_shadow_roots(index, len(node['shadowRoots']))
+				for shadow_root in reversed(node['shadowRoots']):
+					stack.append((shadow_root, html_frames, total_frame_offset, index, 'shadow_root'))
+			if 'contentDocument' in node and node['contentDocument']:
+				stack.append((node['contentDocument'], html_frames, total_frame_offset, index, 'content_document'))
 
-			# Set visibility using the collected HTML frames
-			dom_tree_node.is_visible = self.is_element_visible_according_to_all_parents(dom_tree_node, updated_html_frames)
+		if cross_origin_iframes:
+			await self._attach_cross_origin_iframes(cross_origin_iframes, iframe_depth)
 
-			# DEBUG: Log visibility info for form elements in iframes
-			if dom_tree_node.tag_name and dom_tree_node.tag_name.upper() in ['INPUT', 'SELECT', 'TEXTAREA', 'LABEL']:
-				attrs = dom_tree_node.attributes or {}
-				elem_id = attrs.get('id', '')
-				elem_name = attrs.get('name', '')
-				if (
-					'city' in elem_id.lower()
-					or 'city' in elem_name.lower()
-					or 'state' in elem_id.lower()
-					or 'state' in elem_name.lower()
-					or 'zip' in elem_id.lower()
-					or 'zip' in elem_name.lower()
-				):
-					self.logger.debug(
-						f"🔍 DEBUG: Form element {dom_tree_node.tag_name} id='{elem_id}' name='{elem_name}' - visible={dom_tree_node.is_visible}, bounds={dom_tree_node.snapshot_node.bounds if dom_tree_node.snapshot_node else 'NO_SNAPSHOT'}"
-					)
+		assert root != NO_INDEX
+		return view(store, root)
 
-			# handle cross origin iframe (just recursively call the main function with the proper target if it exists in iframes)
-			# only do this if the iframe is visible (otherwise it's not worth it)
+	async def _capture_trees(self, target_id: TargetID, timeout: float | None = None) -> TargetAllTrees:
+		"""Capture the trees of a target, at most `max_concurrent_frames` targets at a time.
 
-			if (
-				# TODO: hacky way to disable cross origin iframes for now
-				self.cross_origin_iframes and node['nodeName'].upper() == 'IFRAME' and node.get('contentDocument', None) is None
-			):  # None meaning there is no content
-				# Check iframe depth to prevent infinite recursion
-				if iframe_depth >= self.max_iframe_depth:
-					self.logger.debug(
-						f'Skipping iframe at depth {iframe_depth} to prevent infinite recursion (max depth: {self.max_iframe_depth})'
-					)
-				else:
-					# Check if iframe is visible and large enough (>= 200px in both dimensions)
-					should_process_iframe = False
-
-					# First check if the iframe element itself is visible
-					if dom_tree_node.is_visible:
-						# Check iframe dimensions
-						if dom_tree_node.snapshot_node and dom_tree_node.snapshot_node.bounds:
-							bounds = dom_tree_node.snapshot_node.bounds
-							width = bounds.width
-							height = bounds.height
-
-							# Only process if iframe is at least 200px in both dimensions
-							if width >= 200 and height >= 200:
-								should_process_iframe = True
-								self.logger.debug(f'Processing cross-origin iframe: visible=True, width={width}, height={height}')
-							else:
-								self.logger.debug(
-									f'Skipping small cross-origin iframe: width={width}, height={height} (needs >= 200px)'
-								)
-						else:
-							self.logger.debug('Skipping cross-origin iframe: no bounds available')
-					else:
-						self.logger.debug('Skipping invisible cross-origin iframe')
-
-					if should_process_iframe:
-						# Use get_all_frames to find the iframe's target
-						frame_id = node.get('frameId', None)
-						if frame_id:
-							all_frames, _ = await self.browser_session.get_all_frames()
-							frame_info = all_frames.get(frame_id)
-							iframe_document_target = None
-							if frame_info and frame_info.get('frameTargetId'):
-								# Get the target info for this iframe
-								targets = await self.browser_session.cdp_client.send.Target.getTargets()
-								iframe_document_target = next(
-									(t for t in targets['targetInfos'] if t['targetId'] == frame_info['frameTargetId']), None
-								)
-						else:
-							iframe_document_target = None
-						# if target actually exists in one of the frames, just recursively build the dom tree for it
-						if iframe_document_target:
-							self.logger.debug(
-								f'Getting content document for iframe {node.get("frameId", None)} at depth {iframe_depth + 1}'
-							)
-							content_document = await self.get_dom_tree(
-								target_id=iframe_document_target.get('targetId'),
-								# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
-								# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
-								# initial_html_frames=updated_html_frames,
-								initial_total_frame_offset=total_frame_offset,
-								iframe_depth=iframe_depth + 1,
-							)
-
-							dom_tree_node.content_document = content_document
-							dom_tree_node.content_document.parent_node = dom_tree_node
-
-			return dom_tree_node
-
-		enhanced_dom_tree_node = await _construct_enhanced_node(dom_tree['root'], initial_html_frames, initial_total_frame_offset)
-
-		return enhanced_dom_tree_node
+		Only the CDP calls hold a slot, not the tree building or the iframes nested in the target, which are
+		captured afterwards.
+		"""
+		async with self._capture_slots:
+			if timeout is None:
+				return await self._get_all_trees(target_id)
+			return await asyncio.wait_for(self._get_all_trees(target_id), timeout=timeout)
+
+	def _should_process_cross_origin_iframe(self, dom_tree_node: EnhancedDOMTreeNode) -> bool:
+		"""Only visible iframes of at least 200x200px are worth capturing"""
+		if not dom_tree_node.is_visible:
+			self.logger.debug('Skipping invisible cross-origin iframe')
+			return False
+
+		if not dom_tree_node.snapshot_node or not dom_tree_node.snapshot_node.bounds:
+			self.logger.debug('Skipping cross-origin iframe: no bounds available')
+			return False
+
+		width = dom_tree_node.snapshot_node.bounds.width
+		height = dom_tree_node.snapshot_node.bounds.height
+		if width < 200 or height < 200:
+			self.logger.debug(f'Skipping small cross-origin iframe: width={width}, height={height} (needs >= 200px)')
+			return False
+
+		self.logger.debug(f'Processing cross-origin iframe: visible=True, width={width}, height={height}')
+		return True
+
+	async def _attach_cross_origin_iframes(
+		self, iframes: list[tuple[EnhancedDOMTreeNode, Node, DOMRect]], iframe_depth: int
+	) -> None:
+		"""Build the DOM trees of the cross origin iframes of a page and attach them as the iframes' content documents.
+
+		The iframe targets are looked up once for all iframes, then their trees are captured concurrently (see
+		`_capture_trees`, each one with `frame_timeout`) and grafted into the page's tree once all of them are done.
+		An iframe that times out or fails is left without content document.
+		"""
+		# Check iframe depth to prevent infinite recursion
+		if iframe_depth >= self.max_iframe_depth:
+			self.logger.debug(
+				f'Skipping iframe at depth {iframe_depth} to prevent infinite recursion (max depth: {self.max_iframe_depth})'
+			)
+			return
+
+		iframes = [iframe for iframe in iframes if self._should_process_cross_origin_iframe(iframe[0])]
+		if not iframes:
+			return
+
+		# Use get_all_frames to find the iframes' targets
+		all_frames, _ = await self.browser_session.get_all_frames()
+		targets = await self.browser_session.cdp_client.send.Target.getTargets()
+		target_ids = {target['targetId'] for target in targets['targetInfos']}
+
+		# if target actually exists in one of the frames, build the dom tree for it
+		to_capture: list[tuple[EnhancedDOMTreeNode, TargetID, DOMRect]] = []
+		for dom_tree_node, node, total_frame_offset in iframes:
+			frame_info = all_frames.get(node['frameId']) if node.get('frameId') else None
+			iframe_target_id = frame_info.get('frameTargetId') if frame_info else None
+			if iframe_target_id and iframe_target_id in target_ids:
+				to_capture.append((dom_tree_node, iframe_target_id, total_frame_offset))
+
+		content_documents = await asyncio.gather(
+			*(
+				self._get_cross_origin_iframe_tree(iframe_target_id, total_frame_offset, iframe_depth + 1)
+				for _, iframe_target_id, total_frame_offset in to_capture
+			)
+		)
+
+		for (dom_tree_node, _, _), content_document in zip(to_capture, content_documents):
+			if content_document is not None:
+				dom_tree_node.content_document = content_document
+				content_document.parent_node = dom_tree_node
+
+	async def _get_cross_origin_iframe_tree(
+		self, target_id: TargetID, total_frame_offset: DOMRect, iframe_depth: int
+	) -> EnhancedDOMTreeNode | None:
+		self.logger.debug(f'Getting content document for iframe target {target_id[-4:]} at depth {iframe_depth}')
+		start = time.time()
+		try:
+			return await self.get_dom_tree(
+				target_id=target_id,
+				# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
+				# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
+				# initial_html_frames=updated_html_frames,
+				initial_total_frame_offset=total_frame_offset,
+				iframe_depth=iframe_depth,
+			)
+		except TimeoutError:
+			self.logger.debug(f'Skipping cross-origin iframe target {target_id[-4:]}: no trees after {self.frame_timeout}s')
+			self.capture_timing[target_id] = {'timeout': time.time() - start}
+		except Exception as e:
+			self.logger.debug(f'Skipping cross-origin iframe target {target_id[-4:]}: {type(e).__name__}: {e}')
+			self.capture_timing[target_id] = {'failed': time.time() - start}
+		return None
 
 	async def get_serialized_dom_tree(
 		self, previous_cached_state: SerializedDOMState | None = None
@@ -721,18 +794,24 @@ class DomService:
 		"""
 
 		# Use current target (None means use current)
-		assert self.browser_session.current_target_id is not None
-		enhanced_dom_tree = await self.get_dom_tree(target_id=self.browser_session.current_target_id)
+		target_id = self.browser_session.current_target_id
+		assert target_id is not None
+		self.capture_timing = {}
+		enhanced_dom_tree = await self.get_dom_tree(target_id=target_id)
 
 		start = time.time()
-		serialized_dom_state, serializer_timing = DOMTreeSerializer(
-			enhanced_dom_tree, previous_cached_state, paint_order_filtering=self.paint_order_filtering
-		).serialize_accessible_elements()
+		with profiler.span('serialize_dom_tree', 'serializer'):
+			serialized_dom_state, serializer_timing = DOMTreeSerializer(
+				enhanced_dom_tree, previous_cached_state, paint_order_filtering=self.paint_order_filtering
+			).serialize_accessible_elements()
 
 		end = time.time()
 		serialize_total_timing = {'serialize_dom_tree_total': end - start}
 
-		# Combine all timing info
+		# Combine all timing info, the captures of cross origin iframes per target
 		all_timing = {**serializer_timing, **serialize_total_timing}
+		for captured_target_id, cdp_timing in self.capture_timing.items():
+			prefix = '' if captured_target_id == target_id else f'iframe_{captured_target_id[-4:]}_'
+			all_timing.update({f'{prefix}{key}': value for key, value in cdp_timing.items()})
 
 		return serialized_dom_state, enhanced_dom_tree, all_timing
@@ -0,0 +1,374 @@
+"""
+Columnar storage for enhanced DOM trees.
+
+A page can have tens of thousands of nodes. Instead of a graph of Python objects per node (the node, its attribute
+dict, AX node, snapshot node and rects), `DomService` writes every node as one row of parallel arrays in a `DomStore`,
+with all strings interned once per tree. `EnhancedDOMTreeNode` and its AX node, snapshot node and rects are thin views
+over these rows (see `browser_use.dom.views`), made on access, so the existing attribute API keeps working.
+"""
+
+from array import array
+from typing import Any
+
+NO_INDEX = -1
+"""No node / no row / no string (None)"""
+FOREIGN = -2
+"""The link points to a node of another store, e.g. the document of a cross-origin iframe, see `DomStore.foreign`"""
+
+# node flags
+IS_VISIBLE_SET = 1
+IS_VISIBLE = 2
+IS_SCROLLABLE_SET = 4
+IS_SCROLLABLE = 8
+HAS_POSITION = 16
+
+# snapshot flags
+HAS_BOUNDS = 1
+HAS_CLIENT_RECTS = 2
+HAS_SCROLL_RECTS = 4
+HAS_PAINT_ORDER = 8
+HAS_STACKING_CONTEXTS = 16
+
+_EMPTY_RECT = (0.0, 0.0, 0.0, 0.0)
+
+
+class StringTable:
+	"""Interned strings referenced by their index, `NO_INDEX` stands for None"""
+
+	__slots__ = ('strings', '_ids')
+
+	def __init__(self) -> None:
+		self.strings: list[str] = []
+		self._ids: dict[str, int] = {}
+
+	def add(self, value: str | None) -> int:
+		if value is None:
+			return NO_INDEX
+		index = self._ids.get(value)
+		if index is None:
+			index = self._ids[value] = len(self.strings)
+			self.strings.append(value)
+		return index
+
+	def get(self, index: int) -> str | None:
+		return self.strings[index] if index >= 0 else None
+
+	def __len__(self) -> int:
+		return len(self.strings)
+
+
+class DomStore:
+	"""
+	The nodes of one DOM tree as rows of parallel arrays.
+
+	Every node has a row in the node columns. Snapshot and AX data have tables of their own, referenced by
+	`snapshot` / `ax` (`NO_INDEX` if the node has none). Children and shadow roots of a node are a block of
+	`children_count` entries in `children` starting at `children_start` (a count of `NO_INDEX` is None), rects are 4
+	consecutive floats (x, y, width, height). Strings (names, values, attributes, ids) are indexes into `strings`.
+	"""
+
+	def __init__(self) -> None:
+		self.strings = StringTable()
+
+		# node columns
+		self.node_id = array('q')
+		self.backend_node_id = array('q')
+		self.node_type = array('b')
+		self.node_name = array('i')
+		self.node_value = array('i')
+		self.attribute_start = array('i')
+		self.attribute_count = array('i')
+		self.flags = array('B')
+		self.parent = array('i')
+		self.content_document = array('i')
+		self.children_start = array('i')
+		self.children_count = array('i')
+		self.shadow_root_start = array('i')
+		self.shadow_root_count = array('i')
+		self.shadow_root_type = array('i')
+		self.frame_id = array('i')
+		self.target_id = array('i')
+		self.session_id = array('i')
+		self.element_index = array('i')
+		self.position = array('d')
+		self.snapshot = array('i')
+		self.ax = array('i')
+
+		# flat lists the node columns point into
+		self.attributes = array('i')
+		"""name, value, name, value, ..."""
+		self.children = array('i')
+		self.shadow_roots = array('i')
+
+		# snapshot table
+		self.snapshot_flags = array('B')
+		self.snapshot_clickable = array('b')
+		self.snapshot_cursor = array('i')
+		self.snapshot_bounds = array('d')
+		self.snapshot_client_rects = array('d')
+		self.snapshot_scroll_rects = array('d')
+		self.snapshot_styles = array('i')
+		self.snapshot_paint_order = array('q')
+		self.snapshot_stacking_contexts = array('q')
+		self.styles: list[dict[str, str]] = []
+		"""Distinct computed style dicts, shared by all snapshot rows with the same styles"""
+		self._style_ids: dict[tuple[tuple[str, str], ...], int] = {}
+
+		# AX table
+		self.ax_node_id = array('i')
+		self.ax_ignored = array('b')
+		self.ax_role = array('i')
+		self.ax_name = array('i')
+		self.ax_description = array('i')
+		self.ax_property_start = array('i')
+		self.ax_property_count = array('i')
+		self.ax_property_names = array('i')
+		self.ax_property_values: list[Any] = []
+		self.ax_child_start = array('i')
+		self.ax_child_count = array('i')
+		self.ax_child_ids = array('i')
+
+		# rarely set per-node data
+		self.foreign: dict[tuple[int, str], Any] = {}
+		"""(node, field) -> links to nodes of other stores, for fields set to `FOREIGN`"""
+		self.compound_children: dict[int, list[dict[str, Any]]] = {}
+		self.uuids: dict[int, str] = {}
+		self.views: list[Any] = []
+		"""The `EnhancedDOMTreeNode` of each node, None until first accessed"""
+
+	def __len__(self) -> int:
+		return len(self.node_id)
+
+	def add_node(
+		self,
+		node_id: int,
+		backend_node_id: int,
+		node_type: int,
+		node_name: str,
+		node_value: str,
+		attributes: list[str] | None,
+		is_scrollable: bool | None,
+		target_id: str,
+		frame_id: str | None,
+		session_id: str | None,
+		shadow_root_type: str | None,
+	) -> int:
+		"""Add a node without links, snapshot or AX data and return its index. `attributes` is CDP's flat name/value list"""
+		index = len(self.node_id)
+		strings = self.strings
+		self.node_id.append(node_id)
+		self.backend_node_id.append(backend_node_id)
+		self.node_type.append(node_type)
+		self.node_name.append(strings.add(node_name))
+		self.node_value.append(strings.add(node_value))
+
+		if attributes:
+			self.attribute_start.append(len(self.attributes))
+			self.attribute_count.append(len(attributes) // 2)
+			self.attributes.extend([strings.add(value) for value in attributes])
+		else:
+			self.attribute_start.append(0)
+			self.attribute_count.append(0)
+
+		self.flags.append(0 if is_scrollable is None else IS_SCROLLABLE_SET | (IS_SCROLLABLE if is_scrollable else 0))
+		self.parent.append(NO_INDEX)
+		self.content_document.append(NO_INDEX)
+		self.children_start.append(0)
+		self.children_count.append(NO_INDEX)
+		self.shadow_root_start.append(0)
+		self.shadow_root_count.append(NO_INDEX)
+		self.shadow_root_type.append(strings.add(shadow_root_type))
+		self.frame_id.append(strings.add(frame_id))
+		self.target_id.append(strings.add(target_id))
+		self.session_id.append(strings.add(session_id))
+		self.element_index.append(NO_INDEX)
+		self.position.extend(_EMPTY_RECT)
+		self.snapshot.append(NO_INDEX)
+		self.ax.append(NO_INDEX)
+		self.views.append(None)
+		return index
+
+	def get_attributes(self, index: int) -> dict[str, str]:
+		count = self.attribute_count[index]
+		if not count:
+			return {}
+		strings = self.strings.strings
+		start = self.attribute_start[index]
+		values = self.attributes[start : start + 2 * count]
+		return {strings[values[i]]: strings[values[i + 1]] for i in range(0, 2 * count, 2)}
+
+	def set_attributes(self, index: int, attributes: dict[str, str]) -> None:
+		self.attribute_start[index] = len(self.attributes)
+		self.attribute_count[index] = len(attributes)
+		for name, value in attributes.items():
+			self.attributes.append(self.strings.add(name))
+			self.attributes.append(self.strings.add(value))
+
+	def set_flag(self, index: int, is_set_flag: int, value_flag: int, value: bool | None) -> None:
+		flags = self.flags[index] & ~(is_set_flag | value_flag)
+		if value is not None:
+			flags |= is_set_flag | (value_flag if value else 0)
+		self.flags[index] = flags
+
+	def set_position(self, index: int, rect: tuple[float, float, float, float] | None) -> None:
+		if rect is None:
+			self.flags[index] &= ~HAS_POSITION
+			return
+		offset = 4 * index
+		position = self.position
+		position[offset], position[offset + 1], position[offset + 2], position[offset + 3] = rect
+		self.flags[index] |= HAS_POSITION
+
+	# --- children and shadow roots ---
+
+	def reserve_children(self, index: int, count: int) -> None:
+		"""Make room for `count` children of a node, which are then added with `append_child`"""
+		self.children_start[index] = len(self.children)
+		self.children_count[index] = 0
+		self.children.extend(array('i', [NO_INDEX]) * count)
+
+	def append_child(self, index: int, child: int) -> None:
+		count = self.children_count[index]
+		self.children[self.children_start[index] + count] = child
+		self.children_count[index] = count + 1
+
+	def reserve_shadow_roots(self, index: int, count: int) -> None:
+		self.shadow_root_start[index] = len(self.shadow_roots)
+		self.shadow_root_count[index] = 0
+		self.shadow_roots.extend(array('i', [NO_INDEX]) * count)
+
+	def append_shadow_root(self, index: int, shadow_root: int) -> None:
+		count = self.shadow_root_count[index]
+		self.shadow_roots[self.shadow_root_start[index] + count] = shadow_root
+		self.shadow_root_count[index] = count + 1
+
+	def set_children(self, index: int, children: list[int] | None) -> None:
+		if children is None:
+			self.children_count[index] = NO_INDEX
+			return
+		self.reserve_children(index, len(children))
+		for child in children:
+			self.append_child(index, child)
+
+	def set_shadow_roots(self, index: int, shadow_roots: list[int] | None) -> None:
+		if shadow_roots is None:
+			self.shadow_root_count[index] = NO_INDEX
+			return
+		self.reserve_shadow_roots(index, len(shadow_roots))
+		for shadow_root in shadow_roots:
+			self.append_shadow_root(index, shadow_root)
+
+	# --- snapshot table ---
+
+	def add_snapshot(
+		self,
+		index: int,
+		is_clickable: bool | None,
+		cursor_style: str | None,
+		bounds: Any | None,
+		client_rects: Any | None,
+		scroll_rects: Any | None,
+		computed_styles: dict[str, str] | None,
+		paint_order: int | None,
+		stacking_contexts: int | None,
+	) -> None:
+		"""Add a snapshot row for a node, rects are anything with x, y, width and height"""
+		self.snapshot[index] = len(self.snapshot_flags)
+		flags = 0
+		if bounds is not None:
+			flags |= HAS_BOUNDS
+			self.snapshot_bounds.extend((bounds.x, bounds.y, bounds.width, bounds.height))
+		else:
+			self.snapshot_bounds.extend(_EMPTY_RECT)
+		if client_rects is not None:
+			flags |= HAS_CLIENT_RECTS
+			self.snapshot_client_rects.extend((client_rects.x, client_rects.y, client_rects.width, client_rects.height))
+		else:
+			self.snapshot_client_rects.extend(_EMPTY_RECT)
+		if scroll_rects is not None:
+			flags |= HAS_SCROLL_RECTS
+			self.snapshot_scroll_rects.extend((scroll_rects.x, scroll_rects.y, scroll_rects.width, scroll_rects.height))
+		else:
+			self.snapshot_scroll_rects.extend(_EMPTY_RECT)
+		if paint_order is not None:
+			flags |= HAS_PAINT_ORDER
+		if stacking_contexts is not None:
+			flags |= HAS_STACKING_CONTEXTS
+
+		self.snapshot_flags.append(flags)
+		self.snapshot_clickable.append(NO_INDEX if is_clickable is None else int(is_clickable))
+		self.snapshot_cursor.append(self.strings.add(cursor_style))
+		self.snapshot_styles.append(self._add_styles(computed_styles))
+		self.snapshot_paint_order.append(paint_order or 0)
+		self.snapshot_stacking_contexts.append(stacking_contexts or 0)
+
+	def _add_styles(self, computed_styles: dict[str, str] | None) -> int:
+		if computed_styles is None:
+			return NO_INDEX
+		key = tuple(computed_styles.items())
+		style_id = self._style_ids.get(key)
+		if style_id is None:
+			style_id = self._style_ids[key] = len(self.styles)
+			self.styles.append(dict(computed_styles))
+		return style_id
+
+	# --- AX table ---
+
+	def add_ax_node(
+		self,
+		index: int,
+		ax_node_id: str,
+		ignored: bool,
+		role: str | None,
+		name: str | None,
+		description: str | None,
+		properties: list[tuple[str, Any]] | None,
+		child_ids: list[str] | None,
+	) -> None:
+		strings = self.strings
+		self.ax[index] = len(self.ax_node_id)
+		self.ax_node_id.append(strings.add(ax_node_id))
+		self.ax_ignored.append(int(ignored))
+		self.ax_role.append(strings.add(role))
+		self.ax_name.append(strings.add(name))
+		self.ax_description.append(strings.add(description))
+
+		if properties is None:
+			self.ax_property_start.append(0)
+			self.ax_property_count.append(NO_INDEX)
+		else:
+			self.ax_property_start.append(len(self.ax_property_names))
+			self.ax_property_count.append(len(properties))
+			for property_name, value in properties:
+				self.ax_property_names.append(strings.add(property_name))
+				self.ax_property_values.append(value)
+
+		if child_ids is None:
+			self.ax_child_start.append(0)
+			self.ax_child_count.append(NO_INDEX)
+		else:
+			self.ax_child_start.append(len(self.ax_child_ids))
+			self.ax_child_count.append(len(child_ids))
+			self.ax_child_ids.extend([strings.add(child_id) for child_id in child_ids])
+
+	def add_cdp_ax_node(self, index: int, ax_node: dict[str, Any]) -> None:
+		"""Add the AX row of a node from an `Accessibility.getFullAXTree` node"""
+		properties = None
+		if ax_node.get('properties'):
+			properties = [(prop['name'], prop.get('value', {}).get('value', None)) for prop in ax_node['properties']]
+		self.add_ax_node(
+			index,
+			ax_node_id=ax_node['nodeId'],
+			ignored=ax_node['ignored'],
+			role=ax_node.get('role', {}).get('value', None),
+			name=ax_node.get('name', {}).get('value', None),
+			description=ax_node.get('description', {}).get('value', None),
+			properties=properties,
+			child_ids=ax_node.get('childIds', []) if ax_node.get('childIds') else None,
+		)
+
+	def memory_usage(self) -> int:
+		"""Approximate bytes held by the columns and the string table"""
+		total = sum(column.itemsize * len(column) for column in vars(self).values() if isinstance(column, array))
+		total += sum(len(string) + 49 for string in self.strings.strings)
+		return total
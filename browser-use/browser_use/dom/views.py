@@ -1,5 +1,6 @@
 import hashlib
-from dataclasses import asdict, dataclass, field
+from array import array
+from dataclasses import asdict, dataclass
 from enum import Enum
 from typing import Any
 
@@ -11,6 +12,21 @@ from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
 from cdp_use.cdp.target.types import SessionID, TargetID, TargetInfo
 from uuid_extensions import uuid7str
 
+from browser_use.dom.store import (
+	FOREIGN,
+	HAS_BOUNDS,
+	HAS_CLIENT_RECTS,
+	HAS_PAINT_ORDER,
+	HAS_POSITION,
+	HAS_SCROLL_RECTS,
+	HAS_STACKING_CONTEXTS,
+	IS_SCROLLABLE,
+	IS_SCROLLABLE_SET,
+	IS_VISIBLE,
+	IS_VISIBLE_SET,
+	NO_INDEX,
+	DomStore,
+)
 from browser_use.dom.utils import cap_text_length
 from browser_use.observability import observe_debug
 
@@ -288,6 +304,184 @@ class EnhancedSnapshotNode:
 	"""Stacking contexts from the layout tree"""
 
 
+_NODE_TYPES = {node_type.value: node_type for node_type in NodeType}
+_UNSET: Any = object()
+
+
+class _StoredRect(DOMRect):
+	"""A `DOMRect` stored as 4 consecutive floats of a `DomStore` column, writes go to the column"""
+
+	__slots__ = ('_values', '_offset')
+
+	def __init__(self, values: array, offset: int) -> None:
+		self._values = values
+		self._offset = offset
+
+	@property
+	def x(self) -> float:
+		return self._values[self._offset]
+
+	@x.setter
+	def x(self, value: float) -> None:
+		self._values[self._offset] = value
+
+	@property
+	def y(self) -> float:
+		return self._values[self._offset + 1]
+
+	@y.setter
+	def y(self, value: float) -> None:
+		self._values[self._offset + 1] = value
+
+	@property
+	def width(self) -> float:
+		return self._values[self._offset + 2]
+
+	@width.setter
+	def width(self, value: float) -> None:
+		self._values[self._offset + 2] = value
+
+	@property
+	def height(self) -> float:
+		return self._values[self._offset + 3]
+
+	@height.setter
+	def height(self, value: float) -> None:
+		self._values[self._offset + 3] = value
+
+	def __eq__(self, other: object) -> bool:
+		if not isinstance(other, DOMRect):
+			return NotImplemented
+		return (self.x, self.y, self.width, self.height) == (other.x, other.y, other.width, other.height)
+
+	def __repr__(self) -> str:
+		return f'DOMRect(x={self.x!r}, y={self.y!r}, width={self.width!r}, height={self.height!r})'
+
+
+def _stored_rect(values: array, flags: int, flag: int, row: int) -> DOMRect | None:
+	return _StoredRect(values, 4 * row) if flags & flag else None
+
+
+class _StoredSnapshotNode(EnhancedSnapshotNode):
+	"""An `EnhancedSnapshotNode` read from the snapshot table of a `DomStore`"""
+
+	__slots__ = ('_store', '_row')
+
+	def __init__(self, store: DomStore, row: int) -> None:
+		self._store = store
+		self._row = row
+
+	@property
+	def is_clickable(self) -> bool | None:
+		value = self._store.snapshot_clickable[self._row]
+		return None if value == NO_INDEX else bool(value)
+
+	@property
+	def cursor_style(self) -> str | None:
+		return self._store.strings.get(self._store.snapshot_cursor[self._row])
+
+	@property
+	def bounds(self) -> DOMRect | None:
+		store = self._store
+		return _stored_rect(store.snapshot_bounds, store.snapshot_flags[self._row], HAS_BOUNDS, self._row)
+
+	@property
+	def clientRects(self) -> DOMRect | None:
+		store = self._store
+		return _stored_rect(store.snapshot_client_rects, store.snapshot_flags[self._row], HAS_CLIENT_RECTS, self._row)
+
+	@property
+	def scrollRects(self) -> DOMRect | None:
+		store = self._store
+		return _stored_rect(store.snapshot_scroll_rects, store.snapshot_flags[self._row], HAS_SCROLL_RECTS, self._row)
+
+	@property
+	def computed_styles(self) -> dict[str, str] | None:
+		style_id = self._store.snapshot_styles[self._row]
+		return self._store.styles[style_id] if style_id != NO_INDEX else None
+
+	@property
+	def paint_order(self) -> int | None:
+		store = self._store
+		return store.snapshot_paint_order[self._row] if store.snapshot_flags[self._row] & HAS_PAINT_ORDER else None
+
+	@property
+	def stacking_contexts(self) -> int | None:
+		store = self._store
+		if not store.snapshot_flags[self._row] & HAS_STACKING_CONTEXTS:
+			return None
+		return store.snapshot_stacking_contexts[self._row]
+
+	def __eq__(self, other: object) -> bool:
+		if not isinstance(other, EnhancedSnapshotNode):
+			return NotImplemented
+		return asdict(self) == asdict(other)
+
+	def __repr__(self) -> str:
+		return 'EnhancedSnapshotNode(' + ', '.join(f'{key}={value!r}' for key, value in asdict(self).items()) + ')'
+
+
+class _StoredAXNode(EnhancedAXNode):
+	"""An `EnhancedAXNode` read from the AX table of a `DomStore`"""
+
+	__slots__ = ('_store', '_row')
+
+	def __init__(self, store: DomStore, row: int) -> None:
+		self._store = store
+		self._row = row
+
+	@property
+	def ax_node_id(self) -> str:
+		return self._store.strings.strings[self._store.ax_node_id[self._row]]
+
+	@property
+	def ignored(self) -> bool:
+		return bool(self._store.ax_ignored[self._row])
+
+	@property
+	def role(self) -> str | None:
+		return self._store.strings.get(self._store.ax_role[self._row])
+
+	@property
+	def name(self) -> str | None:
+		return self._store.strings.get(self._store.ax_name[self._row])
+
+	@property
+	def description(self) -> str | None:
+		return self._store.strings.get(self._store.ax_description[self._row])
+
+	@property
+	def properties(self) -> list[EnhancedAXProperty] | None:
+		store = self._store
+		count = store.ax_property_count[self._row]
+		if count == NO_INDEX:
+			return None
+		start = store.ax_property_start[self._row]
+		strings = store.strings.strings
+		return [
+			EnhancedAXProperty(name=strings[store.ax_property_names[i]], value=store.ax_property_values[i])  # type: ignore[arg-type]
+			for i in range(start, start + count)
+		]
+
+	@property
+	def child_ids(self) -> list[str] | None:
+		store = self._store
+		count = store.ax_child_count[self._row]
+		if count == NO_INDEX:
+			return None
+		start = store.ax_child_start[self._row]
+		strings = store.strings.strings
+		return [strings[child_id] for child_id in store.ax_child_ids[start : start + count]]
+
+	def __eq__(self, other: object) -> bool:
+		if not isinstance(other, EnhancedAXNode):
+			return NotImplemented
+		return asdict(self) == asdict(other)
+
+	def __repr__(self) -> str:
+		return 'EnhancedAXNode(' + ', '.join(f'{key}={value!r}' for key, value in asdict(self).items()) + ')'
+
+
 # @dataclass(slots=True)
 # class SuperSelector:
 # 	node_id: int
@@ -304,84 +498,387 @@ class EnhancedSnapshotNode:
 # 	element_index: int | None
 
 
-@dataclass(slots=True)
 class EnhancedDOMTreeNode:
 	"""
 	Enhanced DOM tree node that contains information from AX, DOM, and Snapshot trees. It's mostly based on the types on DOM node type with enhanced data from AX and Snapshot trees.
 
 	@dev when serializing check if the value is a valid value first!
 
+	A node is a view of one row of a `DomStore` (see `browser_use.dom.store`), the fields below are read from and
+	written to the store. Each row gets a single view, made on first access. Creating a node directly gives it a
+	store of its own.
+
 	Learn more about the fields:
 	- (DOM node) https://chromedevtools.github.io/devtools-protocol/tot/DOM/#type-BackendNode
 	- (AX node) https://chromedevtools.github.io/devtools-protocol/tot/Accessibility/#type-AXNode
 	- (Snapshot node) https://chromedevtools.github.io/devtools-protocol/tot/DOMSnapshot/#type-DOMNode
 	"""
 
+	__slots__ = ('_store', '_index', '_attributes', '_snapshot_node')
+
+	def __init__(
+		self,
+		node_id: int,
+		backend_node_id: int,
+		node_type: NodeType,
+		node_name: str,
+		node_value: str,
+		attributes: dict[str, str],
+		is_scrollable: bool | None,
+		is_visible: bool | None,
+		absolute_position: DOMRect | None,
+		target_id: TargetID,
+		frame_id: str | None,
+		session_id: SessionID | None,
+		content_document: 'EnhancedDOMTreeNode | None',
+		shadow_root_type: ShadowRootType | None,
+		shadow_roots: list['EnhancedDOMTreeNode'] | None,
+		parent_node: 'EnhancedDOMTreeNode | None',
+		children_nodes: list['EnhancedDOMTreeNode'] | None,
+		ax_node: EnhancedAXNode | None,
+		snapshot_node: EnhancedSnapshotNode | None,
+		element_index: int | None = None,
+		_compound_children: list[dict[str, Any]] | None = None,
+		uuid: str | None = None,
+	) -> None:
+		self._store = DomStore()
+		self._attributes = None
+		self._snapshot_node = _UNSET
+		self._index = self._store.add_node(
+			node_id,
+			backend_node_id,
+			node_type,
+			node_name,
+			node_value,
+			None,
+			is_scrollable,
+			target_id,
+			frame_id,
+			session_id,
+			shadow_root_type,
+		)
+		self._store.views[self._index] = self
+		self.attributes = attributes
+		self.is_visible = is_visible
+		self.absolute_position = absolute_position
+		self.content_document = content_document
+		self.shadow_roots = shadow_roots
+		self.parent_node = parent_node
+		self.children_nodes = children_nodes
+		self.ax_node = ax_node
+		self.snapshot_node = snapshot_node
+		self.element_index = element_index
+		if _compound_children:
+			self._compound_children = _compound_children
+		if uuid is not None:
+			self.uuid = uuid
+
+	@classmethod
+	def _view(cls, store: DomStore, index: int) -> 'EnhancedDOMTreeNode':
+		"""The node at `index` of `store`, made on first access"""
+		node = store.views[index]
+		if node is None:
+			node = store.views[index] = object.__new__(cls)
+			node._store = store
+			node._index = index
+			node._attributes = None
+			node._snapshot_node = _UNSET
+		return node
+
+	@classmethod
+	def __get_pydantic_core_schema__(cls, source_type: Any, handler: Any) -> Any:
+		from pydantic_core import core_schema
+
+		return core_schema.is_instance_schema(
+			cls, serialization=core_schema.plain_serializer_function_ser_schema(lambda node: node.__json__())
+		)
+
 	# region - DOM Node data
 
-	node_id: int
-	backend_node_id: int
+	@property
+	def node_id(self) -> int:
+		return self._store.node_id[self._index]
 
-	node_type: NodeType
-	"""Node types, defined in `NodeType` enum."""
-	node_name: str
-	"""Only applicable for `NodeType.ELEMENT_NODE`"""
-	node_value: str
-	"""this is where the value from `NodeType.TEXT_NODE` is stored usually"""
-	attributes: dict[str, str]
-	"""slightly changed from the original attributes to be more readable"""
-	is_scrollable: bool | None
-	"""
-	Whether the node is scrollable.
-	"""
-	is_visible: bool | None
-	"""
-	Whether the node is visible according to the upper most frame node.
-	"""
+	@node_id.setter
+	def node_id(self, value: int) -> None:
+		self._store.node_id[self._index] = value
 
-	absolute_position: DOMRect | None
-	"""
-	Absolute position of the node in the document according to the top-left of the page.
-	"""
+	@property
+	def backend_node_id(self) -> int:
+		return self._store.backend_node_id[self._index]
+
+	@backend_node_id.setter
+	def backend_node_id(self, value: int) -> None:
+		self._store.backend_node_id[self._index] = value
+
+	@property
+	def node_type(self) -> NodeType:
+		"""Node types, defined in `NodeType` enum."""
+		return _NODE_TYPES[self._store.node_type[self._index]]
+
+	@node_type.setter
+	def node_type(self, value: NodeType) -> None:
+		self._store.node_type[self._index] = value
+
+	@property
+	def node_name(self) -> str:
+		"""Only applicable for `NodeType.ELEMENT_NODE`"""
+		return self._store.strings.strings[self._store.node_name[self._index]]
+
+	@node_name.setter
+	def node_name(self, value: str) -> None:
+		self._store.node_name[self._index] = self._store.strings.add(value)
+
+	@property
+	def node_value(self) -> str:
+		"""this is where the value from `NodeType.TEXT_NODE` is stored usually"""
+		return self._store.strings.strings[self._store.node_value[self._index]]
+
+	@node_value.setter
+	def node_value(self, value: str) -> None:
+		self._store.node_value[self._index] = self._store.strings.add(value)
+
+	@property
+	def attributes(self) -> dict[str, str]:
+		"""slightly changed from the original attributes to be more readable"""
+		if self._attributes is None:
+			self._attributes = self._store.get_attributes(self._index)
+		return self._attributes
+
+	@attributes.setter
+	def attributes(self, value: dict[str, str]) -> None:
+		self._store.set_attributes(self._index, value)
+		self._attributes = value
+
+	@property
+	def is_scrollable(self) -> bool | None:
+		"""
+		Whether the node is scrollable.
+		"""
+		flags = self._store.flags[self._index]
+		return bool(flags & IS_SCROLLABLE) if flags & IS_SCROLLABLE_SET else None
+
+	@is_scrollable.setter
+	def is_scrollable(self, value: bool | None) -> None:
+		self._store.set_flag(self._index, IS_SCROLLABLE_SET, IS_SCROLLABLE, value)
+
+	@property
+	def is_visible(self) -> bool | None:
+		"""
+		Whether the node is visible according to the upper most frame node.
+		"""
+		flags = self._store.flags[self._index]
+		return bool(flags & IS_VISIBLE) if flags & IS_VISIBLE_SET else None
+
+	@is_visible.setter
+	def is_visible(self, value: bool | None) -> None:
+		self._store.set_flag(self._index, IS_VISIBLE_SET, IS_VISIBLE, value)
+
+	@property
+	def absolute_position(self) -> DOMRect | None:
+		"""
+		Absolute position of the node in the document according to the top-left of the page.
+		"""
+		return _stored_rect(self._store.position, self._store.flags[self._index], HAS_POSITION, self._index)
+
+	@absolute_position.setter
+	def absolute_position(self, value: DOMRect | None) -> None:
+		self._store.set_position(self._index, (value.x, value.y, value.width, value.height) if value else None)
 
 	# frames
-	target_id: TargetID
-	frame_id: str | None
-	session_id: SessionID | None
-	content_document: 'EnhancedDOMTreeNode | None'
-	"""
-	Content document is the document inside a new iframe.
-	"""
+	@property
+	def target_id(self) -> TargetID:
+		return self._store.strings.strings[self._store.target_id[self._index]]
+
+	@target_id.setter
+	def target_id(self, value: TargetID) -> None:
+		self._store.target_id[self._index] = self._store.strings.add(value)
+
+	@property
+	def frame_id(self) -> str | None:
+		return self._store.strings.get(self._store.frame_id[self._index])
+
+	@frame_id.setter
+	def frame_id(self, value: str | None) -> None:
+		self._store.frame_id[self._index] = self._store.strings.add(value)
+
+	@property
+	def session_id(self) -> SessionID | None:
+		return self._store.strings.get(self._store.session_id[self._index])
+
+	@session_id.setter
+	def session_id(self, value: SessionID | None) -> None:
+		self._store.session_id[self._index] = self._store.strings.add(value)
+
+	@property
+	def content_document(self) -> 'EnhancedDOMTreeNode | None':
+		"""
+		Content document is the document inside a new iframe.
+		"""
+		return self._get_link('content_document', self._store.content_document[self._index])
+
+	@content_document.setter
+	def content_document(self, value: 'EnhancedDOMTreeNode | None') -> None:
+		self._store.content_document[self._index] = self._set_link('content_document', value)
+
 	# Shadow DOM
-	shadow_root_type: ShadowRootType | None
-	shadow_roots: list['EnhancedDOMTreeNode'] | None
-	"""
-	Shadow roots are the shadow DOMs of the element.
-	"""
+	@property
+	def shadow_root_type(self) -> ShadowRootType | None:
+		return self._store.strings.get(self._store.shadow_root_type[self._index])  # type: ignore[return-value]
+
+	@shadow_root_type.setter
+	def shadow_root_type(self, value: ShadowRootType | None) -> None:
+		self._store.shadow_root_type[self._index] = self._store.strings.add(value)
+
+	@property
+	def shadow_roots(self) -> list['EnhancedDOMTreeNode'] | None:
+		"""
+		Shadow roots are the shadow DOMs of the element.
+		"""
+		store, index = self._store, self._index
+		count = store.shadow_root_count[index]
+		if count < 0:
+			return store.foreign[(index, 'shadow_roots')] if count == FOREIGN else None
+		start = store.shadow_root_start[index]
+		views, view = store.views, EnhancedDOMTreeNode._view
+		return [views[root] or view(store, root) for root in store.shadow_roots[start : start + count]]
+
+	@shadow_roots.setter
+	def shadow_roots(self, value: list['EnhancedDOMTreeNode'] | None) -> None:
+		store, index = self._store, self._index
+		if value is not None and any(node._store is not store for node in value):
+			store.foreign[(index, 'shadow_roots')] = value
+			store.shadow_root_count[index] = FOREIGN
+		else:
+			store.set_shadow_roots(index, [node._index for node in value] if value is not None else None)
 
 	# Navigation
-	parent_node: 'EnhancedDOMTreeNode | None'
-	children_nodes: list['EnhancedDOMTreeNode'] | None
+	@property
+	def parent_node(self) -> 'EnhancedDOMTreeNode | None':
+		return self._get_link('parent_node', self._store.parent[self._index])
+
+	@parent_node.setter
+	def parent_node(self, value: 'EnhancedDOMTreeNode | None') -> None:
+		self._store.parent[self._index] = self._set_link('parent_node', value)
+
+	@property
+	def children_nodes(self) -> list['EnhancedDOMTreeNode'] | None:
+		store, index = self._store, self._index
+		count = store.children_count[index]
+		if count < 0:
+			return store.foreign[(index, 'children_nodes')] if count == FOREIGN else None
+		start = store.children_start[index]
+		views, view = store.views, EnhancedDOMTreeNode._view
+		return [views[child] or view(store, child) for child in store.children[start : start + count]]
+
+	@children_nodes.setter
+	def children_nodes(self, value: list['EnhancedDOMTreeNode'] | None) -> None:
+		store, index = self._store, self._index
+		if value is not None and any(node._store is not store for node in value):
+			store.foreign[(index, 'children_nodes')] = value
+			store.children_count[index] = FOREIGN
+		else:
+			store.set_children(index, [node._index for node in value] if value is not None else None)
+
+	def _get_link(self, name: str, target: int) -> 'EnhancedDOMTreeNode | None':
+		if target >= 0:
+			return EnhancedDOMTreeNode._view(self._store, target)
+		return self._store.foreign[(self._index, name)] if target == FOREIGN else None
+
+	def _set_link(self, name: str, value: 'EnhancedDOMTreeNode | None') -> int:
+		self._store.foreign.pop((self._index, name), None)
+		if value is None:
+			return NO_INDEX
+		if value._store is self._store:
+			return value._index
+		self._store.foreign[(self._index, name)] = value
+		return FOREIGN
 
 	# endregion - DOM Node data
 
 	# region - AX Node data
-	ax_node: EnhancedAXNode | None
+	@property
+	def ax_node(self) -> EnhancedAXNode | None:
+		row = self._store.ax[self._index]
+		return _StoredAXNode(self._store, row) if row != NO_INDEX else None
+
+	@ax_node.setter
+	def ax_node(self, value: EnhancedAXNode | None) -> None:
+		if value is None:
+			self._store.ax[self._index] = NO_INDEX
+		else:
+			self._store.add_ax_node(
+				self._index,
+				ax_node_id=value.ax_node_id,
+				ignored=value.ignored,
+				role=value.role,
+				name=value.name,
+				description=value.description,
+				properties=[(prop.name, prop.value) for prop in value.properties] if value.properties is not None else None,
+				child_ids=value.child_ids,
+			)
 
 	# endregion - AX Node data
 
 	# region - Snapshot Node data
-	snapshot_node: EnhancedSnapshotNode | None
+	@property
+	def snapshot_node(self) -> EnhancedSnapshotNode | None:
+		snapshot_node = self._snapshot_node
+		if snapshot_node is _UNSET:
+			row = self._store.snapshot[self._index]
+			snapshot_node = self._snapshot_node = _StoredSnapshotNode(self._store, row) if row != NO_INDEX else None
+		return snapshot_node
+
+	@snapshot_node.setter
+	def snapshot_node(self, value: EnhancedSnapshotNode | None) -> None:
+		if value is None:
+			self._store.snapshot[self._index] = NO_INDEX
+		else:
+			self._store.add_snapshot(
+				self._index,
+				is_clickable=value.is_clickable,
+				cursor_style=value.cursor_style,
+				bounds=value.bounds,
+				client_rects=value.clientRects,
+				scroll_rects=value.scrollRects,
+				computed_styles=value.computed_styles,
+				paint_order=value.paint_order,
+				stacking_contexts=value.stacking_contexts,
+			)
+		self._snapshot_node = _UNSET
 
 	# endregion - Snapshot Node data
 
 	# Interactive element index
-	element_index: int | None = None
+	@property
+	def element_index(self) -> int | None:
+		value = self._store.element_index[self._index]
+		return value if value != NO_INDEX else None
+
+	@element_index.setter
+	def element_index(self, value: int | None) -> None:
+		self._store.element_index[self._index] = value if value is not None else NO_INDEX
 
 	# Compound control child components information
-	_compound_children: list[dict[str, Any]] = field(default_factory=list)
+	@property
+	def _compound_children(self) -> list[dict[str, Any]]:
+		return self._store.compound_children.setdefault(self._index, [])
 
-	uuid: str = field(default_factory=uuid7str)
+	@_compound_children.setter
+	def _compound_children(self, value: list[dict[str, Any]]) -> None:
+		self._store.compound_children[self._index] = value
+
+	@property
+	def uuid(self) -> str:
+		"""Made on first access, ids of the nodes nobody asks for would only cost time"""
+		uuids = self._store.uuids
+		if self._index not in uuids:
+			uuids[self._index] = uuid7str()
+		return uuids[self._index]
+
+	@uuid.setter
+	def uuid(self, value: str) -> None:
+		self._store.uuids[self._index] = value
 
 	@property
 	def parent(self) -> 'EnhancedDOMTreeNode | None':
@@ -396,10 +893,21 @@ class EnhancedDOMTreeNode:
 		"""
 		Returns all children nodes, including shadow roots
 		"""
-		children = self.children_nodes or []
-		if self.shadow_roots:
-			children.extend(self.shadow_roots)
-		return children
+		store, index = self._store, self._index
+		if store.children_count[index] == FOREIGN or store.shadow_root_count[index] == FOREIGN:
+			return (self.children_nodes or []) + (self.shadow_roots or [])
+		views, view = store.views, EnhancedDOMTreeNode._view
+		nodes: list[EnhancedDOMTreeNode] = []
+		children_start, children_count = store.children_start[index], store.children_count[index]
+		if children_count > 0:
+			nodes = [
+				views[child] or view(store, child) for child in store.children[children_start : children_start + children_count]
+			]
+		shadow_root_start, shadow_root_count = store.shadow_root_start[index], store.shadow_root_count[index]
+		if shadow_root_count > 0:
+			shadow_roots = store.shadow_roots[shadow_root_start : shadow_root_start + shadow_root_count]
+			nodes += [views[root] or view(store, root) for root in shadow_roots]
+		return nodes
 
 	@property
 	def tag_name(self) -> str:
@@ -550,12 +1058,13 @@ class EnhancedDOMTreeNode:
 			return True
 
 		# Enhanced detection for elements CDP missed
-		if not self.snapshot_node:
+		snapshot_node = self.snapshot_node
+		if not snapshot_node:
 			return False
 
 		# Check scroll vs client rects - this is the most reliable indicator
-		scroll_rects = self.snapshot_node.scrollRects
-		client_rects = self.snapshot_node.clientRects
+		scroll_rects = snapshot_node.scrollRects
+		client_rects = snapshot_node.clientRects
 
 		if scroll_rects and client_rects:
 			# Content is larger than visible area = scrollable
@@ -564,8 +1073,8 @@ class EnhancedDOMTreeNode:
 
 			if has_vertical_scroll or has_horizontal_scroll:
 				# Also check CSS to make sure scrolling is allowed
-				if self.snapshot_node.computed_styles:
-					styles = self.snapshot_node.computed_styles
+				if snapshot_node.computed_styles:
+					styles = snapshot_node.computed_styles
 
 					overflow = styles.get('overflow', 'visible').lower()
 					overflow_x = styles.get('overflow-x', overflow).lower()
@@ -859,6 +1368,7 @@ class DOMInteractedElement:
 
 	@classmethod
 	def load_from_enhanced_dom_tree(cls, enhanced_dom_tree: EnhancedDOMTreeNode) -> 'DOMInteractedElement':
+		bounds = enhanced_dom_tree.snapshot_node.bounds if enhanced_dom_tree.snapshot_node else None
 		return cls(
 			node_id=enhanced_dom_tree.node_id,
 			backend_node_id=enhanced_dom_tree.backend_node_id,
@@ -867,7 +1377,8 @@ class DOMInteractedElement:
 			node_value=enhanced_dom_tree.node_value,
 			node_name=enhanced_dom_tree.node_name,
 			attributes=enhanced_dom_tree.attributes,
-			bounds=enhanced_dom_tree.snapshot_node.bounds if enhanced_dom_tree.snapshot_node else None,
+			# a copy, the history outlives the DOM store the rect is stored in
+			bounds=DOMRect(x=bounds.x, y=bounds.y, width=bounds.width, height=bounds.height) if bounds else None,
 			x_path=enhanced_dom_tree.xpath,
 			element_hash=hash(enhanced_dom_tree),
 		)
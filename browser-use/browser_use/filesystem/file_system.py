@@ -1,19 +1,36 @@
 import asyncio
+import hashlib
+import multiprocessing
 import re
 import shutil
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from multiprocessing.connection import Connection
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+from pydantic import BaseModel, Field, PrivateAttr
+
+from browser_use.config import CONFIG
 
 INVALID_FILENAME_ERROR_MESSAGE = 'Error: Invalid filename format. Must be alphanumeric with supported extension.'
 DEFAULT_FILE_SYSTEM_PATH = 'browseruse_agent_data'
 
+# Disk writes of all files go through one worker thread, so writes to a file land in the order they were made
+_disk_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='browser_use_file_system')
+_content_versions = count(1)
+
+# Pages of an external PDF returned by one read, and how long their text extraction may take
+MAX_PDF_PAGES = 10
+PDF_EXTRACT_TIMEOUT = 30.0
+
+# PDF text is extracted in a worker process, so a slow or broken document can neither block the event loop nor hang the agent
+_pdf_worker: '_PdfWorker | None' = None
+_pdf_worker_lock = threading.Lock()
+
 
 class FileSystemError(Exception):
 	"""Custom exception for file system operations that should be shown to LLM"""
@@ -22,11 +39,19 @@ class FileSystemError(Exception):
 
 
 class BaseFile(BaseModel, ABC):
-	"""Base class for all file types"""
+	"""Base class for all file types
+
+	Content must be changed through `update_content()`, which gives the file a new `version`. Line counts, previews and
+	state snapshots are cached per version.
+	"""
 
 	name: str
 	content: str = ''
 
+	_version: int = PrivateAttr(default_factory=lambda: next(_content_versions))
+	_line_count: tuple[int, int] | None = PrivateAttr(default=None)
+	_state: tuple[int, dict[str, Any]] | None = PrivateAttr(default=None)
+
 	# --- Subclass must define this ---
 	@property
 	@abstractmethod
@@ -46,15 +71,29 @@ class BaseFile(BaseModel, ABC):
 
 	def update_content(self, content: str) -> None:
 		self.content = content
+		self._version = next(_content_versions)
+
+	@property
+	def version(self) -> int:
+		"""Changes whenever the content changes, never the same for two different contents of any files"""
+		return self._version
 
 	def sync_to_disk_sync(self, path: Path) -> None:
 		file_path = path / self.full_name
 		file_path.write_text(self.content)
 
 	async def sync_to_disk(self, path: Path) -> None:
+		await asyncio.get_running_loop().run_in_executor(_disk_executor, self.sync_to_disk_sync, path)
+
+	async def append_to_disk(self, content: str, path: Path) -> None:
+		"""Append content to the file on disk instead of rewriting it"""
 		file_path = path / self.full_name
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: file_path.write_text(self.content))
+
+		def append() -> None:
+			with file_path.open('a') as f:
+				f.write(content)
+
+		await asyncio.get_running_loop().run_in_executor(_disk_executor, append)
 
 	async def write(self, content: str, path: Path) -> None:
 		self.write_file_content(content)
@@ -62,7 +101,7 @@ class BaseFile(BaseModel, ABC):
 
 	async def append(self, content: str, path: Path) -> None:
 		self.append_file_content(content)
-		await self.sync_to_disk(path)
+		await self.append_to_disk(content, path)
 
 	def read(self) -> str:
 		return self.content
@@ -77,7 +116,15 @@ class BaseFile(BaseModel, ABC):
 
 	@property
 	def get_line_count(self) -> int:
-		return len(self.content.splitlines())
+		if self._line_count is None or self._line_count[0] != self._version:
+			self._line_count = (self._version, len(self.content.splitlines()))
+		return self._line_count[1]
+
+	def get_state(self) -> dict[str, Any]:
+		"""Serializable state of the file, the same dict until the content changes"""
+		if self._state is None or self._state[0] != self._version:
+			self._state = (self._version, {'type': self.__class__.__name__, 'data': self.model_dump()})
+		return self._state[1]
 
 
 class MarkdownFile(BaseFile):
@@ -120,6 +167,11 @@ class PdfFile(BaseFile):
 		return 'pdf'
 
 	def sync_to_disk_sync(self, path: Path) -> None:
+		# reportlab is slow to import, only load it when a PDF is actually written
+		from reportlab.lib.pagesizes import letter
+		from reportlab.lib.styles import getSampleStyleSheet
+		from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
 		file_path = path / self.full_name
 		try:
 			# Create PDF document
@@ -151,9 +203,9 @@ class PdfFile(BaseFile):
 		except Exception as e:
 			raise FileSystemError(f"Error: Could not write to file '{self.full_name}'. {str(e)}")
 
-	async def sync_to_disk(self, path: Path) -> None:
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.sync_to_disk_sync(path))
+	async def append_to_disk(self, content: str, path: Path) -> None:
+		# a PDF can't be appended to, it is rendered again
+		await self.sync_to_disk(path)
 
 
 class FileSystemState(BaseModel):
@@ -164,6 +216,111 @@ class FileSystemState(BaseModel):
 	extracted_content_count: int = 0
 
 
+def _pdf_text_cache_dir() -> Path:
+	return CONFIG.XDG_CACHE_HOME / 'browser_use' / 'pdf_text'
+
+
+def _file_sha256(path: str) -> str:
+	with open(path, 'rb') as f:
+		return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def _read_pdf_text_cache(cache_dir: Path, pages: range) -> tuple[int | None, dict[int, str]]:
+	"""Page count and the cached texts of `pages` of a PDF, the page count is None if the PDF was never read"""
+	try:
+		num_pages = int((cache_dir / 'pages').read_text())
+	except (OSError, ValueError):
+		return None, {}
+	texts: dict[int, str] = {}
+	for page in pages:
+		if page > num_pages:
+			break
+		try:
+			texts[page] = (cache_dir / f'{page}.txt').read_text(encoding='utf-8')
+		except OSError:
+			pass
+	return num_pages, texts
+
+
+def _write_pdf_text_cache(cache_dir: Path, num_pages: int, texts: dict[int, str]) -> None:
+	cache_dir.mkdir(parents=True, exist_ok=True)
+	for page, text in texts.items():
+		(cache_dir / f'{page}.txt').write_text(text, encoding='utf-8')
+	(cache_dir / 'pages').write_text(str(num_pages))
+
+
+def _extract_pdf_pages(path: str, pages: list[int]) -> tuple[int, dict[int, str]]:
+	"""Page count and the text of the given (1-based) pages of a PDF, runs in the PDF worker process"""
+	import pypdf
+
+	reader = pypdf.PdfReader(path)
+	num_pages = len(reader.pages)
+	return num_pages, {page: reader.pages[page - 1].extract_text() for page in pages if page <= num_pages}
+
+
+def _run_pdf_worker(connection: Connection) -> None:
+	"""Main loop of the PDF worker process: runs the calls it receives one at a time until the pipe is closed"""
+	while True:
+		try:
+			fn, args = connection.recv()
+		except EOFError:
+			return
+		try:
+			result = (True, fn(*args))
+		except Exception as e:
+			result = (False, e)
+		connection.send(result)
+
+
+class _PdfWorker:
+	"""A worker process for PDF text extraction, owned directly so a hung extraction can be stopped by terminating it
+
+	The process is spawned, not forked: a fork would copy this process mid-flight, with its event loop and the disk,
+	websocket and GIF threads, and can deadlock the child.
+	"""
+
+	def __init__(self):
+		context = multiprocessing.get_context('spawn')
+		self._connection, worker_connection = context.Pipe()
+		self.process = context.Process(target=_run_pdf_worker, args=(worker_connection,), name='browser_use_pdf', daemon=True)
+		self.process.start()
+		worker_connection.close()
+
+	def call(self, fn: Callable[..., Any], args: tuple, timeout: float) -> Any:
+		"""Blocking, raises TimeoutError if fn takes longer than timeout and EOFError if the process died"""
+		self._connection.send((fn, args))
+		if not self._connection.poll(timeout):
+			raise TimeoutError
+		ok, result = self._connection.recv()
+		if not ok:
+			raise result
+		return result
+
+	def stop(self) -> None:
+		self.process.terminate()
+		self._connection.close()
+
+
+def _call_pdf_worker(fn: Callable[..., Any], *args: Any, timeout: float) -> Any:
+	"""Run fn in the PDF worker process, one call at a time; a timed out or crashed worker is replaced on the next call"""
+	global _pdf_worker
+	with _pdf_worker_lock:
+		if _pdf_worker is None:
+			_pdf_worker = _PdfWorker()
+		try:
+			return _pdf_worker.call(fn, args, timeout)
+		except (TimeoutError, EOFError, OSError):
+			_stop_pdf_worker()
+			raise
+
+
+def _stop_pdf_worker() -> None:
+	global _pdf_worker
+	worker, _pdf_worker = _pdf_worker, None
+	if worker is not None:
+		worker.stop()
+
+
 class FileSystem:
 	"""Enhanced file system with in-memory storage and multiple file type support"""
 
@@ -188,6 +345,8 @@ class FileSystem:
 		}
 
 		self.files = {}
+		# full filename -> (content version, description) of each file in describe()
+		self._descriptions: dict[str, tuple[int, str]] = {}
 		if create_default_files:
 			self.default_files = ['todo.md']
 			self._create_default_files()
@@ -253,8 +412,13 @@ class FileSystem:
 
 		return file_obj.read()
 
-	async def read_file(self, full_filename: str, external_file: bool = False) -> str:
-		"""Read file content using file-specific read method and return appropriate message to LLM"""
+	async def read_file(
+		self, full_filename: str, external_file: bool = False, start_page: int = 1, end_page: int | None = None
+	) -> str:
+		"""Read file content using file-specific read method and return appropriate message to LLM
+
+		External PDFs are read `MAX_PDF_PAGES` pages at a time, from `start_page` to `end_page` (1-based, inclusive).
+		"""
 		if external_file:
 			try:
 				try:
@@ -268,17 +432,7 @@ class FileSystem:
 						content = await f.read()
 						return f'Read from file {full_filename}.\n<content>\n{content}\n</content>'
 				elif extension == 'pdf':
-					import pypdf
-
-					reader = pypdf.PdfReader(full_filename)
-					num_pages = len(reader.pages)
-					MAX_PDF_PAGES = 10
-					extra_pages = num_pages - MAX_PDF_PAGES
-					extracted_text = ''
-					for page in reader.pages[:MAX_PDF_PAGES]:
-						extracted_text += page.extract_text()
-					extra_pages_text = f'{extra_pages} more pages...' if extra_pages > 0 else ''
-					return f'Read from file {full_filename}.\n<content>\n{extracted_text}\n{extra_pages_text}</content>'
+					return await self._read_pdf(full_filename, start_page, end_page)
 				else:
 					return f'Error: Cannot read file {full_filename} as {extension} extension is not supported.'
 			except FileNotFoundError:
@@ -303,6 +457,47 @@ class FileSystem:
 		except Exception:
 			return f"Error: Could not read file '{full_filename}'."
 
+	async def _read_pdf(self, full_filename: str, start_page: int, end_page: int | None) -> str:
+		"""Text of a page range of an external PDF, from the text cache or extracted in the PDF worker process"""
+		if start_page < 1 or (end_page is not None and end_page < start_page):
+			return (
+				f'Error: Invalid page range {start_page}-{end_page}. Pages start at 1 and end_page must not be before start_page.'
+			)
+		last_page = start_page + MAX_PDF_PAGES - 1
+		if end_page is not None:
+			last_page = min(end_page, last_page)
+		pages = range(start_page, last_page + 1)
+
+		cache_dir = _pdf_text_cache_dir() / await asyncio.to_thread(_file_sha256, full_filename)
+		num_pages, texts = await asyncio.to_thread(_read_pdf_text_cache, cache_dir, pages)
+		missing = [page for page in pages if page not in texts and (num_pages is None or page <= num_pages)]
+		if missing:
+			try:
+				num_pages, extracted = await asyncio.to_thread(
+					_call_pdf_worker, _extract_pdf_pages, full_filename, missing, timeout=PDF_EXTRACT_TIMEOUT
+				)
+			except TimeoutError:
+				return f"Error: Reading '{full_filename}' took longer than {PDF_EXTRACT_TIMEOUT:g}s."
+			except (EOFError, OSError):
+				return f"Error: Could not read file '{full_filename}'."  # the worker crashed on this document
+			texts.update(extracted)
+			try:
+				await asyncio.to_thread(_write_pdf_text_cache, cache_dir, num_pages, extracted)
+			except OSError:
+				pass  # the cache is an optimization, a read-only cache dir must not fail the read
+		assert num_pages is not None
+
+		if start_page > num_pages:
+			return f"Error: '{full_filename}' has {num_pages} pages, there is no page {start_page}."
+		last_page = min(last_page, num_pages)
+		extracted_text = ''.join(texts[page] for page in range(start_page, last_page + 1))
+		extra_pages = num_pages - last_page
+		extra_pages_text = f'{extra_pages} more pages, continue with start_page={last_page + 1}...' if extra_pages > 0 else ''
+		return (
+			f'Read from file {full_filename} (pages {start_page}-{last_page} of {num_pages}).\n'
+			f'<content>\n{extracted_text}\n{extra_pages_text}</content>'
+		)
+
 	async def write_file(self, full_filename: str, content: str) -> str:
 		"""Write content to file using file-specific write method"""
 		if not self._is_valid_filename(full_filename):
@@ -380,77 +575,84 @@ class FileSystem:
 
 	def describe(self) -> str:
 		"""List all files with their content information using file-specific display methods"""
-		DISPLAY_CHARS = 400
 		description = ''
+		descriptions: dict[str, tuple[int, str]] = {}
 
 		for file_obj in self.files.values():
 			# Skip todo.md from description
 			if file_obj.full_name == 'todo.md':
 				continue
 
-			content = file_obj.read()
-
-			# Handle empty files
-			if not content:
-				description += f'<file>\n{file_obj.full_name} - [empty file]\n</file>\n'
-				continue
-
-			lines = content.splitlines()
-			line_count = len(lines)
-
-			# For small files, display the entire content
-			whole_file_description = (
-				f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{content}\n</content>\n</file>\n'
-			)
-			if len(content) < int(1.5 * DISPLAY_CHARS):
-				description += whole_file_description
-				continue
-
-			# For larger files, display start and end previews
-			half_display_chars = DISPLAY_CHARS // 2
-
-			# Get start preview
-			start_preview = ''
-			start_line_count = 0
-			chars_count = 0
-			for line in lines:
-				if chars_count + len(line) + 1 > half_display_chars:
-					break
-				start_preview += line + '\n'
-				chars_count += len(line) + 1
-				start_line_count += 1
-
-			# Get end preview
-			end_preview = ''
-			end_line_count = 0
-			chars_count = 0
-			for line in reversed(lines):
-				if chars_count + len(line) + 1 > half_display_chars:
-					break
-				end_preview = line + '\n' + end_preview
-				chars_count += len(line) + 1
-				end_line_count += 1
-
-			# Calculate lines in between
-			middle_line_count = line_count - start_line_count - end_line_count
-			if middle_line_count <= 0:
-				description += whole_file_description
-				continue
-
-			start_preview = start_preview.strip('\n').rstrip()
-			end_preview = end_preview.strip('\n').rstrip()
-
-			# Format output
-			if not (start_preview or end_preview):
-				description += f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{middle_line_count} lines...\n</content>\n</file>\n'
-			else:
-				description += f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{start_preview}\n'
-				description += f'... {middle_line_count} more lines ...\n'
-				description += f'{end_preview}\n'
-				description += '</content>\n</file>\n'
+			# Files are only described again when their content changed
+			cached = self._descriptions.get(file_obj.full_name)
+			if cached is None or cached[0] != file_obj.version:
+				cached = (file_obj.version, self._describe_file(file_obj))
+			descriptions[file_obj.full_name] = cached
+			description += cached[1]
 
+		self._descriptions = descriptions
 		return description.strip('\n')
 
+	def _describe_file(self, file_obj: BaseFile) -> str:
+		"""Describe one file: its whole content if it is small, otherwise start and end previews"""
+		DISPLAY_CHARS = 400
+		content = file_obj.read()
+
+		# Handle empty files
+		if not content:
+			return f'<file>\n{file_obj.full_name} - [empty file]\n</file>\n'
+
+		lines = content.splitlines()
+		line_count = len(lines)
+
+		# For small files, display the entire content
+		whole_file_description = f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{content}\n</content>\n</file>\n'
+		if len(content) < int(1.5 * DISPLAY_CHARS):
+			return whole_file_description
+
+		# For larger files, display start and end previews
+		half_display_chars = DISPLAY_CHARS // 2
+
+		# Get start preview
+		start_preview = ''
+		start_line_count = 0
+		chars_count = 0
+		for line in lines:
+			if chars_count + len(line) + 1 > half_display_chars:
+				break
+			start_preview += line + '\n'
+			chars_count += len(line) + 1
+			start_line_count += 1
+
+		# Get end preview
+		end_preview = ''
+		end_line_count = 0
+		chars_count = 0
+		for line in reversed(lines):
+			if chars_count + len(line) + 1 > half_display_chars:
+				break
+			end_preview = line + '\n' + end_preview
+			chars_count += len(line) + 1
+			end_line_count += 1
+
+		# Calculate lines in between
+		middle_line_count = line_count - start_line_count - end_line_count
+		if middle_line_count <= 0:
+			return whole_file_description
+
+		start_preview = start_preview.strip('\n').rstrip()
+		end_preview = end_preview.strip('\n').rstrip()
+
+		# Format output
+		if not (start_preview or end_preview):
+			return f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{middle_line_count} lines...\n</content>\n</file>\n'
+
+		description = f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{start_preview}\n'
+		description += f'... {middle_line_count} more lines ...\n'
+		description += f'{end_preview}\n'
+		description += '</content>\n</file>\n'
+		return description
+
 	def get_todo_contents(self) -> str:
 		"""Get todo file contents"""
 		todo_file = self.get_file('todo.md')
@@ -458,11 +660,10 @@ class FileSystem:
 
 	def get_state(self) -> FileSystemState:
 		"""Get serializable state of the file system"""
-		files_data = {}
-		for full_filename, file_obj in self.files.items():
-			files_data[full_filename] = {'type': file_obj.__class__.__name__, 'data': file_obj.model_dump()}
+		files_data = {full_filename: file_obj.get_state() for full_filename, file_obj in self.files.items()}
 
-		return FileSystemState(
+		# the file entries are already valid, constructing without validation keeps them shared with earlier snapshots
+		return FileSystemState.model_construct(
 			files=files_data, base_dir=str(self.base_dir), extracted_content_count=self.extracted_content_count
 		)
 
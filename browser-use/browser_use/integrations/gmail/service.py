@@ -4,9 +4,11 @@ Handles Gmail API authentication, email reading, and 2FA code extraction.
 This service provides a clean interface for agents to interact with Gmail.
 """
 
+import asyncio
 import base64
 import logging
 import os
+import time
 from pathlib import Path
 from typing import Any
 
@@ -34,6 +36,13 @@ class GmailService:
 	# Gmail API scopes
 	SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+	# Messages fetched per batch request (Gmail allows 100, but recommends at most 50)
+	BATCH_SIZE = 50
+	# Parsed messages kept in memory
+	MAX_CACHED_MESSAGES = 500
+	# Seconds a query's message ids are reused while the mailbox has not changed
+	QUERY_CACHE_TTL = 60.0
+
 	def __init__(
 		self,
 		credentials_file: str | None = None,
@@ -70,6 +79,13 @@ class GmailService:
 		self.creds = None
 		self._authenticated = False
 
+		# Parsed messages by id, and the message ids each query returned as of _history_id
+		self._messages: dict[str, dict[str, Any]] = {}
+		self._query_results: dict[tuple[str, int], tuple[list[str], float]] = {}
+		self._history_id: str | None = None
+		# The Google client is synchronous and not thread safe: one call at a time, in a worker thread
+		self._api_lock = asyncio.Lock()
+
 	def is_authenticated(self) -> bool:
 		"""Check if Gmail service is authenticated"""
 		return self._authenticated and self.service is not None
@@ -160,28 +176,8 @@ class GmailService:
 			if query:
 				logger.debug(f'🔍 Query: {query}')
 
-			# Get message list
-			assert self.service is not None
-			results = self.service.users().messages().list(userId='me', maxResults=max_results, q=query).execute()
-
-			messages = results.get('messages', [])
-			if not messages:
-				logger.info('📭 No messages found')
-				return []
-
-			logger.info(f'📨 Found {len(messages)} messages, fetching details...')
-
-			# Get full message details
-			emails = []
-			for i, message in enumerate(messages, 1):
-				logger.debug(f'📖 Reading email {i}/{len(messages)}...')
-
-				full_message = self.service.users().messages().get(userId='me', id=message['id'], format='full').execute()
-
-				email_data = self._parse_email(full_message)
-				emails.append(email_data)
-
-			return emails
+			async with self._api_lock:
+				return await asyncio.to_thread(self._fetch_recent_emails, max_results, query)
 
 		except HttpError as error:
 			logger.error(f'❌ Gmail API error: {error}')
@@ -190,6 +186,67 @@ class GmailService:
 			logger.error(f'❌ Unexpected error fetching emails: {e}')
 			return []
 
+	def _fetch_recent_emails(self, max_results: int, query: str) -> list[dict[str, Any]]:
+		"""List the query's message ids and fetch the messages that are not cached yet (blocking)"""
+		assert self.service is not None
+		if self._mailbox_changed():
+			self._query_results.clear()
+
+		key = (query, max_results)
+		cached = self._query_results.get(key)
+		if cached and time.monotonic() - cached[1] < self.QUERY_CACHE_TTL:
+			message_ids = cached[0]
+			logger.debug('📭 Mailbox unchanged since the last poll, reusing its results')
+		else:
+			results = self.service.users().messages().list(userId='me', maxResults=max_results, q=query).execute()
+			message_ids = [message['id'] for message in results.get('messages', [])]
+			self._query_results[key] = (message_ids, time.monotonic())
+
+		if not message_ids:
+			logger.info('📭 No messages found')
+			return []
+
+		missing = [message_id for message_id in message_ids if message_id not in self._messages]
+		logger.info(f'📨 Found {len(message_ids)} messages, fetching {len(missing)} new ones...')
+		self._fetch_messages(missing)
+
+		return [self._messages[message_id] for message_id in message_ids if message_id in self._messages]
+
+	def _mailbox_changed(self) -> bool:
+		"""Check the mailbox history for any change since the last poll (blocking)"""
+		assert self.service is not None
+		users = self.service.users()
+		if self._history_id is not None:
+			try:
+				history = users.history().list(userId='me', startHistoryId=self._history_id, maxResults=1).execute()
+				self._history_id = history.get('historyId', self._history_id)
+				return bool(history.get('history'))
+			except HttpError as error:
+				# Gmail only keeps about a week of history, an outdated id starts over
+				if error.resp.status != 404:
+					raise
+
+		self._history_id = users.getProfile(userId='me').execute()['historyId']
+		return True
+
+	def _fetch_messages(self, message_ids: list[str]) -> None:
+		"""Fetch and cache messages, BATCH_SIZE messages per HTTP request (blocking)"""
+		assert self.service is not None
+
+		def on_response(request_id: str, response: dict[str, Any], exception: HttpError | None) -> None:
+			if exception is not None:
+				logger.warning(f'⚠️ Could not fetch email {request_id}: {exception}')
+				return
+			self._messages[request_id] = self._parse_email(response)
+			if len(self._messages) > self.MAX_CACHED_MESSAGES:
+				del self._messages[next(iter(self._messages))]
+
+		for start in range(0, len(message_ids), self.BATCH_SIZE):
+			batch = self.service.new_batch_http_request(callback=on_response)
+			for message_id in message_ids[start : start + self.BATCH_SIZE]:
+				batch.add(self.service.users().messages().get(userId='me', id=message_id, format='full'), request_id=message_id)
+			batch.execute()
+
 	def _parse_email(self, message: dict[str, Any]) -> dict[str, Any]:
 		"""Parse Gmail message into readable format"""
 		headers = {h['name']: h['value'] for h in message['payload']['headers']}
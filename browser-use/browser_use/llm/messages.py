@@ -5,7 +5,14 @@ This implementation is based on the OpenAI types, while removing all the parts t
 # region - Content parts
 from typing import Literal, Union
 
-from openai import BaseModel
+from pydantic import BaseModel as _PydanticBaseModel
+from pydantic import ConfigDict
+
+
+class BaseModel(_PydanticBaseModel):
+	"""Same config as the openai SDK's BaseModel these types were based on, without importing the SDK."""
+
+	model_config = ConfigDict(extra='allow', defer_build=True)
 
 
 def _truncate(text: str, max_length: int = 50) -> str:
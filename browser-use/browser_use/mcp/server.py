@@ -61,6 +61,9 @@ def _configure_mcp_server_logging():
 	# Set environment to suppress browser-use logging during server mode
 	os.environ['BROWSER_USE_LOGGING_LEVEL'] = 'warning'
 	os.environ['BROWSER_USE_SETUP_LOGGING'] = 'false'  # Prevent automatic logging setup
+	from browser_use.config import CONFIG
+
+	CONFIG.reload()
 
 	# Configure logging to stderr for MCP mode - preserve warnings and above for troubleshooting
 	setup_logging(stream=sys.stderr, log_level='warning', force_setup=True)
@@ -150,6 +153,27 @@ except ImportError:
 from browser_use.telemetry import MCPServerTelemetryEvent, ProductTelemetry
 from browser_use.utils import get_browser_use_version
 
+# Direct browser control tools that accept a `session_id` and run against a pooled browser session
+SESSION_AWARE_TOOLS = {
+	'browser_navigate',
+	'browser_click',
+	'browser_type',
+	'browser_get_state',
+	'browser_extract_content',
+	'browser_scroll',
+	'browser_go_back',
+	'browser_close',
+	'browser_list_tabs',
+	'browser_switch_tab',
+	'browser_close_tab',
+}
+
+# Session-aware tools that only make sense on an existing session, they never launch a browser, with their answer if there is none
+NO_SESSION_RESULTS = {
+	'browser_close': 'No browser session to close',
+	'browser_list_tabs': 'Error: No browser session active',
+}
+
 
 def get_parent_process_cmdline() -> str | None:
 	"""Get the command line of all parent processes up the chain."""
@@ -185,7 +209,7 @@ def get_parent_process_cmdline() -> str | None:
 class BrowserUseServer:
 	"""MCP Server for browser-use capabilities."""
 
-	def __init__(self, session_timeout_minutes: int = 10):
+	def __init__(self, session_timeout_minutes: int = 10, max_sessions: int = 5):
 		# Ensure all logging goes to stderr (in case new loggers were created)
 		_ensure_all_loggers_use_stderr()
 
@@ -202,6 +226,8 @@ class BrowserUseServer:
 		# Session management
 		self.active_sessions: dict[str, dict[str, Any]] = {}  # session_id -> session info
 		self.session_timeout_minutes = session_timeout_minutes
+		self.max_sessions = max_sessions  # pool size, least recently used idle session is evicted when full
+		self._sessions_lock = asyncio.Lock()  # serializes creation/eviction of pooled sessions
 		self._cleanup_task: Any = None
 
 		# Setup handlers
@@ -213,7 +239,7 @@ class BrowserUseServer:
 		@self.server.list_tools()
 		async def handle_list_tools() -> list[types.Tool]:
 			"""List all available browser-use tools."""
-			return [
+			tools = [
 				# Agent tools
 				# Direct browser control tools
 				types.Tool(
@@ -404,6 +430,15 @@ class BrowserUseServer:
 				),
 			]
 
+			# Direct browser control tools can target a pooled browser session
+			for tool in tools:
+				if tool.name in SESSION_AWARE_TOOLS:
+					tool.inputSchema['properties']['session_id'] = {
+						'type': 'string',
+						'description': 'Browser session to run in, created on first use (omit to use the default session)',
+					}
+			return tools
+
 		@self.server.list_resources()
 		async def handle_list_resources() -> list[types.Resource]:
 			"""List available resources (none for browser-use)."""
@@ -463,55 +498,73 @@ class BrowserUseServer:
 			return await self._close_all_sessions()
 
 		# Direct browser control tools (require active session)
-		elif tool_name.startswith('browser_'):
-			# Ensure browser session exists
-			if not self.browser_session:
-				await self._init_browser_session()
+		elif tool_name in SESSION_AWARE_TOOLS:
+			# Get (or lazily create) the pooled session, calls on different sessions run concurrently
+			browser_session = await self._acquire_session(arguments.get('session_id'), create=tool_name not in NO_SESSION_RESULTS)
+			if browser_session is None:
+				return NO_SESSION_RESULTS[tool_name]
+			session_data = self.active_sessions[browser_session.id]
+			start_time = time.time()
+			try:
+				async with session_data['lock']:
+					return await self._execute_browser_tool(browser_session, tool_name, arguments)
+			finally:
+				self._release_session(browser_session.id, time.time() - start_time)
+
+		return f'Unknown tool: {tool_name}'
 
-			if tool_name == 'browser_navigate':
-				return await self._navigate(arguments['url'], arguments.get('new_tab', False))
+	async def _execute_browser_tool(self, browser_session: BrowserSession, tool_name: str, arguments: dict[str, Any]) -> str:
+		"""Execute a direct browser control tool against a specific browser session."""
+		if tool_name == 'browser_navigate':
+			return await self._navigate(browser_session, arguments['url'], arguments.get('new_tab', False))
 
-			elif tool_name == 'browser_click':
-				return await self._click(arguments['index'], arguments.get('new_tab', False))
+		elif tool_name == 'browser_click':
+			return await self._click(browser_session, arguments['index'], arguments.get('new_tab', False))
 
-			elif tool_name == 'browser_type':
-				return await self._type_text(arguments['index'], arguments['text'])
+		elif tool_name == 'browser_type':
+			return await self._type_text(browser_session, arguments['index'], arguments['text'])
 
-			elif tool_name == 'browser_get_state':
-				return await self._get_browser_state(arguments.get('include_screenshot', False))
+		elif tool_name == 'browser_get_state':
+			return await self._get_browser_state(browser_session, arguments.get('include_screenshot', False))
 
-			elif tool_name == 'browser_extract_content':
-				return await self._extract_content(arguments['query'], arguments.get('extract_links', False))
+		elif tool_name == 'browser_extract_content':
+			return await self._extract_content(browser_session, arguments['query'], arguments.get('extract_links', False))
 
-			elif tool_name == 'browser_scroll':
-				return await self._scroll(arguments.get('direction', 'down'))
+		elif tool_name == 'browser_scroll':
+			return await self._scroll(browser_session, arguments.get('direction', 'down'))
 
-			elif tool_name == 'browser_go_back':
-				return await self._go_back()
+		elif tool_name == 'browser_go_back':
+			return await self._go_back(browser_session)
 
-			elif tool_name == 'browser_close':
-				return await self._close_browser()
+		elif tool_name == 'browser_close':
+			return await self._close_browser(browser_session)
 
-			elif tool_name == 'browser_list_tabs':
-				return await self._list_tabs()
+		elif tool_name == 'browser_list_tabs':
+			return await self._list_tabs(browser_session)
 
-			elif tool_name == 'browser_switch_tab':
-				return await self._switch_tab(arguments['tab_id'])
+		elif tool_name == 'browser_switch_tab':
+			return await self._switch_tab(browser_session, arguments['tab_id'])
 
-			elif tool_name == 'browser_close_tab':
-				return await self._close_tab(arguments['tab_id'])
+		elif tool_name == 'browser_close_tab':
+			return await self._close_tab(browser_session, arguments['tab_id'])
 
 		return f'Unknown tool: {tool_name}'
 
 	async def _init_browser_session(self, allowed_domains: list[str] | None = None, **kwargs):
-		"""Initialize browser session using config"""
+		"""Initialize the default browser session using config"""
 		if self.browser_session:
 			return
 
+		self.browser_session = await self._create_browser_session(allowed_domains=allowed_domains, **kwargs)
+
+	async def _create_browser_session(
+		self, session_id: str | None = None, allowed_domains: list[str] | None = None, **kwargs
+	) -> BrowserSession:
+		"""Create, start and track a new browser session using config"""
 		# Ensure all logging goes to stderr before browser initialization
 		_ensure_all_loggers_use_stderr()
 
-		logger.debug('Initializing browser session...')
+		logger.debug(f'Initializing browser session {session_id or "(default)"}...')
 
 		# Get profile config
 		profile_config = get_default_profile(self.config)
@@ -532,6 +585,10 @@ class BrowserUseServer:
 		if allowed_domains is not None:
 			profile_data['allowed_domains'] = allowed_domains
 
+		# Named pool sessions run their own browser processes, which cannot share one profile directory
+		if session_id is not None:
+			profile_data['user_data_dir'] = None
+
 		# Merge any additional kwargs that are valid BrowserProfile fields
 		for key, value in kwargs.items():
 			profile_data[key] = value
@@ -540,11 +597,16 @@ class BrowserUseServer:
 		profile = BrowserProfile(**profile_data)
 
 		# Create browser session
-		self.browser_session = BrowserSession(browser_profile=profile)
-		await self.browser_session.start()
+		browser_session = BrowserSession(id=session_id, browser_profile=profile)
+		await browser_session.start()
 
 		# Track the session for management
-		self._track_session(self.browser_session)
+		self._track_session(browser_session)
+
+		# Tools, LLM and FileSystem are stateless across sessions, create them once and share them
+		if self.tools is not None:
+			logger.debug('Browser session initialized')
+			return browser_session
 
 		# Create tools for direct actions
 		self.tools = Tools()
@@ -564,6 +626,7 @@ class BrowserUseServer:
 		self.file_system = FileSystem(base_dir=Path(file_system_path).expanduser())
 
 		logger.debug('Browser session initialized')
+		return browser_session
 
 	async def _retry_with_browser_use_agent(
 		self,
@@ -647,35 +710,23 @@ class BrowserUseServer:
 			# Clean up
 			await agent.close()
 
-	async def _navigate(self, url: str, new_tab: bool = False) -> str:
+	async def _navigate(self, browser_session: BrowserSession, url: str, new_tab: bool = False) -> str:
 		"""Navigate to a URL."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
-		# Update session activity
-		self._update_session_activity(self.browser_session.id)
-
 		from browser_use.browser.events import NavigateToUrlEvent
 
 		if new_tab:
-			event = self.browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url, new_tab=True))
+			event = browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url, new_tab=True))
 			await event
 			return f'Opened new tab with URL: {url}'
 		else:
-			event = self.browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url))
+			event = browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url))
 			await event
 			return f'Navigated to: {url}'
 
-	async def _click(self, index: int, new_tab: bool = False) -> str:
+	async def _click(self, browser_session: BrowserSession, index: int, new_tab: bool = False) -> str:
 		"""Click an element by index."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
-		# Update session activity
-		self._update_session_activity(self.browser_session.id)
-
 		# Get the element
-		element = await self.browser_session.get_dom_element_by_index(index)
+		element = await browser_session.get_dom_element_by_index(index)
 		if not element:
 			return f'Element with index {index} not found'
 
@@ -684,7 +735,7 @@ class BrowserUseServer:
 			href = element.attributes.get('href')
 			if href:
 				# Convert relative href to absolute URL
-				state = await self.browser_session.get_browser_state_summary()
+				state = await browser_session.get_browser_state_summary()
 				current_url = state.url
 				if href.startswith('/'):
 					# Relative URL - construct full URL
@@ -698,7 +749,7 @@ class BrowserUseServer:
 				# Open link in new tab
 				from browser_use.browser.events import NavigateToUrlEvent
 
-				event = self.browser_session.event_bus.dispatch(NavigateToUrlEvent(url=full_url, new_tab=True))
+				event = browser_session.event_bus.dispatch(NavigateToUrlEvent(url=full_url, new_tab=True))
 				await event
 				return f'Clicked element {index} and opened in new tab {full_url[:20]}...'
 			else:
@@ -706,23 +757,20 @@ class BrowserUseServer:
 				# Opening in new tab without href is not reliably supported
 				from browser_use.browser.events import ClickElementEvent
 
-				event = self.browser_session.event_bus.dispatch(ClickElementEvent(node=element))
+				event = browser_session.event_bus.dispatch(ClickElementEvent(node=element))
 				await event
 				return f'Clicked element {index} (new tab not supported for non-link elements)'
 		else:
 			# Normal click
 			from browser_use.browser.events import ClickElementEvent
 
-			event = self.browser_session.event_bus.dispatch(ClickElementEvent(node=element))
+			event = browser_session.event_bus.dispatch(ClickElementEvent(node=element))
 			await event
 			return f'Clicked element {index}'
 
-	async def _type_text(self, index: int, text: str) -> str:
+	async def _type_text(self, browser_session: BrowserSession, index: int, text: str) -> str:
 		"""Type text into an element."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
-		element = await self.browser_session.get_dom_element_by_index(index)
+		element = await browser_session.get_dom_element_by_index(index)
 		if not element:
 			return f'Element with index {index} not found'
 
@@ -750,7 +798,7 @@ class BrowserUseServer:
 			else:
 				sensitive_key_name = 'credential'
 
-		event = self.browser_session.event_bus.dispatch(
+		event = browser_session.event_bus.dispatch(
 			TypeTextEvent(node=element, text=text, is_sensitive=is_potentially_sensitive, sensitive_key_name=sensitive_key_name)
 		)
 		await event
@@ -763,12 +811,9 @@ class BrowserUseServer:
 		else:
 			return f"Typed '{text}' into element {index}"
 
-	async def _get_browser_state(self, include_screenshot: bool = False) -> str:
+	async def _get_browser_state(self, browser_session: BrowserSession, include_screenshot: bool = False) -> str:
 		"""Get current browser state."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
-		state = await self.browser_session.get_browser_state_summary(cache_clickable_elements_hashes=False)
+		state = await browser_session.get_browser_state_summary(cache_clickable_elements_hashes=False)
 
 		result = {
 			'url': state.url,
@@ -795,7 +840,7 @@ class BrowserUseServer:
 
 		return json.dumps(result, indent=2)
 
-	async def _extract_content(self, query: str, extract_links: bool = False) -> str:
+	async def _extract_content(self, browser_session: BrowserSession, query: str, extract_links: bool = False) -> str:
 		"""Extract content from current page."""
 		if not self.llm:
 			return 'Error: LLM not initialized (set OPENAI_API_KEY)'
@@ -803,13 +848,10 @@ class BrowserUseServer:
 		if not self.file_system:
 			return 'Error: FileSystem not initialized'
 
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
 		if not self.tools:
 			return 'Error: Tools not initialized'
 
-		state = await self.browser_session.get_browser_state_summary()
+		state = await browser_session.get_browser_state_summary()
 
 		# Use the extract_structured_data action
 		# Create a dynamic action model that matches the tools's expectations
@@ -825,22 +867,19 @@ class BrowserUseServer:
 		action = ExtractAction()
 		action_result = await self.tools.act(
 			action=action,
-			browser_session=self.browser_session,
+			browser_session=browser_session,
 			page_extraction_llm=self.llm,
 			file_system=self.file_system,
 		)
 
 		return action_result.extracted_content or 'No content extracted'
 
-	async def _scroll(self, direction: str = 'down') -> str:
+	async def _scroll(self, browser_session: BrowserSession, direction: str = 'down') -> str:
 		"""Scroll the page."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
 		from browser_use.browser.events import ScrollEvent
 
 		# Scroll by a standard amount (500 pixels)
-		event = self.browser_session.event_bus.dispatch(
+		event = browser_session.event_bus.dispatch(
 			ScrollEvent(
 				direction=direction,  # type: ignore
 				amount=500,
@@ -849,64 +888,52 @@ class BrowserUseServer:
 		await event
 		return f'Scrolled {direction}'
 
-	async def _go_back(self) -> str:
+	async def _go_back(self, browser_session: BrowserSession) -> str:
 		"""Go back in browser history."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
 		from browser_use.browser.events import GoBackEvent
 
-		event = self.browser_session.event_bus.dispatch(GoBackEvent())
+		event = browser_session.event_bus.dispatch(GoBackEvent())
 		await event
 		return 'Navigated back'
 
-	async def _close_browser(self) -> str:
+	async def _close_browser(self, browser_session: BrowserSession) -> str:
 		"""Close the browser session."""
-		if self.browser_session:
-			from browser_use.browser.events import BrowserStopEvent
+		from browser_use.browser.events import BrowserStopEvent
 
-			event = self.browser_session.event_bus.dispatch(BrowserStopEvent())
-			await event
+		# out of the pool first, so no other tool call acquires the session while it stops
+		self.active_sessions.pop(browser_session.id, None)
+		if self.browser_session is browser_session:
 			self.browser_session = None
-			self.tools = None
-			return 'Browser closed'
-		return 'No browser session to close'
+		event = browser_session.event_bus.dispatch(BrowserStopEvent())
+		await event
+		return 'Browser closed'
 
-	async def _list_tabs(self) -> str:
+	async def _list_tabs(self, browser_session: BrowserSession) -> str:
 		"""List all open tabs."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
-		tabs_info = await self.browser_session.get_tabs()
+		tabs_info = await browser_session.get_tabs()
 		tabs = []
 		for i, tab in enumerate(tabs_info):
 			tabs.append({'tab_id': tab.target_id[-4:], 'url': tab.url, 'title': tab.title or ''})
 		return json.dumps(tabs, indent=2)
 
-	async def _switch_tab(self, tab_id: str) -> str:
+	async def _switch_tab(self, browser_session: BrowserSession, tab_id: str) -> str:
 		"""Switch to a different tab."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
 		from browser_use.browser.events import SwitchTabEvent
 
-		target_id = await self.browser_session.get_target_id_from_tab_id(tab_id)
-		event = self.browser_session.event_bus.dispatch(SwitchTabEvent(target_id=target_id))
+		target_id = await browser_session.get_target_id_from_tab_id(tab_id)
+		event = browser_session.event_bus.dispatch(SwitchTabEvent(target_id=target_id))
 		await event
-		state = await self.browser_session.get_browser_state_summary()
+		state = await browser_session.get_browser_state_summary()
 		return f'Switched to tab {tab_id}: {state.url}'
 
-	async def _close_tab(self, tab_id: str) -> str:
+	async def _close_tab(self, browser_session: BrowserSession, tab_id: str) -> str:
 		"""Close a specific tab."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
 		from browser_use.browser.events import CloseTabEvent
 
-		target_id = await self.browser_session.get_target_id_from_tab_id(tab_id)
-		event = self.browser_session.event_bus.dispatch(CloseTabEvent(target_id=target_id))
+		target_id = await browser_session.get_target_id_from_tab_id(tab_id)
+		event = browser_session.event_bus.dispatch(CloseTabEvent(target_id=target_id))
 		await event
-		current_url = await self.browser_session.get_current_page_url()
+		current_url = await browser_session.get_current_page_url()
 		return f'Closed tab # {tab_id}, now on {current_url}'
 
 	def _track_session(self, session: BrowserSession) -> None:
@@ -916,6 +943,12 @@ class BrowserUseServer:
 			'created_at': time.time(),
 			'last_activity': time.time(),
 			'url': getattr(session, 'current_url', None),
+			'lock': asyncio.Lock(),  # tool calls on the same session run one at a time
+			'in_flight': 0,  # tool calls acquired but not released yet, busy sessions are never evicted
+			'tool_calls': 0,
+			'total_latency': 0.0,
+			'last_latency': None,
+			'max_latency': 0.0,
 		}
 
 	def _update_session_activity(self, session_id: str) -> None:
@@ -923,6 +956,61 @@ class BrowserUseServer:
 		if session_id in self.active_sessions:
 			self.active_sessions[session_id]['last_activity'] = time.time()
 
+	async def _acquire_session(self, session_id: str | None = None, create: bool = True) -> BrowserSession | None:
+		"""Get a pooled browser session for a tool call, creating it on first use unless `create` is False.
+
+		Without a session_id the default session is used. The session is marked busy until _release_session().
+		"""
+		if session_id is None and self.browser_session:
+			session_id = self.browser_session.id
+
+		session_data = self.active_sessions.get(session_id) if session_id else None
+		if session_data is None:
+			if not create:
+				return None
+			async with self._sessions_lock:
+				session_data = self.active_sessions.get(session_id) if session_id else None
+				if session_data is None:
+					await self._evict_idle_sessions(keep=self.max_sessions - 1)
+					if session_id is None:
+						await self._init_browser_session()
+						assert self.browser_session is not None
+						session_id = self.browser_session.id
+					else:
+						await self._create_browser_session(session_id=session_id)
+					session_data = self.active_sessions[session_id]
+
+		session_data['in_flight'] += 1
+		self._update_session_activity(session_data['session'].id)
+		return session_data['session']
+
+	def _release_session(self, session_id: str, duration: float) -> None:
+		"""Mark a tool call on a pooled session as finished and record its latency."""
+		session_data = self.active_sessions.get(session_id)
+		if session_data is None:
+			return  # closed while the tool call was running
+		session_data['in_flight'] -= 1
+		session_data['tool_calls'] += 1
+		session_data['total_latency'] += duration
+		session_data['last_latency'] = duration
+		session_data['max_latency'] = max(session_data['max_latency'], duration)
+		session_data['last_activity'] = time.time()
+
+	async def _evict_idle_sessions(self, keep: int) -> None:
+		"""Close least recently used idle sessions until at most `keep` sessions remain in the pool."""
+		while len(self.active_sessions) > keep:
+			idle_sessions = [
+				(session_data['last_activity'], session_id)
+				for session_id, session_data in self.active_sessions.items()
+				if session_data['in_flight'] == 0
+			]
+			if not idle_sessions:
+				raise RuntimeError(f'Browser session pool is full: all {len(self.active_sessions)} sessions are busy')
+
+			_, lru_session_id = min(idle_sessions)
+			logger.info(f'Evicting least recently used browser session {lru_session_id}')
+			await self._close_session(lru_session_id)  # leaves the pool before the browser is closed, even if closing fails
+
 	async def _list_sessions(self) -> str:
 		"""List all active browser sessions."""
 		if not self.active_sessions:
@@ -937,14 +1025,23 @@ class BrowserUseServer:
 			# Check if session is still active
 			is_active = hasattr(session, 'cdp_client') and session.cdp_client is not None
 
+			tool_calls = session_data['tool_calls']
 			sessions_info.append(
 				{
 					'session_id': session_id,
 					'created_at': created_at,
 					'last_activity': last_activity,
 					'active': is_active,
+					'busy': session_data['in_flight'] > 0,
+					'default': bool(self.browser_session and self.browser_session.id == session_id),
 					'current_url': session_data.get('url', 'Unknown'),
 					'age_minutes': (time.time() - session_data['created_at']) / 60,
+					'tool_calls': tool_calls,
+					'avg_latency_ms': round(session_data['total_latency'] / tool_calls * 1000, 1) if tool_calls else None,
+					'last_latency_ms': round(session_data['last_latency'] * 1000, 1)
+					if session_data['last_latency'] is not None
+					else None,
+					'max_latency_ms': round(session_data['max_latency'] * 1000, 1),
 				}
 			)
 
@@ -952,12 +1049,16 @@ class BrowserUseServer:
 
 	async def _close_session(self, session_id: str) -> str:
 		"""Close a specific browser session."""
-		if session_id not in self.active_sessions:
+		# Remove from tracking before closing, a tool call must not acquire the session while it shuts down
+		session_data = self.active_sessions.pop(session_id, None)
+		if session_data is None:
 			return f'Session {session_id} not found'
-
-		session_data = self.active_sessions[session_id]
 		session = session_data['session']
 
+		# If this was the default session, clear it
+		if self.browser_session and self.browser_session.id == session_id:
+			self.browser_session = None
+
 		try:
 			# Close the session
 			if hasattr(session, 'kill'):
@@ -965,14 +1066,6 @@ class BrowserUseServer:
 			elif hasattr(session, 'close'):
 				await session.close()
 
-			# Remove from tracking
-			del self.active_sessions[session_id]
-
-			# If this was the current session, clear it
-			if self.browser_session and self.browser_session.id == session_id:
-				self.browser_session = None
-				self.tools = None
-
 			return f'Successfully closed session {session_id}'
 		except Exception as e:
 			return f'Error closing session {session_id}: {str(e)}'
@@ -995,9 +1088,8 @@ class BrowserUseServer:
 			except Exception as e:
 				errors.append(f'{session_id}: {str(e)}')
 
-		# Clear current session references
+		# Clear default session reference
 		self.browser_session = None
-		self.tools = None
 
 		result = f'Closed {closed_count} sessions'
 		if errors:
@@ -1013,7 +1105,8 @@ class BrowserUseServer:
 		expired_sessions = []
 		for session_id, session_data in self.active_sessions.items():
 			last_activity = session_data['last_activity']
-			if current_time - last_activity > timeout_seconds:
+			# never close a session while a tool call is running on it
+			if session_data['in_flight'] == 0 and current_time - last_activity > timeout_seconds:
 				expired_sessions.append(session_id)
 
 		for session_id in expired_sessions:
@@ -1058,12 +1151,12 @@ class BrowserUseServer:
 			)
 
 
-async def main(session_timeout_minutes: int = 10):
+async def main(session_timeout_minutes: int = 10, max_sessions: int = 5):
 	if not MCP_AVAILABLE:
 		print('MCP SDK is required. Install with: pip install mcp', file=sys.stderr)
 		sys.exit(1)
 
-	server = BrowserUseServer(session_timeout_minutes=session_timeout_minutes)
+	server = BrowserUseServer(session_timeout_minutes=session_timeout_minutes, max_sessions=max_sessions)
 	server._telemetry.capture(
 		MCPServerTelemetryEvent(
 			version=get_browser_use_version(),
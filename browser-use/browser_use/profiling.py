@@ -0,0 +1,258 @@
+# @file purpose: In-process span profiler that attributes time to the DOM, serializer, watchdog, CDP, LLM and action layers
+"""
+Span profiler for browser-use
+
+Records nested, timed spans in-process so a slow agent step can be attributed to the layer that caused it.
+
+Features:
+- Nested spans that follow asyncio tasks (the current span is kept in a ContextVar)
+- Near-zero overhead when disabled: `profiler.span()` returns a shared no-op context manager
+- Per-step summaries (milliseconds per layer) stored on `AgentHistory.metadata.span_summary`
+- Spans are tagged with the agent whose run they happen in, so agents sharing a process get their own summaries and traces
+- Export to Chrome trace-event JSON, viewable offline in Perfetto (ui.perfetto.dev) or chrome://tracing
+
+Enable with BROWSER_USE_PROFILE=true (or `profiler.enable()`). If BROWSER_USE_PROFILE_TRACE_DIR is set, the agent
+writes a trace file there at the end of every run.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from contextvars import ContextVar, Token
+from functools import wraps
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from browser_use.config import CONFIG
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class Span:
+	"""A timed region of code, optionally nested inside a parent span."""
+
+	__slots__ = ('name', 'category', 'args', 'start_ns', 'end_ns', 'parent', 'outer_categories', 'track', 'owner')
+
+	def __init__(
+		self, name: str, category: str, args: dict[str, Any], parent: 'Span | None', track: str, owner: str | None = None
+	):
+		self.name = name
+		self.category = category
+		self.args = args
+		self.parent = parent
+		# categories of all enclosing spans, used to avoid counting nested spans of the same layer twice
+		self.outer_categories: frozenset[str] = parent.outer_categories | {parent.category} if parent is not None else frozenset()
+		self.track = track
+		self.owner = owner  # id of the agent the span was recorded for, None outside of an agent run
+		self.start_ns = time.perf_counter_ns()
+		self.end_ns: int | None = None
+
+	@property
+	def duration_ms(self) -> float:
+		end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+		return (end_ns - self.start_ns) / 1e6
+
+	def __repr__(self) -> str:
+		return f'Span({self.category}:{self.name}, {self.duration_ms:.2f}ms)'
+
+
+class _SpanContext:
+	"""Context manager that records a span on the profiler."""
+
+	__slots__ = ('_profiler', '_name', '_category', '_args', '_span', '_token')
+
+	def __init__(self, profiler: 'SpanProfiler', name: str, category: str, args: dict[str, Any]):
+		self._profiler = profiler
+		self._name = name
+		self._category = category
+		self._args = args
+
+	def __enter__(self) -> Span:
+		profiler = self._profiler
+		self._span = Span(
+			self._name, self._category, self._args, profiler._current.get(), _current_track(), profiler._owner.get()
+		)
+		self._token = profiler._current.set(self._span)
+		return self._span
+
+	def __exit__(self, exc_type, exc, tb) -> None:
+		span = self._span
+		span.end_ns = time.perf_counter_ns()
+		if exc_type is not None:
+			span.args['error'] = exc_type.__name__
+		try:
+			self._profiler._current.reset(self._token)
+		except ValueError:
+			# exited in a different context than it was entered in (e.g. an async generator), just restore the parent
+			self._profiler._current.set(span.parent)
+		self._profiler.spans.append(span)
+
+
+class _NoOpSpanContext:
+	"""Shared context manager returned while profiling is disabled."""
+
+	__slots__ = ()
+
+	def __enter__(self) -> None:
+		return None
+
+	def __exit__(self, exc_type, exc, tb) -> None:
+		return None
+
+
+_NO_OP_SPAN = _NoOpSpanContext()
+
+
+def _current_track() -> str:
+	"""Name of the asyncio task (or thread) a span runs in, each one becomes its own track in the trace."""
+	try:
+		task = asyncio.current_task()
+	except RuntimeError:
+		task = None
+	return task.get_name() if task is not None else threading.current_thread().name
+
+
+class SpanProfiler:
+	"""Records nested spans and turns them into per-step summaries and Chrome traces."""
+
+	def __init__(self, enabled: bool = False, max_spans: int = 100_000):
+		self.enabled = enabled
+		# finished spans in the order they ended, oldest are dropped once max_spans is reached
+		self.spans: deque[Span] = deque(maxlen=max_spans)
+		self._current: ContextVar[Span | None] = ContextVar('browser_use_current_span', default=None)
+		# the agent spans are recorded for, follows the asyncio tasks (and event bus handlers) started during its run
+		self._owner: ContextVar[str | None] = ContextVar('browser_use_span_owner', default=None)
+
+	def enable(self) -> None:
+		self.enabled = True
+
+	def disable(self) -> None:
+		self.enabled = False
+
+	def clear(self) -> None:
+		self.spans.clear()
+
+	def set_owner(self, owner: str | None) -> Token[str | None]:
+		"""Tag the spans recorded from now on in this context (and tasks started from it) with owner, e.g. the agent id"""
+		return self._owner.set(owner)
+
+	def reset_owner(self, token: Token[str | None]) -> None:
+		"""Restore the owner from before the set_owner() call that returned token"""
+		self._owner.reset(token)
+
+	def span(self, name: str, category: str = '', **args: Any) -> _SpanContext | _NoOpSpanContext:
+		"""Record the enclosed block as a span, usable in sync and async code: `with profiler.span('name', 'dom'):`"""
+		if not self.enabled:
+			return _NO_OP_SPAN
+		return _SpanContext(self, name, category, args)
+
+	def annotate(self, **args: Any) -> None:
+		"""Attach extra arguments to the current span, shown in the trace viewer"""
+		if self.enabled and (span := self._current.get()) is not None:
+			span.args.update(args)
+
+	def current_span(self, category: str | None = None) -> Span | None:
+		"""Get the innermost open span, or the innermost open span of the given category"""
+		span = self._current.get()
+		while span is not None and category is not None and span.category != category:
+			span = span.parent
+		return span
+
+	def summarize(self, root: Span) -> dict[str, float]:
+		"""
+		Get the milliseconds spent per category during `root`
+
+		Includes spans that ran in other tasks while root was open (e.g. watchdog handlers running on the event bus),
+		except spans of other owners, so agents running concurrently in one process don't count each other's time.
+		Spans without an owner are counted for every root. Categories overlap: a watchdog's time includes the DOM
+		build it ran.
+		"""
+		end_ns = root.end_ns if root.end_ns is not None else time.perf_counter_ns()
+		totals: dict[str, float] = {}
+		for span in reversed(self.spans):
+			assert span.end_ns is not None
+			if span.end_ns < root.start_ns:
+				break
+			if span is root or span.start_ns < root.start_ns or span.end_ns > end_ns:
+				continue
+			if span.owner is not None and span.owner != root.owner:
+				continue
+			if span.category in span.outer_categories:
+				continue
+			totals[span.category] = totals.get(span.category, 0.0) + (span.end_ns - span.start_ns) / 1e6
+
+		summary = {'total': (end_ns - root.start_ns) / 1e6}
+		summary.update(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+		return {category: round(ms, 3) for category, ms in summary.items()}
+
+	def to_chrome_trace(self, owner: str | None = None) -> dict[str, Any]:
+		"""Convert the finished spans to the Chrome trace-event format, only those of owner (and without one) if given"""
+		pid = os.getpid()
+		track_ids: dict[str, int] = {}
+		events: list[dict[str, Any]] = []
+		for span in sorted(self.spans, key=lambda span: span.start_ns):
+			assert span.end_ns is not None
+			if owner is not None and span.owner is not None and span.owner != owner:
+				continue
+			tid = track_ids.setdefault(span.track, len(track_ids) + 1)
+			events.append(
+				{
+					'name': span.name,
+					'cat': span.category,
+					'ph': 'X',
+					'ts': span.start_ns / 1000,
+					'dur': (span.end_ns - span.start_ns) / 1000,
+					'pid': pid,
+					'tid': tid,
+					'args': {
+						key: value if isinstance(value, (str, int, float, bool)) else str(value)
+						for key, value in span.args.items()
+					},
+				}
+			)
+		for track, tid in track_ids.items():
+			events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': track}})
+		return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+	def export_chrome_trace(self, path: str | Path, owner: str | None = None) -> Path:
+		"""Write the finished spans (of owner, if given) as Chrome trace-event JSON, open it in ui.perfetto.dev or chrome://tracing"""
+		path = Path(path).expanduser()
+		path.parent.mkdir(parents=True, exist_ok=True)
+		path.write_text(json.dumps(self.to_chrome_trace(owner)))
+		return path
+
+
+profiler = SpanProfiler(enabled=CONFIG.BROWSER_USE_PROFILE)
+
+
+def traced(name: str | None = None, category: str = '') -> Callable[[F], F]:
+	"""Decorator that records every call of a sync or async function as a span"""
+
+	def decorator(func: F) -> F:
+		span_name = name or func.__name__
+
+		if asyncio.iscoroutinefunction(func):
+
+			@wraps(func)
+			async def async_wrapper(*args, **kwargs):
+				if not profiler.enabled:
+					return await func(*args, **kwargs)
+				with profiler.span(span_name, category):
+					return await func(*args, **kwargs)
+
+			return cast(F, async_wrapper)
+
+		@wraps(func)
+		def sync_wrapper(*args, **kwargs):
+			if not profiler.enabled:
+				return func(*args, **kwargs)
+			with profiler.span(span_name, category):
+				return func(*args, **kwargs)
+
+		return cast(F, sync_wrapper)
+
+	return decorator
@@ -2,47 +2,112 @@
 Screenshot storage service for browser-use agents.
 """
 
+import asyncio
 import base64
+import hashlib
+from collections.abc import Sequence
 from pathlib import Path
 
 import anyio
 
+# Files read at once by load_screenshots(), a long history must not open all of its screenshots together
+MAX_CONCURRENT_SCREENSHOT_READS = 16
+
 
 class ScreenshotService:
-	"""Simple screenshot storage service that saves screenshots to disk"""
+	"""Simple screenshot storage service that saves screenshots to disk
+
+	Screenshots are named by the hash of their content, so steps that show the same page share one file and it is
+	written once. With `near_duplicate_threshold` set, a screenshot that differs from the previous one in at most that
+	many bits of their 64-bit perceptual hashes reuses the previous file.
+	"""
 
-	def __init__(self, agent_directory: str | Path):
+	def __init__(self, agent_directory: str | Path, near_duplicate_threshold: int | None = None):
 		"""Initialize with agent directory path"""
 		self.agent_directory = Path(agent_directory) if isinstance(agent_directory, str) else agent_directory
+		self.near_duplicate_threshold = near_duplicate_threshold
 
 		# Create screenshots subdirectory
 		self.screenshots_dir = self.agent_directory / 'screenshots'
 		self.screenshots_dir.mkdir(parents=True, exist_ok=True)
 
-	async def store_screenshot(self, screenshot_b64: str, step_number: int) -> str:
-		"""Store screenshot to disk and return the full path as string"""
-		screenshot_filename = f'step_{step_number}.png'
-		screenshot_path = self.screenshots_dir / screenshot_filename
+		self._stored: set[str] = set()  # paths of the screenshots written by this service
+		self._perceptual_hashes: dict[str, int] = {}  # screenshot path -> perceptual hash, with near_duplicate_threshold
+		self._last_path: str | None = None
 
+	async def store_screenshot(self, screenshot_b64: str) -> str:
+		"""Store screenshot to disk and return the full path as string"""
 		# Decode base64 and save to disk
 		screenshot_data = base64.b64decode(screenshot_b64)
+		screenshot_path = self.screenshots_dir / f'{hashlib.sha256(screenshot_data).hexdigest()[:32]}.png'
+		path = str(screenshot_path)
 
-		async with await anyio.open_file(screenshot_path, 'wb') as f:
-			await f.write(screenshot_data)
+		if path not in self._stored:
+			perceptual_hash = None
+			if self.near_duplicate_threshold is not None:
+				perceptual_hash = await asyncio.to_thread(_perceptual_hash, screenshot_data)
+				last_hash = self._perceptual_hashes.get(self._last_path) if self._last_path else None
+				if last_hash is not None and (perceptual_hash ^ last_hash).bit_count() <= self.near_duplicate_threshold:
+					perceptual_hash = None
+					path = self._last_path  # type: ignore[assignment]
 
-		return str(screenshot_path)
+			if path not in self._stored:
+				self._stored.add(path)  # registered before writing, a concurrent store of the same content must not write again
+				if perceptual_hash is not None:
+					self._perceptual_hashes[path] = perceptual_hash
+				async with await anyio.open_file(screenshot_path, 'wb') as f:
+					await f.write(screenshot_data)
+
+		self._last_path = path
+		return path
 
 	async def get_screenshot(self, screenshot_path: str) -> str | None:
 		"""Load screenshot from disk path and return as base64"""
-		if not screenshot_path:
-			return None
+		return await _load_screenshot(screenshot_path)
+
+	async def get_screenshots(self, screenshot_paths: Sequence[str | None]) -> list[str | None]:
+		"""Load several screenshots concurrently as base64, reading each distinct file once"""
+		return await load_screenshots(screenshot_paths)
+
+
+async def load_screenshots(screenshot_paths: Sequence[str | None]) -> list[str | None]:
+	"""Load screenshots as base64 without blocking the event loop, reading each distinct file once, concurrently"""
+	unique_paths = list(dict.fromkeys(path for path in screenshot_paths if path))
+	slots = asyncio.Semaphore(MAX_CONCURRENT_SCREENSHOT_READS)
+
+	async def load(path: str) -> str | None:
+		async with slots:
+			return await _load_screenshot(path)
+
+	loaded = dict(zip(unique_paths, await asyncio.gather(*(load(path) for path in unique_paths))))
+	return [loaded[path] if path else None for path in screenshot_paths]
+
+
+async def _load_screenshot(screenshot_path: str | None) -> str | None:
+	if not screenshot_path:
+		return None
+
+	path = Path(screenshot_path)
+	if not await anyio.Path(path).exists():
+		return None
+
+	# Load from disk and encode to base64
+	async with await anyio.open_file(path, 'rb') as f:
+		screenshot_data = await f.read()
+
+	return base64.b64encode(screenshot_data).decode('utf-8')
+
 
-		path = Path(screenshot_path)
-		if not path.exists():
-			return None
+def _perceptual_hash(screenshot_data: bytes) -> int:
+	"""64-bit difference hash: whether each pixel of a 9x8 grayscale thumbnail is brighter than its right neighbour"""
+	from io import BytesIO
 
-		# Load from disk and encode to base64
-		async with await anyio.open_file(path, 'rb') as f:
-			screenshot_data = await f.read()
+	from PIL import Image
 
-		return base64.b64encode(screenshot_data).decode('utf-8')
+	with Image.open(BytesIO(screenshot_data)) as image:
+		pixels = list(image.convert('L').resize((9, 8), Image.Resampling.BILINEAR).getdata())
+	bits = 0
+	for row in range(8):
+		for column in range(8):
+			bits = bits << 1 | (pixels[row * 9 + column] > pixels[row * 9 + column + 1])
+	return bits
@@ -2,7 +2,6 @@ import logging
 import os
 
 from dotenv import load_dotenv
-from posthog import Posthog
 from uuid_extensions import uuid7str
 
 from browser_use.telemetry.views import BaseTelemetryEvent
@@ -42,6 +41,8 @@ class ProductTelemetry:
 		if telemetry_disabled:
 			self._posthog_client = None
 		else:
+			from posthog import Posthog
+
 			logger.info('Using anonymized telemetry, see https://docs.browser-use.com/development/telemetry.')
 			self._posthog_client = Posthog(
 				project_api_key=self.PROJECT_API_KEY,
@@ -1,13 +1,19 @@
 """
 Token cost service that tracks LLM token usage and costs.
 
-Fetches pricing data from LiteLLM repository and caches it for 1 day.
+Fetches pricing data from LiteLLM repository in the background and caches it for 1 day,
+falling back to a pricing snapshot bundled with the package when offline.
 Automatically tracks token usage when LLMs are registered and invoked.
 """
 
 import asyncio
+import importlib.resources
+import json
 import logging
 import os
+import time
+from collections import deque
+from collections.abc import Iterator
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -26,6 +32,7 @@ from browser_use.tokens.views import (
 	TokenCostCalculated,
 	TokenUsageEntry,
 	UsageSummary,
+	UsageTotals,
 )
 
 load_dotenv()
@@ -44,37 +51,115 @@ def xdg_cache_home() -> Path:
 
 
 class TokenCost:
-	"""Service for tracking token usage and calculating costs"""
+	"""Service for tracking token usage and calculating costs
+
+	Usage is folded into running per-model and per-time-bucket totals as it is recorded, so summaries do not depend on
+	the length of the run. Only the most recent `max_history` entries are kept in memory, older entries are dropped or,
+	if `history_spill_path` is set, appended to that JSONL file.
+
+	Pricing data is loaded in the background, from `pricing_file` (or BROWSER_USE_PRICING_FILE) if given, otherwise from
+	the LiteLLM cache or repository, falling back to the bundled snapshot. Entries recorded before it is ready are costed
+	once it is loaded, so nothing waits on pricing I/O. get_usage_summary() waits for it at most PRICING_WAIT_TIMEOUT
+	seconds, after that the summary prices those entries with the bundled snapshot until the download has finished.
+	"""
 
 	CACHE_DIR_NAME = 'browser_use/token_cost'
 	CACHE_DURATION = timedelta(days=1)
 	PRICING_URL = 'https://raw.githubusercontent.com/BerriAI/litellm/main/model_prices_and_context_window.json'
-
-	def __init__(self, include_cost: bool = False):
+	PRICING_SNAPSHOT_FILE = 'pricing_snapshot.json'
+	PRICING_WAIT_TIMEOUT = 1.0  # seconds get_usage_summary() waits for pricing data still being downloaded
+
+	def __init__(
+		self,
+		include_cost: bool = False,
+		max_history: int | None = 1000,
+		history_spill_path: str | Path | None = None,
+		bucket_size: timedelta = timedelta(minutes=1),
+		max_buckets: int = 7 * 24 * 60,
+		pricing_file: str | Path | None = None,
+	):
 		self.include_cost = include_cost or os.getenv('BROWSER_USE_CALCULATE_COST', 'false').lower() == 'true'
-
-		self.usage_history: list[TokenUsageEntry] = []
+		pricing_file = pricing_file or os.getenv('BROWSER_USE_PRICING_FILE')
+		self.pricing_file = Path(pricing_file).expanduser() if pricing_file else None
+
+		self.usage_history: deque[TokenUsageEntry] = deque(maxlen=max_history)
+		self.history_spill_path = Path(history_spill_path).expanduser() if history_spill_path else None
+		self.bucket_size = bucket_size
+		self.max_buckets = max_buckets
+		self._bucket_seconds = bucket_size.total_seconds()
+		self._totals_by_model: dict[str, UsageTotals] = {}
+		# bucket index (unix time // bucket_size) -> per-model totals of the usage recorded in that time window
+		self._totals_by_bucket: dict[int, dict[str, UsageTotals]] = {}
+		# entries recorded before pricing data was loaded, costed by _apply_pending_costs()
+		self._uncosted_entries: list[TokenUsageEntry] = []
+		self._history_truncated = False
 		self.registered_llms: dict[str, BaseChatModel] = {}
 		self._pricing_data: dict[str, Any] | None = None
+		self._pricing_task: asyncio.Task[None] | None = None
+		self._bundled_pricing: dict[str, Any] | None = None
+		self._pricing_wait_until: float | None = None  # deadline of the summaries waiting for pricing data, set once
 		self._initialized = False
 		self._cache_dir = xdg_cache_home() / self.CACHE_DIR_NAME
 
 	async def initialize(self) -> None:
-		"""Initialize the service by loading pricing data"""
+		"""Initialize the service by starting to load pricing data in the background"""
 		if not self._initialized:
 			if self.include_cost:
-				await self._load_pricing_data()
+				self._pricing_task = asyncio.create_task(self._load_pricing_data())
 			self._initialized = True
 
+	async def wait_for_pricing(self) -> None:
+		"""Wait until the background pricing data load has finished"""
+		if not self._initialized:
+			await self.initialize()
+
+		if self._pricing_task:
+			await asyncio.shield(self._pricing_task)
+
 	async def _load_pricing_data(self) -> None:
-		"""Load pricing data from cache or fetch from GitHub"""
-		# Try to find a valid cache file
-		cache_file = await self._find_valid_cache()
+		"""Load pricing data from the user's pricing file, or from cache or GitHub, falling back to the bundled snapshot"""
+		try:
+			if self.pricing_file:
+				await self._load_from_pricing_file(self.pricing_file)
+				return
 
-		if cache_file:
-			await self._load_from_cache(cache_file)
-		else:
-			await self._fetch_and_cache_pricing_data()
+			# Try to find a valid cache file
+			cache_file = await self._find_valid_cache()
+
+			if cache_file:
+				await self._load_from_cache(cache_file)
+			else:
+				await self._fetch_and_cache_pricing_data()
+		except Exception as e:
+			logger.debug(f'Error loading pricing data: {e}')
+		finally:
+			if not self._pricing_data:
+				self._pricing_data = await self._load_bundled_pricing()
+			self._apply_pending_costs()
+
+	async def _load_from_pricing_file(self, pricing_file: Path) -> None:
+		"""Load a user supplied pricing file in LiteLLM format, its models override the bundled snapshot"""
+		try:
+			async with aiofiles.open(pricing_file, 'r') as f:
+				user_pricing = json.loads(await f.read())
+		except Exception as e:
+			logger.warning(f'⚠️ Could not load pricing file {pricing_file}, using bundled pricing instead: {e}')
+			return
+
+		self._pricing_data = {**await self._load_bundled_pricing(), **user_pricing}
+
+	async def _load_bundled_pricing(self) -> dict[str, Any]:
+		"""Load the pricing snapshot shipped with the package"""
+
+		def read_snapshot() -> dict[str, Any]:
+			with importlib.resources.files('browser_use.tokens').joinpath(self.PRICING_SNAPSHOT_FILE).open('r') as f:
+				return json.load(f)
+
+		try:
+			return await asyncio.to_thread(read_snapshot)
+		except Exception as e:
+			logger.debug(f'Error loading bundled pricing snapshot: {e}')
+			return {}
 
 	async def _find_valid_cache(self) -> Path | None:
 		"""Find the most recent valid cache file"""
@@ -163,14 +248,18 @@ class TokenCost:
 
 	async def get_model_pricing(self, model_name: str) -> ModelPricing | None:
 		"""Get pricing information for a specific model"""
-		# Ensure we're initialized
-		if not self._initialized:
-			await self.initialize()
+		# Ensure pricing data has been loaded
+		await self.wait_for_pricing()
 
-		if not self._pricing_data or model_name not in self._pricing_data:
+		return self._get_loaded_model_pricing(model_name)
+
+	def _get_loaded_model_pricing(self, model_name: str, pricing_data: dict[str, Any] | None = None) -> ModelPricing | None:
+		"""Get pricing information for a specific model from the already loaded (or the given) pricing data"""
+		pricing_data = self._pricing_data if pricing_data is None else pricing_data
+		if not pricing_data or model_name not in pricing_data:
 			return None
 
-		data = self._pricing_data[model_name]
+		data = pricing_data[model_name]
 		return ModelPricing(
 			model=model_name,
 			input_cost_per_token=data.get('input_cost_per_token'),
@@ -190,6 +279,18 @@ class TokenCost:
 		if data is None:
 			return None
 
+		return self._cost_from_pricing(data, usage)
+
+	def _calculate_cost_sync(self, model: str, usage: ChatInvokeUsage) -> TokenCostCalculated | None:
+		"""Calculate cost from the already loaded pricing data"""
+		data = self._get_loaded_model_pricing(model)
+		if data is None:
+			return None
+
+		return self._cost_from_pricing(data, usage)
+
+	@staticmethod
+	def _cost_from_pricing(data: ModelPricing, usage: ChatInvokeUsage) -> TokenCostCalculated:
 		uncached_prompt_tokens = usage.prompt_tokens - (usage.prompt_cached_tokens or 0)
 
 		return TokenCostCalculated(
@@ -211,17 +312,82 @@ class TokenCost:
 		)
 
 	def add_usage(self, model: str, usage: ChatInvokeUsage) -> TokenUsageEntry:
-		"""Add token usage entry to history (without calculating cost)"""
+		"""Add token usage entry to history and to the running totals, costing it once if pricing is loaded"""
 		entry = TokenUsageEntry(
 			model=model,
 			timestamp=datetime.now(),
 			usage=usage,
 		)
 
-		self.usage_history.append(entry)
+		if self.include_cost:
+			if self._pricing_data is None:
+				self._uncosted_entries.append(entry)
+			else:
+				entry.cost = self._calculate_cost_sync(model, usage)
+
+		model_totals = self._totals_by_model.setdefault(model, UsageTotals())
+		bucket_totals = self._get_bucket(entry.timestamp).setdefault(model, UsageTotals())
+		for totals in (model_totals, bucket_totals):
+			totals.add_usage(usage)
+			if entry.cost:
+				totals.add_cost(entry.cost)
+
+		self._append_to_history(entry)
 
 		return entry
 
+	def _bucket_key(self, timestamp: datetime) -> int:
+		return int(timestamp.timestamp() // self._bucket_seconds)
+
+	def _get_bucket(self, timestamp: datetime) -> dict[str, UsageTotals]:
+		"""Get the per-model totals of the time bucket containing timestamp, dropping the oldest buckets past max_buckets"""
+		key = self._bucket_key(timestamp)
+		bucket = self._totals_by_bucket.get(key)
+		if bucket is None:
+			bucket = self._totals_by_bucket[key] = {}
+			while len(self._totals_by_bucket) > self.max_buckets:
+				del self._totals_by_bucket[next(iter(self._totals_by_bucket))]
+		return bucket
+
+	def _append_to_history(self, entry: TokenUsageEntry) -> None:
+		history = self.usage_history
+		if history.maxlen is not None and len(history) >= history.maxlen:
+			# the append below drops the oldest entry (or the new one if history is disabled)
+			dropped = history[0] if history else entry
+			self._history_truncated = True
+			if self.history_spill_path:
+				try:
+					self.history_spill_path.parent.mkdir(parents=True, exist_ok=True)
+					with self.history_spill_path.open('a', encoding='utf-8') as f:
+						f.write(dropped.model_dump_json() + '\n')
+				except OSError as e:
+					logger.debug(f'Error spilling token usage history to {self.history_spill_path}: {e}')
+		history.append(entry)
+
+	def _apply_pending_costs(self) -> None:
+		"""Cost the entries recorded before pricing data was loaded and add them to the running totals"""
+		if not self._uncosted_entries or self._pricing_data is None:
+			return
+
+		entries, self._uncosted_entries = self._uncosted_entries, []
+		for entry in entries:
+			entry.cost = self._calculate_cost_sync(entry.model, entry.usage)
+			if entry.cost is None:
+				continue
+			self._totals_by_model[entry.model].add_cost(entry.cost)
+			bucket = self._totals_by_bucket.get(self._bucket_key(entry.timestamp))
+			if bucket and entry.model in bucket:
+				bucket[entry.model].add_cost(entry.cost)
+
+	def iter_usage_history(self) -> Iterator[TokenUsageEntry]:
+		"""Iterate over all recorded entries, oldest first, including the ones spilled to disk"""
+		if self.history_spill_path and self.history_spill_path.exists():
+			with self.history_spill_path.open(encoding='utf-8') as f:
+				for line in f:
+					if line.strip():
+						yield TokenUsageEntry.model_validate_json(line)
+		yield from list(self.usage_history)
+
 	# async def _log_non_usage_llm(self, llm: BaseChatModel) -> None:
 	# 	"""Log non-usage to the logger"""
 	# 	C_CYAN = '\033[96m'
@@ -241,8 +407,9 @@ class TokenCost:
 		C_BLUE = '\033[94m'
 		C_RESET = '\033[0m'
 
-		# Always get cost breakdown for token details (even if not showing costs)
-		cost = await self.calculate_cost(model, usage.usage)
+		# Cost is calculated once per entry, either when recorded or as soon as pricing data is loaded
+		self._apply_pending_costs()
+		cost = usage.cost
 
 		# Build input tokens breakdown
 		input_part = self._build_input_tokens_display(usage.usage, cost)
@@ -347,89 +514,142 @@ class TokenCost:
 
 	def get_usage_tokens_for_model(self, model: str) -> ModelUsageTokens:
 		"""Get usage tokens for a specific model"""
-		filtered_usage = [u for u in self.usage_history if u.model == model]
+		totals = self._totals_by_model.get(model) or UsageTotals()
 
 		return ModelUsageTokens(
 			model=model,
-			prompt_tokens=sum(u.usage.prompt_tokens for u in filtered_usage),
-			prompt_cached_tokens=sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage),
-			completion_tokens=sum(u.usage.completion_tokens for u in filtered_usage),
-			total_tokens=sum(u.usage.prompt_tokens + u.usage.completion_tokens for u in filtered_usage),
+			prompt_tokens=totals.prompt_tokens,
+			prompt_cached_tokens=totals.prompt_cached_tokens,
+			completion_tokens=totals.completion_tokens,
+			total_tokens=totals.total_tokens,
 		)
 
 	async def get_usage_summary(self, model: str | None = None, since: datetime | None = None) -> UsageSummary:
-		"""Get summary of token usage and costs (costs calculated on-the-fly)"""
-		filtered_usage = self.usage_history
+		"""Get summary of token usage and costs from the running totals"""
+		totals_by_model = await self._get_summary_totals(since)
 
 		if model:
-			filtered_usage = [u for u in filtered_usage if u.model == model]
-
-		if since:
-			filtered_usage = [u for u in filtered_usage if u.timestamp >= since]
-
-		if not filtered_usage:
-			return UsageSummary(
-				total_prompt_tokens=0,
-				total_prompt_cost=0.0,
-				total_prompt_cached_tokens=0,
-				total_prompt_cached_cost=0.0,
-				total_completion_tokens=0,
-				total_completion_cost=0.0,
-				total_tokens=0,
-				total_cost=0.0,
-				entry_count=0,
-			)
+			totals_by_model = {model: totals_by_model[model]} if model in totals_by_model else {}
 
-		# Calculate totals
-		total_prompt = sum(u.usage.prompt_tokens for u in filtered_usage)
-		total_completion = sum(u.usage.completion_tokens for u in filtered_usage)
-		total_tokens = total_prompt + total_completion
-		total_prompt_cached = sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage)
-		models = list({u.model for u in filtered_usage})
+		return self._build_usage_summary(totals_by_model)
 
-		# Calculate per-model stats with record-by-record cost calculation
+	async def _get_summary_totals(self, since: datetime | None = None) -> dict[str, UsageTotals]:
+		"""Per-model totals for a summary, waiting at most PRICING_WAIT_TIMEOUT in total for pricing data"""
+		provisional_totals: dict[str, UsageTotals] = {}
+		if self.include_cost:
+			if not self._initialized:
+				await self.initialize()
+			if self._pricing_task and not self._pricing_task.done():
+				if self._pricing_wait_until is None:
+					self._pricing_wait_until = time.monotonic() + self.PRICING_WAIT_TIMEOUT
+				await asyncio.wait({self._pricing_task}, timeout=max(0.0, self._pricing_wait_until - time.monotonic()))
+			if self._pricing_data is None:
+				# still downloading (e.g. offline until the request times out), don't hold up the end of the run for it
+				provisional_totals = await self._get_provisional_totals(since)
+			self._apply_pending_costs()
+
+		totals_by_model = self._get_totals_since(since) if since else self._totals_by_model
+		if provisional_totals:
+			totals_by_model = {
+				model: self._merged_totals(totals_by_model.get(model), provisional_totals.get(model)) for model in totals_by_model
+			}
+		return totals_by_model
+
+	@staticmethod
+	def _build_usage_summary(totals_by_model: dict[str, UsageTotals]) -> UsageSummary:
+		summary_totals = UsageTotals()
 		model_stats: dict[str, ModelUsageStats] = {}
-		total_prompt_cost = 0.0
-		total_completion_cost = 0.0
-		total_prompt_cached_cost = 0.0
-
-		for entry in filtered_usage:
-			if entry.model not in model_stats:
-				model_stats[entry.model] = ModelUsageStats(model=entry.model)
-
-			stats = model_stats[entry.model]
-			stats.prompt_tokens += entry.usage.prompt_tokens
-			stats.completion_tokens += entry.usage.completion_tokens
-			stats.total_tokens += entry.usage.prompt_tokens + entry.usage.completion_tokens
-			stats.invocations += 1
-
-			if self.include_cost:
-				# Calculate cost record by record using the updated calculate_cost function
-				cost = await self.calculate_cost(entry.model, entry.usage)
-				if cost:
-					stats.cost += cost.total_cost
-					total_prompt_cost += cost.prompt_cost
-					total_completion_cost += cost.completion_cost
-					total_prompt_cached_cost += cost.prompt_read_cached_cost or 0
-
-		# Calculate averages
-		for stats in model_stats.values():
-			if stats.invocations > 0:
-				stats.average_tokens_per_invocation = stats.total_tokens / stats.invocations
+		for model_name, totals in totals_by_model.items():
+			summary_totals.merge(totals)
+			model_stats[model_name] = ModelUsageStats(
+				model=model_name,
+				prompt_tokens=totals.prompt_tokens,
+				completion_tokens=totals.completion_tokens,
+				total_tokens=totals.total_tokens,
+				cost=totals.total_cost,
+				invocations=totals.invocations,
+				average_tokens_per_invocation=totals.total_tokens / totals.invocations if totals.invocations else 0.0,
+			)
 
 		return UsageSummary(
-			total_prompt_tokens=total_prompt,
-			total_prompt_cost=total_prompt_cost,
-			total_prompt_cached_tokens=total_prompt_cached,
-			total_prompt_cached_cost=total_prompt_cached_cost,
-			total_completion_tokens=total_completion,
-			total_completion_cost=total_completion_cost,
-			total_tokens=total_tokens,
-			total_cost=total_prompt_cost + total_completion_cost + total_prompt_cached_cost,
-			entry_count=len(filtered_usage),
+			total_prompt_tokens=summary_totals.prompt_tokens,
+			total_prompt_cost=summary_totals.prompt_cost,
+			total_prompt_cached_tokens=summary_totals.prompt_cached_tokens,
+			total_prompt_cached_cost=summary_totals.prompt_cached_cost,
+			total_completion_tokens=summary_totals.completion_tokens,
+			total_completion_cost=summary_totals.completion_cost,
+			total_tokens=summary_totals.total_tokens,
+			total_cost=summary_totals.total_cost,
+			entry_count=summary_totals.invocations,
 			by_model=model_stats,
 		)
 
+	async def _get_provisional_totals(self, since: datetime | None) -> dict[str, UsageTotals]:
+		"""Cost of the entries waiting for pricing data, priced with the bundled snapshot, per model
+
+		Only used for a summary, the entries stay uncosted and are costed with the real pricing data once it is loaded.
+		"""
+		if self._bundled_pricing is None:
+			self._bundled_pricing = await self._load_bundled_pricing()
+
+		totals_by_model: dict[str, UsageTotals] = {}
+		for entry in self._uncosted_entries:
+			if since and entry.timestamp < since:
+				continue
+			pricing = self._get_loaded_model_pricing(entry.model, self._bundled_pricing)
+			if pricing is not None:
+				totals_by_model.setdefault(entry.model, UsageTotals()).add_cost(self._cost_from_pricing(pricing, entry.usage))
+		return totals_by_model
+
+	@staticmethod
+	def _merged_totals(*totals: UsageTotals | None) -> UsageTotals:
+		merged = UsageTotals()
+		for model_totals in totals:
+			if model_totals:
+				merged.merge(model_totals)
+		return merged
+
+	def _get_totals_since(self, since: datetime) -> dict[str, UsageTotals]:
+		"""
+		Get per-model totals of the usage recorded at or after `since`
+
+		Later buckets are summed whole. The bucket containing `since` is split exactly using the in-memory history,
+		or counted whole when part of it has already left the history. Usage older than max_buckets is not covered.
+		"""
+		boundary = self._bucket_key(since)
+		result: dict[str, UsageTotals] = {}
+
+		def add(model: str, totals: UsageTotals) -> None:
+			result.setdefault(model, UsageTotals()).merge(totals)
+
+		for key in reversed(self._totals_by_bucket):
+			if key <= boundary:
+				break
+			for model, totals in self._totals_by_bucket[key].items():
+				add(model, totals)
+
+		boundary_bucket = self._totals_by_bucket.get(boundary)
+		if not boundary_bucket:
+			return result
+
+		history = self.usage_history
+		if self._history_truncated and not (history and history[0].timestamp < since):
+			for model, totals in boundary_bucket.items():
+				add(model, totals)
+			return result
+
+		for entry in reversed(history):
+			if entry.timestamp < since:
+				break
+			if self._bucket_key(entry.timestamp) != boundary:
+				continue
+			totals = UsageTotals()
+			totals.add_usage(entry.usage)
+			if entry.cost:
+				totals.add_cost(entry.cost)
+			add(entry.model, totals)
+		return result
+
 	def _format_tokens(self, tokens: int) -> str:
 		"""Format token count with k suffix for thousands"""
 		if tokens >= 1000000000:
@@ -442,10 +662,11 @@ class TokenCost:
 
 	async def log_usage_summary(self) -> None:
 		"""Log a comprehensive usage summary per model with colors and nice formatting"""
-		if not self.usage_history:
+		if not self._totals_by_model:
 			return
 
-		summary = await self.get_usage_summary()
+		totals_by_model = await self._get_summary_totals()
+		summary = self._build_usage_summary(totals_by_model)
 
 		if summary.entry_count == 0:
 			return
@@ -492,20 +713,10 @@ class TokenCost:
 
 			# Format cost display (only if cost tracking is enabled)
 			if self.include_cost:
-				# Calculate per-model costs on-the-fly
-				total_model_cost = 0.0
-				model_prompt_cost = 0.0
-				model_completion_cost = 0.0
-
-				# Calculate costs for this model
-				for entry in self.usage_history:
-					if entry.model == model:
-						cost = await self.calculate_cost(entry.model, entry.usage)
-						if cost:
-							model_prompt_cost += cost.prompt_cost
-							model_completion_cost += cost.completion_cost
-
-				total_model_cost = model_prompt_cost + model_completion_cost
+				totals = totals_by_model[model]
+				model_prompt_cost = totals.prompt_cost
+				model_completion_cost = totals.completion_cost
+				total_model_cost = totals.total_cost
 
 				if total_model_cost > 0:
 					cost_part = f' (${C_MAGENTA}{total_model_cost:.4f}{C_RESET})'
@@ -532,13 +743,21 @@ class TokenCost:
 		return summary.by_model
 
 	def clear_history(self) -> None:
-		"""Clear usage history"""
-		self.usage_history = []
+		"""Clear usage history, the running totals and the spilled history file"""
+		self.usage_history.clear()
+		self._totals_by_model.clear()
+		self._totals_by_bucket.clear()
+		self._uncosted_entries.clear()
+		self._history_truncated = False
+		if self.history_spill_path:
+			self.history_spill_path.unlink(missing_ok=True)
 
 	async def refresh_pricing_data(self) -> None:
 		"""Force refresh of pricing data from GitHub"""
 		if self.include_cost:
 			await self._fetch_and_cache_pricing_data()
+			if not self._pricing_data:
+				self._pricing_data = await self._load_bundled_pricing()
 
 	async def clean_old_caches(self, keep_count: int = 3) -> None:
 		"""Clean up old cache files, keeping only the most recent ones"""
@@ -564,5 +783,5 @@ class TokenCost:
 	async def ensure_pricing_loaded(self) -> None:
 		"""Ensure pricing data is loaded in the background. Call this after creating the service."""
 		if not self._initialized and self.include_cost:
-			# This will run in the background and won't block
+			# Only starts the background load, does not wait for it
 			await self.initialize()
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, TypeVar
 
@@ -8,14 +9,6 @@ from browser_use.llm.views import ChatInvokeUsage
 T = TypeVar('T', bound=BaseModel)
 
 
-class TokenUsageEntry(BaseModel):
-	"""Single token usage entry"""
-
-	model: str
-	timestamp: datetime
-	usage: ChatInvokeUsage
-
-
 class TokenCostCalculated(BaseModel):
 	"""Token cost"""
 
@@ -46,6 +39,57 @@ class TokenCostCalculated(BaseModel):
 		)
 
 
+class TokenUsageEntry(BaseModel):
+	"""Single token usage entry"""
+
+	model: str
+	timestamp: datetime
+	usage: ChatInvokeUsage
+	cost: TokenCostCalculated | None = None
+	"""Calculated once when pricing is available, None if cost tracking is off or the model has no pricing."""
+
+
+@dataclass(slots=True)
+class UsageTotals:
+	"""Running token and cost totals, updated in place as usage entries are recorded"""
+
+	invocations: int = 0
+	prompt_tokens: int = 0
+	prompt_cached_tokens: int = 0
+	completion_tokens: int = 0
+	prompt_cost: float = 0.0
+	prompt_cached_cost: float = 0.0
+	completion_cost: float = 0.0
+
+	@property
+	def total_tokens(self) -> int:
+		return self.prompt_tokens + self.completion_tokens
+
+	@property
+	def total_cost(self) -> float:
+		return self.prompt_cost + self.completion_cost
+
+	def add_usage(self, usage: ChatInvokeUsage) -> None:
+		self.invocations += 1
+		self.prompt_tokens += usage.prompt_tokens
+		self.prompt_cached_tokens += usage.prompt_cached_tokens or 0
+		self.completion_tokens += usage.completion_tokens
+
+	def add_cost(self, cost: TokenCostCalculated) -> None:
+		self.prompt_cost += cost.prompt_cost
+		self.prompt_cached_cost += cost.prompt_read_cached_cost or 0
+		self.completion_cost += cost.completion_cost
+
+	def merge(self, other: 'UsageTotals') -> None:
+		self.invocations += other.invocations
+		self.prompt_tokens += other.prompt_tokens
+		self.prompt_cached_tokens += other.prompt_cached_tokens
+		self.completion_tokens += other.completion_tokens
+		self.prompt_cost += other.prompt_cost
+		self.prompt_cached_cost += other.prompt_cached_cost
+		self.completion_cost += other.completion_cost
+
+
 class ModelPricing(BaseModel):
 	"""Pricing information for a model"""
 
@@ -2,19 +2,18 @@ import asyncio
 import functools
 import inspect
 import logging
-import re
 from collections.abc import Callable
 from inspect import Parameter, iscoroutinefunction, signature
 from types import UnionType
 from typing import Any, Generic, Optional, TypeVar, Union, get_args, get_origin
 
-import pyotp
 from pydantic import BaseModel, Field, RootModel, create_model
 
 from browser_use.browser import BrowserSession
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
 from browser_use.observability import observe_debug
+from browser_use.profiling import profiler
 from browser_use.telemetry.service import ProductTelemetry
 from browser_use.tools.registry.views import (
 	ActionModel,
@@ -22,7 +21,7 @@ from browser_use.tools.registry.views import (
 	RegisteredAction,
 	SpecialActionParameters,
 )
-from browser_use.utils import is_new_tab_page, match_url_with_domain_pattern, time_execution_async
+from browser_use.utils import SensitiveDataMatcher, is_new_tab_page, time_execution_async
 
 Context = TypeVar('Context')
 
@@ -307,7 +306,7 @@ class Registry(Generic[Context]):
 		return decorator
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='execute_action')
-	@time_execution_async('--execute_action')
+	@time_execution_async('--execute_action', category='action')
 	async def execute_action(
 		self,
 		action_name: str,
@@ -322,6 +321,8 @@ class Registry(Generic[Context]):
 		if action_name not in self.registry.actions:
 			raise ValueError(f'Action {action_name} not found')
 
+		profiler.annotate(action=action_name)
+
 		action = self.registry.actions[action_name]
 		try:
 			# Create the validated Pydantic model
@@ -410,52 +411,20 @@ class Registry(Generic[Context]):
 		Returns:
 			BaseModel: The parameter object with placeholders replaced by actual values
 		"""
-		secret_pattern = re.compile(r'<secret>(.*?)</secret>')
-
 		# Set to track all missing placeholders across the full object
-		all_missing_placeholders = set()
+		all_missing_placeholders: set[str] = set()
 		# Set to track successfully replaced placeholders
-		replaced_placeholders = set()
-
-		# Process sensitive data based on format and current URL
-		applicable_secrets = {}
-
-		for domain_or_key, content in sensitive_data.items():
-			if isinstance(content, dict):
-				# New format: {domain_pattern: {key: value}}
-				# Only include secrets for domains that match the current URL
-				if current_url and not is_new_tab_page(current_url):
-					# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
-					if match_url_with_domain_pattern(current_url, domain_or_key):
-						applicable_secrets.update(content)
-			else:
-				# Old format: {key: value}, expose to all domains (only allowed for legacy reasons)
-				applicable_secrets[domain_or_key] = content
+		replaced_placeholders: set[str] = set()
 
-		# Filter out empty values
-		applicable_secrets = {k: v for k, v in applicable_secrets.items() if v}
+		# Secrets of the domains matching the current URL, plus the old format ones
+		applicable_secrets = SensitiveDataMatcher.cached(sensitive_data).secrets_for_url(current_url)
 
 		def recursively_replace_secrets(value: str | dict | list) -> str | dict | list:
 			if isinstance(value, str):
-				matches = secret_pattern.findall(value)
-				# check if the placeholder key, like x_password is in the output parameters of the LLM and replace it with the sensitive data
-				for placeholder in matches:
-					if placeholder in applicable_secrets:
-						# generate a totp code if secret is a 2fa secret
-						if 'bu_2fa_code' in placeholder:
-							totp = pyotp.TOTP(applicable_secrets[placeholder], digits=6)
-							replacement_value = totp.now()
-						else:
-							replacement_value = applicable_secrets[placeholder]
-
-						value = value.replace(f'<secret>{placeholder}</secret>', replacement_value)
-						replaced_placeholders.add(placeholder)
-					else:
-						# Keep track of missing placeholders
-						all_missing_placeholders.add(placeholder)
-						# Don't replace the tag, keep it as is
-
-				return value
+				# replace the placeholder keys, like x_password, in the output parameters of the LLM with the sensitive data
+				return SensitiveDataMatcher.fill_placeholders(
+					value, applicable_secrets, replaced_placeholders, all_missing_placeholders
+				)
 			elif isinstance(value, dict):
 				return {k: recursively_replace_secrets(v) for k, v in value.items()}
 			elif isinstance(value, list):
@@ -92,13 +92,10 @@ class ActionRegistry(BaseModel):
 		if domains is None or not url:
 			return True
 
-		# Use the centralized URL matching logic from utils
-		from browser_use.utils import match_url_with_domain_pattern
+		# Use the centralized URL matching logic from utils, compiled once per domain list
+		from browser_use.utils import DomainMatcher
 
-		for domain_pattern in domains:
-			if match_url_with_domain_pattern(url, domain_pattern):
-				return True
-		return False
+		return DomainMatcher.cached(domains).matches(url)
 
 	def get_prompt_description(self, page_url: str | None = None) -> str:
 		"""Get a description of all actions for the prompt
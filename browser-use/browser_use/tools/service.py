@@ -49,7 +49,7 @@ from browser_use.tools.views import (
 	SwitchTabAction,
 	UploadFileAction,
 )
-from browser_use.utils import _log_pretty_url, time_execution_sync
+from browser_use.utils import _log_pretty_url, time_execution_async
 
 logger = logging.getLogger(__name__)
 
@@ -911,10 +911,18 @@ You will be given a query and the markdown of a webpage that has been filtered t
 			logger.info(f'💾 {result}')
 			return ActionResult(extracted_content=result, long_term_memory=result)
 
-		@self.registry.action('Read file_name from file system')
-		async def read_file(file_name: str, available_file_paths: list[str], file_system: FileSystem):
+		@self.registry.action(
+			'Read file_name from file system. PDFs are read 10 pages at a time, use start_page and end_page (1-based) to read further pages.'
+		)
+		async def read_file(
+			file_name: str,
+			available_file_paths: list[str],
+			file_system: FileSystem,
+			start_page: int = 1,
+			end_page: int | None = None,
+		):
 			if available_file_paths and file_name in available_file_paths:
-				result = await file_system.read_file(file_name, external_file=True)
+				result = await file_system.read_file(file_name, external_file=True, start_page=start_page, end_page=end_page)
 			else:
 				result = await file_system.read_file(file_name)
 
@@ -1239,7 +1247,7 @@ SHADOW DOM ACCESS EXAMPLE:
 
 	# Act --------------------------------------------------------------------
 	@observe_debug(ignore_input=True, ignore_output=True, name='act')
-	@time_execution_sync('--act')
+	@time_execution_async('--act', category='action')
 	async def act(
 		self,
 		action: ActionModel,
@@ -5,9 +5,9 @@ import platform
 import re
 import signal
 import time
-from collections.abc import Callable, Coroutine
-from fnmatch import fnmatch
-from functools import cache, wraps
+from collections.abc import Callable, Coroutine, Iterable, Mapping
+from fnmatch import fnmatch, translate
+from functools import cache, lru_cache, wraps
 from pathlib import Path
 from sys import stderr
 from typing import Any, ParamSpec, TypeVar
@@ -16,6 +16,8 @@ from urllib.parse import urlparse
 import httpx
 from dotenv import load_dotenv
 
+from browser_use.profiling import profiler
+
 load_dotenv()
 
 # Pre-compiled regex for URL detection - used in URL shortening
@@ -24,16 +26,27 @@ URL_PATTERN = re.compile(r'https?://[^\s<>"\']+|www\.[^\s<>"\']+|[^\s<>"\']+\.[a
 
 logger = logging.getLogger(__name__)
 
-# Import error types - these may need to be adjusted based on actual import paths
-try:
-	from openai import BadRequestError as OpenAIBadRequestError
-except ImportError:
-	OpenAIBadRequestError = None
+# Provider error types, resolved lazily by __getattr__ because importing the provider SDKs is slow
+_LAZY_PROVIDER_ERRORS = {
+	'OpenAIBadRequestError': ('openai', 'BadRequestError'),
+	'GroqBadRequestError': ('groq', 'BadRequestError'),
+}
+
+
+def __getattr__(name: str):
+	"""Lazy import mechanism for provider error types, None if the provider SDK is not installed."""
+	if name in _LAZY_PROVIDER_ERRORS:
+		module_path, attr_name = _LAZY_PROVIDER_ERRORS[name]
+		try:
+			from importlib import import_module
+
+			attr = getattr(import_module(module_path), attr_name)
+		except ImportError:
+			attr = None
+		globals()[name] = attr
+		return attr
 
-try:
-	from groq import BadRequestError as GroqBadRequestError  # type: ignore[import-not-found]
-except ImportError:
-	GroqBadRequestError = None
+	raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 
 # Global flag to prevent duplicate exit messages
@@ -327,25 +340,37 @@ class SignalHandler:
 			setattr(self.loop, 'waiting_for_input', False)
 
 
-def time_execution_sync(additional_text: str = '') -> Callable[[Callable[P, R]], Callable[P, R]]:
+def _get_execution_logger(args: tuple, kwargs: dict) -> logging.Logger:
+	self_has_logger = args and getattr(args[0], 'logger', None)
+	if self_has_logger:
+		return getattr(args[0], 'logger')
+	elif 'agent' in kwargs:
+		return getattr(kwargs['agent'], 'logger')
+	elif 'browser_session' in kwargs:
+		return getattr(kwargs['browser_session'], 'logger')
+	return logging.getLogger(__name__)
+
+
+def _default_span_category(func: Callable) -> str:
+	"""Profiler category of a decorated function: the browser_use subpackage it lives in (agent, tools, browser, dom)"""
+	parts = func.__module__.split('.')
+	return parts[1] if len(parts) > 1 and parts[0] == 'browser_use' else parts[0]
+
+
+def time_execution_sync(additional_text: str = '', category: str | None = None) -> Callable[[Callable[P, R]], Callable[P, R]]:
 	def decorator(func: Callable[P, R]) -> Callable[P, R]:
+		span_name = additional_text.strip('-') or func.__name__
+		span_category = category or _default_span_category(func)
+
 		@wraps(func)
 		def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
 			start_time = time.time()
-			result = func(*args, **kwargs)
+			with profiler.span(span_name, span_category):
+				result = func(*args, **kwargs)
 			execution_time = time.time() - start_time
 			# Only log if execution takes more than 0.25 seconds
 			if execution_time > 0.25:
-				self_has_logger = args and getattr(args[0], 'logger', None)
-				if self_has_logger:
-					logger = getattr(args[0], 'logger')
-				elif 'agent' in kwargs:
-					logger = getattr(kwargs['agent'], 'logger')
-				elif 'browser_session' in kwargs:
-					logger = getattr(kwargs['browser_session'], 'logger')
-				else:
-					logger = logging.getLogger(__name__)
-				logger.debug(f'⏳ {additional_text.strip("-")}() took {execution_time:.2f}s')
+				_get_execution_logger(args, kwargs).debug(f'⏳ {span_name}() took {execution_time:.2f}s')
 			return result
 
 		return wrapper
@@ -355,26 +380,22 @@ def time_execution_sync(additional_text: str = '') -> Callable[[Callable[P, R]],
 
 def time_execution_async(
 	additional_text: str = '',
+	category: str | None = None,
 ) -> Callable[[Callable[P, Coroutine[Any, Any, R]]], Callable[P, Coroutine[Any, Any, R]]]:
 	def decorator(func: Callable[P, Coroutine[Any, Any, R]]) -> Callable[P, Coroutine[Any, Any, R]]:
+		span_name = additional_text.strip('-') or func.__name__
+		span_category = category or _default_span_category(func)
+
 		@wraps(func)
 		async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
 			start_time = time.time()
-			result = await func(*args, **kwargs)
+			with profiler.span(span_name, span_category):
+				result = await func(*args, **kwargs)
 			execution_time = time.time() - start_time
 			# Only log if execution takes more than 0.25 seconds to avoid spamming the logs
 			# you can lower this threshold locally when you're doing dev work to performance optimize stuff
 			if execution_time > 0.25:
-				self_has_logger = args and getattr(args[0], 'logger', None)
-				if self_has_logger:
-					logger = getattr(args[0], 'logger')
-				elif 'agent' in kwargs:
-					logger = getattr(kwargs['agent'], 'logger')
-				elif 'browser_session' in kwargs:
-					logger = getattr(kwargs['browser_session'], 'logger')
-				else:
-					logger = logging.getLogger(__name__)
-				logger.debug(f'⏳ {additional_text.strip("-")}() took {execution_time:.2f}s')
+				_get_execution_logger(args, kwargs).debug(f'⏳ {span_name}() took {execution_time:.2f}s')
 			return result
 
 		return wrapper
@@ -534,6 +555,305 @@ def match_url_with_domain_pattern(url: str, domain_pattern: str, log_warnings: b
 		return False
 
 
+class DomainSuffixTrie:
+	"""Maps domains to values and finds every value whose domain is the host itself or a parent domain of it.
+
+	Labels are stored right to left (com -> example -> www), so a lookup costs one step per label of the host
+	regardless of how many domains are stored.
+	"""
+
+	def __init__(self):
+		self._root: dict[str | None, Any] = {}
+
+	def add(self, domain: str, value: Any) -> None:
+		node = self._root
+		for label in reversed(domain.split('.')):
+			node = node.setdefault(label, {})
+		node.setdefault(None, []).append(value)
+
+	def find(self, host: str) -> list[Any]:
+		"""Values of all stored domains equal to host or matching it on a label boundary (example.com for a.example.com)."""
+		found = []
+		node = self._root
+		for label in reversed(host.split('.')):
+			node = node.get(label)
+			if node is None:
+				break
+			found.extend(node.get(None, ()))
+		return found
+
+
+@lru_cache(maxsize=1024)
+def _parse_url_scheme_and_host(url: str) -> tuple[str, str]:
+	"""Lowercased (scheme, hostname) of a URL as used for domain pattern matching, ('', '') if it can't be parsed."""
+	try:
+		parsed_url = urlparse(url)
+		scheme = parsed_url.scheme.lower() if parsed_url.scheme else ''
+		domain = parsed_url.hostname.lower() if parsed_url.hostname else ''
+		return scheme, domain
+	except Exception as e:
+		logger.error(f'⛔️ Error parsing URL {url} for domain matching: {type(e).__name__}: {e}')
+		return '', ''
+
+
+class DomainMatcher:
+	"""
+	A list of domain patterns compiled once, gives the same results as match_url_with_domain_pattern(). SECURITY CRITICAL.
+
+	Exact domains are looked up in a dict, *.domain patterns in a suffix trie, and the remaining glob patterns
+	are combined into one regex per scheme pattern, so matching a URL no longer loops over every pattern.
+	Use DomainMatcher.cached(patterns) to reuse the compiled matcher for the same pattern list.
+	"""
+
+	def __init__(self, patterns: Iterable[str], log_warnings: bool = False):
+		self.patterns: list[str] = list(patterns)
+
+		# pattern scheme -> compiled glob (None when it has no glob characters and is compared by equality)
+		self._scheme_regexes: dict[str, re.Pattern[str] | None] = {}
+		self._any_domain: list[tuple[int, str]] = []  # (pattern index, pattern scheme) for scheme://*
+		self._exact_domains: dict[str, list[tuple[int, str]]] = {}
+		self._parent_domains = DomainSuffixTrie()
+		# pattern scheme -> [(pattern index, [domain regexes])], plus a combined regex of the group for a quick check
+		self._glob_domains: dict[str, list[tuple[int, list[re.Pattern[str]]]]] = {}
+		self._glob_combined: dict[str, re.Pattern[str]] = {}
+
+		for index, domain_pattern in enumerate(self.patterns):
+			self._compile_pattern(index, domain_pattern, log_warnings)
+
+		for pattern_scheme, entries in self._glob_domains.items():
+			alternatives = [regex.pattern for _, regexes in entries for regex in regexes]
+			self._glob_combined[pattern_scheme] = re.compile('|'.join(f'(?:{alternative})' for alternative in alternatives))
+
+	@classmethod
+	def cached(cls, patterns: Iterable[str], log_warnings: bool = False) -> 'DomainMatcher':
+		"""Get a compiled matcher for the patterns, reusing a previously compiled one for the same list."""
+		return _compile_domain_matcher(tuple(patterns), log_warnings)
+
+	def _compile_pattern(self, index: int, domain_pattern: str, log_warnings: bool) -> None:
+		# Same normalization as match_url_with_domain_pattern()
+		domain_pattern = domain_pattern.lower()
+		if '://' in domain_pattern:
+			pattern_scheme, pattern_domain = domain_pattern.split('://', 1)
+		else:
+			pattern_scheme = 'https'  # Default to matching only https for security
+			pattern_domain = domain_pattern
+		if ':' in pattern_domain and not pattern_domain.startswith(':'):
+			pattern_domain = pattern_domain.split(':', 1)[0]
+
+		if pattern_scheme not in self._scheme_regexes:
+			has_glob = any(char in pattern_scheme for char in '*?[')
+			self._scheme_regexes[pattern_scheme] = re.compile(translate(pattern_scheme)) if has_glob else None
+		entry = (index, pattern_scheme)
+
+		if pattern_domain == '*':
+			self._any_domain.append(entry)
+			return
+
+		# an exact match wins even for patterns that are rejected as unsafe below
+		self._exact_domains.setdefault(pattern_domain, []).append(entry)
+		if '*' not in pattern_domain:
+			return
+
+		if pattern_domain.count('*.') > 1 or pattern_domain.count('.*') > 1:
+			if log_warnings:
+				logger.error(f'⛔️ Multiple wildcards in pattern=[{domain_pattern}] are not supported')
+			return
+		if pattern_domain.endswith('.*'):
+			if log_warnings:
+				logger.error(f'⛔️ Wildcard TLDs like in pattern=[{domain_pattern}] are not supported for security')
+			return
+		if '*' in pattern_domain.replace('*.', ''):
+			if log_warnings:
+				logger.error(f'⛔️ Only *.domain style patterns are supported, ignoring pattern=[{domain_pattern}]')
+			return
+
+		parent_domain = pattern_domain[2:] if pattern_domain.startswith('*.') else None
+		if parent_domain is not None and not any(char in parent_domain for char in '?['):
+			# *.example.com matches example.com and anything ending in .example.com
+			self._parent_domains.add(parent_domain, entry)
+			return
+
+		regexes = [re.compile(translate(pattern_domain))]
+		if parent_domain is not None:
+			regexes.append(re.compile(translate(parent_domain)))
+		self._glob_domains.setdefault(pattern_scheme, []).append((index, regexes))
+
+	def _scheme_matches(self, pattern_scheme: str, scheme: str) -> bool:
+		scheme_regex = self._scheme_regexes[pattern_scheme]
+		return scheme_regex.match(scheme) is not None if scheme_regex else scheme == pattern_scheme
+
+	def _matching_indexes(self, url: str, first_only: bool) -> list[int]:
+		# Note: new tab pages should be handled at the callsite, not here
+		if is_new_tab_page(url):
+			return []
+
+		scheme, domain = _parse_url_scheme_and_host(url)
+		if not scheme or not domain:
+			return []
+
+		indexes = []
+		candidates = self._any_domain + self._exact_domains.get(domain, []) + self._parent_domains.find(domain)
+		for index, pattern_scheme in candidates:
+			if self._scheme_matches(pattern_scheme, scheme):
+				if first_only:
+					return [index]
+				indexes.append(index)
+
+		for pattern_scheme, entries in self._glob_domains.items():
+			if not self._scheme_matches(pattern_scheme, scheme) or not self._glob_combined[pattern_scheme].match(domain):
+				continue
+			for index, regexes in entries:
+				if any(regex.match(domain) for regex in regexes):
+					if first_only:
+						return [index]
+					indexes.append(index)
+		return indexes
+
+	def matches(self, url: str) -> bool:
+		"""Check if the URL matches any of the patterns."""
+		return bool(self._matching_indexes(url, first_only=True))
+
+	def matching_patterns(self, url: str) -> list[str]:
+		"""All patterns that match the URL, in their original order."""
+		return [self.patterns[index] for index in sorted(set(self._matching_indexes(url, first_only=False)))]
+
+
+@lru_cache(maxsize=128)
+def _compile_domain_matcher(patterns: tuple[str, ...], log_warnings: bool) -> DomainMatcher:
+	return DomainMatcher(patterns, log_warnings=log_warnings)
+
+
+SECRET_PLACEHOLDER_PATTERN = re.compile(r'<secret>(.*?)</secret>')
+
+
+class SensitiveDataMatcher:
+	"""
+	The secrets of a sensitive_data dict, prepared once for redacting them from text and filling in their placeholders.
+
+	sensitive_data is either in the old format {key: value} or the new format {domain_pattern: {key: value}}.
+	Use SensitiveDataMatcher.cached(sensitive_data) to reuse the matcher for the same sensitive data.
+	"""
+
+	def __init__(self, sensitive_data: Mapping[str, str | Mapping[str, str]]):
+		self.sensitive_data = sensitive_data
+		self._domain_patterns = [domain for domain, content in sensitive_data.items() if isinstance(content, Mapping)]
+		self._url_secrets: dict[str | None, dict[str, str]] = {}
+
+		# secret value -> placeholder tag, a value used by several keys is tagged with the first one
+		self._tags: dict[str, str] = {}
+		for key_or_domain, content in sensitive_data.items():
+			items = content.items() if isinstance(content, Mapping) else [(key_or_domain, content)]
+			for key, value in items:
+				if value:  # Skip empty values
+					self._tags.setdefault(value, f'<secret>{key}</secret>')
+
+	@classmethod
+	def cached(cls, sensitive_data: Mapping[str, str | Mapping[str, str]]) -> 'SensitiveDataMatcher':
+		"""Get a matcher for the sensitive data, reusing a previously built one for the same secrets."""
+		frozen = tuple(
+			(key, tuple(content.items()) if isinstance(content, Mapping) else content) for key, content in sensitive_data.items()
+		)
+		return _build_sensitive_data_matcher(frozen)
+
+	@property
+	def has_secrets(self) -> bool:
+		return bool(self._tags)
+
+	def redact(self, text: str) -> str:
+		"""Replace every secret value in text with its <secret>key</secret> placeholder
+
+		Occurrences are found with one C-level search per secret (in CPython this beats a combined regex, which has to
+		try every alternative at every position), then the result is assembled in one pass. Where secrets overlap, the
+		leftmost and then the longest one is replaced as a whole.
+		"""
+		matches: list[tuple[int, int, str]] = []
+		for value in self._tags:
+			start = text.find(value)
+			while start != -1:
+				matches.append((start, -len(value), value))
+				start = text.find(value, start + len(value))
+		if not matches:
+			return text
+
+		matches.sort()
+		parts: list[str] = []
+		position = 0
+		for start, _, value in matches:
+			if start < position:
+				continue  # inside a secret that was already replaced
+			parts.append(text[position:start])
+			parts.append(self._tags[value])
+			position = start + len(value)
+		parts.append(text[position:])
+		return ''.join(parts)
+
+	def secrets_for_url(self, current_url: str | None) -> dict[str, str]:
+		"""The secrets that may be used on current_url: those of matching domain patterns and all old format ones"""
+		if current_url in self._url_secrets:
+			return self._url_secrets[current_url]
+
+		# Match the current URL against all domain patterns at once
+		matching_domains: set[str] = set()
+		if self._domain_patterns and current_url and not is_new_tab_page(current_url):
+			# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
+			matching_domains = set(DomainMatcher.cached(self._domain_patterns).matching_patterns(current_url))
+
+		secrets: dict[str, str] = {}
+		for domain_or_key, content in self.sensitive_data.items():
+			if isinstance(content, Mapping):
+				# New format: {domain_pattern: {key: value}}
+				# Only include secrets for domains that match the current URL
+				if domain_or_key in matching_domains:
+					secrets.update(content)
+			else:
+				# Old format: {key: value}, expose to all domains (only allowed for legacy reasons)
+				secrets[domain_or_key] = content
+
+		# Filter out empty values
+		secrets = {key: value for key, value in secrets.items() if value}
+		if len(self._url_secrets) >= 128:
+			self._url_secrets.clear()
+		self._url_secrets[current_url] = secrets
+		return secrets
+
+	@staticmethod
+	def fill_placeholders(text: str, secrets: Mapping[str, str], used: set[str], missing: set[str]) -> str:
+		"""Replace the <secret>key</secret> placeholders in text with their values in one pass
+
+		Keys ending up in the text are added to used, unknown keys to missing (their placeholders are kept). Keys
+		containing bu_2fa_code are TOTP secrets and are replaced with the current code.
+		"""
+		if '<secret>' not in text:
+			return text
+		codes: dict[str, str] = {}
+
+		def replace(match: re.Match[str]) -> str:
+			placeholder = match.group(1)
+			if placeholder not in secrets:
+				missing.add(placeholder)
+				return match.group(0)
+			used.add(placeholder)
+			if 'bu_2fa_code' not in placeholder:
+				return secrets[placeholder]
+			# generate a totp code if secret is a 2fa secret, the same one for every placeholder in the text
+			if placeholder not in codes:
+				import pyotp
+
+				codes[placeholder] = pyotp.TOTP(secrets[placeholder], digits=6).now()
+			return codes[placeholder]
+
+		return SECRET_PLACEHOLDER_PATTERN.sub(replace, text)
+
+
+@lru_cache(maxsize=32)
+def _build_sensitive_data_matcher(
+	frozen_sensitive_data: tuple[tuple[str, str | tuple[tuple[str, str], ...]], ...],
+) -> SensitiveDataMatcher:
+	return SensitiveDataMatcher(
+		{key: dict(content) if isinstance(content, tuple) else content for key, content in frozen_sensitive_data}
+	)
+
+
 def merge_dicts(a: dict, b: dict, path: tuple[str, ...] = ()):
 	for key in b:
 		if key in a:
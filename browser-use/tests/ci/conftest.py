@@ -31,6 +31,11 @@ load_dotenv()
 # Skip LLM API key verification for tests
 os.environ['SKIP_LLM_API_KEY_VERIFICATION'] = 'true'
 
+from browser_use.config import CONFIG
+
+# Tests change env vars between (and inside) tests, keep CONFIG in sync with them
+CONFIG.watch_env_changes()
+
 from bubus import BaseEvent
 
 from browser_use import Agent
@@ -0,0 +1,103 @@
+"""The history GIF is written frame by frame, with one palette, skipping steps without a real screenshot."""
+
+import base64
+import struct
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+
+from browser_use.agent.gif import HistoryGifBuilder, _load_fonts, create_history_gif
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList, AgentOutput
+from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT, BrowserStateHistory
+from browser_use.tools.service import Tools
+
+AgentOutputWithActions = AgentOutput.type_with_custom_actions(Tools().registry.create_action_model())
+
+
+def make_step(tmp_path: Path, step: int, screenshot: str | None, url: str = 'https://example.com') -> AgentHistory:
+	screenshot_path = None
+	if screenshot:
+		screenshot_path = tmp_path / f'{step}.png'
+		screenshot_path.write_bytes(base64.b64decode(screenshot))
+	model_output = AgentOutputWithActions.model_validate(
+		{'evaluation_previous_goal': '', 'memory': '', 'next_goal': f'Goal {step}', 'action': [{'go_back': {}}]}
+	)
+	return AgentHistory(
+		model_output=model_output,
+		result=[ActionResult()],
+		state=BrowserStateHistory(
+			url=url, title='', tabs=[], interacted_element=[None], screenshot_path=str(screenshot_path) if screenshot else None
+		),
+	)
+
+
+def page(color: tuple[int, int, int], size: tuple[int, int] = (640, 400)) -> str:
+	buffer = BytesIO()
+	Image.new('RGB', size, color).save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode()
+
+
+def test_history_gif_skips_steps_without_real_screenshots(tmp_path: Path):
+	history = AgentHistoryList(
+		history=[
+			make_step(tmp_path, 1, PLACEHOLDER_4PX_SCREENSHOT),
+			make_step(tmp_path, 2, page((255, 0, 0)), url='chrome://newtab/'),
+			make_step(tmp_path, 3, page((0, 0, 255))),
+			make_step(tmp_path, 4, None),
+			make_step(tmp_path, 5, page((0, 255, 0), size=(800, 600))),
+		]
+	)
+	output_path = tmp_path / 'history.gif'
+
+	create_history_gif('Find the pricing page', history, output_path=str(output_path), duration=500)
+
+	# logical screen width and height in the header, strict decoders clip the frames to it
+	assert struct.unpack('<HH', output_path.read_bytes()[6:10]) == (640, 400)
+	with Image.open(output_path) as gif:
+		assert gif.size == (640, 400) and gif.n_frames == 3  # task frame, step 3 and step 5 scaled to the first frame
+		assert gif.info['loop'] == 0 and gif.info['duration'] == 500
+		frames = []
+		for i in range(gif.n_frames):
+			gif.seek(i)
+			assert 'transparency' not in gif.info
+			frames.append(gif.convert('RGB'))
+	assert frames[0].getpixel((5, 5)) == (0, 0, 0)  # the task frame
+	assert frames[1].getpixel((5, 5)) == (0, 0, 255)
+	assert frames[2].getpixel((5, 5)) == (0, 255, 0)
+
+
+def test_frames_are_written_as_steps_are_added(tmp_path: Path):
+	output_path = tmp_path / 'history.gif'
+	builder = HistoryGifBuilder('Find the pricing page', output_path=str(output_path), show_task=False)
+
+	sizes = []
+	for step in range(1, 4):
+		builder.append_step(make_step(tmp_path, step, page((0, 80 * step, 0))), step)
+		sizes.append(output_path.stat().st_size)
+
+	assert sizes[0] < sizes[1] < sizes[2]
+	assert builder.close()
+	with Image.open(output_path) as gif:
+		assert gif.n_frames == 3 == builder.frame_count
+
+	assert not HistoryGifBuilder('Nothing to show', output_path=str(tmp_path / 'empty.gif')).close()
+	assert not (tmp_path / 'empty.gif').exists()
+
+
+async def test_queued_steps_are_rendered_in_order(tmp_path: Path):
+	output_path = tmp_path / 'history.gif'
+	builder = HistoryGifBuilder('Find the pricing page', output_path=str(output_path))
+	colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 255)]
+	fonts_loaded = _load_fonts.cache_info().misses
+
+	for step, color in enumerate(colors, 1):
+		builder.queue_step(make_step(tmp_path, step, page(color)), step)
+
+	assert await builder.aclose()
+	with Image.open(output_path) as gif:
+		assert gif.n_frames == 5
+		for i, color in enumerate(colors, 1):
+			gif.seek(i)
+			assert gif.convert('RGB').getpixel((5, 5)) == color
+	assert _load_fonts.cache_info().misses <= fonts_loaded + 1
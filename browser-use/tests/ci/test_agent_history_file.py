@@ -0,0 +1,102 @@
+"""AgentHistoryList files: the streamed JSON export, JSONL appended per step and the lazy JSONL reader."""
+
+import json
+from pathlib import Path
+
+from browser_use.agent.views import (
+	ActionResult,
+	AgentHistory,
+	AgentHistoryList,
+	AgentHistoryReader,
+	AgentHistoryWriter,
+	AgentOutput,
+	StepMetadata,
+)
+from browser_use.browser.views import BrowserStateHistory, TabInfo
+from browser_use.tools.service import Tools
+
+ActionModel = Tools().registry.create_action_model()
+AgentOutputWithActions = AgentOutput.type_with_custom_actions(ActionModel)
+
+
+def make_step(step: int) -> AgentHistory:
+	model_output = AgentOutputWithActions.model_validate(
+		{
+			'evaluation_previous_goal': 'Success',
+			'memory': f'step {step}',
+			'next_goal': 'Log in',
+			'action': [{'input_text': {'index': step, 'text': 'hunter2'}}, {'click_element_by_index': {'index': 1}}],
+		}
+	)
+	return AgentHistory(
+		model_output=model_output,
+		result=[ActionResult(extracted_content=f'typed into {step}', include_in_memory=True)],
+		state=BrowserStateHistory(
+			url=f'https://example.com/{step}',
+			title='Example',
+			tabs=[TabInfo(url=f'https://example.com/{step}', title='Example', target_id='TARGET')],
+			interacted_element=[None, None],
+			screenshot_path=None,
+		),
+		metadata=StepMetadata(step_start_time=step, step_end_time=step + 1, step_number=step),
+	)
+
+
+def test_json_export_is_unchanged(tmp_path: Path):
+	sensitive_data = {'password': 'hunter2'}
+	history = AgentHistoryList(history=[make_step(i) for i in range(3)])
+
+	history.save_to_file(tmp_path / 'history.json', sensitive_data=sensitive_data)
+	AgentHistoryList(history=[]).save_to_file(tmp_path / 'empty.json')
+
+	expected = json.dumps(history.model_dump(sensitive_data=sensitive_data), indent=2)
+	assert (tmp_path / 'history.json').read_text() == expected
+	assert (tmp_path / 'empty.json').read_text() == json.dumps({'history': []}, indent=2)
+
+	loaded = AgentHistoryList.load_from_file(tmp_path / 'history.json', AgentOutputWithActions)
+	assert loaded.model_dump() == history.model_dump(sensitive_data=sensitive_data)
+
+
+async def test_steps_are_appended_as_they_complete(tmp_path: Path):
+	path = tmp_path / 'run' / 'history.jsonl'
+	path.parent.mkdir()
+	path.write_text('left over from a previous run\n')
+	writer = AgentHistoryWriter(path, sensitive_data={'password': 'hunter2'})
+	steps = [make_step(i) for i in range(5)]
+
+	await writer.append(steps[0])
+	reader = AgentHistoryReader(path, AgentOutputWithActions)
+	assert len(reader) == 1 and reader[0].state.url == 'https://example.com/0'
+
+	for step in steps[1:]:
+		await writer.append(step)
+	path.write_text(path.read_text() + '{"model_output": null, "resu')  # the run crashed while writing
+
+	reader.refresh()
+	assert len(reader) == 5
+	assert [h.state.url for h in reader[3:]] == ['https://example.com/3', 'https://example.com/4']
+	assert reader[-1].model_output.action[1].model_dump(exclude_none=True) == {'click_element_by_index': {'index': 1}}  # type: ignore[union-attr]
+
+	# JSONL and JSON hold the same history
+	loaded = AgentHistoryList.load_from_file(path, AgentOutputWithActions)
+	assert loaded.model_dump() == AgentHistoryList(history=steps).model_dump(sensitive_data={'password': 'hunter2'})
+	loaded.save_to_file(tmp_path / 'export.jsonl')
+	assert (tmp_path / 'export.jsonl').read_text() == path.read_text().rsplit('\n', 1)[0] + '\n'
+
+
+def test_reader_validates_only_accessed_steps(tmp_path: Path, monkeypatch):
+	path = tmp_path / 'history.jsonl'
+	AgentHistoryList(history=[make_step(i) for i in range(50)]).save_to_file(path)
+	validated: list[str] = []
+	load_dump = AgentHistory.load_dump.__func__  # type: ignore[attr-defined]
+
+	def counting_load_dump(cls, data, output_model):
+		validated.append(data['state']['url'])
+		return load_dump(cls, data, output_model)
+
+	monkeypatch.setattr(AgentHistory, 'load_dump', classmethod(counting_load_dump))
+	reader = AgentHistoryReader(path, AgentOutputWithActions)
+
+	assert len(reader) == 50 and validated == []
+	assert reader[42].metadata.step_number == 42  # type: ignore[union-attr]
+	assert validated == ['https://example.com/42']
@@ -0,0 +1,120 @@
+"""AgentScheduler runs agents in one process against one browser, each in a browser context of its own."""
+
+import asyncio
+
+import pytest
+from cdp_use import CDPClient
+
+from browser_use.agent.scheduler import AgentScheduler, _ScheduledChatModel, _ScheduledTask
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.session import MultiplexedCDPClient
+from tests.ci.conftest import create_mock_llm
+
+
+async def test_cdp_commands_wait_for_a_free_slot(monkeypatch):
+	in_flight: list[str] = []
+	peak = 0
+	answer = asyncio.Event()
+
+	async def send_raw(self, method, params=None, session_id=None):
+		nonlocal peak
+		in_flight.append(method)
+		peak = max(peak, len(in_flight))
+		if not method.startswith('Fetch.'):
+			await answer.wait()  # e.g. a navigation held up by a paused request
+		in_flight.remove(method)
+		return {}
+
+	monkeypatch.setattr(CDPClient, 'send_raw', send_raw)
+	client = MultiplexedCDPClient('ws://127.0.0.1:1/devtools/browser/unused', max_in_flight_commands=2)
+
+	commands = [asyncio.create_task(client.send_raw('Page.navigate', session_id=f'S{i}')) for i in range(5)]
+	await asyncio.sleep(0.05)
+	assert in_flight == ['Page.navigate'] * 2 and client.in_flight_commands == {'S0': 1, 'S1': 1}
+
+	# answers to the browser are never throttled, they unblock the commands holding the slots
+	await asyncio.wait_for(client.send_raw('Fetch.continueRequest', params={'requestId': '1'}), timeout=1)
+
+	answer.set()
+	await asyncio.gather(*commands)
+	assert peak == 3 and client.in_flight_commands == {}
+
+
+async def test_llm_calls_share_slots_in_arrival_order():
+	order: list[str] = []
+	slots = asyncio.Semaphore(1)
+
+	class SlowModel:
+		model = 'slow'
+
+		async def ainvoke(self, messages, output_format=None):
+			order.append(messages[0])
+			await asyncio.sleep(0.01)
+
+	llm = SlowModel()
+	first, second = _ScheduledChatModel(llm, slots), _ScheduledChatModel(llm, slots)  # type: ignore[arg-type]
+	await asyncio.gather(*(handle.ainvoke([f'{name}{i}']) for i in range(3) for name, handle in [('a', first), ('b', second)]))
+
+	assert order == ['a0', 'b0', 'a1', 'b1', 'a2', 'b2']
+	assert first.model == 'slow' and first is not second
+
+
+def test_agents_get_their_own_browser_session():
+	scheduler = AgentScheduler()
+
+	with pytest.raises(ValueError):
+		scheduler.add('Find the pricing page', llm=create_mock_llm(), browser_session=BrowserSession())
+
+
+def test_agents_do_not_share_storage_state(tmp_path):
+	profile = BrowserProfile(headless=True, user_data_dir=tmp_path / 'profile', storage_state=tmp_path / 'storage_state.json')
+	scheduler = AgentScheduler(browser_session=BrowserSession(browser_profile=profile))
+	scheduled = _ScheduledTask('Open the page', create_mock_llm(), 2, None, None, {})
+
+	agent = scheduler._create_agent(scheduled, 'CONTEXT1', None)
+
+	assert agent.browser_session is not None and agent.browser_session.browser_context_id == 'CONTEXT1'
+	assert agent.browser_session.browser_profile.user_data_dir != tmp_path / 'profile'
+	assert agent.browser_session.browser_profile.storage_state is None
+	assert profile.storage_state == tmp_path / 'storage_state.json'
+
+
+async def test_reset_closes_the_root_socket_of_context_sessions():
+	class FakeRootClient:
+		stopped = False
+
+		async def stop(self):
+			self.stopped = True
+
+	for browser_context_id, closed in [('CONTEXT1', True), (None, False)]:
+		session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None))
+		session.browser_context_id = browser_context_id
+		root = FakeRootClient()
+		session._cdp_client_root = root  # type: ignore[assignment]
+
+		await session.reset()
+
+		assert root.stopped is closed and session._cdp_client_root is None
+
+
+async def test_agents_only_see_their_own_tabs(httpserver):
+	httpserver.expect_request('/').respond_with_data('<html><head><title>Shared</title></head></html>', content_type='text/html')
+	url = httpserver.url_for('/')
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, keep_alive=True))
+	scheduler = AgentScheduler(browser_session=browser_session, max_concurrent_llm_calls=1)
+	for _ in range(3):
+		scheduler.add(
+			'Open the page', llm=create_mock_llm(), max_steps=2, initial_actions=[{'go_to_url': {'url': url, 'new_tab': True}}]
+		)
+
+	try:
+		histories = await scheduler.run()
+	finally:
+		await browser_session.kill()
+
+	assert all(history.is_done() for history in histories)
+	assert len({agent.browser_session.browser_context_id for agent in scheduler.agents}) == 3  # type: ignore[union-attr]
+	# the tabs every agent saw during its steps, no agent saw a tab of another one
+	tabs_per_agent = [{tab.target_id for item in history.history for tab in item.state.tabs} for history in histories]
+	assert all(tabs_per_agent)
+	assert len(set().union(*tabs_per_agent)) == sum(len(tabs) for tabs in tabs_per_agent)
@@ -0,0 +1,89 @@
+"""Tests for the offline benchmark harness: synthetic CDP payloads replay through the DOM pipeline."""
+
+from benchmarks.fake_llm import ScriptedChatModel
+from benchmarks.pages import deep_shadow, large_table, many_iframes, render_html
+from benchmarks.run import BenchmarkResult, Replay, ReplayDomService, compare_to_baseline, percentile, run_stage
+from benchmarks.synthetic import build_cdp_payloads
+from browser_use.agent.views import AgentOutput
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.views import NodeType
+from browser_use.llm.messages import UserMessage
+from browser_use.tools.service import Tools
+
+
+async def serialize(root):
+	tree = await ReplayDomService(build_cdp_payloads(root)).get_dom_tree('TARGET')
+	state, _ = DOMTreeSerializer(tree).serialize_accessible_elements()
+	return tree, state
+
+
+async def test_synthetic_table_replays_to_interactive_elements():
+	tree, state = await serialize(large_table(rows=10))
+
+	assert tree.node_type == NodeType.DOCUMENT_NODE
+	tags = sorted(node.tag_name for node in state.selector_map.values())
+	assert tags == ['a'] * 10 + ['button'] * 10 + ['input'] * 10
+	assert 'Item 9' in state.llm_representation()
+
+
+async def test_synthetic_shadow_roots_and_iframes_are_traversed():
+	_, shadow_state = await serialize(deep_shadow(hosts=2, depth=4))
+	assert len(shadow_state.selector_map) == 8
+	assert 'Shadow Content (Open)' in shadow_state.llm_representation()
+
+	_, frame_state = await serialize(many_iframes(frames=3))
+	frame_tags = [node.tag_name for node in frame_state.selector_map.values()]
+	assert frame_tags.count('input') == 3 and frame_tags.count('select') == 3
+
+
+def test_pages_render_to_self_contained_html():
+	html = render_html(many_iframes(frames=1))
+	assert html.startswith('<!DOCTYPE html><html><head><title>Many iframes</title>')
+	assert 'srcdoc="&lt;!DOCTYPE html&gt;' in html
+
+	assert '<template shadowrootmode="open">' in render_html(deep_shadow(hosts=1, depth=2))
+
+
+async def test_every_stage_runs_on_replayed_payloads():
+	replay = Replay('many_iframes')
+	assert replay.source in ('synthetic', 'recorded')
+
+	for stage in ('snapshot_lookup', 'dom_tree', 'serialize', 'prompt'):
+		result = await run_stage(replay, stage, iterations=2, warmup=0)
+		assert result.name == f'many_iframes/{stage}'
+		assert len(result.timings_ms) == 2
+		assert result.peak_memory_mb > 0
+
+
+def test_compare_to_baseline_flags_regressions():
+	baseline = {
+		'results': {
+			'page/slower': {'p50_ms': 100.0, 'peak_memory_mb': 1.0, 'source': 'synthetic'},
+			'page/noise': {'p50_ms': 0.1, 'peak_memory_mb': 1.0, 'source': 'synthetic'},
+			'page/other_source': {'p50_ms': 1.0, 'peak_memory_mb': 1.0, 'source': 'recorded'},
+		}
+	}
+	results = [
+		BenchmarkResult('page/slower', [150.0, 160.0], 1.0, 'synthetic'),
+		BenchmarkResult('page/noise', [0.5], 1.0, 'synthetic'),
+		BenchmarkResult('page/other_source', [50.0], 1.0, 'synthetic'),
+		BenchmarkResult('page/new', [50.0], 1.0, 'synthetic'),
+	]
+
+	assert compare_to_baseline(results, baseline, tolerance=0.25) == ['page/slower']
+	assert compare_to_baseline(results, baseline, tolerance=0.75) == []
+	assert percentile([5.0, 1.0, 3.0, 2.0, 4.0], 50) == 3.0
+	assert percentile([5.0, 1.0, 3.0, 2.0, 4.0], 95) == 5.0
+
+
+async def test_scripted_llm_follows_script_then_finishes():
+	AgentOutputWithActions = AgentOutput.type_with_custom_actions(Tools().registry.create_action_model())
+	llm = ScriptedChatModel.scrolling(2)
+	messages = [UserMessage(content='x' * 40)]
+
+	outputs = [(await llm.ainvoke(messages, AgentOutputWithActions)).completion for _ in range(3)]
+
+	actions = [output.action[0].model_dump(exclude_unset=True) for output in outputs]
+	assert [next(iter(action)) for action in actions] == ['scroll', 'scroll', 'done']
+	assert actions[0]['scroll']['down'] is True and actions[1]['scroll']['down'] is False
+	assert llm.prompt_chars == [40, 40, 40]
@@ -0,0 +1,83 @@
+"""BrowserEventBus keeps a bounded history without old results, watchdog handlers only pay for debug logs when shown."""
+
+import logging
+from types import SimpleNamespace
+from typing import Any, cast
+
+from bubus import BaseEvent
+
+from browser_use.browser.event_bus import BrowserEventBus
+from browser_use.browser.events import ScreenshotEvent
+from browser_use.browser.watchdog_base import BaseWatchdog
+
+
+class StepEvent(BaseEvent[str]):
+	pass
+
+
+async def test_history_is_bounded_and_old_results_are_released():
+	bus = BrowserEventBus(max_history_size=20, max_result_history=5)
+	screenshots: list[ScreenshotEvent] = []
+	history_while_running: list[str] = []
+
+	async def on_ScreenshotEvent(event: ScreenshotEvent) -> str:
+		return 'x' * 100_000
+
+	async def on_StepEvent(event: StepEvent) -> str:
+		for _ in range(30):
+			screenshots.append(await bus.dispatch(ScreenshotEvent()))
+		history_while_running.extend(bus.event_history)
+		return 'done'
+
+	bus.on(ScreenshotEvent, on_ScreenshotEvent)
+	bus.on(StepEvent, on_StepEvent)
+	try:
+		slow = bus.dispatch(StepEvent())
+		assert await slow.event_result() == 'done'
+
+		# the event in flight stays, the oldest completed ones make room
+		assert history_while_running == [slow.event_id] + [event.event_id for event in screenshots[-19:]]
+		assert len(bus.event_history) == 20
+
+		# only the most recent events keep their results
+		results = [await event.event_result(raise_if_none=False) for event in screenshots[-19:]]
+		assert results[-4:] == ['x' * 100_000] * 4
+		assert results[:-5] == [None] * 14
+	finally:
+		await bus.stop(clear=True, timeout=5)
+
+
+async def test_handler_skips_debug_formatting_unless_debug_is_enabled():
+	class CountingHistory(dict):
+		lookups = 0
+
+		def get(self, *args):
+			CountingHistory.lookups += 1
+			return super().get(*args)
+
+	bus = BrowserEventBus()
+	bus.event_history = CountingHistory()
+	logger = logging.getLogger('browser_use.test_browser_event_bus')
+	session = SimpleNamespace(event_bus=bus, logger=logger, agent_focus=None)
+
+	class StepWatchdog:
+		async def on_StepEvent(self, event: StepEvent) -> str:
+			return 'png'
+
+	async def on_ScreenshotEvent(event: ScreenshotEvent) -> str:
+		step = await bus.dispatch(StepEvent())
+		return await step.event_result()  # type: ignore[return-value]
+
+	bus.on(ScreenshotEvent, on_ScreenshotEvent)
+	BaseWatchdog.attach_handler_to_session(cast(Any, session), StepEvent, StepWatchdog().on_StepEvent)
+	try:
+		logger.setLevel(logging.INFO)
+		assert await bus.dispatch(ScreenshotEvent()).event_result() == 'png'
+		assert CountingHistory.lookups == 0
+
+		logger.setLevel(logging.DEBUG)
+		assert await bus.dispatch(ScreenshotEvent()).event_result() == 'png'
+		assert CountingHistory.lookups > 0
+	finally:
+		logger.setLevel(logging.NOTSET)
+		await bus.stop(clear=True, timeout=5)
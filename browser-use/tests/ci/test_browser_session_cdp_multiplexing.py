@@ -0,0 +1,100 @@
+"""Tests for multiplexing all CDP target sessions over the single root WebSocket connection."""
+
+import asyncio
+import json
+
+import pytest
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.session import BrowserSession, MultiplexedCDPClient
+
+
+class FakeWebSocket:
+	"""Records sent CDP messages without answering them."""
+
+	def __init__(self):
+		self.sent: list[dict] = []
+
+	async def send(self, raw: str) -> None:
+		self.sent.append(json.loads(raw))
+
+
+async def test_multiplexed_client_counts_in_flight_commands_per_session():
+	client = MultiplexedCDPClient('ws://unused')
+	client.ws = FakeWebSocket()  # type: ignore[assignment]
+
+	first = asyncio.create_task(client.send_raw('Runtime.evaluate', {'expression': '1'}, session_id='session-a'))
+	second = asyncio.create_task(client.send_raw('Runtime.evaluate', {'expression': '2'}, session_id='session-a'))
+	third = asyncio.create_task(client.send_raw('Target.getTargets'))
+	await asyncio.sleep(0)
+
+	assert client.in_flight_commands == {'session-a': 2, '': 1}
+	assert [msg.get('sessionId') for msg in client.ws.sent] == ['session-a', 'session-a', None]  # type: ignore[union-attr]
+
+	# answer the commands the way the message handler does
+	client.pending_requests.pop(1).set_result({'result': {'value': 1}})
+	await first
+	assert client.in_flight_commands == {'session-a': 1, '': 1}
+
+	client.pending_requests.pop(2).set_exception(RuntimeError('target closed'))
+	client.pending_requests.pop(3).set_result({'targetInfos': []})
+	with pytest.raises(RuntimeError):
+		await second
+	await third
+	assert client.in_flight_commands == {}
+
+
+@pytest.fixture(scope='module')
+def http_server():
+	server = HTTPServer()
+	server.start()
+	for page in ('a', 'b', 'c'):
+		server.expect_request(f'/{page}').respond_with_data(
+			f'<html><head><title>Page {page}</title></head><body>{page}</body></html>', content_type='text/html'
+		)
+	yield server
+	server.stop()
+
+
+@pytest.fixture(scope='module')
+async def browser_session():
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, keep_alive=True))
+	await browser_session.start()
+	yield browser_session
+	await browser_session.kill()
+
+
+async def test_new_tabs_share_root_socket(browser_session: BrowserSession, http_server: HTTPServer):
+	base_url = f'http://{http_server.host}:{http_server.port}'
+	for page in ('a', 'b', 'c'):
+		event = browser_session.event_bus.dispatch(NavigateToUrlEvent(url=f'{base_url}/{page}', new_tab=True))
+		await event
+		await event.event_result(raise_if_any=True, raise_if_none=False)
+
+	tabs = await browser_session.get_tabs()
+	for tab in tabs:
+		await browser_session.get_or_create_cdp_session(tab.target_id, focus=False)
+
+	sessions = [browser_session._cdp_session_pool[tab.target_id] for tab in tabs]
+	assert len(sessions) >= 3
+	assert all(session.cdp_client is browser_session.cdp_client for session in sessions)
+	assert not any(session.owns_cdp_client for session in sessions)
+	assert len({session.session_id for session in sessions}) == len(sessions)
+	assert all(session.in_flight_commands == 0 for session in sessions)
+
+
+async def test_destroyed_target_is_removed_from_pool(browser_session: BrowserSession):
+	new_target = await browser_session.cdp_client.send.Target.createTarget(params={'url': 'about:blank'})
+	target_id = new_target['targetId']
+	await browser_session.get_or_create_cdp_session(target_id, focus=False)
+	assert target_id in browser_session._cdp_session_pool
+
+	await browser_session.cdp_client.send.Target.closeTarget(params={'targetId': target_id})
+	for _ in range(20):
+		if target_id not in browser_session._cdp_session_pool:
+			break
+		await asyncio.sleep(0.1)
+
+	assert target_id not in browser_session._cdp_session_pool
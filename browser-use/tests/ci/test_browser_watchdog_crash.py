@@ -1,8 +1,13 @@
 """Test CrashWatchdog functionality."""
 
 import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
 from typing import cast
 
+import psutil
 import pytest
 
 from browser_use.browser.events import (
@@ -326,3 +331,121 @@ async def test_browser_process_kill_detection():
 			await session.kill()
 		except Exception:
 			pass
+
+
+class FakeWebSocket:
+	"""Records sent CDP messages without answering them."""
+
+	def __init__(self):
+		self.sent: list[str] = []
+
+	async def send(self, raw: str) -> None:
+		self.sent.append(raw)
+
+
+@pytest.fixture
+async def monitored_session():
+	"""A BrowserSession with an unanswered root CDP client and a CrashWatchdog hooked into it, no real browser."""
+	from browser_use.browser.session import MultiplexedCDPClient
+	from browser_use.browser.watchdogs.crash_watchdog import CrashWatchdog
+
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None))
+	cdp_client = MultiplexedCDPClient('ws://unused')
+	cdp_client.ws = FakeWebSocket()  # type: ignore[assignment]
+	session._cdp_client_root = cdp_client
+	watchdog = CrashWatchdog(event_bus=session.event_bus, browser_session=session, command_timeout_seconds=0.1)
+
+	errors: list[BrowserErrorEvent] = []
+	session.event_bus.on(BrowserErrorEvent, lambda event: errors.append(event))
+
+	yield session, watchdog, cdp_client, errors
+
+	await watchdog._stop_monitoring()
+	await session.event_bus.stop(clear=True, timeout=5)
+
+
+async def test_crash_watchdog_is_idle_while_browser_is_healthy(monitored_session):
+	session, watchdog, cdp_client, errors = monitored_session
+	await watchdog._start_monitoring()
+
+	await asyncio.sleep(0.3)
+
+	assert cdp_client.ws.sent == []  # type: ignore[union-attr]
+	assert not watchdog._cdp_event_tasks
+	assert errors == []
+
+
+async def test_crash_watchdog_reports_websocket_close(monitored_session):
+	session, watchdog, cdp_client, errors = monitored_session
+	await watchdog._start_monitoring()
+
+	cdp_client._on_message_handler_done(None)  # type: ignore[arg-type]
+	cdp_client._on_message_handler_done(None)  # type: ignore[arg-type]
+	await session.event_bus.wait_until_idle()
+
+	assert [error.error_type for error in errors] == ['BrowserDisconnected']
+	assert 'disconnected unexpectedly' in errors[0].message
+
+
+async def test_crash_watchdog_ignores_websocket_close_after_stop(monitored_session):
+	session, watchdog, cdp_client, errors = monitored_session
+	await watchdog._start_monitoring()
+	await watchdog._stop_monitoring()
+
+	cdp_client._on_message_handler_done(None)  # type: ignore[arg-type]
+	await session.event_bus.wait_until_idle()
+
+	assert errors == []
+	assert cdp_client.disconnect_callbacks == [] and cdp_client.slow_command_callbacks == []
+
+
+async def test_crash_watchdog_probes_only_after_command_timeout(monitored_session):
+	session, watchdog, cdp_client, errors = monitored_session
+	watchdog.probe_timeout_seconds = 0.1
+	await watchdog._start_monitoring()
+
+	answered = asyncio.create_task(cdp_client.send_raw('Browser.getVersion'))
+	await asyncio.sleep(0)
+	cdp_client.pending_requests.pop(1).set_result({})
+	await answered
+	await asyncio.sleep(0.15)
+	assert len(cdp_client.ws.sent) == 1  # type: ignore[union-attr]
+
+	stuck = asyncio.create_task(cdp_client.send_raw('Target.getTargets'))
+	await asyncio.sleep(0.4)  # command timeout, then the probe (Browser.getVersion) times out unanswered too
+
+	sent_methods = [json.loads(raw)['method'] for raw in cdp_client.ws.sent]  # type: ignore[union-attr]
+	assert sent_methods == ['Browser.getVersion', 'Target.getTargets', 'Browser.getVersion']
+	await session.event_bus.wait_until_idle()
+	assert [error.error_type for error in errors] == ['BrowserUnresponsive']
+	stuck.cancel()
+
+
+@pytest.mark.skipif(not hasattr(os, 'pidfd_open'), reason='browser process exit watcher needs pidfd support')
+async def test_crash_watchdog_detects_browser_process_exit(monitored_session):
+	session, watchdog, cdp_client, errors = monitored_session
+	process = await asyncio.create_subprocess_exec('sleep', '30')
+	session._local_browser_watchdog = SimpleNamespace(_subprocess=psutil.Process(process.pid))
+	await watchdog._start_monitoring()
+
+	killed_at = time.perf_counter()
+	process.kill()
+	await process.wait()
+	for _ in range(50):
+		if errors:
+			break
+		await asyncio.sleep(0.01)
+
+	assert [error.error_type for error in errors] == ['BrowserProcessCrashed']
+	assert time.perf_counter() - killed_at < 0.5
+	assert watchdog._process_watcher_fd is None
+
+
+async def test_crash_watchdog_is_opt_in():
+	for monitor_crashes, attached in [(False, False), (True, True)]:
+		session = BrowserSession(
+			browser_profile=BrowserProfile(headless=True, user_data_dir=None, monitor_crashes=monitor_crashes)
+		)
+		await session.attach_all_watchdogs()
+		assert (session._crash_watchdog is not None) is attached
+		await session.event_bus.stop(clear=True, timeout=5)
@@ -0,0 +1,155 @@
+"""ClickableElementDetector gives the same decisions as the original rule-by-rule implementation."""
+
+import random
+
+from benchmarks.pages import PAGES
+from benchmarks.run import ReplayDomService
+from benchmarks.synthetic import build_cdp_payloads
+from browser_use.dom.serializer.clickable_elements import ClickableElementDetector
+from browser_use.dom.views import DOMRect, EnhancedAXNode, EnhancedAXProperty, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType
+
+
+def reference_is_interactive(node: EnhancedDOMTreeNode) -> bool:
+	"""The detector before it was table driven"""
+	if node.node_type != NodeType.ELEMENT_NODE:
+		return False
+	if node.tag_name in {'html', 'body'}:
+		return False
+	if node.tag_name and node.tag_name.upper() == 'IFRAME' or node.tag_name.upper() == 'FRAME':
+		if node.snapshot_node and node.snapshot_node.bounds:
+			if node.snapshot_node.bounds.width > 100 and node.snapshot_node.bounds.height > 100:
+				return True
+
+	if node.attributes:
+		search_indicators = {'search', 'magnify', 'glass', 'lookup', 'find', 'query', 'search-icon', 'search-btn'}
+		search_indicators |= {'search-button', 'searchbox'}
+		class_list = node.attributes.get('class', '').lower().split()
+		if any(indicator in ' '.join(class_list) for indicator in search_indicators):
+			return True
+		element_id = node.attributes.get('id', '').lower()
+		if any(indicator in element_id for indicator in search_indicators):
+			return True
+		for attr_name, attr_value in node.attributes.items():
+			if attr_name.startswith('data-') and any(indicator in attr_value.lower() for indicator in search_indicators):
+				return True
+
+	if node.ax_node and node.ax_node.properties:
+		for prop in node.ax_node.properties:
+			if prop.name == 'disabled' and prop.value:
+				return False
+			if prop.name == 'hidden' and prop.value:
+				return False
+			if prop.name in ['focusable', 'editable', 'settable'] and prop.value:
+				return True
+			if prop.name in ['checked', 'expanded', 'pressed', 'selected']:
+				return True
+			if prop.name in ['required', 'autocomplete'] and prop.value:
+				return True
+			if prop.name == 'keyshortcuts' and prop.value:
+				return True
+
+	if node.tag_name in {'button', 'input', 'select', 'textarea', 'a', 'details', 'summary', 'option', 'optgroup'}:
+		return True
+
+	roles = {'button', 'link', 'menuitem', 'option', 'radio', 'checkbox', 'tab', 'textbox', 'combobox', 'slider'}
+	roles |= {'spinbutton', 'search', 'searchbox'}
+	if node.attributes:
+		if any(attr in node.attributes for attr in {'onclick', 'onmousedown', 'onmouseup', 'onkeydown', 'onkeyup', 'tabindex'}):
+			return True
+		if 'role' in node.attributes and node.attributes['role'] in roles:
+			return True
+
+	if node.ax_node and node.ax_node.role and node.ax_node.role in roles | {'listbox'}:
+		return True
+
+	if (
+		node.snapshot_node
+		and node.snapshot_node.bounds
+		and 10 <= node.snapshot_node.bounds.width <= 50
+		and 10 <= node.snapshot_node.bounds.height <= 50
+	):
+		if node.attributes and any(attr in node.attributes for attr in {'class', 'role', 'onclick', 'data-action', 'aria-label'}):
+			return True
+
+	if node.snapshot_node and node.snapshot_node.cursor_style and node.snapshot_node.cursor_style == 'pointer':
+		return True
+
+	return False
+
+
+def random_node(rng: random.Random) -> EnhancedDOMTreeNode:
+	tag = rng.choice(['DIV', 'SPAN', 'BUTTON', 'A', 'IFRAME', 'FRAME', 'HTML', 'BODY', 'LABEL', 'SVG', 'LI', 'INPUT'])
+	attribute_values = {
+		'class': ['', 'btn primary', 'Site-Search', 'magnifying  glass', 'card', 'LookUp\tx'],
+		'id': ['', 'main', 'FindMe', 'query-box'],
+		'data-action': ['', 'open', 'search'],
+		'data-testid': ['row', 'GLASS'],
+		'role': ['button', 'listbox', 'presentation', 'tab'],
+		'onclick': ['go()'],
+		'tabindex': ['0', '-1'],
+		'aria-label': ['Close'],
+		'title': ['search'],
+	}
+	attributes = {name: rng.choice(values) for name, values in attribute_values.items() if rng.random() < 0.2}
+
+	ax_node = None
+	if rng.random() < 0.7:
+		names = ['disabled', 'hidden', 'focusable', 'editable', 'settable', 'checked', 'expanded', 'pressed', 'selected']
+		names += ['required', 'autocomplete', 'keyshortcuts', 'level', 'multiline', 'invalid']
+		values = [True, False, '', 'true', 'false', None, 0, 1, 'Ctrl+K']
+		properties = [EnhancedAXProperty(rng.choice(names), rng.choice(values)) for _ in range(rng.randint(0, 4))]  # type: ignore[arg-type]
+		role = rng.choice([None, '', 'generic', 'button', 'listbox', 'link', 'StaticText', 'searchbox'])
+		ax_node = EnhancedAXNode('ax', False, role, None, None, properties if properties or rng.random() < 0.5 else None, None)
+
+	snapshot_node = None
+	if rng.random() < 0.8:
+		bounds = None
+		if rng.random() < 0.8:
+			bounds = DOMRect(0, 0, rng.choice([0, 5, 10, 30, 50, 51, 100, 101, 400]), rng.choice([0, 10, 50, 100, 101, 300]))
+		cursor = rng.choice([None, 'auto', 'pointer', 'default'])
+		snapshot_node = EnhancedSnapshotNode(None, cursor, bounds, None, None, None, None, None)
+
+	return EnhancedDOMTreeNode(
+		node_id=1,
+		backend_node_id=1,
+		node_type=NodeType.ELEMENT_NODE if rng.random() < 0.9 else NodeType.TEXT_NODE,
+		node_name=tag,
+		node_value='',
+		attributes=attributes,
+		is_scrollable=None,
+		is_visible=True,
+		absolute_position=None,
+		target_id='TARGET',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=None,
+		ax_node=ax_node,
+		snapshot_node=snapshot_node,
+	)
+
+
+def test_same_decisions_on_random_nodes():
+	rng = random.Random(41)
+	nodes = [random_node(rng) for _ in range(5000)]
+
+	decisions = [ClickableElementDetector.is_interactive(node) for node in nodes]
+
+	for node, decision in zip(nodes, decisions):
+		assert decision == reference_is_interactive(node), node
+	assert 0.2 < sum(decisions) / len(decisions) < 0.8
+
+
+async def test_same_decisions_on_benchmark_pages():
+	for page in PAGES.values():
+		tree = await ReplayDomService(build_cdp_payloads(page())).get_dom_tree('TARGET')
+		stack = [tree]
+		while stack:
+			node = stack.pop()
+			assert ClickableElementDetector.is_interactive(node) == reference_is_interactive(node), node
+			stack.extend(node.children_and_shadow_roots)
+			if node.content_document:
+				stack.append(node.content_document)
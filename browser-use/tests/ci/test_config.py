@@ -118,3 +118,51 @@ class TestLazyConfig:
 				os.environ['BROWSER_USE_CLOUD_SYNC'] = sync_original
 			else:
 				os.environ.pop('BROWSER_USE_CLOUD_SYNC', None)
+
+
+class TestConfigSnapshot:
+	"""Test that CONFIG serves values from a snapshot unless reloaded or watching the environment."""
+
+	def test_snapshot_ignores_env_changes_until_reload(self, monkeypatch):
+		monkeypatch.setenv('BROWSER_USE_LOGGING_LEVEL', 'debug')
+		CONFIG.reload()
+		CONFIG.watch_env_changes(False)
+		try:
+			assert CONFIG.BROWSER_USE_LOGGING_LEVEL == 'debug'
+
+			monkeypatch.setenv('BROWSER_USE_LOGGING_LEVEL', 'warning')
+			assert CONFIG.BROWSER_USE_LOGGING_LEVEL == 'debug'
+
+			CONFIG.reload()
+			assert CONFIG.BROWSER_USE_LOGGING_LEVEL == 'warning'
+		finally:
+			CONFIG.watch_env_changes()
+
+	def test_snapshot_parses_environment_once(self, monkeypatch):
+		from browser_use import config as config_module
+
+		parses = []
+		original_flat_env_config = config_module.FlatEnvConfig
+
+		def counting_flat_env_config(*args, **kwargs):
+			parses.append(1)
+			return original_flat_env_config(*args, **kwargs)
+
+		monkeypatch.setattr(config_module, 'FlatEnvConfig', counting_flat_env_config)
+		monkeypatch.setenv('BROWSER_USE_HEADLESS', 'true')
+		CONFIG.reload()
+		CONFIG.watch_env_changes(False)
+		try:
+			for _ in range(100):
+				assert CONFIG.BROWSER_USE_HEADLESS is True
+				assert CONFIG.BROWSER_USE_ALLOWED_DOMAINS is None
+			assert len(parses) == 1
+		finally:
+			CONFIG.watch_env_changes()
+			CONFIG.reload()
+
+	def test_unknown_attribute_raises(self):
+		import pytest
+
+		with pytest.raises(AttributeError):
+			CONFIG.NOT_A_CONFIG_VALUE
@@ -0,0 +1,150 @@
+"""Cross origin iframes and per-frame accessibility trees are captured concurrently, bounded, with a per-frame timeout."""
+
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+from typing import Any, cast
+
+from benchmarks.pages import El, document
+from benchmarks.synthetic import build_cdp_payloads
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode, TargetAllTrees
+
+logger = logging.getLogger(__name__)
+
+MAIN = 'MAIN-TARGET-0000'
+
+
+def page_with_cross_origin_iframes(frames: int) -> dict[str, Any]:
+	"""A page whose iframes have no content document, like cross origin iframes in DOM.getDocument"""
+	payloads = build_cdp_payloads(document('Widgets', [El('iframe', {'title': f'widget {i}'}) for i in range(frames)]))
+	stack = [payloads['dom_tree']['root']]
+	while stack:
+		node = stack.pop()
+		node.pop('contentDocument', None)
+		stack.extend(node.get('children', []))
+	return payloads
+
+
+class FakeFramesDomService(DomService):
+	"""Every target replays its own payloads after a delay, counting how many captures run at once"""
+
+	def __init__(self, payloads: dict[str, dict[str, Any]], delays: dict[str, float], **kwargs: Any):
+		frames = {f'FRAME{i:04d}': {'frameTargetId': target_id} for i, target_id in enumerate(payloads) if target_id != MAIN}
+
+		async def get_all_frames():
+			return frames, {}
+
+		async def get_targets():
+			return {'targetInfos': [{'targetId': target_id} for target_id in payloads]}
+
+		session = SimpleNamespace(
+			logger=logger,
+			agent_focus=None,
+			current_target_id=MAIN,
+			get_all_frames=get_all_frames,
+			cdp_client=SimpleNamespace(send=SimpleNamespace(Target=SimpleNamespace(getTargets=get_targets))),
+		)
+		super().__init__(cast(Any, session), logger=logger, cross_origin_iframes=True, **kwargs)
+		self.payloads = payloads
+		self.delays = delays
+		self.running = 0
+		self.max_running = 0
+
+	async def _get_all_trees(self, target_id: str) -> TargetAllTrees:
+		self.running += 1
+		self.max_running = max(self.max_running, self.running)
+		try:
+			await asyncio.sleep(self.delays.get(target_id, 0))
+		finally:
+			self.running -= 1
+		payloads = self.payloads[target_id]
+		return TargetAllTrees(
+			snapshot=payloads['snapshot'],
+			dom_tree=payloads['dom_tree'],
+			ax_tree=payloads['ax_tree'],
+			device_pixel_ratio=payloads['device_pixel_ratio'],
+			cdp_timing={'cdp_calls_total': self.delays.get(target_id, 0)},
+		)
+
+
+def iframes(root: EnhancedDOMTreeNode) -> list[EnhancedDOMTreeNode]:
+	found, stack = [], [root]
+	while stack:
+		node = stack.pop()
+		if node.tag_name == 'iframe':
+			found.append(node)
+		stack.extend(reversed(node.children_and_shadow_roots))
+	return found
+
+
+async def test_cross_origin_iframes_are_captured_concurrently_and_grafted():
+	frame_targets = [f'IFRAME-TARGET-{i:04d}' for i in range(1, 4)]
+	payloads = {MAIN: page_with_cross_origin_iframes(len(frame_targets))}
+	for i, target_id in enumerate(frame_targets):
+		payloads[target_id] = build_cdp_payloads(document(f'widget {i}', [El('button', children=[f'Pay {i}'])]))
+	delays = {target_id: 0.4 for target_id in frame_targets}
+	delays[frame_targets[1]] = 30.0  # never answers
+	service = FakeFramesDomService(payloads, delays, max_concurrent_frames=2, frame_timeout=0.6)
+
+	start = time.monotonic()
+	state, root, timing = await service.get_serialized_dom_tree()
+	elapsed = time.monotonic() - start
+
+	assert elapsed < 1.3  # one at a time would take 0.4s + 0.6s timeout + 0.4s
+	assert service.max_running == 2
+	documents = [iframe.content_document for iframe in iframes(root)]
+	assert [bool(content_document) for content_document in documents] == [True, False, True]
+	assert all(content_document.parent_node.tag_name == 'iframe' for content_document in documents if content_document)
+	assert sorted(node.get_all_children_text() for node in state.selector_map.values() if node.tag_name == 'button') == [
+		'Pay 0',
+		'Pay 2',
+	]
+
+	assert timing['cdp_calls_total'] == 0
+	assert timing['iframe_0001_cdp_calls_total'] == 0.4
+	assert timing['iframe_0002_timeout'] >= 0.6
+
+
+async def test_accessibility_trees_of_frames_are_fetched_bounded_and_skipped_on_timeout():
+	frame_ids = [f'FRAME-{i}' for i in range(6)]
+	running = 0
+	max_running = 0
+
+	async def get_full_ax_tree(params, session_id):
+		nonlocal running, max_running
+		running += 1
+		max_running = max(max_running, running)
+		try:
+			await asyncio.sleep(30 if params['frameId'] == 'FRAME-3' else 0.05)
+		finally:
+			running -= 1
+		return {'nodes': [{'nodeId': params['frameId'], 'ignored': False}]}
+
+	async def get_frame_tree(session_id):
+		return {'frameTree': {'frame': {'id': frame_ids[0]}, 'childFrames': [{'frame': {'id': i}} for i in frame_ids[1:]]}}
+
+	cdp_session = SimpleNamespace(
+		session_id='S',
+		cdp_client=SimpleNamespace(
+			send=SimpleNamespace(
+				Page=SimpleNamespace(getFrameTree=get_frame_tree),
+				Accessibility=SimpleNamespace(getFullAXTree=get_full_ax_tree),
+			)
+		),
+	)
+
+	async def get_or_create_cdp_session(target_id, focus):
+		return cdp_session
+
+	session = SimpleNamespace(logger=logger, get_or_create_cdp_session=get_or_create_cdp_session)
+	service = DomService(cast(Any, session), max_concurrent_frames=2, frame_timeout=0.3)
+	timing: dict[str, float] = {}
+
+	ax_tree = await service._get_ax_tree_for_all_frames(MAIN, timing)
+
+	assert [node['nodeId'] for node in ax_tree['nodes']] == ['FRAME-0', 'FRAME-1', 'FRAME-2', 'FRAME-4', 'FRAME-5']
+	assert max_running == 2
+	assert sorted(timing) == [f'ax_tree_frame_ME-{i}' for i in range(6)]
+	assert timing['ax_tree_frame_ME-3'] >= 0.3
@@ -0,0 +1,143 @@
+"""DomStore: the DOM tree is stored in columns, EnhancedDOMTreeNode and its parts are views that keep the old API."""
+
+import tracemalloc
+from dataclasses import asdict
+
+from benchmarks.pages import El, document, large_table
+from benchmarks.run import ReplayDomService
+from benchmarks.synthetic import build_cdp_payloads
+from browser_use.browser.events import ClickElementEvent
+from browser_use.dom.views import (
+	DOMInteractedElement,
+	DOMRect,
+	EnhancedAXNode,
+	EnhancedAXProperty,
+	EnhancedDOMTreeNode,
+	EnhancedSnapshotNode,
+	NodeType,
+)
+
+
+async def build_tree(root: El) -> EnhancedDOMTreeNode:
+	return await ReplayDomService(build_cdp_payloads(root)).get_dom_tree('TARGET')
+
+
+def find(node: EnhancedDOMTreeNode, tag: str) -> EnhancedDOMTreeNode:
+	stack = [node]
+	while stack:
+		node = stack.pop()
+		if node.tag_name == tag:
+			return node
+		stack.extend(node.children_and_shadow_roots)
+		if node.content_document:
+			stack.append(node.content_document)
+	raise LookupError(tag)
+
+
+def standalone_node(**overrides) -> EnhancedDOMTreeNode:
+	fields = dict(
+		node_id=7,
+		backend_node_id=70,
+		node_type=NodeType.ELEMENT_NODE,
+		node_name='BUTTON',
+		node_value='',
+		attributes={'id': 'go', 'type': 'submit'},
+		is_scrollable=False,
+		is_visible=True,
+		absolute_position=DOMRect(x=10.0, y=20.0, width=30.0, height=40.0),
+		target_id='TARGET',
+		frame_id='FRAME',
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=None,
+		ax_node=EnhancedAXNode(
+			ax_node_id='ax7',
+			ignored=False,
+			role='button',
+			name='Go',
+			description=None,
+			properties=[EnhancedAXProperty(name='focusable', value=True)],  # type: ignore[arg-type]
+			child_ids=None,
+		),
+		snapshot_node=EnhancedSnapshotNode(
+			is_clickable=True,
+			cursor_style='pointer',
+			bounds=DOMRect(x=10.0, y=20.0, width=30.0, height=40.0),
+			clientRects=None,
+			scrollRects=None,
+			computed_styles={'display': 'inline-block'},
+			paint_order=3,
+			stacking_contexts=None,
+		),
+	)
+	fields.update(overrides)
+	return EnhancedDOMTreeNode(**fields)
+
+
+async def test_nodes_are_views_of_one_store():
+	tree = await build_tree(document('t', [El('form', children=[El('input', {'name': 'q'}), El('button', children=['Go'])])]))
+	form = find(tree, 'form')
+	button = find(tree, 'button')
+
+	assert button._store is tree._store
+	assert form.children_nodes is not None and button in form.children_nodes
+	assert button.parent_node is form and form.children_nodes[0].parent_node is form
+	assert button.attributes == {} and find(tree, 'input').attributes == {'name': 'q'}
+	assert isinstance(button.snapshot_node, EnhancedSnapshotNode) and isinstance(button.snapshot_node.bounds, DOMRect)
+	assert isinstance(button.ax_node, EnhancedAXNode) and button.ax_node.role == 'button'
+	assert button.xpath.endswith('form/button')
+
+	# writes go to the store
+	button.element_index = 5
+	assert find(tree, 'button').element_index == 5
+	assert button.snapshot_node.bounds is not None
+	button.snapshot_node.bounds.x += 1.5
+	assert find(tree, 'button').snapshot_node.bounds.x == button.snapshot_node.bounds.x  # type: ignore[union-attr]
+
+
+def test_standalone_node_keeps_the_dataclass_api():
+	node = standalone_node()
+
+	assert (node.node_id, node.backend_node_id, node.node_type, node.node_name) == (7, 70, NodeType.ELEMENT_NODE, 'BUTTON')
+	assert node.attributes == {'id': 'go', 'type': 'submit'}
+	assert (node.is_scrollable, node.is_visible, node.element_index, node.shadow_roots) == (False, True, None, None)
+	assert node.absolute_position == DOMRect(x=10.0, y=20.0, width=30.0, height=40.0)
+	assert node.ax_node == EnhancedAXNode('ax7', False, 'button', 'Go', None, [EnhancedAXProperty('focusable', True)], None)  # type: ignore[arg-type]
+	assert asdict(node.snapshot_node)['computed_styles'] == {'display': 'inline-block'}  # type: ignore[arg-type]
+	assert node.__json__()['snapshot_node']['bounds'] == {'x': 10.0, 'y': 20.0, 'width': 30.0, 'height': 40.0}
+	assert node.uuid == node.uuid
+
+	child = standalone_node(node_id=8, parent_node=node)
+	node.children_nodes = [child]
+	assert node.children_nodes == [child] and child.parent_node is node
+
+	interacted = DOMInteractedElement.load_from_enhanced_dom_tree(node)
+	assert type(interacted.bounds) is DOMRect and interacted.bounds.to_dict()['width'] == 30.0
+
+
+async def test_nodes_go_through_events():
+	tree = await build_tree(document('t', [El('button', {'id': 'go'}, ['Go'])]))
+	button = find(tree, 'button')
+	button.element_index = 1
+
+	event = ClickElementEvent(node=button)
+
+	assert event.node.backend_node_id == button.backend_node_id and event.node.element_index == 1
+	assert event.node.parent_node is None  # events get a detached copy
+	assert event.model_dump(mode='json')['node']['attributes'] == {'id': 'go'}
+
+
+async def test_tree_retains_less_than_a_kilobyte_per_node():
+	payloads = build_cdp_payloads(large_table(rows=100))
+
+	tracemalloc.start()
+	try:
+		tree = await ReplayDomService(payloads).get_dom_tree('TARGET')
+		retained, _ = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+
+	assert retained / len(tree._store) < 1024
@@ -0,0 +1,168 @@
+"""DOM tree construction and serialization: output stability on replayed pages and no recursion limits on deep pages."""
+
+import hashlib
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+from benchmarks.pages import El, deep_shadow, document, huge_dom, large_table, many_iframes
+from benchmarks.run import ReplayDomService
+from benchmarks.synthetic import build_cdp_payloads
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, SerializedDOMState
+
+
+def mixed_page() -> El:
+	"""Shadow hosts with light children, an iframe inside a shadow root, nested clickables, compound controls, scrolling"""
+	return document(
+		'Mixed',
+		[
+			El(
+				'nav',
+				children=[
+					El('a', {'href': '/'}, [El('span', children=['Home link'])]),
+					El(
+						'button',
+						{'type': 'button'},
+						[El('span', children=['Nested']), El('a', {'href': '/inner'}, ['inner link'])],
+					),
+				],
+			),
+			El(
+				'x-card',
+				children=[El('p', children=['light child'])],
+				shadow=[
+					El('button', children=['Shadow button']),
+					El('iframe', {'title': 'in shadow'}, frame=[El('input', {'type': 'date', 'name': 'when'})]),
+				],
+			),
+			El(
+				'form',
+				children=[
+					El('input', {'type': 'range', 'min': '1', 'max': '5'}),
+					El('select', {'name': 'choice'}, [El('option', children=['A']), El('option', children=['B'])]),
+					El('label', children=['Label text']),
+				],
+			),
+			El('div', {'style': 'overflow: auto; height: 100px'}, [El('p', children=[f'Row {row}']) for row in range(20)]),
+			El('div', {'role': 'button', 'aria-label': 'Custom button'}, ['Custom']),
+		],
+	)
+
+
+PAGES = {
+	'large_table': lambda: large_table(rows=30),
+	'deep_shadow': lambda: deep_shadow(hosts=3, depth=6),
+	'many_iframes': lambda: many_iframes(frames=4),
+	'huge_dom': lambda: huge_dom(target_nodes=1500),
+	'mixed': mixed_page,
+}
+
+# sha256 prefixes of the constructed tree and the serializer output of each page, see page_digest()
+EXPECTED_DIGESTS = {
+	'large_table': '535a54aca717cc62',
+	'deep_shadow': 'ae33369caedee0d1',
+	'many_iframes': '301c4259adcc404f',
+	'huge_dom': '34cbefb44cb97eff',
+	'mixed': 'e81900e2a791ce40',
+}
+
+
+def _rect(rect: DOMRect | None) -> tuple[float, ...] | None:
+	return (round(rect.x, 3), round(rect.y, 3), round(rect.width, 3), round(rect.height, 3)) if rect else None
+
+
+def tree_signature(root: EnhancedDOMTreeNode) -> list[tuple]:
+	rows = []
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		rows.append(
+			(
+				node.node_id,
+				node.parent_node.node_id if node.parent_node else None,
+				node.node_name,
+				node.is_visible,
+				_rect(node.absolute_position),
+				_rect(node.snapshot_node.bounds if node.snapshot_node else None),
+				[child.node_id for child in node.children_nodes or []],
+				[shadow_root.node_id for shadow_root in node.shadow_roots or []],
+				node.content_document.node_id if node.content_document else None,
+			)
+		)
+		stack.extend(reversed(node.children_and_shadow_roots))
+		if node.content_document:
+			stack.append(node.content_document)
+	return rows
+
+
+async def build_tree(root: El) -> EnhancedDOMTreeNode:
+	return await ReplayDomService(build_cdp_payloads(root)).get_dom_tree('TARGET')
+
+
+async def page_digest(root: El) -> str:
+	tree = await build_tree(root)
+	state, _ = DOMTreeSerializer(tree).serialize_accessible_elements()
+	signature = tree_signature(tree)
+
+	# serialize a fresh tree again with half of the elements already known, to cover the is_new markers
+	known = dict(list(state.selector_map.items())[: len(state.selector_map) // 2])
+	second_state, _ = DOMTreeSerializer(
+		await build_tree(root), SerializedDOMState(_root=None, selector_map=known)
+	).serialize_accessible_elements()
+
+	output = (
+		signature,
+		state.llm_representation(),
+		[(index, node.backend_node_id) for index, node in state.selector_map.items()],
+		second_state.llm_representation(),
+	)
+	return hashlib.sha256(repr(output).encode()).hexdigest()[:16]
+
+
+@contextmanager
+def recursion_limit(limit: int):
+	previous = sys.getrecursionlimit()
+	sys.setrecursionlimit(limit)
+	try:
+		yield
+	finally:
+		sys.setrecursionlimit(previous)
+
+
+@pytest.mark.parametrize('page', PAGES)
+async def test_tree_and_serializer_output_is_unchanged(page: str):
+	assert await page_digest(PAGES[page]()) == EXPECTED_DIGESTS[page]
+
+
+async def test_shadow_content_is_serialized_once_when_host_has_light_children():
+	root = document('t', [El('x-host', children=[El('span', children=['light'])], shadow=[El('button', children=['Go'])])])
+	tree = await build_tree(root)
+	host = next(node for node in tree_signature(tree) if node[2] == 'X-HOST')
+	assert len(host[6]) == 1 and len(host[7]) == 1
+
+	state, _ = DOMTreeSerializer(tree).serialize_accessible_elements()
+
+	assert len(state.selector_map) == 1
+	assert state.llm_representation().count('Shadow Content (Open)') == 1
+
+
+async def test_deeply_nested_page_does_not_hit_recursion_limit():
+	depth = 3000
+	innermost = El('button', children=['Deep button'])
+	for level in range(depth):
+		innermost = El('div' if level % 2 else 'section', children=[innermost])
+	with recursion_limit(20 * depth):  # the payload builder recurses, the code under test must not
+		payloads = build_cdp_payloads(document('Deep', [innermost]))
+	# the synthetic layout indents every level, keep all of them inside the viewport instead
+	for layout in payloads['snapshot']['documents'][0]['layout']['bounds']:
+		layout[:] = [0.0, 0.0, 800.0, 24.0]
+
+	with recursion_limit(500):
+		tree = await ReplayDomService(payloads).get_dom_tree('TARGET')
+		state, _ = DOMTreeSerializer(tree).serialize_accessible_elements()
+		text = state.llm_representation()
+
+	assert [node.tag_name for node in state.selector_map.values()] == ['button']
+	assert text == '[1]<button />\n\tDeep button'
@@ -2,10 +2,12 @@
 
 import asyncio
 import tempfile
+import time
 from pathlib import Path
 
 import pytest
 
+from browser_use.filesystem import file_system as file_system_module
 from browser_use.filesystem.file_system import (
 	DEFAULT_FILE_SYSTEM_PATH,
 	INVALID_FILENAME_ERROR_MESSAGE,
@@ -935,3 +937,148 @@ class TestFileSystemIntegration:
 				assert file_obj.content == f'Content for file {i}'
 
 			fs.nuke()
+
+
+class TestFileSystemCaching:
+	"""Test that unchanged files are not described, counted or snapshotted again."""
+
+	async def test_append_writes_only_the_new_content(self, tmp_path):
+		fs = FileSystem(base_dir=tmp_path, create_default_files=False)
+		await fs.write_file('results.md', '# Results\n')
+		path = fs.data_dir / 'results.md'
+		path.write_text('# Changed on disk\n')
+
+		results = await asyncio.gather(*(fs.append_file('results.md', f'- item {i}\n') for i in range(20)))
+
+		assert all('successfully' in result for result in results)
+		expected = ''.join(f'- item {i}\n' for i in range(20))
+		assert path.read_text() == '# Changed on disk\n' + expected  # appended, not rewritten
+		assert fs.get_file('results.md').content == '# Results\n' + expected  # type: ignore[union-attr]
+
+	async def test_versions_invalidate_line_counts_and_descriptions(self, tmp_path):
+		fs = FileSystem(base_dir=tmp_path, create_default_files=False)
+		await fs.write_file('results.md', 'line\n' * 200)
+		await fs.write_file('notes.txt', 'short note')
+		results = fs.get_file('results.md')
+		assert results is not None
+		version = results.version
+
+		description = fs.describe()
+		assert '200 lines' in description and 'short note' in description
+		assert fs.describe() == description
+		assert fs._descriptions['results.md'][0] == version
+
+		await fs.append_file('results.md', 'last line\n')
+		assert results.version > version
+		assert results.get_line_count == 201
+		assert '201 lines' in fs.describe() and 'last line' in fs.describe()
+
+		await fs.replace_file_str('notes.txt', 'short', 'long')
+		assert 'long note' in fs.describe()
+
+	async def test_state_snapshots_share_unchanged_files(self, tmp_path):
+		fs = FileSystem(base_dir=tmp_path, create_default_files=False)
+		await fs.write_file('results.md', 'x' * 100_000)
+		await fs.write_file('todo.md', '- [ ] one')
+
+		first = fs.get_state()
+		await fs.write_file('todo.md', '- [x] one')
+		second = fs.get_state()
+
+		assert second.files['results.md'] is first.files['results.md']
+		assert second.files['todo.md'] is not first.files['todo.md']
+		assert second.files['todo.md']['data']['content'] == '- [x] one'
+		assert FileSystemState.model_validate(second.model_dump()) == second
+
+		restored = FileSystem.from_state(second)
+		assert restored.get_file('results.md').content == 'x' * 100_000  # type: ignore[union-attr]
+		assert restored.get_file('todo.md').content == '- [x] one'  # type: ignore[union-attr]
+
+
+def hanging_extract(path: str, pages: list[int]) -> tuple[int, dict[int, str]]:
+	time.sleep(60)
+	return 0, {}
+
+
+class TestExternalPdf:
+	"""Test reading downloaded PDFs page by page through the worker process and the text cache."""
+
+	@pytest.fixture
+	def pdf_path(self, tmp_path, monkeypatch):
+		from reportlab.lib.pagesizes import letter
+		from reportlab.pdfgen import canvas
+
+		monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+		path = tmp_path / 'report.pdf'
+		pdf = canvas.Canvas(str(path), pagesize=letter)
+		for page in range(1, 26):
+			pdf.drawString(72, 720, f'Page number {page}')
+			pdf.showPage()
+		pdf.save()
+		return str(path)
+
+	async def test_pages_through_long_documents(self, tmp_path, pdf_path):
+		fs = FileSystem(base_dir=tmp_path, create_default_files=False)
+
+		first = await fs.read_file(pdf_path, external_file=True)
+		assert first.startswith(f'Read from file {pdf_path} (pages 1-10 of 25).')
+		assert 'Page number 1' in first and 'Page number 10' in first and 'Page number 11' not in first
+		assert '15 more pages, continue with start_page=11...' in first
+
+		last = await fs.read_file(pdf_path, external_file=True, start_page=21, end_page=40)
+		assert '(pages 21-25 of 25)' in last and 'Page number 25' in last and 'more pages' not in last
+
+		middle = await fs.read_file(pdf_path, external_file=True, start_page=12, end_page=13)
+		assert 'Page number 12' in middle and 'Page number 14' not in middle
+
+		assert 'there is no page 26' in await fs.read_file(pdf_path, external_file=True, start_page=26)
+		assert 'Invalid page range' in await fs.read_file(pdf_path, external_file=True, start_page=5, end_page=4)
+
+	async def test_cached_pages_skip_extraction(self, tmp_path, pdf_path, monkeypatch):
+		fs = FileSystem(base_dir=tmp_path, create_default_files=False)
+		first = await fs.read_file(pdf_path, external_file=True, end_page=5)
+		cache_dirs = list((tmp_path / 'cache' / 'browser_use' / 'pdf_text').iterdir())
+		assert len(cache_dirs) == 1 and (cache_dirs[0] / '5.txt').read_text().startswith('Page number 5')
+
+		def no_worker(*args, **kwargs):
+			raise AssertionError('cached pages were extracted again')
+
+		monkeypatch.setattr(file_system_module, '_call_pdf_worker', no_worker)
+		again = await FileSystem(base_dir=tmp_path / 'other', create_default_files=False).read_file(
+			pdf_path, external_file=True, end_page=5
+		)
+		assert again == first
+
+	async def test_slow_extraction_times_out_without_blocking(self, tmp_path, pdf_path, monkeypatch):
+		fs = FileSystem(base_dir=tmp_path, create_default_files=False)
+		file_system_module._stop_pdf_worker()
+		monkeypatch.setattr(file_system_module, '_extract_pdf_pages', hanging_extract)
+		monkeypatch.setattr(file_system_module, 'PDF_EXTRACT_TIMEOUT', 1.0)
+		ticks = 0
+
+		async def tick():
+			nonlocal ticks
+			while True:
+				await asyncio.sleep(0.05)
+				ticks += 1
+
+		ticker = asyncio.create_task(tick())
+		started = time.monotonic()
+		try:
+			result = await fs.read_file(pdf_path, external_file=True)
+		finally:
+			ticker.cancel()
+
+		assert result == f"Error: Reading '{pdf_path}' took longer than 1s."
+		assert time.monotonic() - started < 10 and ticks >= 10
+		assert file_system_module._pdf_worker is None
+
+		# the hung worker was replaced
+		monkeypatch.undo()
+		monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+		assert 'Page number 1' in await fs.read_file(pdf_path, external_file=True)
+		worker = file_system_module._pdf_worker
+		assert worker is not None and worker.process.is_alive()
+		file_system_module._stop_pdf_worker()
+		worker.process.join(5)
+		assert not worker.process.is_alive()
@@ -0,0 +1,208 @@
+"""GmailService against a local fake of the Gmail API: batched fetches, history based polling and the message cache."""
+
+import asyncio
+import base64
+import time
+from typing import Any
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from browser_use.integrations.gmail import GmailService
+
+
+class FakeRequest:
+	def __init__(self, api: 'FakeGmailApi', method: str, handler, **params: Any):
+		self.api = api
+		self.method = method
+		self.handler = handler
+		self.params = params
+
+	def execute(self) -> Any:
+		self.api.http_requests.append(self.method)
+		return self._run()
+
+	def _run(self) -> Any:
+		self.api.calls.append(self.method)
+		time.sleep(self.api.latency)
+		return self.handler(**self.params)
+
+
+class FakeBatch:
+	"""Like googleapiclient's BatchHttpRequest: one HTTP request, one callback per call"""
+
+	def __init__(self, api: 'FakeGmailApi', callback):
+		self.api = api
+		self.callback = callback
+		self.requests: list[tuple[str, FakeRequest]] = []
+
+	def add(self, request: FakeRequest, request_id: str) -> None:
+		self.requests.append((request_id, request))
+
+	def execute(self) -> None:
+		self.api.http_requests.append(f'batch({len(self.requests)})')
+		for request_id, request in self.requests:
+			try:
+				response, exception = request._run(), None
+			except HttpError as error:
+				response, exception = None, error
+			self.callback(request_id, response, exception)
+
+
+class FakeGmailApi:
+	"""The parts of the discovery based Gmail client that GmailService uses, backed by an in-memory mailbox"""
+
+	def __init__(self, latency: float = 0.0):
+		self.latency = latency
+		self.history_id = 100
+		self.mailbox: dict[str, dict[str, Any]] = {}
+		self.deleted: set[str] = set()  # still listed, but gone by the time they are fetched
+		self.calls: list[str] = []
+		self.http_requests: list[str] = []
+		self.first_history_id = self.history_id
+
+	def deliver(self, subject: str, body: str) -> str:
+		self.history_id += 1
+		message_id = f'msg{len(self.mailbox):03d}'
+		self.mailbox[message_id] = {
+			'id': message_id,
+			'threadId': f'thread-{message_id}',
+			'historyId': str(self.history_id),
+			'internalDate': str(1_700_000_000_000 + len(self.mailbox)),
+			'payload': {
+				'headers': [{'name': 'Subject', 'value': subject}, {'name': 'From', 'value': 'noreply@example.com'}],
+				'body': {'data': base64.urlsafe_b64encode(body.encode()).decode()},
+			},
+		}
+		return message_id
+
+	def error(self, status: int) -> HttpError:
+		return HttpError(httplib2.Response({'status': status}), b'{}')
+
+	# googleapiclient resource API
+
+	def users(self) -> 'FakeGmailApi':
+		return self
+
+	def history(self) -> 'FakeGmailApi':
+		return self
+
+	def new_batch_http_request(self, callback) -> FakeBatch:
+		return FakeBatch(self, callback)
+
+	def getProfile(self, userId: str) -> FakeRequest:
+		return FakeRequest(self, 'getProfile', lambda: {'historyId': str(self.history_id)})
+
+	def messages(self) -> 'FakeMessages':
+		return FakeMessages(self)
+
+	def list(self, userId: str, startHistoryId: str, maxResults: int) -> FakeRequest:
+		def history_list():
+			if int(startHistoryId) < self.first_history_id:
+				raise self.error(404)
+			changes = [{'id': str(i)} for i in range(int(startHistoryId) + 1, self.history_id + 1)]
+			return {'history': changes[:maxResults], 'historyId': str(self.history_id)}
+
+		return FakeRequest(self, 'history.list', history_list)
+
+
+class FakeMessages:
+	def __init__(self, api: FakeGmailApi):
+		self.api = api
+
+	def list(self, userId: str, maxResults: int, q: str) -> FakeRequest:
+		def messages_list():
+			ids = sorted(self.api.mailbox, reverse=True)[:maxResults]
+			return {'messages': [{'id': message_id} for message_id in ids]} if ids else {}
+
+		return FakeRequest(self.api, 'messages.list', messages_list)
+
+	def get(self, userId: str, id: str, format: str) -> FakeRequest:
+		def messages_get():
+			if id in self.api.deleted:
+				raise self.api.error(404)
+			return self.api.mailbox[id]
+
+		return FakeRequest(self.api, 'messages.get', messages_get)
+
+
+def gmail_with(api: FakeGmailApi) -> GmailService:
+	gmail = GmailService(access_token='token')
+	gmail.service = api  # type: ignore[assignment]
+	gmail._authenticated = True
+	return gmail
+
+
+async def test_polls_fetch_only_new_messages():
+	api = FakeGmailApi()
+	for i in range(3):
+		api.deliver(f'Code {i}', f'Your code is {i}{i}{i}')
+	gmail = gmail_with(api)
+
+	emails = await gmail.get_recent_emails(max_results=10, query='code', time_filter='5m')
+	assert [email['subject'] for email in emails] == ['Code 2', 'Code 1', 'Code 0']
+	assert emails[0]['body'] == 'Your code is 222' and emails[0]['from'] == 'noreply@example.com'
+	assert api.http_requests == ['getProfile', 'messages.list', 'batch(3)']
+
+	# nothing arrived: one history request, no listing and no fetching
+	api.http_requests.clear()
+	assert await gmail.get_recent_emails(max_results=10, query='code', time_filter='5m') == emails
+	assert api.http_requests == ['history.list']
+
+	# a new message: listed again, only the new one is fetched
+	api.http_requests.clear()
+	api.deliver('Code 3', 'Your code is 333')
+	emails = await gmail.get_recent_emails(max_results=10, query='code', time_filter='5m')
+	assert [email['subject'] for email in emails] == ['Code 3', 'Code 2', 'Code 1', 'Code 0']
+	assert api.http_requests == ['history.list', 'messages.list', 'batch(1)']
+
+
+async def test_messages_are_fetched_in_batches_and_failures_are_skipped():
+	api = FakeGmailApi()
+	for i in range(60):
+		api.deliver(f'Newsletter {i}', 'Hello')
+	api.deleted.add('msg042')
+	gmail = gmail_with(api)
+
+	emails = await gmail.get_recent_emails(max_results=60)
+
+	assert len(emails) == 59 and 'msg042' not in {email['id'] for email in emails}
+	assert api.http_requests == ['getProfile', 'messages.list', 'batch(50)', 'batch(10)']
+	assert api.calls.count('messages.get') == 60
+
+
+async def test_outdated_history_id_starts_over():
+	api = FakeGmailApi()
+	api.deliver('Code', '123456')
+	gmail = gmail_with(api)
+	await gmail.get_recent_emails()
+
+	gmail._history_id = '1'
+	api.http_requests.clear()
+	emails = await gmail.get_recent_emails()
+
+	assert [email['subject'] for email in emails] == ['Code']
+	assert api.http_requests == ['history.list', 'getProfile', 'messages.list']
+
+
+async def test_api_calls_do_not_block_the_event_loop():
+	api = FakeGmailApi(latency=0.1)
+	for i in range(5):
+		api.deliver(f'Code {i}', str(i))
+	gmail = gmail_with(api)
+	ticks = 0
+
+	async def tick():
+		nonlocal ticks
+		while True:
+			await asyncio.sleep(0.01)
+			ticks += 1
+
+	ticker = asyncio.create_task(tick())
+	try:
+		emails = await gmail.get_recent_emails()
+	finally:
+		ticker.cancel()
+
+	assert len(emails) == 5
+	assert ticks >= 10  # 7 calls of 0.1s ran in a worker thread
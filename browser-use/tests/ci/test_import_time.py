@@ -0,0 +1,72 @@
+"""Import time regression tests: `import browser_use` must not load provider SDKs or optional subsystems."""
+
+import subprocess
+import sys
+
+import pytest
+
+# generous so slow CI machines pass, a provider SDK sneaking back in costs more than this on its own
+IMPORT_TIME_BUDGET_MS = 3000
+
+HEAVY_MODULES = [
+	'openai',
+	'anthropic',
+	'google.genai',
+	'groq',
+	'ollama',
+	'boto3',
+	'posthog',
+	'reportlab',
+	'PIL',
+	'mcp',
+	'imageio',
+]
+
+
+def import_time(statement: str) -> tuple[dict[str, int], int]:
+	"""Run `statement` in a fresh interpreter with -X importtime, return {module: cumulative µs} and the total µs."""
+	result = subprocess.run(
+		[sys.executable, '-X', 'importtime', '-c', statement],
+		capture_output=True,
+		text=True,
+		check=True,
+	)
+	modules: dict[str, int] = {}
+	total_us = 0
+	for line in result.stderr.splitlines():
+		if not line.startswith('import time:') or 'cumulative' in line:
+			continue
+		_, cumulative, name = line.split('|')
+		modules[name.strip()] = int(cumulative)
+		if not name.startswith('  '):  # top level import, its cumulative time includes everything below it
+			total_us += int(cumulative)
+	return modules, total_us
+
+
+@pytest.mark.parametrize(
+	'statement',
+	[
+		'import browser_use',
+		'from browser_use import Agent, BrowserSession, BrowserProfile, Tools',
+	],
+)
+def test_import_does_not_load_heavy_optional_modules(statement: str):
+	modules, total_us = import_time(statement)
+
+	loaded = [name for name in HEAVY_MODULES if name in modules]
+	assert not loaded, f'{statement!r} imported {loaded}, import them lazily where they are used'
+	assert total_us / 1000 < IMPORT_TIME_BUDGET_MS, f'{statement!r} took {total_us / 1000:.0f}ms to import'
+
+
+def test_plain_import_does_not_load_agent_or_browser():
+	modules, _ = import_time('import browser_use')
+
+	assert 'browser_use.agent.service' not in modules
+	assert 'browser_use.browser.session' not in modules
+
+
+def test_chat_model_import_only_loads_its_own_provider():
+	modules, _ = import_time('from browser_use import ChatOpenAI')
+
+	assert 'openai' in modules
+	assert not {'anthropic', 'google.genai', 'groq', 'ollama', 'boto3'} & modules.keys()
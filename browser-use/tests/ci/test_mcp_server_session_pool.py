@@ -0,0 +1,158 @@
+"""Tests for the pooled, session-aware browser tools of the MCP server."""
+
+import asyncio
+import json
+import logging
+import time
+
+import mcp.types as types
+import pytest
+
+from browser_use.mcp.server import SESSION_AWARE_TOOLS, BrowserUseServer
+
+# importing the MCP server silences all logging for stdio mode, undo that for the rest of the test run
+logging.disable(logging.NOTSET)
+
+
+class FakeBrowserSession:
+	"""Stands in for a started BrowserSession, only the parts the session pool touches."""
+
+	def __init__(self, session_id: str):
+		self.id = session_id
+		self.cdp_client = object()
+		self.killed = False
+
+	async def kill(self) -> None:
+		self.killed = True
+
+
+@pytest.fixture
+def server():
+	server = BrowserUseServer(max_sessions=2)
+	created: list[FakeBrowserSession] = []
+
+	async def create_browser_session(session_id: str | None = None, **kwargs):
+		session = FakeBrowserSession(session_id or 'default')
+		created.append(session)
+		server._track_session(session)  # type: ignore[arg-type]
+		return session
+
+	async def execute_browser_tool(browser_session, tool_name: str, arguments: dict):
+		await asyncio.sleep(arguments.get('delay', 0))
+		return f'{tool_name} ran in {browser_session.id}'
+
+	server._create_browser_session = create_browser_session  # type: ignore[method-assign]
+	server._execute_browser_tool = execute_browser_tool  # type: ignore[method-assign]
+	server.created_sessions = created  # type: ignore[attr-defined]
+	return server
+
+
+async def test_browser_tools_advertise_session_id(server: BrowserUseServer):
+	list_tools = server.server.request_handlers[types.ListToolsRequest]
+	result = await list_tools(types.ListToolsRequest(method='tools/list'))
+	tools = {tool.name: tool for tool in result.root.tools}  # type: ignore[union-attr]
+
+	for name in SESSION_AWARE_TOOLS & tools.keys():
+		assert 'session_id' in tools[name].inputSchema['properties']
+	assert 'session_id' not in tools['browser_list_sessions'].inputSchema['properties']
+	assert 'session_id' not in tools['retry_with_browser_use_agent'].inputSchema['properties']
+
+
+async def test_tool_calls_without_session_id_use_default_session(server: BrowserUseServer):
+	assert await server._execute_tool('browser_go_back', {}) == 'browser_go_back ran in default'
+	assert await server._execute_tool('browser_go_back', {}) == 'browser_go_back ran in default'
+	assert server.browser_session is not None and server.browser_session.id == 'default'
+	assert len(server.created_sessions) == 1  # type: ignore[attr-defined]
+
+
+async def test_different_sessions_run_concurrently(server: BrowserUseServer):
+	start = time.perf_counter()
+	results = await asyncio.gather(
+		server._execute_tool('browser_scroll', {'session_id': 'a', 'delay': 0.3}),
+		server._execute_tool('browser_scroll', {'session_id': 'b', 'delay': 0.3}),
+	)
+	elapsed = time.perf_counter() - start
+
+	assert results == ['browser_scroll ran in a', 'browser_scroll ran in b']
+	assert elapsed < 0.55
+
+
+async def test_same_session_calls_are_serialized(server: BrowserUseServer):
+	start = time.perf_counter()
+	await asyncio.gather(
+		server._execute_tool('browser_scroll', {'session_id': 'a', 'delay': 0.2}),
+		server._execute_tool('browser_scroll', {'session_id': 'a', 'delay': 0.2}),
+	)
+	assert time.perf_counter() - start >= 0.4
+
+
+async def test_least_recently_used_idle_session_is_evicted(server: BrowserUseServer):
+	await server._execute_tool('browser_go_back', {'session_id': 'a'})
+	await server._execute_tool('browser_go_back', {'session_id': 'b'})
+	await server._execute_tool('browser_go_back', {'session_id': 'a'})  # b is now least recently used
+
+	await server._execute_tool('browser_go_back', {'session_id': 'c'})
+
+	assert set(server.active_sessions) == {'a', 'c'}
+	evicted = [session for session in server.created_sessions if session.id == 'b']  # type: ignore[attr-defined]
+	assert evicted and evicted[0].killed
+
+
+async def test_busy_sessions_are_not_evicted(server: BrowserUseServer):
+	slow_calls = [
+		asyncio.create_task(server._execute_tool('browser_scroll', {'session_id': session_id, 'delay': 0.3}))
+		for session_id in ('a', 'b')
+	]
+	await asyncio.sleep(0.1)
+
+	with pytest.raises(RuntimeError, match='pool is full'):
+		await server._execute_tool('browser_go_back', {'session_id': 'c'})
+
+	await asyncio.gather(*slow_calls)
+	assert set(server.active_sessions) == {'a', 'b'}
+
+
+async def test_list_sessions_reports_per_session_latency(server: BrowserUseServer):
+	await server._execute_tool('browser_scroll', {'session_id': 'a', 'delay': 0.05})
+	await server._execute_tool('browser_scroll', {'session_id': 'a', 'delay': 0.05})
+
+	sessions = json.loads(await server._execute_tool('browser_list_sessions', {}))
+
+	assert len(sessions) == 1
+	assert sessions[0]['session_id'] == 'a'
+	assert sessions[0]['tool_calls'] == 2
+	assert sessions[0]['busy'] is False
+	assert sessions[0]['avg_latency_ms'] >= 50
+	assert sessions[0]['max_latency_ms'] >= sessions[0]['last_latency_ms'] >= 50
+
+
+async def test_session_being_evicted_is_not_handed_out(server: BrowserUseServer):
+	await server._execute_tool('browser_go_back', {'session_id': 'a'})
+	await server._execute_tool('browser_go_back', {'session_id': 'b'})
+	dying = server.active_sessions['a']['session']
+	kill_started, finish_kill = asyncio.Event(), asyncio.Event()
+
+	async def slow_kill() -> None:
+		kill_started.set()
+		await finish_kill.wait()
+		dying.killed = True
+
+	dying.kill = slow_kill
+	eviction = asyncio.create_task(server._execute_tool('browser_go_back', {'session_id': 'c'}))
+	await kill_started.wait()
+
+	# a call for the session being evicted gets a new browser instead of the one shutting down
+	assert 'a' not in server.active_sessions
+	finish_kill.set()
+	assert await eviction == 'browser_go_back ran in c'
+	assert await server._execute_tool('browser_go_back', {'session_id': 'a'}) == 'browser_go_back ran in a'
+	assert server.active_sessions['a']['session'] is not dying and dying.killed
+
+
+async def test_close_and_list_tabs_do_not_launch_a_browser(server: BrowserUseServer):
+	assert await server._execute_tool('browser_close', {}) == 'No browser session to close'
+	assert await server._execute_tool('browser_list_tabs', {'session_id': 'unknown'}) == 'Error: No browser session active'
+	assert server.created_sessions == []  # type: ignore[attr-defined]
+
+	await server._execute_tool('browser_go_back', {'session_id': 'a'})
+	assert await server._execute_tool('browser_list_tabs', {'session_id': 'a'}) == 'browser_list_tabs ran in a'
@@ -0,0 +1,90 @@
+"""The agent history description is updated incrementally and matches rebuilding it from all items."""
+
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.message_manager.views import HistoryDescriptionBuffer, HistoryItem, MessageManagerState
+from browser_use.agent.views import ActionResult, AgentSettings, AgentStepInfo
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.messages import SystemMessage
+
+
+def rebuilt_description(items: list[HistoryItem], max_history_items: int | None) -> str:
+	"""The previous implementation: render every item on every step"""
+	if max_history_items is None or len(items) <= max_history_items:
+		return '\n'.join(item.to_string() for item in items)
+	omitted_count = len(items) - max_history_items
+	return '\n'.join(
+		[
+			items[0].to_string(),
+			f'<sys>[... {omitted_count} previous steps omitted...]</sys>',
+			*(item.to_string() for item in items[-(max_history_items - 1) :]),
+		]
+	)
+
+
+def make_item(step: int) -> HistoryItem:
+	if step % 7 == 0:
+		return HistoryItem(step_number=step, error='Agent failed to output in the right format.')
+	if step % 5 == 0:
+		return HistoryItem(system_message=f'<follow_up_user_request> task {step} </follow_up_user_request>')
+	return HistoryItem(step_number=step, memory=f'memory {step}', next_goal='next', action_results=f'Result:\nclicked {step}')
+
+
+def test_description_matches_rebuilding_from_all_items():
+	for max_history_items in [None, 6, 10]:
+		buffer = HistoryDescriptionBuffer(max_history_items)
+		items = [HistoryItem(step_number=0, system_message='Agent initialized')]
+		assert buffer.render([]) == ''
+
+		for step in range(1, 40):
+			assert buffer.render(items) == rebuilt_description(items, max_history_items)
+			items.extend(make_item(step) for _ in range(1 + step % 2))
+		assert buffer.render(items) == rebuilt_description(items, max_history_items)
+
+		# a replaced or shortened list is rendered from scratch
+		items = items[:12]
+		assert buffer.render(items) == rebuilt_description(items, max_history_items)
+		items[-1] = make_item(100)
+		assert buffer.render(items) == rebuilt_description(items, max_history_items)
+
+
+def test_each_item_is_rendered_once(tmp_path: Path, monkeypatch):
+	manager = MessageManager(
+		task='Find the pricing page',
+		system_message=SystemMessage(content='You are a browser agent.'),
+		file_system=FileSystem(tmp_path),
+		state=MessageManagerState(),
+		max_history_items=6,
+	)
+	rendered: list[int | None] = []
+	to_string = HistoryItem.to_string
+
+	def counting_to_string(self: HistoryItem) -> str:
+		rendered.append(self.step_number)
+		return to_string(self)
+
+	monkeypatch.setattr(HistoryItem, 'to_string', counting_to_string)
+
+	for step in range(1, 21):
+		manager._update_agent_history_description(
+			None, [ActionResult(error='x' * 300, long_term_memory=f'opened page {step}')], AgentStepInfo(step, 20)
+		)
+		assert manager.agent_history_description == manager.agent_history_description
+	monkeypatch.setattr(HistoryItem, 'to_string', to_string)
+
+	assert rendered == list(range(21))
+	assert manager.agent_history_description == rebuilt_description(manager.state.agent_history_items, 6)
+	assert '<sys>[... 15 previous steps omitted...]</sys>' in manager.agent_history_description
+
+
+def test_history_window_too_small_is_rejected():
+	for max_history_items in [0, 1]:
+		with pytest.raises(ValueError):
+			HistoryDescriptionBuffer(max_history_items)
+	with pytest.raises(ValidationError):
+		AgentSettings(max_history_items=1)
+	assert AgentSettings(max_history_items=6).max_history_items == 6
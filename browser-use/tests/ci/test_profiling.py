@@ -0,0 +1,170 @@
+"""Tests for the span profiler: nesting across tasks, per-step summaries and Chrome trace export."""
+
+import asyncio
+import json
+
+import pytest
+
+from browser_use.profiling import SpanProfiler, profiler, traced
+from browser_use.utils import time_execution_async, time_execution_sync
+
+
+@pytest.fixture
+def enabled_profiler():
+	was_enabled = profiler.enabled
+	profiler.enable()
+	profiler.clear()
+	yield profiler
+	profiler.clear()
+	if not was_enabled:
+		profiler.disable()
+
+
+def test_disabled_profiler_records_nothing():
+	spans = SpanProfiler(enabled=False)
+
+	with spans.span('build', 'dom') as span:
+		spans.annotate(nodes=10)
+
+	assert span is None
+	assert not spans.spans
+	assert spans.current_span() is None
+
+
+async def test_spans_nest_across_async_tasks():
+	spans = SpanProfiler(enabled=True)
+
+	async def fetch(name: str):
+		with spans.span(name, 'cdp'):
+			await asyncio.sleep(0.01)
+			return spans.current_span('step')
+
+	with spans.span('step 1', 'step') as step:
+		parents = await asyncio.gather(fetch('a'), fetch('b'))
+
+	assert parents == [step, step]
+	assert spans.current_span() is None
+	by_name = {span.name: span for span in spans.spans}
+	assert by_name['a'].parent is step and by_name['b'].parent is step
+	assert by_name['a'].track != by_name['b'].track  # gathered tasks get their own track
+
+
+async def test_summarize_attributes_time_per_category():
+	spans = SpanProfiler(enabled=True)
+
+	with spans.span('step 1', 'step') as step:
+		with spans.span('get_state', 'watchdog'):
+			with spans.span('build', 'dom'):
+				with spans.span('build_inner', 'dom'):  # same layer nested, must not be counted twice
+					await asyncio.sleep(0.02)
+		with spans.span('invoke', 'llm'):
+			await asyncio.sleep(0.01)
+
+	summary = spans.summarize(step)
+
+	assert list(summary)[0] == 'total'
+	assert set(summary) == {'total', 'watchdog', 'dom', 'llm'}
+	assert summary['dom'] >= 20
+	assert summary['dom'] < sum(span.duration_ms for span in spans.spans if span.category == 'dom')
+	assert summary['llm'] >= 10
+	assert summary['total'] >= summary['watchdog'] + summary['llm']
+
+
+def test_exceptions_are_recorded_and_context_is_restored():
+	spans = SpanProfiler(enabled=True)
+
+	with pytest.raises(ValueError):
+		with spans.span('click', 'action'):
+			raise ValueError('boom')
+
+	assert spans.spans[0].args == {'error': 'ValueError'}
+	assert spans.current_span() is None
+
+
+def test_chrome_trace_export(tmp_path):
+	spans = SpanProfiler(enabled=True)
+	with spans.span('step 1', 'step', step=1):
+		with spans.span('Page.navigate', 'cdp', url=tmp_path):
+			pass
+
+	path = spans.export_chrome_trace(tmp_path / 'traces' / 'run.trace.json')
+	trace = json.loads(path.read_text())
+
+	complete = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+	assert [event['name'] for event in complete] == ['step 1', 'Page.navigate']
+	assert complete[0]['cat'] == 'step' and complete[0]['args'] == {'step': 1}
+	assert complete[1]['args'] == {'url': str(tmp_path)}
+	assert complete[0]['ts'] <= complete[1]['ts']
+	assert complete[0]['dur'] >= complete[1]['dur']
+	assert any(event['ph'] == 'M' and event['name'] == 'thread_name' for event in trace['traceEvents'])
+
+
+async def test_concurrent_agents_only_see_their_own_spans():
+	spans = SpanProfiler(enabled=True)
+
+	async def watchdog(name: str):
+		# like an event bus handler, running in a task started during the agent's run but outside of its step span
+		with spans.span(f'{name} handler', 'watchdog'):
+			await asyncio.sleep(0.02)
+
+	async def agent(name: str):
+		token = spans.set_owner(name)
+		try:
+			with spans.span(f'{name} step', 'step') as step:
+				handler = asyncio.create_task(watchdog(name))
+				with spans.span(f'{name} invoke', 'llm'):
+					await asyncio.sleep(0.02)
+				await handler
+			return step
+		finally:
+			spans.reset_owner(token)
+
+	step_a, step_b = await asyncio.gather(agent('a'), agent('b'))
+	with spans.span('shared browser', 'cdp'):
+		pass
+
+	by_name = {span.name: span for span in spans.spans}
+	for name, step in (('a', step_a), ('b', step_b)):
+		summary = spans.summarize(step)
+		assert set(summary) == {'total', 'watchdog', 'llm'}
+		# the agent's own time only, not both agents'
+		assert summary['watchdog'] == round(by_name[f'{name} handler'].duration_ms, 3)
+		assert summary['llm'] == round(by_name[f'{name} invoke'].duration_ms, 3)
+	assert spans.current_span() is None and spans._owner.get() is None
+
+	trace = spans.to_chrome_trace(owner='a')
+	names = {event['name'] for event in trace['traceEvents'] if event['ph'] == 'X'}
+	assert names == {'a step', 'a handler', 'a invoke', 'shared browser'}
+	assert len([event for event in spans.to_chrome_trace()['traceEvents'] if event['ph'] == 'X']) == 7
+
+
+def test_max_spans_bounds_memory():
+	spans = SpanProfiler(enabled=True, max_spans=5)
+	for i in range(20):
+		with spans.span(f'span {i}'):
+			pass
+
+	assert [span.name for span in spans.spans] == [f'span {i}' for i in range(15, 20)]
+
+
+async def test_decorators_record_spans(enabled_profiler: SpanProfiler):
+	@time_execution_async('--act', category='action')
+	async def act():
+		enabled_profiler.annotate(action='click')
+		return sync_helper()
+
+	@time_execution_sync('--helper')
+	def sync_helper():
+		return traced_helper()
+
+	@traced(category='dom')
+	def traced_helper():
+		return 'done'
+
+	assert await act() == 'done'
+
+	spans = {span.name: span for span in enabled_profiler.spans}
+	assert spans['act'].category == 'action' and spans['act'].args == {'action': 'click'}
+	assert spans['helper'].parent is spans['act']
+	assert spans['helper'].category == __name__.split('.')[0]  # defaults to the package the function lives in
+	assert spans['traced_helper'].category == 'dom' and spans['traced_helper'].parent is spans['helper']
@@ -0,0 +1,114 @@
+"""ScreenshotService stores each distinct screenshot once and reads shared files once."""
+
+import base64
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList
+from browser_use.browser.views import BrowserStateHistory
+from browser_use.screenshots.service import ScreenshotService
+
+
+def screenshot(text: str, dot: tuple[int, int] | None = None, background: str = 'white') -> str:
+	image = Image.new('RGB', (320, 200), background)
+	draw = ImageDraw.Draw(image)
+	draw.rectangle((20, 20, 300, 60), fill='navy')
+	draw.text((30, 100), text, fill='black')
+	if dot:
+		image.putpixel(dot, (250, 250, 250))
+	buffer = BytesIO()
+	image.save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode()
+
+
+async def test_identical_screenshots_share_one_file(tmp_path: Path):
+	service = ScreenshotService(tmp_path)
+	page, other_page = screenshot('Search results'), screenshot('Checkout')
+
+	paths = [await service.store_screenshot(b64) for b64 in [page, page, other_page, page]]
+
+	assert paths[0] == paths[1] == paths[3] != paths[2]
+	assert {str(path) for path in service.screenshots_dir.iterdir()} == {paths[0], paths[2]}
+	assert await service.get_screenshots([paths[0], None, paths[2], paths[3]]) == [page, None, other_page, page]
+
+
+async def test_near_duplicates_reuse_the_previous_file(tmp_path: Path):
+	page = screenshot('Loading...')
+	almost_the_same = screenshot('Loading...', dot=(200, 150))
+	other_page = screenshot('Done', background='black')
+
+	exact = ScreenshotService(tmp_path / 'exact')
+	assert len({await exact.store_screenshot(b64) for b64 in [page, almost_the_same]}) == 2
+
+	service = ScreenshotService(tmp_path / 'near', near_duplicate_threshold=4)
+	paths = [await service.store_screenshot(b64) for b64 in [page, almost_the_same, other_page]]
+
+	assert paths[0] == paths[1] != paths[2]
+	assert await service.get_screenshot(paths[1]) == page
+
+
+def test_agent_passes_near_duplicate_threshold(mock_llm):
+	from browser_use import Agent
+
+	agent = Agent(task='Test', llm=mock_llm, screenshot_near_duplicate_threshold=4)
+	assert agent.screenshot_service.near_duplicate_threshold == 4
+	assert Agent(task='Test', llm=mock_llm).screenshot_service.near_duplicate_threshold is None
+
+
+async def test_history_reads_shared_screenshots_once(tmp_path: Path, monkeypatch):
+	service = ScreenshotService(tmp_path)
+	page, other_page = screenshot('Search results'), screenshot('Checkout')
+	paths = [await service.store_screenshot(b64) for b64 in [page, page, other_page, page]]
+	history = AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[ActionResult()],
+				state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[], screenshot_path=path),
+			)
+			for path in [*paths[:4], None]
+		]
+	)
+	reads: list[str | None] = []
+	get_screenshot = BrowserStateHistory.get_screenshot
+
+	def counting_get_screenshot(self: BrowserStateHistory) -> str | None:
+		reads.append(self.screenshot_path)
+		return get_screenshot(self)
+
+	monkeypatch.setattr(BrowserStateHistory, 'get_screenshot', counting_get_screenshot)
+
+	assert history.screenshots() == [page, page, other_page, page, None]
+	assert reads == [paths[0], paths[2], None]
+
+
+async def test_async_history_screenshots_read_shared_files_once(tmp_path: Path, monkeypatch):
+	from browser_use.screenshots import service as service_module
+
+	service = ScreenshotService(tmp_path)
+	page, other_page = screenshot('Search results'), screenshot('Checkout')
+	paths = [await service.store_screenshot(b64) for b64 in [page, page, other_page]]
+	history = AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[ActionResult()],
+				state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[], screenshot_path=path),
+			)
+			for path in [*paths, None, str(tmp_path / 'deleted.png')]
+		]
+	)
+	reads: list[str | None] = []
+	load_screenshot = service_module._load_screenshot
+
+	async def counting_load_screenshot(path: str | None) -> str | None:
+		reads.append(path)
+		return await load_screenshot(path)
+
+	monkeypatch.setattr(service_module, '_load_screenshot', counting_load_screenshot)
+
+	assert await history.ascreenshots() == history.screenshots() == [page, page, other_page, None, None]
+	assert await history.ascreenshots(n_last=3, return_none_if_not_screenshot=False) == [other_page]
+	assert sorted(reads[:3]) == sorted([paths[0], paths[2], str(tmp_path / 'deleted.png')]) and len(reads) == 5
@@ -0,0 +1,105 @@
+"""SensitiveDataMatcher redacts and fills in secrets in one pass, with the same result as replacing them one by one."""
+
+import random
+import re
+
+import pyotp
+
+from browser_use.utils import SensitiveDataMatcher
+
+
+def sequential_redact(text: str, sensitive_data: dict) -> str:
+	"""The previous implementation: one str.replace per secret"""
+	sensitive_values: dict[str, str] = {}
+	for key_or_domain, content in sensitive_data.items():
+		if isinstance(content, dict):
+			for key, val in content.items():
+				if val:
+					sensitive_values[key] = val
+		elif content:
+			sensitive_values[key_or_domain] = content
+	for key, val in sensitive_values.items():
+		text = text.replace(val, f'<secret>{key}</secret>')
+	return text
+
+
+def sequential_fill(text: str, secrets: dict[str, str], used: set[str], missing: set[str]) -> str:
+	"""The previous implementation: findall, then one str.replace per placeholder"""
+	for placeholder in re.findall(r'<secret>(.*?)</secret>', text):
+		if placeholder in secrets:
+			text = text.replace(f'<secret>{placeholder}</secret>', secrets[placeholder])
+			used.add(placeholder)
+		else:
+			missing.add(placeholder)
+	return text
+
+
+def test_redaction_matches_sequential_replace():
+	rng = random.Random(48)
+	filler = ['the ', 'login ', 'form ', 'with ', 'value ', '\n', '"', ': ', 'x']
+
+	for _ in range(300):
+		# distinct secrets that do not contain each other or overlap in the text, where the replace order cannot matter
+		values = list(dict.fromkeys(f'#{rng.randrange(10_000)}S{rng.randrange(10**6)}#' for _ in range(rng.randint(1, 8))))
+		keys = [f'key_{i}' for i in range(len(values))]
+		if rng.random() < 0.5:
+			sensitive_data = dict(zip(keys, values))
+		else:
+			sensitive_data = {'https://*.example.com': dict(zip(keys[::2], values[::2])), **dict(zip(keys[1::2], values[1::2]))}
+		sensitive_data['empty'] = ''
+		text = ''.join(rng.choice(filler + values) for _ in range(rng.randint(0, 60)))
+
+		assert SensitiveDataMatcher(sensitive_data).redact(text) == sequential_redact(text, sensitive_data)
+
+
+def test_overlapping_secrets_are_redacted_as_a_whole():
+	matcher = SensitiveDataMatcher({'pin': '1234', 'card': '4111123456', 'code': '5678'})
+
+	# one by one, the pin would be replaced first and leave the rest of the card number in the text
+	assert matcher.redact('card 4111123456, pin 1234') == 'card <secret>card</secret>, pin <secret>pin</secret>'
+	assert matcher.redact('12345678') == '<secret>pin</secret><secret>code</secret>'
+	assert SensitiveDataMatcher({'a': 'abc', 'b': 'bcd'}).redact('abcd') == '<secret>a</secret>d'
+
+
+def test_same_key_on_several_domains_redacts_every_value():
+	matcher = SensitiveDataMatcher({'https://a.com': {'password': 'first'}, 'https://b.com': {'password': 'second'}})
+
+	assert matcher.redact('first second') == '<secret>password</secret> <secret>password</secret>'
+	assert matcher.secrets_for_url('https://b.com/login') == {'password': 'second'}
+	assert matcher.secrets_for_url('about:blank') == {}
+
+
+def test_placeholders_are_filled_like_sequential_replace():
+	rng = random.Random(49)
+	secrets = {f'key_{i}': f'value {i}' for i in range(6)}
+	# a stray opening tag swallows the next placeholder into its key in both implementations, just differently
+	pieces = ['text ', '</secret>', '<secret>unknown</secret>', *(f'<secret>{key}</secret>' for key in secrets)]
+
+	for _ in range(300):
+		text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+		used, missing, expected_used, expected_missing = set(), set(), set(), set()
+
+		assert SensitiveDataMatcher.fill_placeholders(text, secrets, used, missing) == sequential_fill(
+			text, secrets, expected_used, expected_missing
+		)
+		assert (used, missing) == (expected_used, expected_missing)
+
+
+def test_totp_placeholder_gets_the_current_code():
+	secret = pyotp.random_base32()
+	used: set[str] = set()
+
+	filled = SensitiveDataMatcher.fill_placeholders(
+		'<secret>bu_2fa_code</secret> <secret>bu_2fa_code</secret>', {'bu_2fa_code': secret}, used, set()
+	)
+
+	code, again = filled.split()
+	assert code == again and len(code) == 6 and pyotp.TOTP(secret).verify(code, valid_window=1)
+	assert used == {'bu_2fa_code'}
+
+
+def test_cached_matcher_is_reused_for_equal_sensitive_data():
+	assert SensitiveDataMatcher.cached({'https://*.example.com': {'user': 'me'}}) is SensitiveDataMatcher.cached(
+		{'https://*.example.com': {'user': 'me'}}
+	)
+	assert not SensitiveDataMatcher.cached({'user': ''}).has_secrets
@@ -0,0 +1,117 @@
+"""Tests for event-driven, debounced storage state persistence."""
+
+import asyncio
+import json
+
+import pytest
+from bubus import EventBus
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.watchdogs.storage_state_watchdog import StorageStateWatchdog
+
+COOKIE = {'name': 'sid', 'value': '1', 'domain': 'example.com', 'path': '/'}
+
+
+@pytest.fixture
+async def storage(monkeypatch, tmp_path):
+	"""A watchdog whose browser returns whatever storage state the test puts in `state`."""
+	state_file = tmp_path / 'storage_state.json'
+	state = {'cookies': [dict(COOKIE)], 'origins': []}
+	fetches = []
+
+	async def get_storage_state(self, keep_dom_storage_enabled: bool = False):
+		fetches.append(keep_dom_storage_enabled)
+		return json.loads(json.dumps(state))
+
+	async def get_or_create_cdp_session(self, *args, **kwargs):
+		return True
+
+	monkeypatch.setattr(BrowserSession, '_cdp_get_storage_state', get_storage_state)
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+
+	browser_session = BrowserSession(browser_profile=BrowserProfile(storage_state=str(state_file), user_data_dir=None))
+	watchdog = StorageStateWatchdog(
+		event_bus=EventBus(), browser_session=browser_session, save_debounce=0.1, auto_save_interval=0.5
+	)
+	yield watchdog, state_file, state, fetches
+	await watchdog._stop_monitoring()
+	await watchdog.event_bus.stop(clear=True, timeout=5)
+
+
+async def test_set_cookie_headers_are_detected_case_insensitively(storage):
+	watchdog, *_ = storage
+
+	watchdog._on_response_extra_info({'headers': {'content-type': 'text/html'}})  # type: ignore[arg-type]
+	assert not watchdog._changes
+
+	watchdog._on_response_extra_info({'headers': {'SET-COOKIE': 'sid=1'}})  # type: ignore[arg-type]
+	assert watchdog._changes == {'cookies'}
+
+
+async def test_bursts_of_changes_are_saved_once_after_debounce(storage):
+	watchdog, state_file, _, fetches = storage
+
+	for _ in range(5):
+		watchdog._mark_changed('cookies')
+		watchdog._on_dom_storage_changed({})
+		await asyncio.sleep(0.02)
+	assert not state_file.exists()
+
+	await asyncio.sleep(0.3)
+	assert len(fetches) == 1
+	assert json.loads(state_file.read_text())['cookies'] == [COOKIE]
+	assert not watchdog._changes
+
+
+async def test_continuous_changes_are_saved_within_auto_save_interval(storage):
+	watchdog, state_file, _, fetches = storage
+
+	for _ in range(12):  # keeps resetting the debounce for 0.6s, longer than auto_save_interval
+		watchdog._mark_changed('origins')
+		await asyncio.sleep(0.05)
+
+	assert len(fetches) >= 1
+	assert state_file.exists()
+
+
+async def test_unchanged_state_is_not_rewritten(storage):
+	watchdog, state_file, state, _ = storage
+
+	await watchdog._save_storage_state()
+	first_write = state_file.stat().st_mtime_ns
+	await watchdog._save_storage_state()
+	assert state_file.stat().st_mtime_ns == first_write
+	assert not state_file.with_suffix('.json.bak').exists()
+
+	state['cookies'][0]['value'] = '2'
+	await watchdog._save_storage_state()
+	assert json.loads(state_file.read_text())['cookies'][0]['value'] == '2'
+	assert json.loads(state_file.with_suffix('.json.bak').read_text())['cookies'][0]['value'] == '1'
+	assert not state_file.with_suffix('.json.tmp').exists()
+
+
+async def test_save_merges_with_cookies_already_in_file(storage):
+	watchdog, state_file, _, _ = storage
+	other_cookie = {'name': 'other', 'value': 'x', 'domain': 'other.com', 'path': '/'}
+	state_file.write_text(json.dumps({'cookies': [other_cookie], 'origins': []}))
+
+	await watchdog._save_storage_state()
+
+	assert json.loads(state_file.read_text())['cookies'] == [other_cookie, COOKIE]
+
+
+def test_diff_storage_states():
+	old = {'cookies': [COOKIE, {**COOKIE, 'name': 'gone'}], 'origins': [{'origin': 'https://a.com', 'localStorage': []}]}
+	new = {
+		'cookies': [{**COOKIE, 'value': '2'}, {**COOKIE, 'name': 'new'}],
+		'origins': [{'origin': 'https://a.com', 'localStorage': [{'name': 'k', 'value': 'v'}]}],
+	}
+
+	diff = StorageStateWatchdog._diff_storage_states(old, new)
+
+	assert diff == {
+		'cookies_added': ['new@example.com/'],
+		'cookies_changed': ['sid@example.com/'],
+		'cookies_removed': ['gone@example.com/'],
+		'origins_changed': ['https://a.com'],
+	}
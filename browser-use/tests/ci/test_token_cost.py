@@ -0,0 +1,195 @@
+"""Tests for the running usage totals and bounded history of the token cost service."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from browser_use.llm.views import ChatInvokeUsage
+from browser_use.tokens.service import TokenCost
+
+PRICING = {
+	'model-a': {'input_cost_per_token': 0.001, 'output_cost_per_token': 0.002, 'cache_read_input_token_cost': 0.0001},
+	'model-b': {'input_cost_per_token': 0.01, 'output_cost_per_token': 0.02},
+}
+
+
+def make_usage(prompt: int, completion: int, cached: int | None = None) -> ChatInvokeUsage:
+	return ChatInvokeUsage(
+		prompt_tokens=prompt,
+		prompt_cached_tokens=cached,
+		prompt_cache_creation_tokens=None,
+		prompt_image_tokens=None,
+		completion_tokens=completion,
+		total_tokens=prompt + completion,
+	)
+
+
+@pytest.fixture
+def token_cost(tmp_path, monkeypatch) -> TokenCost:
+	tc = TokenCost(include_cost=True, max_history=3, history_spill_path=tmp_path / 'usage.jsonl')
+
+	async def load_pricing_data(self):
+		self._pricing_data = PRICING
+
+	monkeypatch.setattr(TokenCost, '_load_pricing_data', load_pricing_data)
+	return tc
+
+
+async def test_summary_comes_from_running_totals(token_cost: TokenCost):
+	await token_cost.initialize()
+	token_cost.add_usage('model-a', make_usage(100, 10, cached=40))
+	token_cost.add_usage('model-b', make_usage(200, 20))
+	token_cost.add_usage('model-a', make_usage(300, 30))
+
+	summary = await token_cost.get_usage_summary()
+
+	assert summary.entry_count == 3
+	assert summary.total_prompt_tokens == 600
+	assert summary.total_completion_tokens == 60
+	assert summary.total_prompt_cached_tokens == 40
+	assert summary.by_model['model-a'].invocations == 2
+	assert summary.by_model['model-a'].average_tokens_per_invocation == 220
+	expected_a = 60 * 0.001 + 40 * 0.0001 + 10 * 0.002 + 300 * 0.001 + 30 * 0.002
+	expected_b = 200 * 0.01 + 20 * 0.02
+	assert summary.by_model['model-a'].cost == pytest.approx(expected_a)
+	assert summary.total_cost == pytest.approx(expected_a + expected_b)
+	assert summary.total_prompt_cached_cost == pytest.approx(40 * 0.0001)
+
+	only_b = await token_cost.get_usage_summary(model='model-b')
+	assert only_b.entry_count == 1
+	assert only_b.total_cost == pytest.approx(expected_b)
+	assert (await token_cost.get_usage_summary(model='unknown')).entry_count == 0
+
+	tokens = token_cost.get_usage_tokens_for_model('model-a')
+	assert (tokens.prompt_tokens, tokens.prompt_cached_tokens, tokens.completion_tokens) == (400, 40, 40)
+
+
+async def test_cost_is_calculated_once_pricing_is_loaded(token_cost: TokenCost):
+	entry = token_cost.add_usage('model-b', make_usage(100, 10))
+	assert entry.cost is None  # pricing not loaded yet
+
+	summary = await token_cost.get_usage_summary()
+
+	assert entry.cost is not None
+	assert summary.total_cost == pytest.approx(100 * 0.01 + 10 * 0.02)
+	assert (await token_cost.get_usage_summary()).total_cost == summary.total_cost
+	assert token_cost.add_usage('model-b', make_usage(100, 10)).cost == entry.cost
+
+
+async def test_history_is_bounded_and_spilled_to_disk(token_cost: TokenCost):
+	for i in range(5):
+		token_cost.add_usage('model-a', make_usage(i, 1))
+
+	assert [entry.usage.prompt_tokens for entry in token_cost.usage_history] == [2, 3, 4]
+	assert [entry.usage.prompt_tokens for entry in token_cost.iter_usage_history()] == [0, 1, 2, 3, 4]
+	assert (await token_cost.get_usage_summary()).entry_count == 5
+
+	token_cost.clear_history()
+	assert not token_cost.usage_history
+	assert list(token_cost.iter_usage_history()) == []
+	assert (await token_cost.get_usage_summary()).entry_count == 0
+
+
+async def test_summary_since_uses_time_buckets(monkeypatch):
+	token_cost = TokenCost(bucket_size=timedelta(minutes=1), max_history=2)
+	now = datetime(2025, 1, 1, 12, 0, 0)
+	timestamps = [now, now + timedelta(seconds=30), now + timedelta(minutes=2), now + timedelta(minutes=2, seconds=30)]
+
+	class FakeDatetime(datetime):
+		@classmethod
+		def now(cls, tz=None):
+			return timestamps.pop(0)
+
+	monkeypatch.setattr('browser_use.tokens.service.datetime', FakeDatetime)
+	for prompt in (1, 2, 3, 4):
+		token_cost.add_usage('model-a', make_usage(prompt, 0))
+
+	async def prompt_tokens_since(since: datetime) -> int:
+		return (await token_cost.get_usage_summary(since=since)).total_prompt_tokens
+
+	assert await prompt_tokens_since(now - timedelta(hours=1)) == 10
+	assert await prompt_tokens_since(now + timedelta(minutes=1)) == 7
+	# split exactly inside a bucket whose entries are still in memory
+	assert await prompt_tokens_since(now + timedelta(minutes=2, seconds=10)) == 4
+	# entries of the first bucket left the history, so that bucket is counted whole
+	assert await prompt_tokens_since(now + timedelta(seconds=10)) == 10
+
+
+async def test_initialize_does_not_wait_for_pricing(tmp_path, monkeypatch):
+	tc = TokenCost(include_cost=True)
+	tc._cache_dir = tmp_path
+	loaded = asyncio.Event()
+
+	async def fetch_and_cache_pricing_data(self):
+		await loaded.wait()
+		self._pricing_data = PRICING
+
+	monkeypatch.setattr(TokenCost, '_fetch_and_cache_pricing_data', fetch_and_cache_pricing_data)
+
+	await asyncio.wait_for(tc.initialize(), timeout=1)
+	entry = tc.add_usage('model-b', make_usage(100, 10))
+	assert entry.cost is None
+
+	loaded.set()
+	summary = await asyncio.wait_for(tc.get_usage_summary(), timeout=1)
+	assert entry.cost is not None
+	assert summary.total_cost == pytest.approx(100 * 0.01 + 10 * 0.02)
+
+
+async def test_bundled_pricing_is_used_when_offline(tmp_path, monkeypatch):
+	tc = TokenCost(include_cost=True)
+	tc._cache_dir = tmp_path
+
+	async def fetch_and_cache_pricing_data(self):
+		self._pricing_data = {}  # what a failed download leaves behind
+
+	monkeypatch.setattr(TokenCost, '_fetch_and_cache_pricing_data', fetch_and_cache_pricing_data)
+
+	pricing = await tc.get_model_pricing('gpt-4.1-mini')
+	assert pricing is not None and pricing.input_cost_per_token
+
+
+async def test_summary_does_not_wait_for_a_slow_pricing_download(tmp_path, monkeypatch):
+	tc = TokenCost(include_cost=True)
+	tc._cache_dir = tmp_path
+	loaded = asyncio.Event()
+
+	async def fetch_and_cache_pricing_data(self):
+		await loaded.wait()
+		self._pricing_data = {'gpt-4.1-mini': PRICING['model-b']}
+
+	monkeypatch.setattr(TokenCost, '_fetch_and_cache_pricing_data', fetch_and_cache_pricing_data)
+	monkeypatch.setattr(TokenCost, 'PRICING_WAIT_TIMEOUT', 0.1)
+
+	await tc.initialize()
+	entry = tc.add_usage('gpt-4.1-mini', make_usage(100, 10))
+	bundled = tc._get_loaded_model_pricing('gpt-4.1-mini', await tc._load_bundled_pricing())
+	assert bundled is not None and bundled.input_cost_per_token and bundled.output_cost_per_token
+
+	summary = await asyncio.wait_for(tc.get_usage_summary(), timeout=1)
+	assert summary.total_cost == pytest.approx(100 * bundled.input_cost_per_token + 10 * bundled.output_cost_per_token)
+	assert summary.by_model['gpt-4.1-mini'].cost == pytest.approx(summary.total_cost)
+	assert entry.cost is None  # priced for the summary only, costed once the download finishes
+
+	loaded.set()
+	await asyncio.sleep(0)
+	summary = await asyncio.wait_for(tc.get_usage_summary(), timeout=1)
+	assert entry.cost is not None
+	assert summary.total_cost == pytest.approx(100 * 0.01 + 10 * 0.02)
+
+
+async def test_pricing_file_overrides_bundled_pricing_without_network(tmp_path, monkeypatch):
+	pricing_file = tmp_path / 'pricing.json'
+	pricing_file.write_text(json.dumps({'gpt-4.1-mini': PRICING['model-a'], 'my-local-model': PRICING['model-b']}))
+	tc = TokenCost(include_cost=True, pricing_file=pricing_file)
+
+	async def fetch_and_cache_pricing_data(self):
+		raise AssertionError('pricing must not be downloaded when a pricing file is given')
+
+	monkeypatch.setattr(TokenCost, '_fetch_and_cache_pricing_data', fetch_and_cache_pricing_data)
+
+	assert (await tc.get_model_pricing('my-local-model')).input_cost_per_token == 0.01  # type: ignore[union-attr]
+	assert (await tc.get_model_pricing('gpt-4.1-mini')).input_cost_per_token == 0.001  # type: ignore[union-attr]
+	assert await tc.get_model_pricing('claude-sonnet-4-20250514') is not None